@@ -0,0 +1,91 @@
+"""
+Benchmark: Feste gegen adaptive Parallelität unter einer Quota
+
+Der lokale Stub-Server lässt nur eine begrenzte Zahl gleichzeitiger Requests
+zu und antwortet darüber mit 429 (wie die Concurrency-Limits der
+ElevenLabs-Tarife). Verglichen werden ein vorsichtiges und ein zu hohes
+festes Limit mit der adaptiven AIMD-Regelung.
+
+Aufruf:
+    python benchmarks/bench_concurrency.py [--hooks 120] [--quota 6] [--synthesis-delay 0.1]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.audio_cache import AudioCache
+from src.backends import ElevenLabsBackend
+from src.concurrency import AdaptiveConcurrency
+from src.config import get_config
+from src.generator import HookGenerator
+from src.logger import set_log_level
+from src.rate_limiter import RateLimiter
+from tests.stub_server import StubTTSServer
+
+config = get_config()
+
+
+def strategies(quota: int) -> dict:
+    """Name -> Controller (feste Limits: Minimum = Maximum)"""
+    timid, aggressive = max(1, quota // 3), quota * 2
+    return {
+        f"fest {timid}": lambda: AdaptiveConcurrency(initial_limit=timid, min_limit=timid, max_limit=timid),
+        f"fest {aggressive}": lambda: AdaptiveConcurrency(initial_limit=aggressive, min_limit=aggressive,
+                                                          max_limit=aggressive),
+        "adaptiv": lambda: AdaptiveConcurrency(initial_limit=2, min_limit=1, max_limit=aggressive),
+    }
+
+
+def run(controller: AdaptiveConcurrency, hooks: int, quota: int, delay: float) -> dict:
+    """Rendert einen Katalog gegen einen frischen Stub mit Quota"""
+    with StubTTSServer(frames=40, first_byte_delay=delay, max_concurrent=quota) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        generator = HookGenerator(
+            "bench", "bench", concurrency=controller,
+            cache=AudioCache(str(Path(tmp) / "cache")),
+            backend=ElevenLabsBackend("bench", api_base=server.api_base)
+        )
+        generator.rate_limiter = RateLimiter(0)
+        texts = [f"Hook Nummer {i+1} mit etwas Text zum Sprechen" for i in range(hooks)]
+
+        started = time.monotonic()
+        zip_path, message = generator.generate_hooks_batch(texts, tmp)
+        elapsed = time.monotonic() - started
+
+    status = controller.snapshot()
+    return {
+        'seconds': elapsed,
+        'ok': zip_path is not None,
+        'throttled': server.throttled,
+        'peak': server.peak_active,
+        'limit': status['limit'],
+        'decisions': status['increases'] + status['decreases'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hooks", type=int, default=120)
+    parser.add_argument("--quota", type=int, default=6)
+    parser.add_argument("--synthesis-delay", type=float, default=0.1)
+    parser.add_argument("--retry-delay", type=float, default=0.2)
+    args = parser.parse_args()
+    set_log_level("ERROR")
+    config.network.retry_delay = args.retry_delay
+
+    print(f"Quota: {args.quota} gleichzeitige Requests, {args.hooks} Hooks\n")
+    print(f"{'Strategie':<10} {'Dauer (s)':>10} {'429':>6} {'Spitze':>7} {'Limit':>6} "
+          f"{'Entscheidungen':>15} {'Ergebnis':>9}")
+    for name, factory in strategies(args.quota).items():
+        result = run(factory(), args.hooks, args.quota, args.synthesis_delay)
+        print(f"{name:<10} {result['seconds']:>10.2f} {result['throttled']:>6} {result['peak']:>7} "
+              f"{result['limit']:>6} {result['decisions']:>15} {'ok' if result['ok'] else 'Fehler':>9}")
+
+
+if __name__ == "__main__":
+    main()
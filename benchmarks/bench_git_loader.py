@@ -0,0 +1,85 @@
+"""
+Benchmark: Ladezeit von GitLoader-Modulen mit kaltem und warmem Bytecode-Cache
+
+Ein lokaler Stub liefert die echten Quelltexte des Projekts unter einem
+Commit-Hash aus. Verglichen werden:
+    kalt            leerer Cache (Download + Kompilieren)
+    Bytecode kalt   Quelltext gecacht, Bytecode gelöscht (Kompilieren)
+    warm            Quelltext und Bytecode gecacht (nur marshal + exec)
+
+Aufruf:
+    python benchmarks/bench_git_loader.py [--runs 20] [--modules setup,generator,demo,git_loader]
+
+(logger ist nicht voreingestellt: das erneut ausgeführte Modul setzt das Log-Level zurück)
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.git_loader import GitLoader, ModuleCache
+from src.logger import set_log_level
+from tests.stub_git_server import StubGitServer
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+
+
+def load(server: StubGitServer, cache: ModuleCache, modules: list) -> tuple:
+    """Lädt alle Module in einer frischen Session: (Dauer, Metriken)"""
+    loader = GitLoader(server.repo, base_url=server.base_url, cache=cache)
+    started = time.perf_counter()
+    results = loader.load_multiple_modules(modules, COMMIT, {'__name__': "bench"})
+    elapsed = time.perf_counter() - started
+    if not all(status['success'] for status in results.values()):
+        failed = [module for module, status in results.items() if not status['success']]
+        raise RuntimeError(f"Module nicht geladen: {failed}")
+    return elapsed, loader.metrics
+
+
+def run(server: StubGitServer, modules: list) -> dict:
+    """Ein Durchlauf aller drei Szenarien mit eigenem Cache-Verzeichnis"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ModuleCache(tmp)
+        cold, cold_metrics = load(server, cache, modules)
+        shutil.rmtree(Path(tmp) / "bytecode")
+        compile_only, compile_metrics = load(server, cache, modules)
+        warm, warm_metrics = load(server, cache, modules)
+
+    assert cold_metrics['downloaded'] == len(modules)
+    assert compile_metrics['compiled'] == len(modules) and compile_metrics['downloaded'] == 0
+    assert warm_metrics['bytecode_hits'] == len(modules)
+    return {'kalt': cold, 'Bytecode kalt': compile_only, 'warm': warm}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--modules", default="setup,generator,demo,git_loader")
+    args = parser.parse_args()
+    set_log_level("ERROR")
+
+    modules = [name.strip() for name in args.modules.split(",") if name.strip()]
+    sources = {name: (SRC_DIR / f"{name}.py").read_text(encoding="utf-8") for name in modules}
+    size = sum(len(code) for code in sources.values())
+    print(f"{len(modules)} Module ({size / 1024:.0f} KiB Quelltext), {args.runs} Durchläufe\n")
+
+    timings = {}
+    with StubGitServer({COMMIT: sources}) as server:
+        for _ in range(args.runs):
+            for scenario, seconds in run(server, modules).items():
+                timings.setdefault(scenario, []).append(seconds)
+
+    print(f"{'Szenario':<14} {'Median (ms)':>12} {'Min (ms)':>10}")
+    for scenario, values in timings.items():
+        print(f"{scenario:<14} {statistics.median(values) * 1000:>12.2f} {min(values) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: Iterationsschleife mit Entwürfen und Audio-Cache
+
+Rendert eine Datei mit 100 Hooks mehrfach, wobei zwischen den Runden ein
+Teil der Texte geändert wird. Verglichen wird das bisherige Vorgehen (jede
+Runde alles in Final-Qualität mit den Standard-Workern) mit Entwürfen im
+breiteren Pool und Cache. Die API wird durch den lokalen Stub-Server ersetzt.
+
+Aufruf:
+    python benchmarks/bench_render.py [--hooks 100] [--synthesis-delay 0.1]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.audio_cache import AudioCache
+from src.config import get_config
+from src.generator import HookGenerator, QUALITY_DRAFT, QUALITY_FINAL
+from src.logger import set_log_level
+from src.rate_limiter import RateLimiter
+from src.scheduler import HookJob, JobScheduler
+from tests.stub_server import StubTTSServer
+
+config = get_config()
+
+
+def iteration_texts(hooks: int, rounds: int, edit_ratio: float):
+    """Texte pro Runde: in jeder Runde wird ein Teil der Hooks umformuliert"""
+    texts = [f"Hook Nummer {i+1} mit etwas Text zum Sprechen" for i in range(hooks)]
+    edits = max(1, int(hooks * edit_ratio))
+    for round_index in range(rounds):
+        if round_index:
+            start = (round_index * edits) % hooks
+            for i in range(start, start + edits):
+                texts[i % hooks] = f"{texts[i % hooks]} (Version {round_index + 1})"
+        yield list(texts)
+
+
+def run(quality: str, workers: int, keep_cache: bool, args) -> list:
+    """Führt alle Runden aus und liefert die Dauer pro Runde"""
+    durations = []
+    scheduler = JobScheduler(workers=workers, rate_limiter=RateLimiter(0))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(str(Path(tmp) / "cache"))
+
+        for round_index, texts in enumerate(iteration_texts(args.hooks, args.rounds, args.edit_ratio)):
+            if not keep_cache:
+                cache = AudioCache(str(Path(tmp) / f"cache-{round_index}"))
+
+            generator = HookGenerator("bench", "bench", quality=quality, cache=cache)
+            output_dir = Path(tmp) / f"round-{round_index}"
+            output_dir.mkdir()
+
+            started = time.monotonic()
+            job = scheduler.submit(HookJob(generator, texts, str(output_dir)))
+            zip_path, message = job.wait()
+            durations.append(time.monotonic() - started)
+
+            if zip_path is None:
+                raise RuntimeError(message)
+
+    scheduler.shutdown()
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hooks", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--edit-ratio", type=float, default=0.1)
+    parser.add_argument("--synthesis-delay", type=float, default=0.1)
+    args = parser.parse_args()
+    set_log_level("WARNING")
+
+    with StubTTSServer(frames=80, first_byte_delay=args.synthesis_delay) as server:
+        config.elevenlabs.api_base = server.api_base
+
+        baseline = run(QUALITY_FINAL, config.scheduler.workers, False, args)
+        drafts = run(QUALITY_DRAFT, config.render.draft_workers, True, args)
+
+    print(f"{'Runde':<8} {'Final ohne Cache (s)':>22} {'Entwurf mit Cache (s)':>22} {'Faktor':>8}")
+    for i, (old, new) in enumerate(zip(baseline, drafts)):
+        print(f"{i+1:<8} {old:>22.2f} {new:>22.2f} {old / new:>7.1f}x")
+    print(f"{'Summe':<8} {sum(baseline):>22.2f} {sum(drafts):>22.2f} {sum(baseline) / sum(drafts):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: Job-Abschlusszeiten des Schedulers unter gemischter Last
+
+Simuliert einen großen Bulk-Katalog und mehrere kleine interaktive Jobs
+verschiedener Nutzer und vergleicht FIFO mit Priorität/SJF/Fair-Share.
+
+Aufruf:
+    python benchmarks/bench_scheduler.py [--seconds-per-char 0.0002]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.generator import HookGenerator
+from src.logger import set_log_level
+from src.rate_limiter import RateLimiter
+from src.scheduler import HookJob, JobScheduler
+
+
+class SimulatedGenerator(HookGenerator):
+    """Generator ohne Netzwerk: Dauer proportional zur Zeichenanzahl"""
+
+    def __init__(self, seconds_per_char: float):
+        super().__init__("bench", "bench")
+        self.seconds_per_char = seconds_per_char
+
+    def generate_audio_hook(self, text: str, output_path: str, token=None) -> bool:
+        time.sleep(len(text) * self.seconds_per_char)
+        with open(output_path, "wb") as f:
+            f.write(b"\x00" * 64)
+        return True
+
+
+def percentile(values, q: float) -> float:
+    """Einfaches Perzentil (nächster Rang)"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def workload():
+    """(Startverzögerung, Nutzer, Hook-Anzahl, Zeichen pro Hook)"""
+    jobs = [(0.0, "catalog-a", 200, 120), (0.05, "catalog-b", 80, 120)]
+    for i in range(12):
+        jobs.append((0.1 + i * 0.15, f"user-{i}", 3, 80))
+    return jobs
+
+
+def run(policy: str, seconds_per_char: float, workers: int) -> dict:
+    """Führt die Last einmal mit der gegebenen Strategie aus"""
+    scheduler = JobScheduler(workers=workers, policy=policy, rate_limiter=RateLimiter(0))
+    generator = SimulatedGenerator(seconds_per_char)
+    submitted = []
+    lock = threading.Lock()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def submit_later(delay, tenant, hooks, chars):
+            time.sleep(delay)
+            output_dir = Path(tmp) / f"{tenant}-{policy}"
+            output_dir.mkdir()
+            job = HookJob(generator, ["x" * chars] * hooks, str(output_dir), tenant=tenant)
+            with lock:
+                submitted.append(scheduler.submit(job))
+
+        threads = [threading.Thread(target=submit_later, args=spec) for spec in workload()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for job in submitted:
+            job.wait()
+
+    scheduler.shutdown()
+
+    times = {'all': [], 'interactive': [], 'bulk': []}
+    for job in submitted:
+        times['all'].append(job.completion_time)
+        times[job.priority].append(job.completion_time)
+
+    return {
+        name: (statistics.mean(values), percentile(values, 0.95))
+        for name, values in times.items() if values
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds-per-char", type=float, default=0.0002)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    set_log_level("WARNING")
+
+    print(f"{'Strategie':<10} {'Klasse':<12} {'Mittel (s)':>10} {'p95 (s)':>10}")
+    for policy in ("fifo", "sjf"):
+        for name, (mean, p95) in run(policy, args.seconds_per_char, args.workers).items():
+            print(f"{policy:<10} {name:<12} {mean:>10.2f} {p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
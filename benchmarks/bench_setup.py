@@ -0,0 +1,70 @@
+"""
+Benchmark: Installation aus dem Package-Index gegen Installation aus dem Wheelhouse
+
+Baut einmalig ein Wheelhouse und installiert die Anforderungen danach
+abwechselnd über den Index (ohne pip-Cache) und aus dem Wheelhouse, jeweils
+in ein frisches --target-Verzeichnis. Das Wheelhouse-Szenario läuft mit
+--no-index, also vollständig offline.
+
+Aufruf:
+    python benchmarks/bench_setup.py [--requirements "requests httpx nest-asyncio"] [--runs 3]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.logger import set_log_level
+from src.setup import ColabSetup
+
+
+def install(colab: ColabSetup, requirements: list) -> float:
+    """Installiert in ein frisches Zielverzeichnis und misst die Dauer"""
+    with tempfile.TemporaryDirectory() as target, colab._install_command(requirements, isolated=True) as cmd:
+        cmd = cmd + ['--target', target, '--no-cache-dir']
+        started = time.perf_counter()
+        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requirements", default="requests httpx nest-asyncio")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    set_log_level("ERROR")
+
+    requirements = args.requirements.split()
+    with tempfile.TemporaryDirectory() as tmp:
+        requirements_file = Path(tmp) / "requirements.txt"
+        requirements_file.write_text("\n".join(requirements) + "\n")
+
+        started = time.perf_counter()
+        builder = ColabSetup()
+        if not builder.build_wheelhouse(str(requirements_file), str(Path(tmp) / "wheelhouse")):
+            sys.exit("Wheelhouse konnte nicht gebaut werden")
+        wheels = len(builder.wheelhouse_index())
+        print(f"Wheelhouse: {wheels} Wheels in {time.perf_counter() - started:.1f}s gebaut\n")
+
+        strategies = {
+            'Index': ColabSetup(),
+            'Wheelhouse': ColabSetup(wheelhouse_dir=builder.wheelhouse_dir, offline=True),
+        }
+        timings = {name: [] for name in strategies}
+        for _ in range(args.runs):
+            for name, colab in strategies.items():
+                timings[name].append(install(colab, requirements))
+
+    print(f"{'Quelle':<12} {'Median (s)':>11} {'Min (s)':>9}")
+    for name, values in timings.items():
+        print(f"{name:<12} {statistics.median(values):>11.2f} {min(values):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -53,9 +53,10 @@ os.chdir(REPO_DIR)
 # Pfad für Module hinzufügen
 sys.path.insert(0, REPO_DIR)
 
-# Abhängigkeiten installieren
-print("📦 Installiere Abhängigkeiten...")
-os.system("pip install -r requirements.txt -q")
+# Abhängigkeiten installieren (übersprungen, wenn bereits erfüllt)
+print("📦 Prüfe Abhängigkeiten...")
+from src.setup import install_requirements
+install_requirements("requirements.txt")
 
 # Module laden
 try:
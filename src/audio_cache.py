@@ -0,0 +1,193 @@
+"""
+Audio-Cache-Modul für Colab-Sound Projekt
+Inhaltsadressierter Cache für generierte Hooks (getrennt nach Render-Qualität)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("audio_cache")
+config = get_config()
+
+
+class AudioCache:
+    """Speichert fertige Hooks unter dem Hash aller Parameter, die das Audio bestimmen"""
+
+    def __init__(self, root_dir: str, max_bytes: int = None):
+        """
+        Initialisiert den Cache
+
+        Args:
+            root_dir: Cache-Verzeichnis
+            max_bytes: Maximale Gesamtgröße (aus Config wenn nicht angegeben)
+        """
+        self.root_dir = Path(root_dir)
+        self.max_bytes = max_bytes if max_bytes is not None else config.render.cache_max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+        self.metrics = {'hits': 0, 'misses': 0, 'stores': 0, 'evicted': 0}
+
+    @staticmethod
+    def make_key(**params: Any) -> str:
+        """
+        Bildet den Cache-Schlüssel
+
+        Args:
+            **params: Text, Stimme, Modell, Format, Voice-Settings, ...
+
+        Returns:
+            str: SHA-256 über die kanonische JSON-Darstellung
+        """
+        canonical = json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Ablageort eines Eintrags"""
+        return self.root_dir / key[:2] / f"{key}.mp3"
+
+    def contains(self, key: str) -> bool:
+        """Ob ein Eintrag vorhanden ist"""
+        return self.path(key).exists()
+
+    def fetch(self, key: str, destination: str) -> bool:
+        """
+        Kopiert einen Eintrag an das Ziel
+
+        Args:
+            key: Cache-Schlüssel
+            destination: Zielpfad
+
+        Returns:
+            bool: True bei Treffer
+        """
+        source = self.path(key)
+        try:
+            shutil.copyfile(source, destination)
+            os.utime(source)  # Zuletzt genutzt (für die Verdrängung)
+        except FileNotFoundError:
+            with self._lock:
+                self.metrics['misses'] += 1
+            return False
+
+        with self._lock:
+            self.metrics['hits'] += 1
+        return True
+
+    def store(self, key: str, source: str) -> None:
+        """
+        Legt eine fertige Datei im Cache ab
+
+        Args:
+            key: Cache-Schlüssel
+            source: Pfad der (geprüften) Audio-Datei
+        """
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        # Atomar ablegen, damit parallele Leser nie halbe Dateien sehen
+        temp = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            shutil.copyfile(source, temp)
+            size = temp.stat().st_size
+        except OSError as e:
+            temp.unlink(missing_ok=True)
+            logger.warning(f"Hook konnte nicht gecacht werden: {e}")
+            return
+
+        with self._lock:
+            # Ein überschriebener Eintrag zählt nur mit der Größendifferenz
+            try:
+                previous = target.stat().st_size
+            except FileNotFoundError:
+                previous = 0
+            try:
+                os.replace(temp, target)
+            except OSError as e:
+                temp.unlink(missing_ok=True)
+                logger.warning(f"Hook konnte nicht gecacht werden: {e}")
+                return
+
+            self.metrics['stores'] += 1
+            if self._size is not None:
+                self._size += size - previous
+            over_limit = self._current_size() > self.max_bytes
+
+        if over_limit:
+            self.prune()
+
+    def _current_size(self) -> int:
+        """Gesamtgröße, beim ersten Aufruf aus dem Verzeichnis gelesen (unter Lock aufrufen)"""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def _entries(self) -> list:
+        """Alle Einträge als (Pfad, Größe, letzte Nutzung)"""
+        entries = []
+        for entry in self.root_dir.glob("*/*.mp3"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((entry, stat.st_size, stat.st_mtime))
+        return entries
+
+    def prune(self) -> int:
+        """
+        Verdrängt die am längsten nicht genutzten Einträge bis die Größengrenze eingehalten ist
+
+        Returns:
+            int: Anzahl gelöschter Einträge
+        """
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e[2])
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+
+            for entry, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+
+            self._size = total
+            self.metrics['evicted'] += evicted
+
+        if evicted:
+            logger.info(f"🧹 Audio-Cache: {evicted} Einträge verdrängt ({self.root_dir.name})")
+        return evicted
+
+
+# Globale Instanzen (ein Cache pro Render-Qualität)
+_caches: Dict[Tuple[str, str], AudioCache] = {}
+_caches_lock = threading.Lock()
+
+def get_audio_cache(quality: str) -> AudioCache:
+    """
+    Holt den globalen Cache für eine Render-Qualität
+
+    Args:
+        quality: Render-Qualität (z.B. "draft" oder "final")
+
+    Returns:
+        AudioCache-Instanz
+    """
+    root_dir = config.render.cache_dir
+    with _caches_lock:
+        if (root_dir, quality) not in _caches:
+            _caches[(root_dir, quality)] = AudioCache(str(Path(root_dir) / quality))
+        return _caches[(root_dir, quality)]
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Audio-Cache-Modul geladen")
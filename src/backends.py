@@ -0,0 +1,530 @@
+"""
+Backend-Modul für Colab-Sound Projekt
+Austauschbare TTS-Backends (ElevenLabs, lokales Fake-Backend) und latenzbasierter Router
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import requests
+from src.logger import get_logger
+from src.config import get_config, Constants
+from src.circuit_breaker import get_circuit_breaker
+
+logger = get_logger("backends")
+config = get_config()
+
+# MPEG1 Layer III, 128 kbit/s, 44100 Hz: 417 Bytes pro Frame, 1152 Samples (~26ms)
+SILENT_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64]) + bytes(413)
+SILENT_FRAME_SECONDS = 1152 / 44100
+
+
+class BackendError(RuntimeError):
+    """Fehler eines TTS-Backends"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, timeout: bool = False):
+        """
+        Args:
+            message: Fehlerbeschreibung
+            status_code: HTTP-Status (None bei Netzwerkfehlern)
+            timeout: Ob der Request in einen Timeout gelaufen ist
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.timeout = timeout
+
+    @property
+    def transient(self) -> bool:
+        """Ob der Fehler auf eine Störung des Backends hindeutet (Netzwerk oder 5xx)"""
+        return self.status_code is None or self.status_code >= Constants.HTTP_SERVER_ERROR
+
+    @property
+    def throttled(self) -> bool:
+        """Ob das Backend den Request wegen Quota/Überlastung abgelehnt hat (429)"""
+        return self.status_code == Constants.HTTP_RATE_LIMIT
+
+
+@dataclass
+class BackendCapabilities:
+    """Was ein Backend kann und was es kostet"""
+
+    # Unterstützt Audio-Ausgabe während der Synthese
+    streaming: bool = False
+
+    # Unterstützte Ausgabeformate
+    output_formats: List[str] = field(default_factory=list)
+
+    # Relative Kosten pro Zeichen (ElevenLabs = 1.0)
+    cost_per_char: float = 1.0
+
+    # Maximale Textlänge pro Request
+    max_text_length: int = 5000
+
+
+class SynthesisStream:
+    """Audio-Bytes eines Backends in Empfangsreihenfolge"""
+
+    def __init__(self, chunks: Iterable[bytes], content_type: str,
+                 close: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            chunks: Audio-Chunks
+            content_type: Content-Type der Antwort
+            close: Optional: Gibt die Verbindung frei (auch aus anderen Threads aufrufbar)
+        """
+        self.content_type = content_type
+        self._chunks = chunks
+        self._close = close
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._chunks)
+
+    def close(self) -> None:
+        """Bricht den Stream ab und gibt Ressourcen frei"""
+        if self._close is not None:
+            self._close()
+
+
+class TTSBackend(ABC):
+    """Basisklasse: synthesize(text, voice, settings) liefert einen Byte-Stream"""
+
+    name = "backend"
+    capabilities = BackendCapabilities()
+
+    def endpoint(self, voice_id: str) -> str:
+        """Beschreibung des Ziels für Logs und Anzeige"""
+        return f"{self.name}://{voice_id}"
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """Parameter des Backends, die das erzeugte Audio bestimmen (für Cache-Schlüssel)"""
+        return {'backend': self.name}
+
+    @abstractmethod
+    def synthesize(self, text: str, voice_id: str, settings: Dict[str, float],
+                   output_format: Optional[str] = None, stream: bool = False) -> SynthesisStream:
+        """
+        Synthetisiert einen Text
+
+        Args:
+            text: Zu sprechender Text
+            voice_id: Stimme
+            settings: Voice-Settings (stability, similarity_boost, style)
+            output_format: Optional: Ausgabeformat
+            stream: True für möglichst frühe erste Bytes (Vorschau)
+
+        Returns:
+            SynthesisStream: Audio-Chunks
+
+        Raises:
+            BackendError: Bei API- oder Netzwerkfehlern
+        """
+
+
+class ElevenLabsBackend(TTSBackend):
+    """ElevenLabs Text-to-Speech API"""
+
+    name = "elevenlabs"
+
+    def __init__(self, api_key: str, api_base: str = None, model_id: str = None):
+        """
+        Args:
+            api_key: ElevenLabs API Key
+            api_base: Basis-URL (aus Config wenn nicht angegeben)
+            model_id: Modell (aus Config wenn nicht angegeben)
+        """
+        self.api_base = api_base or config.elevenlabs.api_base
+        self.model_id = model_id or config.elevenlabs.model_id
+        self.headers = {
+            "xi-api-key": api_key,
+            "Content-Type": "application/json"
+        }
+        self.capabilities = BackendCapabilities(
+            streaming=True,
+            output_formats=["mp3_22050_32", "mp3_44100_64", "mp3_44100_128", "mp3_44100_192"],
+            cost_per_char=1.0,
+            max_text_length=config.elevenlabs.max_text_length
+        )
+
+    def endpoint(self, voice_id: str) -> str:
+        return f"{self.api_base}/text-to-speech/{voice_id}"
+
+    def fingerprint(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'model_id': self.model_id}
+
+    def build_payload(self, text: str, settings: Dict[str, float], output_format: str) -> dict:
+        """
+        Erstellt den Request-Body
+
+        Args:
+            text: Hook-Text
+            settings: Voice-Settings
+            output_format: Ausgabeformat
+
+        Returns:
+            dict: JSON-Payload
+        """
+        return {
+            "text": text,
+            "model_id": self.model_id,
+            "voice_settings": dict(settings),
+            "output_format": output_format
+        }
+
+    def synthesize(self, text: str, voice_id: str, settings: Dict[str, float],
+                   output_format: Optional[str] = None, stream: bool = False) -> SynthesisStream:
+        output_format = output_format or config.elevenlabs.output_format
+        url = self.endpoint(voice_id)
+        payload = self.build_payload(text, settings, output_format)
+        params = None
+
+        if stream:
+            # Streaming-Endpunkt erwartet Format und Latenz-Optimierung als Query-Parameter
+            url = f"{url}/stream"
+            params = {
+                "optimize_streaming_latency": config.elevenlabs.streaming_latency,
+                "output_format": payload.pop("output_format")
+            }
+
+        try:
+            response = requests.post(
+                url,
+                params=params,
+                json=payload,
+                headers=self.headers,
+                stream=True,
+                timeout=config.network.default_timeout
+            )
+        except requests.exceptions.RequestException as e:
+            raise BackendError(f"Netzwerk-Fehler: {e}",
+                               timeout=isinstance(e, requests.exceptions.Timeout)) from e
+
+        if response.status_code != Constants.HTTP_OK:
+            try:
+                detail = response.text
+            finally:
+                response.close()
+            raise BackendError(f"API-Fehler {response.status_code}: {detail}", response.status_code)
+
+        return SynthesisStream(
+            self._iter_response(response),
+            response.headers.get("Content-Type", ""),
+            response.close
+        )
+
+    def _iter_response(self, response: requests.Response) -> Iterator[bytes]:
+        """Liest die Antwort in Chunks, Netzwerkfehler werden zu BackendError"""
+        try:
+            for chunk in response.iter_content(1024):
+                if chunk:
+                    yield chunk
+        except requests.exceptions.RequestException as e:
+            raise BackendError(f"Netzwerk-Fehler: {e}",
+                               timeout=isinstance(e, requests.exceptions.Timeout)) from e
+
+
+class FakeBackend(TTSBackend):
+    """
+    Lokales Backend für Lasttests: erzeugt deterministisch stumme MP3-Frames
+
+    Die Audiodauer folgt der Textlänge, sodass die Integritätsprüfung besteht.
+    Optional wird die Synthesedauer pro Zeichen simuliert.
+    """
+
+    name = "fake"
+
+    # Angenommene Sprechgeschwindigkeit
+    SPEECH_SECONDS_PER_CHAR = 0.07
+
+    def __init__(self, seconds_per_char: float = None, frames_per_chunk: int = 8):
+        """
+        Args:
+            seconds_per_char: Simulierte Synthesedauer pro Zeichen (aus Config wenn nicht angegeben)
+            frames_per_chunk: Frames pro ausgeliefertem Chunk
+        """
+        self.seconds_per_char = (seconds_per_char if seconds_per_char is not None
+                                 else config.backend.fake_seconds_per_char)
+        self.frames_per_chunk = frames_per_chunk
+        self.capabilities = BackendCapabilities(
+            streaming=True,
+            output_formats=["mp3_44100_128"],
+            cost_per_char=0.0,
+            max_text_length=config.elevenlabs.max_text_length
+        )
+
+    def synthesize(self, text: str, voice_id: str, settings: Dict[str, float],
+                   output_format: Optional[str] = None, stream: bool = False) -> SynthesisStream:
+        frames = max(config.validation.min_frames,
+                     math.ceil(len(text) * self.SPEECH_SECONDS_PER_CHAR / SILENT_FRAME_SECONDS))
+        closed = threading.Event()
+
+        def chunks() -> Iterator[bytes]:
+            if closed.wait(len(text) * self.seconds_per_char):
+                return
+            for offset in range(0, frames, self.frames_per_chunk):
+                if closed.is_set():
+                    return
+                yield SILENT_FRAME * min(self.frames_per_chunk, frames - offset)
+
+        return SynthesisStream(chunks(), "audio/mpeg", closed.set)
+
+
+class BackendStats:
+    """Beobachtete Latenz und Fehlerquote eines Backends"""
+
+    def __init__(self, alpha: float, window_size: int):
+        """
+        Args:
+            alpha: Glättungsfaktor der Latenz
+            window_size: Anzahl der betrachteten letzten Requests
+        """
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self.outcomes = deque(maxlen=window_size)
+        self.requests = 0
+        self.last_request = time.monotonic()  # letzter Versuch (für Test-Requests)
+
+    def record_latency(self, seconds: float) -> None:
+        """Speichert die Zeit bis zum ersten Byte"""
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.alpha * (seconds - self.latency)
+
+    def record_outcome(self, ok: bool) -> None:
+        """Speichert Erfolg oder Störung eines Requests"""
+        self.requests += 1
+        self.outcomes.append(ok)
+
+    @property
+    def error_rate(self) -> float:
+        """Fehlerquote im Fenster"""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class LatencyRouter(TTSBackend):
+    """
+    Verteilt Requests auf mehrere Backends
+
+    Bewertung: Latenz bis zum ersten Byte + Fehlerquote * error_penalty +
+    Kosten * cost_weight; Backends ohne Messwerte gehen mit latency_prior ein.
+    Backends mit offenem Circuit werden übersprungen; bei Störung (Netzwerk,
+    5xx) wird automatisch das nächste versucht. Unterlegene Backends bekommen
+    nach probe_interval ohne Request einen Test-Request, damit veraltete
+    Messwerte sie nicht dauerhaft ausschließen. Statistik und Circuit gelten
+    pro Backend-Instanz: mehrere Backends gleichen Typs heißen im Router
+    z.B. "elevenlabs" und "elevenlabs-2".
+    """
+
+    name = "router"
+
+    def __init__(self, backends: List[TTSBackend], error_penalty: float = None,
+                 cost_weight: float = None, latency_prior: float = None,
+                 probe_interval: float = None, allow_fake: bool = None):
+        """
+        Args:
+            backends: Backends in Vorrang-Reihenfolge (gilt solange keine Messwerte vorliegen)
+            error_penalty: Sekunden Zuschlag bei 100% Fehlerquote (aus Config wenn nicht angegeben)
+            cost_weight: Sekunden Zuschlag pro Kosteneinheit (aus Config wenn nicht angegeben)
+            latency_prior: Angenommene Latenz ohne Messwerte (aus Config wenn nicht angegeben)
+            probe_interval: Sekunden bis zum Test-Request, 0 = nie (aus Config wenn nicht angegeben)
+            allow_fake: Fake-Backend zulassen (aus Config wenn nicht angegeben)
+
+        Raises:
+            ValueError: Ohne Backends oder mit Fake-Backend, das nicht zugelassen ist
+        """
+        if not backends:
+            raise ValueError("Router benötigt mindestens ein Backend")
+
+        cfg = config.backend
+        allow_fake = allow_fake if allow_fake is not None else cfg.router_allow_fake
+        if not allow_fake and any(isinstance(b, FakeBackend) for b in backends):
+            raise ValueError("Fake-Backend im Router nicht zugelassen (liefert stumme MP3s) - "
+                             "siehe router_allow_fake")
+
+        self.backends = backends
+        self.error_penalty = error_penalty if error_penalty is not None else cfg.error_penalty
+        self.cost_weight = cost_weight if cost_weight is not None else cfg.cost_weight
+        self.latency_prior = latency_prior if latency_prior is not None else cfg.latency_prior
+        self.probe_interval = probe_interval if probe_interval is not None else cfg.probe_interval
+        self.ids = self._assign_ids(backends)
+        self.stats = {self.ids[b]: BackendStats(cfg.latency_alpha, cfg.window_size) for b in backends}
+        self._lock = threading.Lock()
+
+        self.capabilities = BackendCapabilities(
+            streaming=any(b.capabilities.streaming for b in backends),
+            output_formats=sorted({f for b in backends for f in b.capabilities.output_formats}),
+            cost_per_char=min(b.capabilities.cost_per_char for b in backends),
+            max_text_length=min(b.capabilities.max_text_length for b in backends)
+        )
+
+    def fingerprint(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'backends': [b.fingerprint() for b in self.backends]}
+
+    @staticmethod
+    def _assign_ids(backends: List[TTSBackend]) -> Dict[TTSBackend, str]:
+        """Eindeutige ID pro Backend-Instanz (Name, ab dem zweiten gleichen Typ mit Zähler)"""
+        ids: Dict[TTSBackend, str] = {}
+        seen: Dict[str, int] = {}
+        for backend in backends:
+            seen[backend.name] = seen.get(backend.name, 0) + 1
+            count = seen[backend.name]
+            ids[backend] = backend.name if count == 1 else f"{backend.name}-{count}"
+        return ids
+
+    def score(self, backend: TTSBackend, text: str) -> float:
+        """Erwartete Kosten eines Requests in Sekunden (kleiner = besser)"""
+        with self._lock:
+            stats = self.stats[self.ids[backend]]
+            latency = stats.latency if stats.latency is not None else self.latency_prior
+            error_rate = stats.error_rate
+        cost = backend.capabilities.cost_per_char * len(text)
+        return latency + error_rate * self.error_penalty + cost * self.cost_weight
+
+    def rank(self, text: str, stream: bool = False) -> List[TTSBackend]:
+        """Backends in der Reihenfolge, in der sie versucht werden"""
+        candidates = [b for b in self.backends if not stream or b.capabilities.streaming]
+        return sorted(candidates, key=lambda b: self.score(b, text))
+
+    def _with_probe(self, ranked: List[TTSBackend]) -> List[TTSBackend]:
+        """Zieht ein lange nicht angefragtes, unterlegenes Backend für einen Test-Request nach vorne"""
+        if not self.probe_interval or len(ranked) < 2:
+            return ranked
+
+        now = time.monotonic()
+        with self._lock:
+            for backend in ranked[1:]:
+                stats = self.stats[self.ids[backend]]
+                if now - stats.last_request >= self.probe_interval:
+                    stats.last_request = now
+                    logger.info(f"🔎 Test-Request an Backend '{self.ids[backend]}'")
+                    return [backend] + [b for b in ranked if b is not backend]
+        return ranked
+
+    def synthesize(self, text: str, voice_id: str, settings: Dict[str, float],
+                   output_format: Optional[str] = None, stream: bool = False) -> SynthesisStream:
+        last_error: Optional[BackendError] = None
+
+        for backend in self._with_probe(self.rank(text, stream)):
+            backend_id = self.ids[backend]
+            breaker = get_circuit_breaker(backend_id)
+            if not breaker.acquire(timeout=0):
+                continue
+
+            started = time.monotonic()
+            with self._lock:
+                self.stats[backend_id].last_request = started
+            try:
+                result = backend.synthesize(text, voice_id, settings, output_format, stream)
+            except BackendError as e:
+                if not e.transient:
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                self._record(backend, ok=False)
+                logger.warning(f"↪️ Backend '{backend_id}' gestört ({e}) - versuche nächstes")
+                last_error = e
+                continue
+            except Exception:
+                breaker.record_ignored()
+                raise
+
+            return self._watch(backend, result, started)
+
+        raise last_error or BackendError("Kein TTS-Backend verfügbar")
+
+    def _record(self, backend: TTSBackend, ok: bool, latency: Optional[float] = None) -> None:
+        """Verbucht das Ergebnis eines Requests"""
+        with self._lock:
+            stats = self.stats[self.ids[backend]]
+            if latency is not None:
+                stats.record_latency(latency)
+            stats.record_outcome(ok)
+
+    def _watch(self, backend: TTSBackend, result: SynthesisStream, started: float) -> SynthesisStream:
+        """Misst Latenz und Ausgang des Streams und meldet beides an Statistik und Circuit"""
+        breaker = get_circuit_breaker(self.ids[backend])
+        settled = threading.Event()
+        first_byte: List[float] = []
+
+        def settle(ok: Optional[bool]) -> None:
+            if settled.is_set():
+                return
+            settled.set()
+            if ok is None:
+                breaker.record_ignored()
+                return
+            if ok:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            self._record(backend, ok, first_byte[0] if first_byte else None)
+
+        def chunks() -> Iterator[bytes]:
+            outcome = None
+            try:
+                for chunk in result:
+                    if not first_byte:
+                        first_byte.append(time.monotonic() - started)
+                    yield chunk
+                outcome = True
+            except BackendError as e:
+                outcome = not e.transient
+                raise
+            finally:
+                settle(outcome)
+
+        def close() -> None:
+            result.close()
+            settle(None)
+
+        return SynthesisStream(chunks(), result.content_type, close)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Liefert die Bewertung aller Backends für Monitoring
+
+        Returns:
+            List[Dict[str, Any]]: ID, Latenz, Fehlerquote und Requests pro Backend
+        """
+        with self._lock:
+            return [
+                {
+                    'name': self.ids[b],
+                    'latency': self.stats[self.ids[b]].latency,
+                    'error_rate': self.stats[self.ids[b]].error_rate,
+                    'requests': self.stats[self.ids[b]].requests
+                }
+                for b in self.backends
+            ]
+
+
+def create_backend(name: str, api_key: str = "") -> TTSBackend:
+    """
+    Erstellt ein Backend anhand seines Namens
+
+    Args:
+        name: "elevenlabs", "elevenlabs@<api_base>", "fake" oder "router"
+            (Router über config.backend.router_backends)
+        api_key: API Key für Backends, die einen benötigen
+
+    Returns:
+        TTSBackend-Instanz
+    """
+    kind, _, api_base = name.partition("@")
+    if kind == ElevenLabsBackend.name:
+        return ElevenLabsBackend(api_key, api_base=api_base or None)
+    if name == FakeBackend.name:
+        return FakeBackend()
+    if name == LatencyRouter.name:
+        return LatencyRouter([create_backend(child, api_key) for child in config.backend.router_backends])
+    raise ValueError(f"Unbekanntes TTS-Backend: {name}")
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Backend-Modul geladen")
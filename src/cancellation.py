@@ -0,0 +1,174 @@
+"""
+Cancellation-Modul für Colab-Sound Projekt
+Kooperativer Abbruch und Zeitbudgets für laufende Generierungen
+"""
+
+import threading
+import time
+from typing import Any, Callable, List, Optional
+from src.logger import get_logger
+
+logger = get_logger("cancellation")
+
+
+class CancellationToken:
+    """Wird durch Generator, Scheduler und Requests gereicht und signalisiert Abbruch"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Initialisiert das Token
+
+        Args:
+            timeout: Optional: Zeitbudget in Sekunden, danach gilt das Token als abgebrochen
+        """
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.timed_out = False
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+        # Laufende Streams auch bei Ablauf des Zeitbudgets sofort abbrechen
+        if timeout:
+            self._timer = threading.Timer(timeout, self.cancel, kwargs={'timed_out': True})
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def cancelled(self) -> bool:
+        """Ob abgebrochen wurde (explizit oder durch Ablauf des Zeitbudgets)"""
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel(timed_out=True)
+            return True
+        return False
+
+    def remaining(self) -> Optional[float]:
+        """
+        Verbleibendes Zeitbudget
+
+        Returns:
+            Optional[float]: Sekunden bis zur Deadline, None ohne Deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def can_finish(self, estimated_seconds: float) -> bool:
+        """
+        Prüft ob eine Arbeit der geschätzten Dauer noch ins Zeitbudget passt
+
+        Args:
+            estimated_seconds: Geschätzte Dauer
+
+        Returns:
+            bool: False wenn abgebrochen oder die Deadline nicht mehr erreichbar ist
+        """
+        if self.cancelled:
+            return False
+        remaining = self.remaining()
+        return remaining is None or estimated_seconds <= remaining
+
+    def cancel(self, timed_out: bool = False) -> None:
+        """
+        Bricht ab und führt registrierte Callbacks aus (z.B. offene Streams schließen)
+
+        Args:
+            timed_out: True wenn der Abbruch durch das Zeitbudget ausgelöst wurde
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.timed_out = timed_out
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        if self._timer is not None:
+            self._timer.cancel()
+
+        logger.info("⏱️ Zeitbudget abgelaufen" if timed_out else "⏹️ Abbruch angefordert")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Fehler in Abbruch-Callback: {e}")
+
+    def on_cancel(self, callback: Callable[[], Any]) -> Callable[[], None]:
+        """
+        Registriert einen Callback für den Abbruch
+
+        Args:
+            callback: Wird beim Abbruch aufgerufen (sofort, falls bereits abgebrochen)
+
+        Returns:
+            Callable: Entfernt den Callback wieder
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def unregister() -> None:
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+                return unregister
+
+        callback()
+        return lambda: None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wartet auf einen Abbruch
+
+        Args:
+            timeout: Maximale Wartezeit
+
+        Returns:
+            bool: True wenn abgebrochen wurde
+        """
+        return self._event.wait(timeout)
+
+
+class DurationEstimator:
+    """Schätzt die Synthesedauer eines Hooks aus bisherigen Messungen (Sekunden pro Zeichen)"""
+
+    def __init__(self, alpha: float = 0.3):
+        """
+        Initialisiert den Schätzer
+
+        Args:
+            alpha: Glättungsfaktor des gleitenden Mittels
+        """
+        self.alpha = alpha
+        self.seconds_per_char: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, chars: int, seconds: float) -> None:
+        """Speichert eine Messung"""
+        if chars <= 0:
+            return
+        sample = seconds / chars
+        with self._lock:
+            if self.seconds_per_char is None:
+                self.seconds_per_char = sample
+            else:
+                self.seconds_per_char += self.alpha * (sample - self.seconds_per_char)
+
+    def estimate(self, chars: int) -> float:
+        """
+        Schätzt die Dauer für einen Text
+
+        Args:
+            chars: Anzahl Zeichen
+
+        Returns:
+            float: Geschätzte Dauer in Sekunden (0 ohne Messwerte)
+        """
+        with self._lock:
+            return (self.seconds_per_char or 0.0) * chars
+
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Cancellation-Modul geladen")
@@ -0,0 +1,217 @@
+"""
+Circuit-Breaker-Modul für Colab-Sound Projekt
+Schützt vor endlosen Timeouts wenn die TTS-API gestört ist
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("circuit_breaker")
+config = get_config()
+
+# Zustände
+STATE_CLOSED = "closed"        # Normalbetrieb
+STATE_OPEN = "open"            # API gestört, Requests werden nicht gesendet
+STATE_HALF_OPEN = "half_open"  # Probe-Requests testen ob die API wieder läuft
+
+
+class CircuitBreaker:
+    """Öffnet nach wiederholten Fehlern und lässt erst nach erfolgreichen Probe-Requests wieder zu"""
+
+    def __init__(self, name: str, failure_threshold: int = None, error_rate_threshold: float = None,
+                 window_size: int = None, min_requests: int = None, open_seconds: float = None,
+                 half_open_max_calls: int = None):
+        """
+        Initialisiert den Circuit-Breaker
+
+        Args:
+            name: Name des geschützten Dienstes (für Logs)
+            failure_threshold: Aufeinanderfolgende Fehler bis zum Öffnen
+            error_rate_threshold: Fehlerquote im Fenster bis zum Öffnen
+            window_size: Anzahl der betrachteten letzten Requests
+            min_requests: Mindestanzahl Requests bevor die Fehlerquote zählt
+            open_seconds: Wartezeit bis zum ersten Probe-Request
+            half_open_max_calls: Gleichzeitige Probe-Requests
+
+        Alle Werte kommen aus der Config wenn nicht angegeben.
+        """
+        cfg = config.circuit_breaker
+        self.name = name
+        self.failure_threshold = failure_threshold or cfg.failure_threshold
+        self.error_rate_threshold = error_rate_threshold or cfg.error_rate_threshold
+        self.min_requests = min_requests or cfg.min_requests
+        self.open_seconds = open_seconds if open_seconds is not None else cfg.open_seconds
+        self.half_open_max_calls = half_open_max_calls or cfg.half_open_max_calls
+
+        self._state = STATE_CLOSED
+        self._window = deque(maxlen=window_size or cfg.window_size)
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trials_in_flight = 0
+        self._cond = threading.Condition()
+
+        self.metrics = {'opened': 0, 'rejected': 0, 'successes': 0, 'failures': 0}
+
+    def _set_state(self, state: str) -> None:
+        """Wechselt den Zustand (unter Lock aufrufen)"""
+        if state == self._state:
+            return
+
+        self._state = state
+        if state == STATE_OPEN:
+            self._opened_at = time.monotonic()
+            self.metrics['opened'] += 1
+            logger.warning(f"🔴 Circuit '{self.name}' geöffnet - Requests pausiert für {self.open_seconds:.0f}s")
+        elif state == STATE_HALF_OPEN:
+            self._trials_in_flight = 0
+            logger.info(f"🟡 Circuit '{self.name}' halb offen - sende Probe-Request")
+        else:
+            self._window.clear()
+            self._consecutive_failures = 0
+            logger.info(f"🟢 Circuit '{self.name}' geschlossen - API wieder erreichbar")
+        self._cond.notify_all()
+
+    def _refresh(self) -> None:
+        """Prüft ob die Wartezeit im offenen Zustand abgelaufen ist (unter Lock aufrufen)"""
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._set_state(STATE_HALF_OPEN)
+
+    @property
+    def state(self) -> str:
+        """Aktueller Zustand"""
+        with self._cond:
+            self._refresh()
+            return self._state
+
+    def retry_after(self) -> float:
+        """Sekunden bis zum nächsten Probe-Request (0 wenn nicht offen)"""
+        with self._cond:
+            self._refresh()
+            if self._state != STATE_OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def acquire(self, timeout: float = 0) -> bool:
+        """
+        Fragt eine Erlaubnis für einen Request an
+
+        Ist der Circuit offen, wird bis zu timeout Sekunden gewartet (Jobs pausieren
+        statt Timeouts abzuwarten). Im halb offenen Zustand werden nur
+        half_open_max_calls Probe-Requests gleichzeitig erlaubt.
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden (0 = sofort scheitern)
+
+        Returns:
+            bool: True wenn der Request gesendet werden darf
+        """
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                self._refresh()
+
+                if self._state == STATE_CLOSED:
+                    return True
+
+                if self._state == STATE_HALF_OPEN and self._trials_in_flight < self.half_open_max_calls:
+                    self._trials_in_flight += 1
+                    return True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.metrics['rejected'] += 1
+                    return False
+
+                if self._state == STATE_OPEN:
+                    remaining = min(remaining, self._opened_at + self.open_seconds - time.monotonic())
+                self._cond.wait(max(remaining, 0.01))
+
+    def record_success(self) -> None:
+        """Meldet einen erfolgreichen Request"""
+        with self._cond:
+            self.metrics['successes'] += 1
+            self._consecutive_failures = 0
+            self._window.append(True)
+
+            if self._state == STATE_HALF_OPEN:
+                self._set_state(STATE_CLOSED)
+
+    def record_failure(self) -> None:
+        """Meldet einen fehlgeschlagenen Request (Timeout, Verbindungsfehler, 5xx)"""
+        with self._cond:
+            self.metrics['failures'] += 1
+            self._consecutive_failures += 1
+            self._window.append(False)
+
+            if self._state == STATE_HALF_OPEN:
+                self._set_state(STATE_OPEN)
+                return
+
+            if self._state == STATE_CLOSED and self._should_open():
+                self._set_state(STATE_OPEN)
+
+    def record_ignored(self) -> None:
+        """Gibt eine Erlaubnis ohne Ergebnis zurück (z.B. abgebrochener Request)"""
+        with self._cond:
+            if self._state == STATE_HALF_OPEN and self._trials_in_flight > 0:
+                self._trials_in_flight -= 1
+                self._cond.notify_all()
+
+    def _should_open(self) -> bool:
+        """Prüft die Schwellwerte (unter Lock aufrufen)"""
+        if self._consecutive_failures >= self.failure_threshold:
+            return True
+
+        if len(self._window) >= self.min_requests:
+            error_rate = self._window.count(False) / len(self._window)
+            return error_rate >= self.error_rate_threshold
+
+        return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Liefert Zustand und Metriken für UI und Monitoring
+
+        Returns:
+            Dict[str, Any]: Zustand, Fehlerquote, Wartezeit und Zähler
+        """
+        retry_after = self.retry_after()
+        with self._cond:
+            error_rate = self._window.count(False) / len(self._window) if self._window else 0.0
+            return {
+                'name': self.name,
+                'state': self._state,
+                'consecutive_failures': self._consecutive_failures,
+                'error_rate': error_rate,
+                'retry_after': retry_after,
+                **self.metrics
+            }
+
+
+# Globale Instanzen (ein Breaker pro Dienst)
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name: str = "elevenlabs") -> CircuitBreaker:
+    """
+    Holt den globalen Circuit-Breaker für einen Dienst
+
+    Args:
+        name: Name des Dienstes
+
+    Returns:
+        CircuitBreaker-Instanz
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Circuit-Breaker-Modul geladen")
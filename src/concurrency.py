@@ -0,0 +1,264 @@
+"""
+Parallelitäts-Modul für Colab-Sound Projekt
+Adaptive Obergrenze für gleichzeitige Synthese-Requests (AIMD)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from src.logger import get_logger
+from src.config import get_config
+from src.cancellation import CancellationToken
+
+logger = get_logger("concurrency")
+config = get_config()
+
+
+class AdaptiveConcurrency:
+    """
+    Regelt die Anzahl gleichzeitiger Requests nach dem AIMD-Prinzip
+
+    Solange die Latenz stabil bleibt und das Limit ausgeschöpft wird, steigt es
+    nach jedem vollen Fenster (limit erfolgreiche Requests) additiv. Bei 429,
+    Timeouts oder steigender Latenz wird es multiplikativ gesenkt. Rückmeldungen
+    von Requests, die vor der letzten Änderung gestartet wurden, lösen keine
+    weitere Entscheidung aus, ebenso Überlastungen solange noch mehr Requests
+    laufen als erlaubt - so halbiert ein einzelner Burst nicht mehrfach.
+
+    Die Basislatenz wird je Längenklasse der Hooks (Zweierpotenzen der
+    Zeichenzahl) als niedriges Perzentil gemessen: Jeder Request hat einen
+    festen Overhead, kurze und lange Hooks sind daher nicht pro Zeichen
+    vergleichbar.
+    """
+
+    def __init__(self, initial_limit: int = None, min_limit: int = None, max_limit: int = None,
+                 increase: int = None, decrease_factor: float = None,
+                 latency_tolerance: float = None, latency_alpha: float = None,
+                 window_size: int = None, min_samples: int = None, baseline_percentile: float = None):
+        """
+        Initialisiert den Controller
+
+        Args:
+            initial_limit: Startwert (aus Config wenn nicht angegeben)
+            min_limit: Untergrenze (aus Config wenn nicht angegeben)
+            max_limit: Obergrenze (aus Config wenn nicht angegeben)
+            increase: Additive Erhöhung pro Fenster (aus Config wenn nicht angegeben)
+            decrease_factor: Multiplikative Senkung (aus Config wenn nicht angegeben)
+            latency_tolerance: Vielfaches der Basislatenz, ab dem die Latenz als steigend gilt
+                (aus Config wenn nicht angegeben)
+            latency_alpha: Glättungsfaktor der Latenz (aus Config wenn nicht angegeben)
+            window_size: Anzahl Messwerte für die Basislatenz je Längenklasse
+                (aus Config wenn nicht angegeben)
+            min_samples: Mindestanzahl Messwerte einer Längenklasse vor latenzbasierten
+                Entscheidungen (aus Config wenn nicht angegeben)
+            baseline_percentile: Perzentil der Messwerte als Basislatenz (aus Config wenn nicht angegeben)
+        """
+        settings = config.concurrency
+        self.min_limit = min_limit if min_limit is not None else settings.min_limit
+        self.max_limit = max(self.min_limit, max_limit if max_limit is not None else settings.max_limit)
+        self.increase = increase if increase is not None else settings.increase
+        self.decrease_factor = decrease_factor if decrease_factor is not None else settings.decrease_factor
+        self.latency_tolerance = latency_tolerance if latency_tolerance is not None else settings.latency_tolerance
+        self.latency_alpha = latency_alpha if latency_alpha is not None else settings.latency_alpha
+        self.min_samples = min_samples if min_samples is not None else settings.min_samples
+        self.baseline_percentile = (baseline_percentile if baseline_percentile is not None
+                                    else settings.baseline_percentile)
+
+        initial = initial_limit if initial_limit is not None else settings.initial_limit
+        self._limit = min(self.max_limit, max(self.min_limit, initial))
+        self._in_flight = 0
+        self._saturated = False
+        self._successes = 0
+        self._changed_at = time.monotonic()
+        self._window_size = window_size or settings.window_size
+        self._samples: Dict[int, deque] = {}
+        # Geglättetes Verhältnis der Latenz zur Basislatenz ihrer Längenklasse
+        self._latency: Optional[float] = None
+        self._cond = threading.Condition()
+
+        self.history = deque(maxlen=settings.history_size)
+        self.metrics = {'increases': 0, 'decreases': 0, 'throttled': 0, 'timeouts': 0,
+                        'slow': 0, 'peak_in_flight': 0}
+
+    @property
+    def limit(self) -> int:
+        """Aktuelle Obergrenze gleichzeitiger Requests"""
+        with self._cond:
+            return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """Anzahl laufender Requests"""
+        with self._cond:
+            return self._in_flight
+
+    def _take(self) -> None:
+        """Belegt einen Slot (unter Lock aufrufen)"""
+        self._in_flight += 1
+        self.metrics['peak_in_flight'] = max(self.metrics['peak_in_flight'], self._in_flight)
+        if self._in_flight >= self._limit:
+            self._saturated = True
+
+    def try_acquire(self) -> bool:
+        """
+        Belegt einen Slot ohne zu warten
+
+        Returns:
+            bool: True wenn ein Slot frei war
+        """
+        with self._cond:
+            if self._in_flight >= self._limit:
+                return False
+            self._take()
+            return True
+
+    def acquire(self, token: Optional[CancellationToken] = None) -> bool:
+        """
+        Blockiert bis ein Slot frei ist
+
+        Args:
+            token: Optional: Cancellation-Token (bricht das Warten ab)
+
+        Returns:
+            bool: True wenn ein Slot belegt wurde, False bei Abbruch
+        """
+        with self._cond:
+            while self._in_flight >= self._limit:
+                if token is not None and token.cancelled:
+                    return False
+                self._cond.wait(0.1 if token is not None else None)
+            self._take()
+            return True
+
+    def release(self) -> None:
+        """Gibt einen Slot frei"""
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._cond.notify()
+
+    def _baseline(self, samples: deque) -> float:
+        """Perzentil der Messwerte einer Längenklasse (unter Lock aufrufen)"""
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.baseline_percentile * len(ordered)))]
+
+    def record_success(self, latency: float, chars: int, started: float) -> None:
+        """
+        Meldet einen erfolgreichen Request
+
+        Die Latenz wird mit der Basislatenz gleich langer Hooks verglichen;
+        solange deren Längenklasse zu wenige Messwerte hat, fällt keine
+        latenzbasierte Entscheidung.
+
+        Args:
+            latency: Dauer des Requests in Sekunden
+            chars: Textlänge
+            started: Startzeitpunkt (time.monotonic())
+        """
+        with self._cond:
+            samples = self._samples.setdefault(max(1, chars).bit_length(), deque(maxlen=self._window_size))
+            samples.append(latency)
+            if len(samples) >= self.min_samples:
+                ratio = latency / max(self._baseline(samples), 1e-9)
+                if self._latency is None:
+                    self._latency = ratio
+                else:
+                    self._latency = self.latency_alpha * ratio + (1 - self.latency_alpha) * self._latency
+
+            if started < self._changed_at:
+                return
+
+            if self._latency is not None and self._latency > self.latency_tolerance:
+                self.metrics['slow'] += 1
+                self._decrease(f"Latenz {self._latency:.1f}x über Basis")
+                return
+
+            self._successes += 1
+            if self._successes >= self._limit and self._saturated and self._limit < self.max_limit:
+                self._set_limit(min(self.max_limit, self._limit + self.increase), "Latenz stabil")
+
+    def record_overload(self, started: float, timeout: bool = False) -> None:
+        """
+        Meldet eine Überlastung (429 oder Timeout)
+
+        Args:
+            started: Startzeitpunkt des Requests (time.monotonic())
+            timeout: True bei Timeout, sonst 429
+        """
+        with self._cond:
+            self.metrics['timeouts' if timeout else 'throttled'] += 1
+            # Laufen noch mehr Requests als erlaubt, wirkt die letzte Senkung noch nicht
+            if started >= self._changed_at and self._in_flight <= self._limit:
+                self._decrease("Timeout" if timeout else "429")
+
+    def _decrease(self, reason: str) -> None:
+        """Senkt das Limit multiplikativ (unter Lock aufrufen)"""
+        self._set_limit(max(self.min_limit, int(self._limit * self.decrease_factor)), reason)
+        # Latenz nach der Entlastung neu messen
+        self._latency = None
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        """Übernimmt ein neues Limit und protokolliert die Entscheidung (unter Lock aufrufen)"""
+        previous = self._limit
+        self._changed_at = time.monotonic()
+        self._successes = 0
+        self._saturated = self._in_flight >= limit
+        if limit == previous:
+            return
+
+        self._limit = limit
+        self.history.append({'time': time.time(), 'previous': previous, 'limit': limit, 'reason': reason})
+        if limit > previous:
+            self.metrics['increases'] += 1
+            logger.info(f"📈 Parallelität {previous} → {limit} ({reason})")
+            self._cond.notify_all()
+        else:
+            self.metrics['decreases'] += 1
+            logger.warning(f"📉 Parallelität {previous} → {limit} ({reason})")
+
+    def decisions(self) -> List[Dict[str, Any]]:
+        """Zuletzt getroffene Entscheidungen (älteste zuerst)"""
+        with self._cond:
+            return list(self.history)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Liefert Limit und Metriken für UI und Monitoring
+
+        Returns:
+            Dict[str, Any]: Limit, laufende Requests, Latenzen und Zähler
+        """
+        with self._cond:
+            return {
+                'limit': self._limit,
+                'in_flight': self._in_flight,
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                # Basislatenz je Längenklasse (Schlüssel: höchste Zeichenzahl der Klasse)
+                'baseline_latency': {2 ** bucket - 1: self._baseline(samples)
+                                     for bucket, samples in sorted(self._samples.items())},
+                'latency': self._latency,
+                **self.metrics
+            }
+
+
+# Globale Instanz (die Quota gilt pro API-Key, daher von allen Generatoren geteilt)
+_concurrency: AdaptiveConcurrency = None
+
+def get_adaptive_concurrency() -> AdaptiveConcurrency:
+    """
+    Holt den globalen Parallelitäts-Controller
+
+    Returns:
+        AdaptiveConcurrency-Instanz
+    """
+    global _concurrency
+
+    if _concurrency is None:
+        _concurrency = AdaptiveConcurrency()
+
+    return _concurrency
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Parallelitäts-Modul geladen")
@@ -4,7 +4,8 @@ Alle Hardcoded-Werte werden hier definiert
 """
 
 import os
-from typing import Dict, Any
+import tempfile
+from typing import Dict, Any, List
 from dataclasses import dataclass, field
 
 
@@ -12,10 +13,16 @@ from dataclasses import dataclass, field
 class ElevenLabsConfig:
     """Konfiguration für ElevenLabs API"""
 
+    # API-Endpunkt
+    api_base: str = "https://api.elevenlabs.io/v1"
+
     # Model-Einstellungen
     model_id: str = "eleven_v3"
     output_format: str = "mp3_44100_128"
 
+    # Streaming-Vorschau (0 = keine Optimierung, 4 = maximale Latenz-Optimierung)
+    streaming_latency: int = 3
+
     # Voice-Einstellungen (Default-Werte)
     default_stability: float = 0.0
     default_similarity_boost: float = 0.8
@@ -28,6 +35,38 @@ class ElevenLabsConfig:
     max_text_length: int = 5000  # Zeichen pro Hook
 
 
+@dataclass
+class BackendConfig:
+    """Konfiguration für TTS-Backends und Router"""
+
+    # Aktives Backend: "elevenlabs", "fake" (stumme Frames für Lasttests) oder "router"
+    name: str = "elevenlabs"
+
+    # Backends des Routers (Reihenfolge = Vorrang solange keine Messwerte vorliegen);
+    # "elevenlabs@<api_base>" für einen weiteren ElevenLabs-Endpunkt
+    router_backends: List[str] = field(default_factory=lambda: ["elevenlabs"])
+
+    # Fake-Backend im Router zulassen (liefert stumme MP3s, die die Prüfung bestehen)
+    router_allow_fake: bool = False
+
+    # Router-Bewertung: Sekunden Zuschlag bei 100% Fehlerquote bzw. pro Kosteneinheit
+    error_penalty: float = 10.0
+    cost_weight: float = 0.001
+
+    # Glättung der Latenz und Fenster für die Fehlerquote
+    latency_alpha: float = 0.3
+    window_size: int = 20
+
+    # Angenommene Latenz (Sekunden) für Backends ohne Messwerte
+    latency_prior: float = 1.0
+
+    # Unterlegene Backends nach so vielen Sekunden ohne Request einmal testen (0 = nie)
+    probe_interval: float = 300.0
+
+    # Simulierte Synthesedauer des Fake-Backends
+    fake_seconds_per_char: float = 0.0
+
+
 @dataclass
 class FileConfig:
     """Konfiguration für Dateiverwaltung"""
@@ -46,6 +85,55 @@ class FileConfig:
     default_encoding: str = "utf-8"
 
 
+@dataclass
+class WorkspaceConfig:
+    """Konfiguration für Job-Arbeitsverzeichnisse und Aufräumen"""
+
+    # Basisverzeichnis für alle Job-Workspaces
+    root_dir: str = "output"
+
+    # Maximales Alter eines Workspaces bevor er gelöscht wird
+    max_age_seconds: int = 6 * 60 * 60  # 6 Stunden
+
+    # Maximaler Speicherplatz aller Workspaces zusammen
+    max_total_bytes: int = 500 * 1024 * 1024  # 500MB
+
+    # Intervall des Hintergrund-Aufräumers
+    janitor_interval: int = 300  # Sekunden
+
+
+@dataclass
+class RenderConfig:
+    """Konfiguration für Entwurfs- und Final-Renderings"""
+
+    # Günstiges Format für Entwürfe (Final nutzt elevenlabs.output_format)
+    draft_output_format: str = "mp3_22050_32"
+
+    # Parallele Worker für Entwürfe (Final nutzt scheduler.workers)
+    draft_workers: int = 6
+
+    # Cache für fertige Hooks (je ein Unterverzeichnis pro Qualität)
+    cache_dir: str = "cache"
+    cache_max_bytes: int = 200 * 1024 * 1024  # 200MB pro Qualität
+
+    # Phrasen-Cache: Hooks satzweise synthetisieren und Sätze hookübergreifend wiederverwenden
+    phrase_cache: bool = False
+
+
+@dataclass
+class SweepConfig:
+    """Konfiguration für den Voice-Settings-Sweep"""
+
+    # Parallele Renderings (Rate-Limit bleibt geteilt)
+    workers: int = 4
+
+    # Maximale Anzahl Renderings (Hooks x Rasterpunkte) pro Sweep
+    max_renders: int = 200
+
+    # Name der Ergebnis-ZIP
+    zip_name: str = "VOICE_SWEEP.zip"
+
+
 @dataclass
 class DemoConfig:
     """Konfiguration für Demo-Funktionalität"""
@@ -56,6 +144,39 @@ class DemoConfig:
     # Cache-Einstellungen
     demo_file_name: str = "demo_hook.mp3"
     cache_demo: bool = True
+    cache_dir: str = "cache/demo"
+
+    # Sekunden, in denen die gecachte Demo ohne Rückfrage beim Server gilt
+    revalidate_seconds: int = 3600
+
+
+@dataclass
+class SetupConfig:
+    """Konfiguration für die Installation der Abhängigkeiten"""
+
+    # Stempel erfüllter Anforderungen (im Temp-Verzeichnis: verfällt mit der Laufzeitumgebung)
+    stamp_dir: str = os.path.join(tempfile.gettempdir(), "colab-sound-setup")
+
+    # Vorgebaute Wheels (z.B. auf eingebundenem Speicher), None = nur Package-Index
+    wheelhouse_dir: str = None
+
+    # Nie auf den Package-Index zugreifen (abgeschottete Render-Rechner)
+    offline: bool = False
+
+
+@dataclass
+class GitLoaderConfig:
+    """Konfiguration für das Laden von Modulen aus dem Git-Repository"""
+
+    # Lokaler Cache für geladene Module (übersteht Notebook-Neustarts)
+    cache_enabled: bool = True
+    cache_dir: str = "cache/git"
+
+    # Mehrere Module als Repository-Archiv mit einem einzigen Request laden
+    use_archive: bool = False
+
+    # Branches/Tags einmal pro Session auf einen Commit festlegen (GitHub API)
+    pin_refs: bool = True
 
 
 @dataclass
@@ -72,6 +193,34 @@ class LoggingConfig:
     console_logging: bool = True
 
 
+@dataclass
+class ProfilingConfig:
+    """Konfiguration für den Profiling-Modus von Generierungsläufen"""
+
+    # Profiling aktivieren (cProfile, tracemalloc und Phasenzeiten pro Lauf)
+    enabled: bool = False
+
+    # Dateinamen-Präfix der Berichte neben der ZIP-Datei
+    file_prefix: str = "profile"
+
+    # Einträge im Allokationsbericht
+    top_allocations: int = 25
+
+    # Gespeicherte Stack-Frames pro Allokation
+    traceback_frames: int = 1
+
+
+@dataclass
+class TracingConfig:
+    """Konfiguration für Tracing-Spans (JSONL-Export ohne Collector)"""
+
+    # Tracing aktivieren
+    enabled: bool = False
+
+    # Trace-Datei (eine Zeile pro abgeschlossenem Span)
+    trace_file: str = "traces/trace.jsonl"
+
+
 @dataclass
 class NetworkConfig:
     """Konfiguration für Netzwerk-Requests"""
@@ -85,16 +234,136 @@ class NetworkConfig:
     retry_delay: float = 2.0  # Sekunden
 
 
+@dataclass
+class SchedulerConfig:
+    """Konfiguration für die Job-Warteschlange"""
+
+    # Anzahl paralleler Synthese-Worker
+    workers: int = 2
+
+    # Jobs bis zu dieser Hook-Anzahl gelten als interaktiv
+    interactive_max_hooks: int = 10
+
+    # Maximaler Vorsprung eines Nutzers (in Zeichen) bevor andere Vorrang bekommen
+    fair_share_quantum: int = 2000
+
+    # Zeitbudget pro Job in Sekunden (0 = unbegrenzt)
+    job_deadline: float = 0
+
+
+@dataclass
+class ConcurrencyConfig:
+    """Konfiguration für die adaptive Parallelität der Synthese (AIMD)"""
+
+    # Adaptive Steuerung aktivieren (opt-in)
+    enabled: bool = False
+
+    # Start-, Mindest- und Höchstzahl gleichzeitiger Synthese-Requests
+    initial_limit: int = 2
+    min_limit: int = 1
+    max_limit: int = 16
+
+    # Additive Erhöhung nach einem vollen Fenster stabiler Requests
+    increase: int = 1
+
+    # Multiplikative Senkung bei 429, Timeout oder steigender Latenz
+    decrease_factor: float = 0.5
+
+    # Latenz gilt als steigend ab diesem Vielfachen der Basislatenz
+    latency_tolerance: float = 2.0
+    latency_alpha: float = 0.3
+
+    # Messwerte für die Basislatenz (Perzentil im Fenster, je Längenklasse der Hooks)
+    window_size: int = 100
+    min_samples: int = 5
+    baseline_percentile: float = 0.1
+
+    # Anzahl gespeicherter Entscheidungen
+    history_size: int = 100
+
+
+@dataclass
+class HedgingConfig:
+    """Konfiguration für Hedged Requests (zweiter Request bei langsamen Antworten)"""
+
+    # Hedging aktivieren (opt-in)
+    enabled: bool = False
+
+    # Perzentil der bisherigen Latenz bis zum ersten Byte, ab dem gehedgt wird
+    percentile: float = 0.95
+
+    # Maximaler Anteil gehedgter Requests am Gesamtverkehr
+    max_hedge_ratio: float = 0.1
+
+    # Mindestanzahl an Messwerten bevor gehedgt wird
+    min_samples: int = 10
+
+    # Anzahl der zuletzt gemessenen Latenzen
+    window_size: int = 100
+
+
+@dataclass
+class ValidationConfig:
+    """Konfiguration für die Integritätsprüfung generierter Audio-Dateien"""
+
+    # Prüfung aktivieren
+    enabled: bool = True
+
+    # Erwartete Mindestdauer (Sekunden Audio pro Zeichen Hook-Text)
+    min_seconds_per_char: float = 0.02
+
+    # Mindestanzahl zusammenhängender MP3-Frames
+    min_frames: int = 3
+
+    # Worker-Threads für die parallele Prüfung
+    verify_workers: int = 2
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Konfiguration für den Circuit-Breaker um die TTS-API"""
+
+    # Öffnen nach so vielen aufeinanderfolgenden Fehlern
+    failure_threshold: int = 5
+
+    # Öffnen ab dieser Fehlerquote im Fenster
+    error_rate_threshold: float = 0.5
+    window_size: int = 20
+    min_requests: int = 10
+
+    # Wartezeit im offenen Zustand bis zum Probe-Request
+    open_seconds: float = 30.0
+
+    # Gleichzeitige Probe-Requests im halb offenen Zustand
+    half_open_max_calls: int = 1
+
+    # Maximale Pause eines Jobs bei offenem Circuit bevor er abbricht
+    max_pause: float = 120.0
+
+
 @dataclass
 class AppConfig:
     """Haupt-Konfiguration für die Anwendung"""
 
     # Sub-Konfigurationen
     elevenlabs: ElevenLabsConfig = field(default_factory=ElevenLabsConfig)
+    backend: BackendConfig = field(default_factory=BackendConfig)
     files: FileConfig = field(default_factory=FileConfig)
+    workspace: WorkspaceConfig = field(default_factory=WorkspaceConfig)
+    render: RenderConfig = field(default_factory=RenderConfig)
+    sweep: SweepConfig = field(default_factory=SweepConfig)
     demo: DemoConfig = field(default_factory=DemoConfig)
+    setup: SetupConfig = field(default_factory=SetupConfig)
+    git_loader: GitLoaderConfig = field(default_factory=GitLoaderConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
+    profiling: ProfilingConfig = field(default_factory=ProfilingConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
     network: NetworkConfig = field(default_factory=NetworkConfig)
+    validation: ValidationConfig = field(default_factory=ValidationConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    concurrency: ConcurrencyConfig = field(default_factory=ConcurrencyConfig)
+    hedging: HedgingConfig = field(default_factory=HedgingConfig)
+    circuit_breaker: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
 
     # App-Metadaten
     app_name: str = "Colab-Sound Hook Generator"
@@ -109,10 +378,23 @@ class AppConfig:
         """
         return {
             'elevenlabs': self.elevenlabs.__dict__,
+            'backend': self.backend.__dict__,
             'files': self.files.__dict__,
+            'workspace': self.workspace.__dict__,
+            'render': self.render.__dict__,
+            'sweep': self.sweep.__dict__,
             'demo': self.demo.__dict__,
+            'setup': self.setup.__dict__,
+            'git_loader': self.git_loader.__dict__,
             'logging': self.logging.__dict__,
+            'profiling': self.profiling.__dict__,
+            'tracing': self.tracing.__dict__,
             'network': self.network.__dict__,
+            'validation': self.validation.__dict__,
+            'scheduler': self.scheduler.__dict__,
+            'concurrency': self.concurrency.__dict__,
+            'hedging': self.hedging.__dict__,
+            'circuit_breaker': self.circuit_breaker.__dict__,
             'app_name': self.app_name,
             'version': self.version
         }
@@ -131,9 +413,24 @@ class AppConfig:
         if os.getenv('ELEVENLABS_MODEL_ID'):
             config.elevenlabs.model_id = os.getenv('ELEVENLABS_MODEL_ID')
 
+        if os.getenv('ELEVENLABS_API_BASE'):
+            config.elevenlabs.api_base = os.getenv('ELEVENLABS_API_BASE')
+
         if os.getenv('RATE_LIMIT_DELAY'):
             config.elevenlabs.rate_limit_delay = float(os.getenv('RATE_LIMIT_DELAY'))
 
+        # Backend-Konfiguration
+        if os.getenv('TTS_BACKEND'):
+            config.backend.name = os.getenv('TTS_BACKEND')
+
+        if os.getenv('TTS_ROUTER_BACKENDS'):
+            config.backend.router_backends = [
+                name.strip() for name in os.getenv('TTS_ROUTER_BACKENDS').split(',') if name.strip()
+            ]
+
+        if os.getenv('TTS_ROUTER_ALLOW_FAKE'):
+            config.backend.router_allow_fake = os.getenv('TTS_ROUTER_ALLOW_FAKE').lower() in ('1', 'true', 'yes')
+
         # Datei-Konfiguration
         if os.getenv('TEXT_SEPARATOR'):
             config.files.default_separator = os.getenv('TEXT_SEPARATOR')
@@ -141,6 +438,88 @@ class AppConfig:
         if os.getenv('ZIP_NAME'):
             config.files.default_zip_name = os.getenv('ZIP_NAME')
 
+        # Workspace-Konfiguration
+        if os.getenv('OUTPUT_DIR'):
+            config.workspace.root_dir = os.getenv('OUTPUT_DIR')
+
+        if os.getenv('OUTPUT_MAX_AGE'):
+            config.workspace.max_age_seconds = int(os.getenv('OUTPUT_MAX_AGE'))
+
+        if os.getenv('OUTPUT_MAX_BYTES'):
+            config.workspace.max_total_bytes = int(os.getenv('OUTPUT_MAX_BYTES'))
+
+        # Render-Konfiguration
+        if os.getenv('DRAFT_OUTPUT_FORMAT'):
+            config.render.draft_output_format = os.getenv('DRAFT_OUTPUT_FORMAT')
+
+        if os.getenv('DRAFT_WORKERS'):
+            config.render.draft_workers = int(os.getenv('DRAFT_WORKERS'))
+
+        if os.getenv('AUDIO_CACHE_DIR'):
+            config.render.cache_dir = os.getenv('AUDIO_CACHE_DIR')
+
+        if os.getenv('PHRASE_CACHE'):
+            config.render.phrase_cache = os.getenv('PHRASE_CACHE').lower() in ('1', 'true', 'yes')
+
+        # Sweep-Konfiguration
+        if os.getenv('SWEEP_WORKERS'):
+            config.sweep.workers = int(os.getenv('SWEEP_WORKERS'))
+
+        # Validierungs-Konfiguration
+        if os.getenv('VALIDATE_AUDIO'):
+            config.validation.enabled = os.getenv('VALIDATE_AUDIO').lower() in ('1', 'true', 'yes')
+
+        # Scheduler-Konfiguration
+        if os.getenv('SCHEDULER_WORKERS'):
+            config.scheduler.workers = int(os.getenv('SCHEDULER_WORKERS'))
+
+        if os.getenv('JOB_DEADLINE'):
+            config.scheduler.job_deadline = float(os.getenv('JOB_DEADLINE'))
+
+        # Parallelitäts-Konfiguration
+        if os.getenv('ADAPTIVE_CONCURRENCY'):
+            config.concurrency.enabled = os.getenv('ADAPTIVE_CONCURRENCY').lower() in ('1', 'true', 'yes')
+
+        if os.getenv('CONCURRENCY_MAX'):
+            config.concurrency.max_limit = int(os.getenv('CONCURRENCY_MAX'))
+
+        # Hedging-Konfiguration
+        if os.getenv('HEDGE_REQUESTS'):
+            config.hedging.enabled = os.getenv('HEDGE_REQUESTS').lower() in ('1', 'true', 'yes')
+
+        if os.getenv('HEDGE_MAX_RATIO'):
+            config.hedging.max_hedge_ratio = float(os.getenv('HEDGE_MAX_RATIO'))
+
+        # Setup-Konfiguration
+        if os.getenv('SETUP_STAMP_DIR'):
+            config.setup.stamp_dir = os.getenv('SETUP_STAMP_DIR')
+
+        if os.getenv('WHEELHOUSE_DIR'):
+            config.setup.wheelhouse_dir = os.getenv('WHEELHOUSE_DIR')
+
+        if os.getenv('PIP_OFFLINE'):
+            config.setup.offline = os.getenv('PIP_OFFLINE').lower() in ('1', 'true', 'yes')
+
+        # Demo-Konfiguration
+        if os.getenv('DEMO_CACHE'):
+            config.demo.cache_demo = os.getenv('DEMO_CACHE').lower() in ('1', 'true', 'yes')
+
+        if os.getenv('DEMO_CACHE_DIR'):
+            config.demo.cache_dir = os.getenv('DEMO_CACHE_DIR')
+
+        # Git-Loader-Konfiguration
+        if os.getenv('GIT_CACHE'):
+            config.git_loader.cache_enabled = os.getenv('GIT_CACHE').lower() in ('1', 'true', 'yes')
+
+        if os.getenv('GIT_CACHE_DIR'):
+            config.git_loader.cache_dir = os.getenv('GIT_CACHE_DIR')
+
+        if os.getenv('GIT_ARCHIVE'):
+            config.git_loader.use_archive = os.getenv('GIT_ARCHIVE').lower() in ('1', 'true', 'yes')
+
+        if os.getenv('GIT_PIN_REFS'):
+            config.git_loader.pin_refs = os.getenv('GIT_PIN_REFS').lower() in ('1', 'true', 'yes')
+
         # Logging-Konfiguration
         if os.getenv('LOG_LEVEL'):
             config.logging.default_level = os.getenv('LOG_LEVEL')
@@ -148,6 +527,18 @@ class AppConfig:
         if os.getenv('LOG_FILE'):
             config.logging.log_file = os.getenv('LOG_FILE')
 
+        # Profiling-Konfiguration
+        if os.getenv('PROFILE_RUNS'):
+            config.profiling.enabled = os.getenv('PROFILE_RUNS').lower() in ('1', 'true', 'yes')
+
+        # Tracing-Konfiguration (eine Trace-Datei aktiviert das Tracing)
+        if os.getenv('TRACING'):
+            config.tracing.enabled = os.getenv('TRACING').lower() in ('1', 'true', 'yes')
+
+        if os.getenv('TRACE_FILE'):
+            config.tracing.trace_file = os.getenv('TRACE_FILE')
+            config.tracing.enabled = True
+
         return config
 
 
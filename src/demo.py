@@ -3,9 +3,14 @@ Demo-Modul für Colab-Sound Projekt
 Zeigt eine Vorschau des Endprodukts mit Beispiel-Audio
 """
 
+import json
 import requests
 import os
-from typing import Optional
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
 from IPython.display import Audio, display, HTML
 from src.logger import get_logger
 from src.config import get_config
@@ -13,42 +18,157 @@ from src.config import get_config
 logger = get_logger("demo")
 config = get_config()
 
+# Ein Lock pro Zieldatei, damit parallele Nutzer auf denselben Download warten
+_download_locks: Dict[str, threading.Lock] = {}
+_download_locks_lock = threading.Lock()
+
+
+def _download_lock(path: Path) -> threading.Lock:
+    with _download_locks_lock:
+        return _download_locks.setdefault(str(path.resolve()), threading.Lock())
+
+
 class DemoPlayer:
     """Verwaltet Demo-Funktionalität für Hook-Generator"""
 
-    def __init__(self, demo_url: str = None):
+    def __init__(self, demo_url: str = None, cache_dir: Optional[str] = None):
         """
         Initialisiert den Demo-Player
 
         Args:
             demo_url: URL der Demo-MP3-Datei (optional, aus Config wenn nicht angegeben)
+            cache_dir: Cache-Verzeichnis (optional, aus Config wenn nicht angegeben)
         """
         self.demo_url = demo_url or config.demo.demo_url
-        self.demo_file = config.demo.demo_file_name
+        self._cache_dir = cache_dir
+        self.metrics = {'downloads': 0, 'not_modified': 0, 'hits': 0}
+        self._metrics_lock = threading.Lock()
+
+    @property
+    def demo_file(self) -> str:
+        """Pfad der lokalen Demo-Datei (im Cache-Verzeichnis, wenn gecacht wird)"""
+        if not config.demo.cache_demo:
+            return config.demo.demo_file_name
+        return str(Path(self._cache_dir or config.demo.cache_dir) / config.demo.demo_file_name)
+
+    def _count(self, metric: str) -> None:
+        with self._metrics_lock:
+            self.metrics[metric] += 1
 
-    def download_demo(self) -> bool:
+    @staticmethod
+    def _meta_path(target: Path) -> Path:
+        return target.with_name(f"{target.name}.json")
+
+    def _load_meta(self, target: Path) -> dict:
+        """Validatoren der gecachten Datei (leer, wenn Datei oder Metadaten nicht passen)"""
+        try:
+            meta = json.loads(self._meta_path(target).read_text(encoding='utf-8'))
+            size = target.stat().st_size
+        except (OSError, ValueError):
+            return {}
+        if meta.get('url') != self.demo_url or meta.get('size') != size:
+            return {}
+        return meta
+
+    def _store_meta(self, target: Path, meta: dict) -> None:
+        temp = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.json.tmp")
+        try:
+            temp.write_text(json.dumps(meta, indent=2), encoding='utf-8')
+            os.replace(temp, self._meta_path(target))
+        except OSError as e:
+            logger.warning(f"Demo-Metadaten konnten nicht gespeichert werden: {e}")
+        finally:
+            temp.unlink(missing_ok=True)
+
+    @staticmethod
+    def _stream_to(response: requests.Response, target: Path) -> int:
+        """Streamt den Body in eine temporäre Datei und benennt sie atomar um"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            size = 0
+            with open(temp, "wb") as f:
+                for chunk in response.iter_content(64 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+
+            # Bei Content-Encoding (gzip, br) zählt Content-Length die übertragenen Bytes
+            expected = response.headers.get('Content-Length')
+            encoded = response.headers.get('Content-Encoding', 'identity').lower() != 'identity'
+            received = response.raw.tell() if encoded else size
+            if expected is not None and int(expected) != received:
+                raise IOError(f"Download unvollständig ({received} von {expected} Bytes)")
+
+            os.replace(temp, target)
+            return size
+        finally:
+            temp.unlink(missing_ok=True)
+
+    def download_demo(self, force: bool = False) -> bool:
         """
-        Lädt die Demo-MP3-Datei herunter
+        Stellt die Demo-MP3-Datei lokal bereit
+
+        Eine gecachte Demo gilt revalidate_seconds lang ohne Request, danach
+        wird sie mit If-None-Match/If-Modified-Since geprüft (304: kein
+        Download). Neue Versionen werden gestreamt und atomar abgelegt;
+        parallele Aufrufe warten auf denselben Download.
+
+        Args:
+            force: Cache ignorieren und neu herunterladen
 
         Returns:
             bool: True bei Erfolg
         """
-        try:
-            response = requests.get(self.demo_url, timeout=config.network.download_timeout)
-            response.raise_for_status()
+        target = Path(self.demo_file)
+        cached = config.demo.cache_demo and not force
 
-            with open(self.demo_file, "wb") as f:
-                f.write(response.content)
+        with _download_lock(target):
+            meta = self._load_meta(target) if cached else {}
+            if meta and time.time() - meta.get('checked', 0) < config.demo.revalidate_seconds:
+                self._count('hits')
+                logger.debug("Demo-MP3 aus dem Cache")
+                return True
 
-            logger.info("Demo-MP3 erfolgreich heruntergeladen")
-            return True
+            headers = {}
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Netzwerk-Fehler beim Download: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Fehler beim Download: {e}")
-            return False
+            try:
+                with requests.get(self.demo_url, headers=headers, stream=True,
+                                  timeout=config.network.download_timeout) as response:
+                    if meta and response.status_code == 304:
+                        meta['checked'] = time.time()
+                        self._store_meta(target, meta)
+                        self._count('not_modified')
+                        logger.info("Demo-MP3 unverändert, nutze Cache")
+                        return True
+
+                    response.raise_for_status()
+                    size = self._stream_to(response, target)
+
+                if config.demo.cache_demo:
+                    self._store_meta(target, {
+                        'url': self.demo_url,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'size': size,
+                        'checked': time.time()
+                    })
+                self._count('downloads')
+                logger.info("Demo-MP3 erfolgreich heruntergeladen")
+                return True
+
+            except requests.exceptions.RequestException as e:
+                if meta:
+                    logger.warning(f"Demo-Server nicht erreichbar, nutze Cache: {e}")
+                    return True
+                logger.error(f"Netzwerk-Fehler beim Download: {e}")
+                return False
+            except Exception as e:
+                logger.error(f"Fehler beim Download: {e}")
+                return False
 
     def show_demo_card(self) -> None:
         """Zeigt eine ansprechende Demo-Karte mit HTML/CSS"""
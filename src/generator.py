@@ -3,22 +3,48 @@ Generator-Modul für Colab-Sound Projekt
 Behandelt die Text-zu-Sprache Konvertierung mit ElevenLabs API
 """
 
-import requests
+import contextlib
+import copy
 import zipfile
 import os
+import threading
 import time
-from typing import Optional, Tuple, List
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Iterator, Optional, Tuple, List
 from pathlib import Path
 from src.logger import get_logger
 from src.config import get_config
+from src.validator import AudioValidator, find_first_frame
+from src.rate_limiter import get_rate_limiter
+from src.circuit_breaker import get_circuit_breaker
+from src.cancellation import CancellationToken, DurationEstimator
+from src.concurrency import AdaptiveConcurrency, get_adaptive_concurrency
+from src.hedging import HedgeAttempt, HedgePolicy, get_hedge_policy, run_hedged
+from src.audio_cache import AudioCache, get_audio_cache
+from src.manifest import ArchiveUpdate, hook_file_name
+from src.backends import BackendError, TTSBackend, create_backend
+from src.phrases import concat_mp3, split_sentences
+from src.profiling import RunProfile, bind as bind_profile, current_profile, stage as profile_stage
+from src.tracing import Tracer, current_span, get_tracer
+from src.workspace import workspace_manager
 
 logger = get_logger("generator")
 config = get_config()
 
-class HookGenerator:
-    """Generiert Audio-Hooks aus Text mit ElevenLabs API"""
+# Render-Qualitäten
+QUALITY_DRAFT = "draft"  # Günstig und schnell zum Vorhören
+QUALITY_FINAL = "final"  # Volle Qualität für die Auslieferung
 
-    def __init__(self, api_key: str, voice_id: str, separator: str = "---"):
+class HookGenerator:
+    """Generiert Audio-Hooks aus Text über ein TTS-Backend (standardmäßig ElevenLabs)"""
+
+    def __init__(self, api_key: str, voice_id: str, separator: str = "---",
+                 hedge_policy: Optional[HedgePolicy] = None,
+                 quality: str = QUALITY_FINAL, cache: Optional[AudioCache] = None,
+                 backend: Optional[TTSBackend] = None, phrase_cache: Optional[bool] = None,
+                 concurrency: Optional[AdaptiveConcurrency] = None, profile: Optional[bool] = None,
+                 tracer: Optional[Tracer] = None):
         """
         Initialisiert den Hook-Generator
 
@@ -26,15 +52,42 @@ class HookGenerator:
             api_key: ElevenLabs API Key
             voice_id: Voice ID für die Sprachsynthese
             separator: Text-Trennzeichen für einzelne Hooks
+            hedge_policy: Optional: Hedging-Strategie (global wenn per Config aktiviert)
+            quality: QUALITY_DRAFT (günstiges Format) oder QUALITY_FINAL
+            cache: Optional: Audio-Cache (globaler Cache der Qualität wenn nicht angegeben)
+            backend: Optional: TTS-Backend (aus config.backend.name wenn nicht angegeben)
+            phrase_cache: Optional: Hooks satzweise synthetisieren und Sätze wiederverwenden
+                (aus config.render.phrase_cache wenn nicht angegeben)
+            concurrency: Optional: Adaptive Parallelität der Synthese (global wenn per Config aktiviert)
+            profile: Optional: Läufe mit cProfile, tracemalloc und Phasenzeiten messen
+                (aus config.profiling.enabled wenn nicht angegeben)
+            tracer: Optional: Tracer für Spans (globaler Tracer aus config.tracing wenn nicht angegeben)
         """
         self.api_key = api_key
         self.voice_id = voice_id
         self.separator = separator
-        self.url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-        self.headers = {
-            "xi-api-key": api_key,
-            "Content-Type": "application/json"
+        self.quality = quality
+        self.output_format = (config.render.draft_output_format if quality == QUALITY_DRAFT
+                              else config.elevenlabs.output_format)
+        self.cache = cache or get_audio_cache(quality)
+        self.backend = backend or create_backend(config.backend.name, api_key)
+        self.url = self.backend.endpoint(voice_id)
+        self.voice_settings = {
+            "stability": config.elevenlabs.default_stability,
+            "similarity_boost": config.elevenlabs.default_similarity_boost,
+            "style": config.elevenlabs.default_style
         }
+        self.validator = AudioValidator()
+        self.rate_limiter = get_rate_limiter()
+        self.breaker = get_circuit_breaker(self.backend.name)
+        self.hedge_policy = hedge_policy or (get_hedge_policy() if config.hedging.enabled else None)
+        self.concurrency = concurrency or (get_adaptive_concurrency() if config.concurrency.enabled else None)
+        self.last_preview_latency: Optional[float] = None
+        self.phrase_cache = config.render.phrase_cache if phrase_cache is None else phrase_cache
+        self.phrase_stats = {'hits': 0, 'misses': 0}
+        self._phrase_lock = threading.Lock()
+        self.profiling = config.profiling.enabled if profile is None else profile
+        self.tracer = tracer or get_tracer()
 
     def validate_text_file(self, file_path: str) -> None:
         """
@@ -109,90 +162,770 @@ class HookGenerator:
             logger.error(f"Fehler beim Parsen der Text-Datei: {e}")
             raise
 
-    def generate_audio_hook(self, text: str, output_path: str) -> bool:
+    def cache_key(self, text: str) -> str:
         """
-        Generiert einen einzelnen Audio-Hook
+        Cache-Schlüssel eines Hooks (alle Parameter, die das Audio bestimmen)
 
         Args:
             text: Hook-Text
+
+        Returns:
+            str: Schlüssel für den Audio-Cache
+        """
+        return AudioCache.make_key(
+            text=text,
+            voice_id=self.voice_id,
+            voice_settings=self.voice_settings,
+            output_format=self.output_format,
+            **self.backend.fingerprint()
+        )
+
+    def is_cached(self, text: str) -> bool:
+        """Ob der Hook ohne API-Request aus dem Cache geliefert werden kann"""
+        if self.cache.contains(self.cache_key(text)):
+            return True
+
+        sentences = split_sentences(text) if self.phrase_cache else []
+        if len(sentences) > 1:
+            phrases = self._phrase_generator()
+            return all(phrases.is_cached(sentence) for sentence in sentences)
+        return False
+
+    def _phrase_generator(self) -> "HookGenerator":
+        """Generator für einzelne Sätze (gleiche Stimme und Einstellungen, eigener Cache)"""
+        phrases = copy.copy(self)
+        phrases.cache = get_audio_cache(f"{self.quality}-phrases")
+        phrases.phrase_cache = False
+        return phrases
+
+    def phrase_summary(self) -> Optional[str]:
+        """
+        Trefferquote des Phrasen-Caches seit dem letzten Zurücksetzen
+
+        Returns:
+            Optional[str]: Zusammenfassung oder None ohne zusammengesetzte Hooks
+        """
+        with self._phrase_lock:
+            hits, misses = self.phrase_stats['hits'], self.phrase_stats['misses']
+        if not hits + misses:
+            return None
+        return f"🧩 Phrasen-Cache: {hits} von {hits + misses} Sätzen wiederverwendet ({hits / (hits + misses):.0%})"
+
+    def _generate_from_phrases(self, text: str, sentences: List[str], output_path: str,
+                               token: Optional[CancellationToken] = None) -> bool:
+        """
+        Setzt einen Hook aus satzweise gecachten Audio-Fragmenten zusammen
+
+        Nur fehlende Sätze werden synthetisiert; die Fragmente werden auf
+        MP3-Frame-Ebene aneinandergehängt.
+
+        Args:
+            text: Hook-Text
+            sentences: Sätze des Hooks
             output_path: Ausgabepfad für die MP3-Datei
+            token: Optional: Cancellation-Token
 
         Returns:
             bool: True bei Erfolg
         """
-        payload = {
-            "text": text,
-            "model_id": config.elevenlabs.model_id,
-            "voice_settings": {
-                "stability": config.elevenlabs.default_stability,
-                "similarity_boost": config.elevenlabs.default_similarity_boost,
-                "style": config.elevenlabs.default_style
-            },
-            "output_format": config.elevenlabs.output_format
-        }
+        phrases = self._phrase_generator()
+        parts = []
+        hits = 0
+        requests_sent = 0
+
+        for i, sentence in enumerate(sentences):
+            if phrases.is_cached(sentence):
+                hits += 1
+            else:
+                # Den ersten Request hat der Aufrufer (Scheduler, Batch) bereits eingeplant
+                if requests_sent:
+                    with self._stage("queue_wait"):
+                        self.rate_limiter.wait()
+                requests_sent += 1
+
+            part_path = Path(f"{output_path}.phrase{i}")
+            try:
+                if not phrases.generate_audio_hook(sentence, str(part_path), token):
+                    return False
+                parts.append(part_path.read_bytes())
+            finally:
+                part_path.unlink(missing_ok=True)
+
+        with self._phrase_lock:
+            self.phrase_stats['hits'] += hits
+            self.phrase_stats['misses'] += len(sentences) - hits
+
+        data = concat_mp3(parts)
+        if config.validation.enabled:
+            result = self.validator.validate_bytes(data, text)
+            if not result.valid:
+                logger.error(f"Zusammengesetzter Hook ungültig ({result.reason}): {output_path}")
+                return False
+
+        with open(output_path, "wb") as f:
+            f.write(data)
+        self.cache.store(self.cache_key(text), output_path)
+
+        logger.info(f"🧩 Hook aus {len(sentences)} Sätzen zusammengesetzt ({hits} aus Cache): {output_path}")
+        return True
+
+    def _stage(self, name: str):
+        """Zeitmessung einer Phase (ohne laufendes Profil ein No-op)"""
+        return profile_stage(name)
+
+    def _bind(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Überträgt aktiven Span und aktives Profil auf eine Funktion für einen Thread-Pool"""
+        return bind_profile(self.tracer.bind(fn))
+
+    def _pool_task(self, fn: Callable[..., Any], *args) -> Any:
+        """Führt eine Aufgabe im Worker-Pool aus (bei laufendem Profil unter cProfile)"""
+        profile = current_profile()
+        if profile is None:
+            return fn(*args)
+        with profile.thread():
+            return fn(*args)
+
+    def _profiled(self, output_dir: str,
+                  run: Callable[[], Tuple[Optional[str], str]]) -> Tuple[Optional[str], str]:
+        """
+        Führt einen Lauf aus, bei aktivem Profiling unter cProfile und tracemalloc
+
+        Berichte (.pstats, Allokationen, Phasenzeiten) landen im Ausgabeverzeichnis.
+        Verschachtelte Läufe (Datei -> Batch) und Läufe innerhalb eines
+        Scheduler-Jobs werden im bereits aktiven Profil erfasst.
 
+        Args:
+            output_dir: Ausgabeverzeichnis
+            run: Lauf, liefert (ZIP-Pfad, Status-Nachricht)
+
+        Returns:
+            Tuple[Optional[str], str]: Ergebnis des Laufs (mit Profil-Zusammenfassung)
+        """
+        if not self.profiling or current_profile() is not None:
+            return run()
+
+        profile = RunProfile(output_dir).start()
         try:
-            response = requests.post(
-                self.url,
-                json=payload,
-                headers=self.headers,
-                stream=True,
-                timeout=config.network.default_timeout
-            )
+            with profile.activate():
+                zip_path, message = run()
+        finally:
+            profile.stop()
+        return zip_path, f"{message}\n{profile.summary()}"
+
+    def _validate_file(self, output_path: str, text: str, content_type: str):
+        """Integritätsprüfung einer heruntergeladenen Datei (als Phase und Span gemessen)"""
+        with self._stage("validate"), self.tracer.span("validate", file=Path(output_path).name) as span:
+            result = self.validator.validate_file(output_path, text, content_type)
+            span.set_attribute("valid", result.valid)
+            return result
+
+    def _fetch_cached(self, key: str, output_path: str, **attributes) -> bool:
+        """Kopiert einen Hook aus dem Audio-Cache (als Span gemessen)"""
+        with self.tracer.span("cache_lookup", **attributes) as span:
+            hit = self.cache.fetch(key, output_path)
+            span.set_attribute("hit", hit)
+            return hit
+
+    def _job_span(self, **attributes):
+        """Root-Span eines Laufs (innerhalb eines laufenden Spans wird dieser weiterverwendet)"""
+        active = current_span()
+        if active is not None:
+            return contextlib.nullcontext(active)
+        return self.tracer.span("job", job_id=uuid.uuid4().hex[:12], quality=self.quality, **attributes)
+
+    def _synthesis_workers(self) -> int:
+        """Größe des Synthese-Pools (die adaptive Obergrenze regelt darunter)"""
+        return self.concurrency.max_limit if self.concurrency is not None else 1
+
+    def plan_update(self, texts: List[str], output_dir: str = ".") -> ArchiveUpdate:
+        """
+        Vergleicht die Hooks mit dem letzten Lauf im Ausgabeverzeichnis
 
-            if response.status_code == 200:
-                with open(output_path, "wb") as f:
-                    for chunk in response.iter_content(1024):
-                        if chunk:
-                            f.write(chunk)
-                logger.info(f"🎵 Hook generiert: {output_path}")
+        Args:
+            texts: Liste der Hook-Texte
+            output_dir: Ausgabeverzeichnis (Workspace)
+
+        Returns:
+            ArchiveUpdate: Übernehmbare und neu zu generierende Hooks
+        """
+        return ArchiveUpdate(output_dir, [self.cache_key(text) for text in texts])
+
+    def _acquire_circuit(self, max_pause: float, token: Optional[CancellationToken] = None) -> bool:
+        """
+        Wartet bei offenem Circuit auf eine Freigabe, bricht aber bei Abbruch sofort ab
+
+        Args:
+            max_pause: Maximale Wartezeit in Sekunden
+            token: Optional: Cancellation-Token (Zeitbudget begrenzt die Wartezeit)
+
+        Returns:
+            bool: True wenn der Request gesendet werden darf
+        """
+        if token is None:
+            return self.breaker.acquire(timeout=max_pause)
+
+        remaining = token.remaining()
+        if remaining is not None:
+            max_pause = min(max_pause, remaining)
+
+        deadline = time.monotonic() + max_pause
+        while not token.cancelled:
+            if self.breaker.acquire(timeout=min(1.0, max(0.0, deadline - time.monotonic()))):
                 return True
-            else:
-                error_msg = f"API-Fehler {response.status_code}: {response.text}"
-                logger.error(error_msg)
+            if time.monotonic() >= deadline:
                 return False
+        return False
+
+    def _fetch_audio(self, text: str, output_path: str,
+                     attempt: Optional[HedgeAttempt] = None,
+                     token: Optional[CancellationToken] = None,
+                     throttle_retries: Optional[int] = None) -> Optional[str]:
+        """
+        Führt einen einzelnen Backend-Request aus und schreibt das Audio in eine Datei
+
+        Latenz, 429 und Timeouts werden an die adaptive Parallelität gemeldet.
+        Abgelehnte Requests (429) werden nach einer Pause wiederholt. Jeder
+        Versuch ist ein Span "request" mit den Kindern connect, first_byte und body.
+
+        Args:
+            text: Hook-Text
+            output_path: Ausgabepfad für die MP3-Datei
+            attempt: Optional: Hedge-Versuch (für Abbruch und Latenzmessung)
+            token: Optional: Cancellation-Token des Jobs
+            throttle_retries: Verbleibende Wiederholungen nach 429 (aus Config wenn nicht angegeben)
+
+        Returns:
+            Optional[str]: Content-Type der Antwort bei Erfolg, sonst None
+        """
+        if throttle_retries is None:
+            throttle_retries = config.network.max_retries
+
+        # Bei gestörter API pausieren statt in Timeouts zu laufen (Hedges warten nicht)
+        max_pause = 0 if attempt is not None and attempt.index > 0 else config.circuit_breaker.max_pause
+        if not self._acquire_circuit(max_pause, token):
+            if token is None or not token.cancelled:
+                logger.error("API gestört (Circuit offen) - Request wird nicht gesendet")
+            return None
+
+        def aborted() -> bool:
+            return (attempt is not None and attempt.cancelled) or (token is not None and token.cancelled)
+
+        unregister = lambda: None
+        audio = None
+        profile = current_profile()
+        writing = 0.0
+        started = time.monotonic()
+        request = self.tracer.start_span("request", backend=self.backend.name,
+                                         hedge=attempt.index if attempt is not None else 0)
+        connected = first_byte = None
+        try:
+            audio = self.backend.synthesize(text, self.voice_id, self.voice_settings, self.output_format)
+            connected = time.time_ns()
+            if attempt is not None:
+                attempt.on_cancel(audio.close)
+            if token is not None:
+                unregister = token.on_cancel(audio.close)
+
+            with open(output_path, "wb") as f:
+                for chunk in audio:
+                    if aborted():
+                        break
+                    if first_byte is None:
+                        first_byte = time.time_ns()
+                    if attempt is not None:
+                        attempt.mark_first_byte()
+                    if profile is None:
+                        f.write(chunk)
+                        continue
+                    write_started = time.perf_counter()
+                    f.write(chunk)
+                    writing += time.perf_counter() - write_started
+
+            if aborted():
+                self.breaker.record_ignored()
+                request.set_status("cancelled")
+                Path(output_path).unlink(missing_ok=True)
+                return None
+
+            self.breaker.record_success()
+            if self.concurrency is not None:
+                self.concurrency.record_success(time.monotonic() - started, len(text), started)
+            return audio.content_type
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Netzwerk-Fehler: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Unerwarteter Fehler: {e}")
+            Path(output_path).unlink(missing_ok=True)
+            if aborted():
+                self.breaker.record_ignored()
+                request.set_status("cancelled")
+                logger.debug(f"Abgebrochener Request beendet: {e}")
+                return None
+
+            request.set_status("error", str(e))
+            if not isinstance(e, BackendError):
+                self.breaker.record_ignored()
+                logger.error(f"Unerwarteter Fehler: {e}")
+                return None
+
+            request.set_attribute("status_code", e.status_code)
+            if self.concurrency is not None and (e.throttled or e.timeout):
+                self.concurrency.record_overload(started, timeout=e.timeout)
+
+            if not e.throttled:
+                # Nur Netzwerk- und Serverfehler deuten auf eine Störung hin
+                if e.transient:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                logger.error(str(e))
+                return None
+
+            # Quota erschöpft: keine Störung der API, nach einer Pause erneut versuchen
+            self.breaker.record_ignored()
+
+        finally:
+            unregister()
+            if audio is not None:
+                audio.close()
+            if profile is not None:
+                profile.add("network", time.monotonic() - started - writing)
+                profile.add("disk_write", writing)
+            self._end_request_span(request, connected, first_byte)
+
+        # Hedges geben bei 429 sofort auf, der ursprüngliche Request läuft weiter
+        if throttle_retries <= 0 or (attempt is not None and attempt.index > 0):
+            logger.error("API-Quota erschöpft (429) - Hook wird nicht generiert")
+            return None
+
+        logger.warning(f"⏳ API-Quota erschöpft (429) - neuer Versuch in {config.network.retry_delay:.1f}s")
+        if token is None:
+            time.sleep(config.network.retry_delay)
+        elif token.wait(config.network.retry_delay):
+            return None
+        if aborted():
+            return None
+        return self._fetch_audio(text, output_path, attempt, token, throttle_retries - 1)
+
+    def _end_request_span(self, request, connected: Optional[int], first_byte: Optional[int]) -> None:
+        """Schließt den Request-Span ab und ergänzt die Phasen connect, first_byte und body"""
+        if not request.recording:
+            return
+        end = time.time_ns()
+        self.tracer.record("connect", request.start_ns, connected or end, parent=request)
+        if connected is not None:
+            self.tracer.record("first_byte", connected, first_byte or end, parent=request)
+        if first_byte is not None:
+            self.tracer.record("body", first_byte, end, parent=request)
+        request.end(end)
+
+    def _download_hook(self, text: str, output_path: str,
+                       token: Optional[CancellationToken] = None) -> Optional[str]:
+        """
+        Lädt einen einzelnen Audio-Hook von der API herunter (ohne Prüfung)
+
+        Mit aktivem Hedging wird bei ausbleibendem ersten Byte ein zweiter
+        Request gestartet, sofern Synthese-Slot und Rate-Limit sofort frei
+        sind; der schnellere gewinnt.
+
+        Args:
+            text: Hook-Text
+            output_path: Ausgabepfad für die MP3-Datei
+            token: Optional: Cancellation-Token des Jobs
+
+        Returns:
+            Optional[str]: Content-Type der Antwort bei Erfolg, sonst None
+        """
+        if self.hedge_policy is None:
+            content_type = self._fetch_audio(text, output_path, token=token)
+            if content_type is not None:
+                logger.info(f"🎵 Hook generiert: {output_path}")
+            return content_type
+
+        def part_path(index: int) -> str:
+            return f"{output_path}.part{index}"
+
+        winner = run_hedged(
+            self._bind(lambda attempt: self._fetch_audio(text, part_path(attempt.index), attempt, token)),
+            self.hedge_policy,
+            discard=lambda index: Path(part_path(index)).unlink(missing_ok=True),
+            admit=self._admit_hedge,
+            release=self._release_hedge
+        )
+        if winner is None:
+            return None
+
+        index, content_type = winner
+        os.replace(part_path(index), output_path)
+        logger.info(f"🎵 Hook generiert: {output_path}")
+        return content_type
+
+    def _admit_hedge(self) -> bool:
+        """Belegt Synthese-Slot und Rate-Limit für einen Hedge, ohne zu warten"""
+        if self.concurrency is not None and not self.concurrency.try_acquire():
             return False
+        if not self.rate_limiter.try_acquire():
+            self._release_hedge()
+            return False
+        return True
+
+    def _release_hedge(self) -> None:
+        """Gibt den Synthese-Slot eines beendeten Hedges frei"""
+        if self.concurrency is not None:
+            self.concurrency.release()
+
+    def generate_audio_hook(self, text: str, output_path: str,
+                            token: Optional[CancellationToken] = None) -> bool:
+        """
+        Generiert einen einzelnen Audio-Hook
+
+        Ungültige Antworten (falscher Content-Type, abgeschnittenes oder zu kurzes
+        Audio) werden bis zu max_retries-mal neu angefordert.
+
+        Args:
+            text: Hook-Text
+            output_path: Ausgabepfad für die MP3-Datei
+            token: Optional: Cancellation-Token (bricht laufende Streams ab)
+
+        Returns:
+            bool: True bei Erfolg
+        """
+        with self.tracer.span("generate_audio_hook", file=Path(output_path).name, chars=len(text)) as span:
+            ok = self._generate_audio_hook(text, output_path, token)
+            span.set_attribute("ok", ok)
+            return ok
+
+    def _generate_audio_hook(self, text: str, output_path: str,
+                             token: Optional[CancellationToken]) -> bool:
+        """Generiert einen einzelnen Audio-Hook (siehe generate_audio_hook)"""
+        key = self.cache_key(text)
+        if self._fetch_cached(key, output_path):
+            logger.info(f"♻️ Hook aus Cache: {output_path}")
+            return True
+
+        sentences = split_sentences(text) if self.phrase_cache else []
+        if len(sentences) > 1:
+            return self._generate_from_phrases(text, sentences, output_path, token)
+
+        attempts = 1 + config.network.max_retries if config.validation.enabled else 1
+
+        for attempt in range(1, attempts + 1):
+            if token is not None and token.cancelled:
+                return False
+
+            content_type = self._download_hook(text, output_path, token)
+            if content_type is None:
+                return False
+
+            if not config.validation.enabled:
+                self.cache.store(key, output_path)
+                return True
+
+            result = self._validate_file(output_path, text, content_type)
+            if result.valid:
+                self.cache.store(key, output_path)
+                return True
+
+            logger.warning(f"⚠️ Ungültiges Audio ({result.reason}) - Versuch {attempt}/{attempts}")
+            if attempt < attempts:
+                if token is None:
+                    time.sleep(config.network.retry_delay)
+                elif token.wait(config.network.retry_delay):
+                    return False
+
+        logger.error(f"Hook nach {attempts} Versuchen weiterhin ungültig: {output_path}")
+        return False
+
+    def stream_preview(self, text: str, token: Optional[CancellationToken] = None) -> Iterator[bytes]:
+        """
+        Streamt einen einzelnen Hook zur sofortigen Wiedergabe
+
+        Fordert das Backend im Streaming-Modus an (bei ElevenLabs der
+        Streaming-Endpunkt mit Latenz-Optimierung) und gibt
+        Audio-Chunks weiter, sobald sie eintreffen. Die Zeit bis zum ersten
+        hörbaren Frame wird geloggt und in last_preview_latency gespeichert.
+
+        Args:
+            text: Hook-Text
+            token: Optional: Cancellation-Token (bricht den Stream ab)
+
+        Yields:
+            bytes: MP3-Chunks in Empfangsreihenfolge
 
-    def generate_hooks_batch(self, texts: List[str], output_dir: str = ".") -> Tuple[Optional[str], str]:
+        Raises:
+            RuntimeError: Bei API-Fehlern oder offenem Circuit
+        """
+        # Vorschau ist interaktiv: bei gestörter API sofort scheitern
+        if not self.breaker.acquire(timeout=0):
+            raise RuntimeError("API gestört - Vorschau aktuell nicht möglich")
+
+        started = time.monotonic()
+        self.last_preview_latency = None
+        buffered = b""
+        audio = None
+        unregister = lambda: None
+
+        try:
+            audio = self.backend.synthesize(
+                text, self.voice_id, self.voice_settings, self.output_format, stream=True
+            )
+            if token is not None:
+                unregister = token.on_cancel(audio.close)
+
+            for chunk in audio:
+                if token is not None and token.cancelled:
+                    self.breaker.record_ignored()
+                    return
+
+                # Erstes hörbares Byte = erster vollständiger MP3-Frame-Header
+                if self.last_preview_latency is None:
+                    buffered += chunk
+                    if find_first_frame(buffered) is not None:
+                        self.last_preview_latency = time.monotonic() - started
+                        logger.info(f"⚡ Erstes hörbares Audio nach {self.last_preview_latency * 1000:.0f}ms")
+                        buffered = b""
+
+                yield chunk
+
+            self.breaker.record_success()
+            logger.info(f"🎧 Vorschau gestreamt in {time.monotonic() - started:.2f}s")
+
+        except GeneratorExit:
+            # Wiedergabe vorzeitig beendet
+            self.breaker.record_ignored()
+            raise
+
+        except Exception as e:
+            # Geschlossene Verbindung nach Abbruch ist kein API-Fehler
+            if token is not None and token.cancelled:
+                self.breaker.record_ignored()
+                return
+            if isinstance(e, BackendError):
+                if e.transient:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+            else:
+                self.breaker.record_ignored()
+            raise
+
+        finally:
+            unregister()
+            if audio is not None:
+                audio.close()
+
+    def generate_hooks_batch(self, texts: List[str], output_dir: str = ".",
+                             token: Optional[CancellationToken] = None,
+                             incremental: Optional[bool] = None) -> Tuple[Optional[str], str]:
         """
         Generiert mehrere Hooks und packt sie in eine ZIP-Datei
 
+        Bei inkrementellen Läufen (Standard in Workspaces) werden unveränderte
+        Hooks aus dem letzten Lauf im selben Ausgabeverzeichnis direkt aus
+        der alten ZIP-Datei übernommen und ein Manifest geschrieben; andere
+        Verzeichnisse bekommen nur die ZIP-Datei. Hooks aus dem
+        Audio-Cache ohne API-Request. Mit adaptiver Parallelität laufen so
+        viele Downloads gleichzeitig, wie der Controller gerade erlaubt. Die
+        Integritätsprüfung läuft in einem Worker-Pool parallel zu den
+        weiteren Downloads; ungültige Hooks werden am Ende erneut generiert.
+        Reicht das Zeitbudget des Tokens nicht mehr für den nächsten Hook,
+        werden die restlichen übersprungen und die fertigen Hooks verpackt.
+        Mit aktivem Profiling liegen die Berichte danach neben der ZIP-Datei,
+        mit aktivem Tracing bekommt der Lauf einen Span "job" mit einem
+        Kind-Span pro Hook.
+
         Args:
             texts: Liste der Hook-Texte
             output_dir: Ausgabeverzeichnis
+            token: Optional: Cancellation-Token mit Abbruch und Zeitbudget
+            incremental: Manifest nutzen und schreiben (default: nur in Workspaces)
 
         Returns:
             Tuple[Optional[str], str]: (ZIP-Pfad, Status-Nachricht)
         """
+        if incremental is None:
+            incremental = workspace_manager.contains(output_dir)
+
+        def run() -> Tuple[Optional[str], str]:
+            with self._job_span(hooks=len(texts)) as job:
+                return self._generate_batch(texts, output_dir, token, job.attributes.get('job_id'), incremental)
+
+        return self._profiled(output_dir, run)
+
+    def _generate_batch(self, texts: List[str], output_dir: str, token: Optional[CancellationToken],
+                        job_id: Optional[str] = None, incremental: bool = False) -> Tuple[Optional[str], str]:
+        """Generiert mehrere Hooks und packt sie (siehe generate_hooks_batch)"""
         if not texts:
             return None, "Keine Texte zum Generieren"
 
         logger.info(f"🎯 Starte Generierung von {len(texts)} Hooks...")
 
-        mp3_files = []
+        with self._phrase_lock:
+            self.phrase_stats = {'hits': 0, 'misses': 0}
+
+        mp3_files = {}
+        failed = []
         output_dir = Path(output_dir)
+        validate = config.validation.enabled
+        estimator = DurationEstimator()
+        update = self.plan_update(texts, str(output_dir)) if incremental else None
+        pending = update.pending if update is not None else range(len(texts))
+        reused = update.reused if update is not None else {}
+
+        def synthesize(i: int) -> Tuple[int, bool, Optional[str]]:
+            """Erzeugt einen Hook im Synthese-Pool und gibt den Slot frei"""
+            file_path = str(output_dir / hook_file_name(i))
+            started = time.monotonic()
+            try:
+                with self.tracer.span("hook", job_id=job_id, hook=i + 1, chars=len(texts[i])) as span:
+                    if self.phrase_cache:
+                        # Satzweise zusammensetzen, geprüft und gecacht wird dabei direkt
+                        ok, content_type = self.generate_audio_hook(texts[i], file_path, token), None
+                    else:
+                        content_type = self._download_hook(texts[i], file_path, token)
+                        ok = content_type is not None
+                    span.set_attribute("ok", ok)
+            finally:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+
+            if ok:
+                estimator.record(len(texts[i]), time.monotonic() - started)
+            return i, ok, content_type
+
+        with ThreadPoolExecutor(max_workers=config.validation.verify_workers) as pool, \
+                ThreadPoolExecutor(max_workers=self._synthesis_workers()) as synthesis:
+            checks = {}
+            running = set()
+
+            def collect(done) -> None:
+                """Wertet fertige Downloads aus und startet deren Prüfung"""
+                for future in done:
+                    running.discard(future)
+                    i, ok, content_type = future.result()
+                    if not ok:
+                        failed.append(i)
+                        continue
+                    mp3_files[i] = hook_file_name(i)
+                    if content_type is None:
+                        continue
+                    file_path = output_dir / hook_file_name(i)
+                    if validate:
+                        checks[i] = pool.submit(
+                            self._bind(self._pool_task), self._validate_file,
+                            str(file_path), texts[i], content_type
+                        )
+                    else:
+                        self.cache.store(self.cache_key(texts[i]), str(file_path))
+
+            for i in pending:
+                text = texts[i]
+                file_path = output_dir / hook_file_name(i)
+
+                if self._fetch_cached(self.cache_key(text), str(file_path), job_id=job_id, hook=i + 1):
+                    logger.info(f"♻️ Hook aus Cache: {file_path}")
+                    mp3_files[i] = hook_file_name(i)
+                    continue
+
+                # Ohne adaptive Parallelität nacheinander, sonst nur fertige Downloads einsammeln
+                if self.concurrency is None:
+                    collect(wait(running).done)
+                else:
+                    collect([future for future in running if future.done()])
+                if failed or (token is not None and token.cancelled):
+                    break
+
+                if token is not None and not token.can_finish(estimator.estimate(len(text))):
+                    if not token.cancelled:
+                        logger.warning(f"⏱️ Zeitbudget reicht nicht für Hook {i+1} - überspringe Rest")
+                    break
+
+                with self._stage("queue_wait"):
+                    if self.concurrency is not None:
+                        with self.tracer.span("concurrency_wait", job_id=job_id, hook=i + 1):
+                            acquired = self.concurrency.acquire(token)
+                        if not acquired:
+                            break
+
+                    # Rate limiting (geteilt mit allen anderen Jobs)
+                    if not self.is_cached(text):
+                        with self.tracer.span("rate_limit_wait", job_id=job_id, hook=i + 1):
+                            self.rate_limiter.wait()
+
+                running.add(synthesis.submit(self._bind(self._pool_task), synthesize, i))
+
+            while running:
+                collect(wait(running, return_when=FIRST_COMPLETED).done)
+
+            if failed and not (token is not None and token.cancelled):
+                return None, f"Fehler bei Hook {min(failed)+1}"
+
+            # Prüfergebnisse einsammeln, ungültige Hooks neu generieren (cacht selbst)
+            for i, check in sorted(checks.items()):
+                file_path = output_dir / hook_file_name(i)
+                result = check.result()
+                if result.valid:
+                    self.cache.store(self.cache_key(texts[i]), str(file_path))
+                    continue
+
+                logger.warning(f"⚠️ Hook {i+1} ungültig ({result.reason}) - generiere neu")
+                if not self.generate_audio_hook(texts[i], str(file_path), token):
+                    if token is not None and token.cancelled:
+                        # Abgeschnittene Hooks nicht ausliefern
+                        mp3_files = {j: name for j, name in mp3_files.items() if j < i}
+                        break
+                    return None, f"Hook {i+1} ungültig: {result.reason}"
+
+        if self.concurrency is not None:
+            status = self.concurrency.snapshot()
+            logger.info(f"⚙️ Parallelität: Limit {status['limit']}, Spitze {status['peak_in_flight']}, "
+                        f"429: {status['throttled']}, Timeouts: {status['timeouts']}")
+
+        if token is not None and token.cancelled and not token.timed_out:
+            return None, "⏹️ Generierung abgebrochen"
+
+        if not mp3_files and not reused:
+            return None, "Keine Hooks erfolgreich generiert"
 
-        for i, text in enumerate(texts):
-            file_name = f"hook_{i+1:02d}.mp3"
-            file_path = output_dir / file_name
+        mp3_files = [mp3_files[i] for i in sorted(mp3_files)]
+        with self._stage("zip"), self.tracer.span("zip", job_id=job_id, files=len(mp3_files)):
+            zip_path, message = self.create_zip(mp3_files, output_dir, update)
+        finished = len(mp3_files) + len(reused)
+        if zip_path and finished < len(texts):
+            message = f"⏱️ Zeitbudget erschöpft - {finished} von {len(texts)} Hooks generiert"
+
+        summary = self.phrase_summary()
+        if zip_path and summary:
+            logger.info(summary)
+            message = f"{message}\n{summary}"
+        return zip_path, message
+
+    def create_zip(self, mp3_files: List[str], output_dir: str = ".",
+                   update: Optional[ArchiveUpdate] = None) -> Tuple[Optional[str], str]:
+        """
+        Packt generierte Hooks in eine ZIP-Datei und löscht die MP3-Dateien
 
-            if self.generate_audio_hook(text, str(file_path)):
-                mp3_files.append(file_name)
-            else:
-                return None, f"Fehler bei Hook {i+1}"
+        Args:
+            mp3_files: Dateinamen der Hooks im Ausgabeverzeichnis
+            output_dir: Ausgabeverzeichnis
+            update: Optional: Inkrementelle Aktualisierung (übernimmt unveränderte
+                Einträge roh aus der alten ZIP-Datei und schreibt das Manifest)
 
-            # Rate limiting (aus Config)
-            if i < len(texts) - 1:  # Nicht nach dem letzten Hook warten
-                time.sleep(config.elevenlabs.rate_limit_delay)
+        Returns:
+            Tuple[Optional[str], str]: (ZIP-Pfad, Status-Nachricht)
+        """
+        if update is not None:
+            try:
+                count = update.write(mp3_files)
+                logger.info(f"📦 ZIP-Datei aktualisiert: {update.zip_path}")
+                message = f"✅ {count} Hooks erfolgreich generiert!"
+                if update.reused:
+                    message += f" ({len(update.reused)} unverändert übernommen)"
+                return str(update.zip_path), message
+
+            except Exception as e:
+                logger.error(f"Fehler beim Erstellen der ZIP-Datei: {e}")
+                return None, f"Fehler beim Erstellen der ZIP-Datei: {e}"
 
-        if not mp3_files:
-            return None, "Keine Hooks erfolgreich generiert"
+        output_dir = Path(output_dir)
 
         # ZIP-Datei erstellen (Name aus Config)
         zip_name = config.files.default_zip_name
@@ -213,30 +946,40 @@ class HookGenerator:
             logger.error(f"Fehler beim Erstellen der ZIP-Datei: {e}")
             return None, f"Fehler beim Erstellen der ZIP-Datei: {e}"
 
-    def generate_from_file(self, file_path: str, output_dir: str = ".") -> Tuple[Optional[str], str]:
+    def generate_from_file(self, file_path: str, output_dir: str = ".",
+                           token: Optional[CancellationToken] = None) -> Tuple[Optional[str], str]:
         """
         Hauptfunktion: Generiert Hooks aus einer Text-Datei
 
         Args:
             file_path: Pfad zur Text-Datei
             output_dir: Ausgabeverzeichnis
+            token: Optional: Cancellation-Token mit Abbruch und Zeitbudget
 
         Returns:
             Tuple[Optional[str], str]: (ZIP-Pfad, Status-Nachricht)
         """
-        try:
-            # Text parsen
-            texts = self.parse_text_file(file_path)
+        def run() -> Tuple[Optional[str], str]:
+            with self._job_span(file=Path(file_path).name) as job:
+                try:
+                    # Text parsen
+                    with self._stage("parse"), self.tracer.span("parse_text_file",
+                                                                job_id=job.attributes.get('job_id')):
+                        texts = self.parse_text_file(file_path)
 
-            # Hooks generieren
-            return self.generate_hooks_batch(texts, output_dir)
+                    # Hooks generieren
+                    return self.generate_hooks_batch(texts, output_dir, token)
 
-        except Exception as e:
-            return None, f"❌ Fehler: {e}"
+                except Exception as e:
+                    return None, f"❌ Fehler: {e}"
+
+        return self._profiled(output_dir, run)
 
 # Globale Funktion für einfache Verwendung
 def generate_hooks(file_path: str, api_key: str, voice_id: str,
-                  separator: str = "---", output_dir: str = ".") -> Tuple[Optional[str], str]:
+                  separator: str = "---", output_dir: str = ".",
+                  token: Optional[CancellationToken] = None,
+                  profile: Optional[bool] = None) -> Tuple[Optional[str], str]:
     """
     Vereinfachte Funktion zum Generieren von Hooks
 
@@ -246,12 +989,15 @@ def generate_hooks(file_path: str, api_key: str, voice_id: str,
         voice_id: Voice ID
         separator: Text-Trennzeichen
         output_dir: Ausgabeverzeichnis
+        token: Optional: Cancellation-Token mit Abbruch und Zeitbudget
+        profile: Optional: Lauf profilieren, Berichte landen in output_dir
+            (aus config.profiling.enabled wenn nicht angegeben)
 
     Returns:
         Tuple[Optional[str], str]: (ZIP-Pfad, Status-Nachricht)
     """
-    generator = HookGenerator(api_key, voice_id, separator)
-    return generator.generate_from_file(file_path, output_dir)
+    generator = HookGenerator(api_key, voice_id, separator, profile=profile)
+    return generator.generate_from_file(file_path, output_dir, token)
 
 # Automatische Info beim Import
 if __name__ != "__main__":
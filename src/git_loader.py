@@ -8,24 +8,321 @@ Stelle sicher, dass du dem Repository-Inhalt vertraust!
 """
 
 import requests
+import io
 import os
+import re
+import sys
+import json
+import time
+import marshal
+import subprocess
+import uuid
+import types
 import hashlib
-from typing import Optional, Dict
+import importlib.abc
+import importlib.util
+import tarfile
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+from types import CodeType
+from typing import Optional, Dict, List
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
 from src.logger import get_logger
+from src.config import get_config
 
 logger = get_logger("git_loader")
+config = get_config()
+
+
+class ModuleCache:
+    """
+    Lokaler Cache für geladene Module, Schlüssel: (Repository, Version, Modul)
+
+    Neben jedem Quelltext liegt eine .json-Datei mit ETag und SHA256. Der
+    GitLoader legt nur Code ab, der die Hash-Verifikation bestanden hat.
+    Kompilierter Bytecode liegt unter bytecode/, Schlüssel: Modul,
+    Quelltext-Hash und Python-Version.
+    """
+
+    def __init__(self, root_dir: str):
+        """
+        Initialisiert den Cache
+
+        Args:
+            root_dir: Cache-Verzeichnis
+        """
+        self.root_dir = Path(root_dir)
+
+    def path(self, repo_url: str, version: str, module_name: str) -> Path:
+        """Ablageort des Quelltexts (Metadaten daneben als .json)"""
+        return self.root_dir / quote(repo_url, safe='') / quote(version, safe='') / f"{module_name}.py"
+
+    def load(self, repo_url: str, version: str, module_name: str) -> Optional[dict]:
+        """
+        Liest einen Eintrag
+
+        Returns:
+            Optional[dict]: {'code', 'etag', 'sha256'} oder None
+        """
+        source = self.path(repo_url, version, module_name)
+        try:
+            meta = json.loads(source.with_suffix('.json').read_text(encoding='utf-8'))
+            meta['code'] = source.read_text(encoding='utf-8')
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def store(self, repo_url: str, version: str, module_name: str, code: str,
+              etag: Optional[str], sha256: str) -> None:
+        """
+        Legt einen verifizierten Quelltext ab
+
+        Args:
+            repo_url: Repository
+            version: Branch, Tag oder Commit-Hash
+            module_name: Name des Moduls
+            code: Quelltext
+            etag: ETag der Antwort (für bedingte Requests)
+            sha256: SHA256 des Quelltexts
+        """
+        source = self.path(repo_url, version, module_name)
+        meta = {'etag': etag, 'sha256': sha256, 'stored_at': time.time()}
+        try:
+            source.parent.mkdir(parents=True, exist_ok=True)
+            # Atomar ablegen, Metadaten zuletzt (parallele Leser sehen nie halbe Einträge)
+            self._write(source, code.encode('utf-8'))
+            self._write(source.with_suffix('.json'), json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Modul {module_name}@{version} konnte nicht gecacht werden: {e}")
+
+    def bytecode_path(self, module_name: str, sha256: str) -> Path:
+        """Ablageort des Bytecodes (unabhängig von der Version, da an den Quelltext gebunden)"""
+        return self.root_dir / "bytecode" / f"{module_name}.{sha256}.{sys.implementation.cache_tag}.pyc"
+
+    def load_bytecode(self, module_name: str, sha256: str) -> Optional[CodeType]:
+        """
+        Liest kompilierten Bytecode
+
+        Args:
+            module_name: Name des Moduls
+            sha256: SHA256 des Quelltexts
+
+        Returns:
+            Optional[CodeType]: Code-Objekt oder None (fehlt, andere Python-Version, beschädigt)
+        """
+        try:
+            data = self.bytecode_path(module_name, sha256).read_bytes()
+        except OSError:
+            return None
+
+        if data[:len(MAGIC_NUMBER)] != MAGIC_NUMBER:
+            return None
+        try:
+            return marshal.loads(data[len(MAGIC_NUMBER):])
+        except (EOFError, ValueError, TypeError):
+            logger.warning(f"Bytecode für {module_name} beschädigt - kompiliere neu")
+            return None
+
+    def store_bytecode(self, module_name: str, sha256: str, code: CodeType) -> None:
+        """
+        Legt kompilierten Bytecode ab
+
+        Args:
+            module_name: Name des Moduls
+            sha256: SHA256 des Quelltexts
+            code: Code-Objekt aus compile()
+        """
+        target = self.bytecode_path(module_name, sha256)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self._write(target, MAGIC_NUMBER + marshal.dumps(code))
+        except OSError as e:
+            logger.warning(f"Bytecode für {module_name} konnte nicht gecacht werden: {e}")
+
+    def pins_path(self, repo_url: str) -> Path:
+        """Ablageort der zuletzt aufgelösten Commits eines Repositories"""
+        return self.root_dir / quote(repo_url, safe='') / "pins.json"
+
+    def load_pin(self, repo_url: str, ref: str) -> Optional[str]:
+        """Zuletzt aufgelöster Commit-Hash eines Branches oder Tags (None wenn unbekannt)"""
+        try:
+            return json.loads(self.pins_path(repo_url).read_text(encoding='utf-8')).get(ref)
+        except (OSError, ValueError):
+            return None
+
+    def store_pin(self, repo_url: str, ref: str, sha: str) -> None:
+        """Merkt sich den Commit-Hash eines Branches oder Tags (Fallback ohne Netzwerk)"""
+        path = self.pins_path(repo_url)
+        try:
+            pins = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            pins = {}
+        pins[ref] = sha
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._write(path, json.dumps(pins, indent=2).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Pin für {ref} konnte nicht gespeichert werden: {e}")
+
+    @staticmethod
+    def _write(target: Path, data: bytes) -> None:
+        temp = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            temp.write_bytes(data)
+            os.replace(temp, target)
+        finally:
+            temp.unlink(missing_ok=True)
+
+
+class RefResolutionError(Exception):
+    """Branch oder Tag konnte nicht in einen Commit-Hash aufgelöst werden"""
+
+
+class RefResolver(ABC):
+    """Basisklasse: löst Branches und Tags in Commit-Hashes auf"""
+
+    def resolve(self, ref: str) -> str:
+        """
+        Löst einen Branch oder Tag auf
+
+        Args:
+            ref: Branch- oder Tag-Name
+
+        Returns:
+            str: Vollständiger Commit-Hash
+
+        Raises:
+            RefResolutionError: Wenn die Referenz unbekannt oder das Repository nicht erreichbar ist
+        """
+        refs = self.list_refs()
+        if ref not in refs:
+            raise RefResolutionError(f"Unbekannte Version '{ref}'")
+        return refs[ref]
+
+    @abstractmethod
+    def list_refs(self) -> Dict[str, str]:
+        """
+        Alle Branches und Tags
+
+        Returns:
+            Dict[str, str]: Name -> Commit-Hash
+
+        Raises:
+            RefResolutionError: Wenn das Repository nicht erreichbar ist
+        """
+
+
+class GitHubApiResolver(RefResolver):
+    """Löst Versionen über die GitHub REST API auf"""
+
+    def __init__(self, repo_url: str, session: Optional[requests.Session] = None,
+                 api_base: str = 'https://api.github.com', timeout: float = 10, token: Optional[str] = None):
+        """
+        Args:
+            repo_url: GitHub Repository (z.B. 'user/repo-name')
+            session: Optional: HTTP-Session (z.B. die des GitLoaders)
+            api_base: Basis-URL der API
+            timeout: Timeout pro Request in Sekunden
+            token: Optional: Access-Token (höheres Rate-Limit, private Repositories)
+        """
+        self.repo_url = repo_url
+        self.session = session or requests.Session()
+        self.api_base = api_base.rstrip('/')
+        self.timeout = timeout
+        self.headers = {'Authorization': f'Bearer {token}'} if token else {}
+
+    def _get(self, path: str, accept: str = 'application/vnd.github+json') -> requests.Response:
+        try:
+            response = self.session.get(f'{self.api_base}/repos/{self.repo_url}/{path}',
+                                        headers=dict(self.headers, Accept=accept), timeout=self.timeout)
+            response.raise_for_status()
+            return response
+        except requests.exceptions.RequestException as e:
+            raise RefResolutionError(f"GitHub API nicht erreichbar: {e}") from e
+
+    def resolve(self, ref: str) -> str:
+        sha = self._get(f"commits/{quote(ref, safe='')}", accept='application/vnd.github.sha').text.strip()
+        if not GitLoader.COMMIT_SHA_PATTERN.match(sha):
+            raise RefResolutionError(f"Unerwartete Antwort für '{ref}': {sha[:80]}")
+        return sha
+
+    def list_refs(self) -> Dict[str, str]:
+        refs = {}
+        for kind in ('tags', 'branches'):
+            for entry in self._get(f'{kind}?per_page=100').json():
+                refs[entry['name']] = entry['commit']['sha']
+        return refs
+
+
+class LsRemoteResolver(RefResolver):
+    """Löst Versionen mit 'git ls-remote' auf (Remote-URL oder lokales Bare-Repository)"""
+
+    def __init__(self, remote: str, timeout: float = 10):
+        """
+        Args:
+            remote: Git-Remote (URL oder Pfad)
+            timeout: Timeout für git in Sekunden
+        """
+        self.remote = remote
+        self.timeout = timeout
+
+    def list_refs(self) -> Dict[str, str]:
+        try:
+            output = subprocess.run(['git', 'ls-remote', '--heads', '--tags', self.remote],
+                                    capture_output=True, text=True, timeout=self.timeout, check=True).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            raise RefResolutionError(f"git ls-remote fehlgeschlagen: {e}") from e
+
+        refs, peeled = {}, {}
+        for line in output.splitlines():
+            sha, _, name = line.partition('\t')
+            for prefix in ('refs/heads/', 'refs/tags/'):
+                if name.startswith(prefix):
+                    name = name[len(prefix):]
+                    # Annotierte Tags: '^{}' zeigt auf den Commit statt auf das Tag-Objekt
+                    if name.endswith('^{}'):
+                        peeled[name[:-3]] = sha
+                    else:
+                        refs[name] = sha
+        refs.update(peeled)
+        return refs
+
 
 class GitLoader:
     """Lädt und verwaltet Code-Module aus einem Git-Repository"""
 
-    # Whitelist von erlaubten Modulen (Sicherheit)
-    ALLOWED_MODULES = {'setup', 'generator', 'demo', 'interface', 'logger', 'git_loader'}
+    # Whitelist von erlaubten Modulen (Sicherheit): alle Module unter src/,
+    # da generator und interface die übrigen Module selbst importieren
+    ALLOWED_MODULES = {
+        'setup', 'generator', 'demo', 'interface', 'logger', 'git_loader', 'config',
+        'validator', 'rate_limiter', 'circuit_breaker', 'cancellation', 'concurrency',
+        'hedging', 'audio_cache', 'manifest', 'backends', 'phrases', 'profiling',
+        'tracing', 'scheduler', 'sweep', 'workspace'
+    }
 
     # Optionale SHA256-Hashes für Code-Validierung
     # Format: {module_name: {version: hash}}
     MODULE_HASHES: Dict[str, Dict[str, str]] = {}
 
-    def __init__(self, repo_url: str, default_branch: str = 'main', verify_hashes: bool = False):
+    # Importe anderer Projekt-Module im geladenen Code (bestimmen die Ausführungsreihenfolge)
+    IMPORT_PATTERN = re.compile(r'^\s*(?:from|import)\s+src\.(\w+)', re.MULTILINE)
+
+    # Vollständige Commit-Hashes sind unveränderlich und werden nie revalidiert
+    COMMIT_SHA_PATTERN = re.compile(r'^[0-9a-f]{40}$')
+
+    # Quelltexte im Repository-Archiv ({repo}-{version}/src/{modul}.py)
+    ARCHIVE_SOURCE_PATTERN = re.compile(r'^[^/]+/src/(\w+)\.py$')
+
+    def __init__(self, repo_url: str, default_branch: str = 'main', verify_hashes: bool = False,
+                 timeout: float = 10, max_workers: Optional[int] = None, base_url: Optional[str] = None,
+                 cache: Optional[ModuleCache] = None, use_archive: Optional[bool] = None,
+                 archive_url: Optional[str] = None, archive_format: str = 'tar.gz',
+                 resolver: Optional[RefResolver] = None):
         """
         Initialisiert den Git-Loader
 
@@ -33,11 +330,46 @@ class GitLoader:
             repo_url: GitHub Repository URL (z.B. 'user/repo-name')
             default_branch: Standard-Branch für Versionen
             verify_hashes: Ob Code-Hashes verifiziert werden sollen
+            timeout: Timeout pro Request in Sekunden
+            max_workers: Maximale Anzahl paralleler Downloads (default: Größe der Whitelist)
+            base_url: Optional: Basis-URL für Roh-Dateien (default: raw.githubusercontent.com)
+            cache: Optional: Modul-Cache (aus Config wenn nicht angegeben)
+            use_archive: Mehrere Module per Repository-Archiv laden (aus Config wenn nicht angegeben)
+            archive_url: Optional: Basis-URL für Archive (default: codeload.github.com)
+            archive_format: Archiv-Format ('tar.gz' oder 'zip')
+            resolver: Optional: Auflösung von Branches/Tags zu Commits
+                (default: GitHub API, ohne eigene base_url; abschaltbar über config.git_loader.pin_refs)
         """
         self.repo_url = repo_url
         self.default_branch = default_branch
-        self.base_url = f'https://raw.githubusercontent.com/{repo_url}'
+        self.base_url = base_url or f'https://raw.githubusercontent.com/{repo_url}'
         self.verify_hashes = verify_hashes
+        self.timeout = timeout
+        self.max_workers = max_workers or len(self.ALLOWED_MODULES)
+
+        # Gemeinsame Session: Verbindungen werden zwischen Modulen wiederverwendet
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.cache = cache or (ModuleCache(config.git_loader.cache_dir)
+                               if config.git_loader.cache_enabled else None)
+        self.use_archive = config.git_loader.use_archive if use_archive is None else use_archive
+        self.archive_url = archive_url or f'https://codeload.github.com/{repo_url}'
+        self.archive_format = archive_format
+        self._archive_sources: Dict[str, Dict[str, str]] = {}
+
+        # Branches und Tags werden einmal pro Session auf einen Commit festgelegt
+        if resolver is None and config.git_loader.pin_refs and base_url is None:
+            resolver = GitHubApiResolver(repo_url, self.session, timeout=timeout)
+        self.resolver = resolver
+        self.pins: Dict[str, str] = {}
+        self._pin_lock = threading.Lock()
+
+        self.metrics = {'downloaded': 0, 'revalidated': 0, 'cache_hits': 0, 'offline_fallbacks': 0,
+                        'compiled': 0, 'bytecode_hits': 0, 'archives': 0}
+        self._metrics_lock = threading.Lock()
 
         logger.info(f"GitLoader initialisiert für Repository: {repo_url}")
 
@@ -87,11 +419,14 @@ class GitLoader:
             logger.warning(f"Keine Hashes für Modul '{module_name}' gespeichert")
             return True
 
-        if version not in self.MODULE_HASHES[module_name]:
+        # Gepinnte Commits: Hashes dürfen unter dem Branch- oder Tag-Namen hinterlegt sein
+        labels = [version] + [ref for ref, sha in self.pins.items() if sha == version]
+        label = next((label for label in labels if label in self.MODULE_HASHES[module_name]), None)
+        if label is None:
             logger.warning(f"Kein Hash für Version '{version}' von Modul '{module_name}'")
             return True
 
-        expected_hash = self.MODULE_HASHES[module_name][version]
+        expected_hash = self.MODULE_HASHES[module_name][label]
         actual_hash = self.calculate_hash(code)
 
         if expected_hash != actual_hash:
@@ -103,6 +438,240 @@ class GitLoader:
         logger.info(f"Hash für {module_name}@{version} verifiziert ✓")
         return True
 
+    def is_commit_sha(self, version: str) -> bool:
+        """Ob die Version ein vollständiger (unveränderlicher) Commit-Hash ist"""
+        return bool(self.COMMIT_SHA_PATTERN.match(version))
+
+    def resolve_version(self, version: Optional[str] = None) -> str:
+        """
+        Legt einen Branch oder Tag für diese Session auf einen Commit fest
+
+        Der erste Aufruf fragt den Resolver, alle weiteren verwenden den Pin -
+        Module einer Session stammen so immer aus demselben Commit und sind
+        dauerhaft cachebar. Ist der Resolver nicht erreichbar, gilt der
+        zuletzt gespeicherte Pin, sonst wird ungepinnt geladen.
+
+        Args:
+            version: Branch, Tag oder Commit-Hash (default: main)
+
+        Returns:
+            str: Commit-Hash (oder die Version selbst ohne Resolver)
+        """
+        version = version or self.default_branch
+        if self.resolver is None or self.is_commit_sha(version):
+            return version
+
+        with self._pin_lock:
+            if version in self.pins:
+                return self.pins[version]
+
+            try:
+                sha = self.resolver.resolve(version)
+            except RefResolutionError as e:
+                sha = self.cache.load_pin(self.repo_url, version) if self.cache is not None else None
+                if sha is None:
+                    logger.warning(f"⚠️  Version '{version}' nicht auflösbar, lade ungepinnt: {e}")
+                    return version
+                logger.warning(f"⚠️  Version '{version}' nicht auflösbar, verwende letzten Pin {sha[:12]}: {e}")
+            else:
+                if self.cache is not None:
+                    self.cache.store_pin(self.repo_url, version, sha)
+
+            self.pins[version] = sha
+            logger.info(f"📌 {version} -> {sha[:12]}")
+            return sha
+
+    def _count(self, metric: str) -> None:
+        with self._metrics_lock:
+            self.metrics[metric] += 1
+
+    def _cached_source(self, module_name: str, version: str) -> Optional[dict]:
+        """Gecachter Eintrag, sofern der Quelltext noch zum gespeicherten SHA256 passt"""
+        if self.cache is None:
+            return None
+        entry = self.cache.load(self.repo_url, version, module_name)
+        if entry is not None and entry.get('sha256') != self.calculate_hash(entry['code']):
+            logger.warning(f"Cache-Eintrag für {module_name}@{version} beschädigt - lade neu")
+            return None
+        return entry
+
+    def fetch_code(self, module_name: str, version: str) -> str:
+        """
+        Lädt den Quelltext eines Moduls über die gemeinsame Session
+
+        Module aus einem in dieser Session geladenen Archiv kosten keinen
+        Request. Mit Cache werden Commit-Hashes nie erneut geladen; Branches
+        und Tags werden per If-None-Match revalidiert (304 = gecachte Version).
+        Ist das Netzwerk nicht erreichbar, wird die zuletzt verifizierte Kopie
+        verwendet.
+
+        Args:
+            module_name: Name des Moduls (ohne .py)
+            version: Branch, Tag oder Commit-Hash
+
+        Returns:
+            str: Quelltext
+
+        Raises:
+            requests.exceptions.RequestException: Bei Netzwerk- oder HTTP-Fehlern
+        """
+        archived = self._archive_sources.get(version, {}).get(module_name)
+        if archived is not None:
+            return archived
+
+        cached = self._cached_source(module_name, version)
+        if cached is not None and self.is_commit_sha(version):
+            self._count('cache_hits')
+            logger.info(f"Modul '{module_name}'@{version[:12]} aus dem Cache")
+            return cached['code']
+
+        url = f'{self.base_url}/{version}/src/{module_name}.py'
+        headers = {'If-None-Match': cached['etag']} if cached is not None and cached.get('etag') else {}
+        logger.info(f"Lade Modul '{module_name}' von {url}")
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if cached is None:
+                raise
+            self._count('offline_fallbacks')
+            logger.warning(f"⚠️  Netzwerk nicht erreichbar, verwende gecachte Kopie von {module_name}@{version}: {e}")
+            return cached['code']
+
+        if response.status_code == 304 and cached is not None:
+            self._count('revalidated')
+            logger.info(f"Modul '{module_name}'@{version} unverändert (304)")
+            return cached['code']
+
+        response.raise_for_status()
+        code = response.text
+        self._count('downloaded')
+
+        if self.cache is not None and self.verify_code_hash(module_name, version, code):
+            self.cache.store(self.repo_url, version, module_name, code,
+                             response.headers.get('ETag'), self.calculate_hash(code))
+        return code
+
+    def fetch_archive(self, version: Optional[str] = None) -> Dict[str, str]:
+        """
+        Lädt alle Module einer Version mit einem einzigen Request (Repository-Archiv)
+
+        Aus dem Archiv werden nur src/*.py im Speicher gelesen. Verifizierte
+        Quelltexte landen im Modul-Cache und werden danach von fetch_code
+        ohne weiteren Request verwendet.
+
+        Args:
+            version: Branch, Tag oder Commit-Hash (default: main)
+
+        Returns:
+            Dict[str, str]: Modulname -> Quelltext (leer bei Fehlern - dann wird einzeln geladen)
+        """
+        version = self.resolve_version(version)
+
+        url = f'{self.archive_url}/{self.archive_format}/{version}'
+        logger.info(f"Lade Archiv von {url}")
+
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            files = self._extract_sources(response.content)
+        except (requests.exceptions.RequestException, tarfile.TarError, zipfile.BadZipFile, ValueError) as e:
+            logger.warning(f"Archiv für {version} nicht verfügbar, lade Module einzeln: {e}")
+            return {}
+        self._count('archives')
+
+        sources = {}
+        for module_name, code in files.items():
+            if not self.verify_code_hash(module_name, version, code):
+                logger.error(f"Hash-Verifikation für {module_name} im Archiv fehlgeschlagen - übersprungen")
+                continue
+            sources[module_name] = code
+            if self.cache is not None:
+                self.cache.store(self.repo_url, version, module_name, code, None, self.calculate_hash(code))
+
+        self._archive_sources[version] = sources
+        logger.info(f"📦 Archiv {version}: {len(sources)} Module ({len(response.content) / 1024:.0f} KiB)")
+        return sources
+
+    def _extract_sources(self, data: bytes) -> Dict[str, str]:
+        """Liest src/*.py aus einem tar.gz- oder zip-Archiv im Speicher"""
+        sources = {}
+        if zipfile.is_zipfile(io.BytesIO(data)):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for name in archive.namelist():
+                    match = self.ARCHIVE_SOURCE_PATTERN.match(name)
+                    if match:
+                        sources[match.group(1)] = archive.read(name).decode('utf-8')
+        else:
+            with tarfile.open(fileobj=io.BytesIO(data), mode='r:*') as archive:
+                for member in archive:
+                    match = self.ARCHIVE_SOURCE_PATTERN.match(member.name)
+                    if match and member.isfile():
+                        sources[match.group(1)] = archive.extractfile(member).read().decode('utf-8')
+        return sources
+
+    def compile_code(self, module_name: str, code: str) -> CodeType:
+        """
+        Kompiliert Quelltext - mit Cache nur einmal pro Quelltext-Hash und Python-Version
+
+        Args:
+            module_name: Name des Moduls
+            code: Quelltext
+
+        Returns:
+            CodeType: Code-Objekt für exec()
+
+        Raises:
+            SyntaxError: Bei ungültigem Quelltext
+        """
+        sha256 = self.calculate_hash(code)
+        if self.cache is not None:
+            compiled = self.cache.load_bytecode(module_name, sha256)
+            if compiled is not None:
+                self._count('bytecode_hits')
+                return compiled
+
+        compiled = compile(code, f"src/{module_name}.py", 'exec', dont_inherit=True)
+        self._count('compiled')
+
+        if self.cache is not None:
+            self.cache.store_bytecode(module_name, sha256, compiled)
+        return compiled
+
+    def execute_code(self, module_name: str, version: str, code: str, namespace: dict) -> bool:
+        """
+        Verifiziert und führt geladenen Code aus
+
+        Args:
+            module_name: Name des Moduls
+            version: Version des Moduls
+            code: Quelltext
+            namespace: Namespace zum Ausführen des Codes
+
+        Returns:
+            bool: True bei Erfolg, False bei Fehler
+        """
+        # Hash-Verifikation (optional)
+        if not self.verify_code_hash(module_name, version, code):
+            logger.error("Hash-Verifikation fehlgeschlagen! Abbruch.")
+            return False
+
+        try:
+            # SICHERHEITSWARNUNG vor exec()
+            logger.warning(f"⚠️  Führe Remote-Code aus: {module_name}@{version}")
+            logger.warning("⚠️  Stelle sicher, dass du diesem Repository vertraust!")
+
+            # Führe den Code im angegebenen Namespace aus
+            # HINWEIS: exec() ist inhärent unsicher!
+            exec(self.compile_code(module_name, code), namespace)
+
+            logger.info(f"Modul '{module_name}' aus {version} erfolgreich geladen")
+            return True
+
+        except Exception as e:
+            logger.error(f"Fehler beim Ausführen von {module_name}: {e}")
+            return False
+
     def load_module(self, module_name: str, version: Optional[str] = None,
                    namespace: Optional[dict] = None, force: bool = False) -> bool:
         """
@@ -126,70 +695,250 @@ class GitLoader:
             logger.error(f"Modul '{module_name}' ist nicht erlaubt")
             return False
 
-        if version is None:
-            version = self.default_branch
+        version = self.resolve_version(version)
 
         if namespace is None:
             namespace = globals()
 
-        url = f'{self.base_url}/{version}/src/{module_name}.py'
-
         try:
-            logger.info(f"Lade Modul '{module_name}' von {url}")
-
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-
-            code = response.text
-
-            # Hash-Verifikation (optional)
-            if not self.verify_code_hash(module_name, version, code):
-                logger.error("Hash-Verifikation fehlgeschlagen! Abbruch.")
-                return False
+            code = self.fetch_code(module_name, version)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Netzwerk-Fehler beim Laden von {module_name}: {e}")
+            return False
 
-            # SICHERHEITSWARNUNG vor exec()
-            logger.warning(f"⚠️  Führe Remote-Code aus: {module_name}@{version}")
-            logger.warning("⚠️  Stelle sicher, dass du diesem Repository vertraust!")
+        return self.execute_code(module_name, version, code, namespace)
 
-            # Führe den Code im angegebenen Namespace aus
-            # HINWEIS: exec() ist inhärent unsicher!
-            exec(code, namespace)
+    def dependency_order(self, sources: Dict[str, str]) -> List[str]:
+        """
+        Sortiert Module so, dass importierte Projekt-Module zuerst ausgeführt werden
 
-            logger.info(f"Modul '{module_name}' aus {version} erfolgreich geladen")
-            return True
+        Args:
+            sources: Modulname -> Quelltext
 
+        Returns:
+            List[str]: Ausführungsreihenfolge (bei Zyklen gilt die ursprüngliche Reihenfolge)
+        """
+        order: List[str] = []
+        visiting = set()
+
+        def visit(module: str):
+            if module in order or module in visiting:
+                return
+            visiting.add(module)
+            for dependency in self.IMPORT_PATTERN.findall(sources[module]):
+                if dependency in sources and dependency != module:
+                    visit(dependency)
+            visiting.discard(module)
+            order.append(module)
+
+        for module in sources:
+            visit(module)
+        return order
+
+    def _timed_fetch(self, module_name: str, version: str) -> tuple:
+        """Lädt ein Modul im Thread-Pool: (Quelltext oder None, Dauer, Fehlermeldung)"""
+        started = time.perf_counter()
+        try:
+            return self.fetch_code(module_name, version), time.perf_counter() - started, None
         except requests.exceptions.RequestException as e:
             logger.error(f"Netzwerk-Fehler beim Laden von {module_name}: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Fehler beim Ausführen von {module_name}: {e}")
-            return False
+            return None, time.perf_counter() - started, str(e)
 
-    def load_multiple_modules(self, modules: list, version: Optional[str] = None) -> dict:
+    def load_multiple_modules(self, modules: list, version: Optional[str] = None,
+                              namespace: Optional[dict] = None) -> dict:
         """
         Lädt mehrere Module gleichzeitig
 
+        Alle Quelltexte werden parallel über die gemeinsame Session geladen
+        (insgesamt etwa ein Round-Trip) und danach in Abhängigkeitsreihenfolge
+        ausgeführt. Module, deren Abhängigkeiten fehlschlagen, werden nicht
+        ausgeführt. Mit use_archive kommt alles aus einem einzigen
+        Archiv-Request, sofern nicht bereits alle Module eines Commits im
+        Cache liegen.
+
         Args:
             modules: Liste der Modulnamen
             version: Version für alle Module
+            namespace: Namespace zum Ausführen des Codes (default: globals())
 
         Returns:
-            dict: Status für jedes Modul
+            dict: Status für jedes Modul:
+                {'success': bool, 'fetch_seconds': float, 'exec_seconds': float, 'error': str oder None}
         """
-        results = {}
-        for module in modules:
-            results[module] = self.load_module(module, version)
+        version = self.resolve_version(version)
+
+        if namespace is None:
+            namespace = globals()
+
+        results = {module: {'success': False, 'fetch_seconds': 0.0, 'exec_seconds': 0.0, 'error': None}
+                   for module in modules}
+        allowed = []
+        for module in results:
+            if self.validate_module_name(module):
+                allowed.append(module)
+            else:
+                results[module]['error'] = "nicht in Whitelist"
+
+        started = time.perf_counter()
+        if allowed and self.use_archive and version not in self._archive_sources:
+            cached = self.is_commit_sha(version) and all(
+                self._cached_source(module, version) is not None for module in allowed)
+            if not cached:
+                self.fetch_archive(version)
+
+        sources = {}
+        if allowed:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(allowed)),
+                                    thread_name_prefix="git-fetch") as pool:
+                futures = {module: pool.submit(self._timed_fetch, module, version) for module in allowed}
+            for module, future in futures.items():
+                code, seconds, error = future.result()
+                results[module]['fetch_seconds'] = seconds
+                results[module]['error'] = error
+                if code is not None:
+                    sources[module] = code
+        fetch_time = time.perf_counter() - started
+
+        for module in self.dependency_order(sources):
+            failed = [dependency for dependency in self.IMPORT_PATTERN.findall(sources[module])
+                      if dependency in results and dependency != module and not results[dependency]['success']]
+            if failed:
+                results[module]['error'] = f"Abhängigkeit fehlgeschlagen: {', '.join(failed)}"
+                logger.error(f"Modul '{module}' übersprungen - {results[module]['error']}")
+                continue
+
+            exec_started = time.perf_counter()
+            results[module]['success'] = self.execute_code(module, version, sources[module], namespace)
+            results[module]['exec_seconds'] = time.perf_counter() - exec_started
+            if not results[module]['success']:
+                results[module]['error'] = "Ausführung fehlgeschlagen"
+
+        loaded = sum(1 for status in results.values() if status['success'])
+        logger.info(f"📦 {loaded}/{len(modules)} Module geladen "
+                    f"(Download {fetch_time:.2f}s, gesamt {time.perf_counter() - started:.2f}s)")
         return results
 
     def get_available_versions(self) -> list:
         """
-        Holt verfügbare Branches/Tags (vereinfacht - nur main/master zurückgegeben)
+        Holt verfügbare Branches/Tags über den Resolver
+
+        Returns:
+            list: Liste verfügbarer Versionen (Standard-Branch zuerst; ohne Resolver nur
+                Standard-Branch und bereits gepinnte Versionen)
+        """
+        versions = set(self.pins)
+        if self.resolver is not None:
+            try:
+                versions.update(self.resolver.list_refs())
+            except RefResolutionError as e:
+                logger.warning(f"Versionen nicht abrufbar: {e}")
+        versions.discard(self.default_branch)
+        return [self.default_branch] + sorted(versions)
+
+    def install_finder(self, version: Optional[str] = None, package: str = 'src') -> "GitModuleFinder":
+        """
+        Bedient Imports von '{package}.*' aus dem Repository (lazy, über sys.meta_path)
+
+        Args:
+            version: Branch, Tag oder Commit-Hash (default: main)
+            package: Paketname der Module im Repository
 
         Returns:
-            list: Liste verfügbarer Versionen
+            GitModuleFinder: Installierter Finder (uninstall() entfernt ihn wieder)
+        """
+        finder = GitModuleFinder(self, self.resolve_version(version), package)
+        finder.install()
+        return finder
+
+
+class GitSourceLoader(importlib.abc.InspectLoader):
+    """Führt ein Modul aus dem Repository in seinem eigenen Modul-Objekt aus"""
+
+    def __init__(self, git_loader: GitLoader, module_name: str, version: str):
+        """
+        Args:
+            git_loader: Loader für Download, Cache und Verifikation
+            module_name: Name des Moduls (ohne Paket)
+            version: Branch, Tag oder Commit-Hash
         """
-        # Vereinfachte Implementierung - in der Praxis würde man die GitHub API verwenden
-        return [self.default_branch, 'develop', 'v1.0.0']
+        self.git_loader = git_loader
+        self.module_name = module_name
+        self.version = version
+
+    def get_source(self, fullname: str) -> str:
+        """Quelltext (aus Archiv, Cache oder Netzwerk)"""
+        try:
+            return self.git_loader.fetch_code(self.module_name, self.version)
+        except requests.exceptions.RequestException as e:
+            raise ImportError(f"Modul '{fullname}' nicht ladbar: {e}", name=fullname) from e
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        """Lädt, verifiziert und führt das Modul aus (bei LazyLoader erst beim ersten Attributzugriff)"""
+        try:
+            code = self.get_source(module.__name__)
+            if not self.git_loader.verify_code_hash(self.module_name, self.version, code):
+                raise ImportError(f"Hash-Verifikation für '{module.__name__}' fehlgeschlagen",
+                                  name=module.__name__)
+
+            logger.warning(f"⚠️  Führe Remote-Code aus: {self.module_name}@{self.version}")
+            exec(self.git_loader.compile_code(self.module_name, code), module.__dict__)
+        except BaseException:
+            # Halb geladenes Modul entfernen, damit ein erneuter Import es wieder versucht
+            sys.modules.pop(module.__name__, None)
+            raise
+        logger.info(f"Modul '{module.__name__}' aus {self.version} geladen")
+
+
+class GitModuleFinder(importlib.abc.MetaPathFinder):
+    """
+    Finder für sys.meta_path: '{package}.{modul}' kommt aus dem Repository
+
+    Bedient werden nur Module der Whitelist; alle anderen Imports laufen
+    über die regulären Finder. Module werden per importlib.util.LazyLoader
+    erst beim ersten Attributzugriff geladen und ausgeführt, jedes in
+    einem eigenen Modul-Objekt in sys.modules. Imports im geladenen Code
+    (z.B. 'from src.logger import get_logger') laufen wieder über den Finder.
+    """
+
+    def __init__(self, git_loader: GitLoader, version: str, package: str = 'src'):
+        """
+        Args:
+            git_loader: Loader für Download, Cache und Verifikation
+            version: Branch, Tag oder Commit-Hash für alle Module
+            package: Paketname der Module im Repository
+        """
+        self.git_loader = git_loader
+        self.version = version
+        self.package = package
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        package, _, module_name = fullname.rpartition('.')
+        if package != self.package or module_name not in self.git_loader.ALLOWED_MODULES:
+            return None
+
+        loader = importlib.util.LazyLoader(GitSourceLoader(self.git_loader, module_name, self.version))
+        return importlib.util.spec_from_loader(
+            fullname, loader, origin=f'{self.git_loader.base_url}/{self.version}/src/{module_name}.py')
+
+    def install(self) -> None:
+        """Setzt den Finder an den Anfang von sys.meta_path (legt das Paket bei Bedarf an)"""
+        if self.package not in sys.modules:
+            try:
+                importlib.import_module(self.package)
+            except ModuleNotFoundError:
+                # Kein lokales Paket (z.B. in Colab): leeres Paket als Container
+                package = types.ModuleType(self.package)
+                package.__path__ = []
+                sys.modules[self.package] = package
+
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        logger.info(f"🔗 Imports von '{self.package}.*' aus {self.git_loader.repo_url}@{self.version}")
+
+    def uninstall(self) -> None:
+        """Entfernt den Finder aus sys.meta_path (bereits importierte Module bleiben)"""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
 
 # Globale Instanz für einfache Verwendung
 git_loader = None
@@ -214,6 +963,19 @@ def load_from_git(module: str, version: Optional[str] = None):
 
     return git_loader.load_module(module, version)
 
+def enable_git_imports(version: Optional[str] = None):
+    """
+    Aktiviert Imports von 'src.*' aus dem Git-Repository (Module werden erst bei Nutzung geladen)
+
+    Args:
+        version: Version (optional)
+    """
+    if git_loader is None:
+        print("❌ Git-Loader nicht initialisiert. Verwende init_git_loader() zuerst.")
+        return None
+
+    return git_loader.install_finder(version)
+
 # Beispiel für die Verwendung:
 if __name__ == "__main__":
     # Initialisierung
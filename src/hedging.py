@@ -0,0 +1,245 @@
+"""
+Hedging-Modul für Colab-Sound Projekt
+Startet bei ungewöhnlich langsamen Antworten einen zweiten, identischen Request
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("hedging")
+config = get_config()
+
+
+class HedgePolicy:
+    """Entscheidet anhand der bisherigen Latenz und eines Budgets, wann gehedgt wird"""
+
+    def __init__(self, percentile: float = None, max_hedge_ratio: float = None,
+                 min_samples: int = None, window_size: int = None):
+        """
+        Initialisiert die Hedging-Strategie
+
+        Args:
+            percentile: Latenz-Perzentil als Schwelle (aus Config wenn nicht angegeben)
+            max_hedge_ratio: Maximaler Anteil gehedgter Requests (aus Config wenn nicht angegeben)
+            min_samples: Mindestanzahl Messwerte (aus Config wenn nicht angegeben)
+            window_size: Größe des Messfensters (aus Config wenn nicht angegeben)
+        """
+        self.percentile = percentile if percentile is not None else config.hedging.percentile
+        self.max_hedge_ratio = max_hedge_ratio if max_hedge_ratio is not None else config.hedging.max_hedge_ratio
+        self.min_samples = min_samples if min_samples is not None else config.hedging.min_samples
+        self._latencies = deque(maxlen=window_size or config.hedging.window_size)
+        self._lock = threading.Lock()
+
+        self.metrics = {'requests': 0, 'hedges': 0, 'hedge_wins': 0, 'budget_denied': 0,
+                        'capacity_denied': 0}
+
+    def record_latency(self, seconds: float) -> None:
+        """Speichert eine gemessene Latenz bis zum ersten Byte"""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def threshold(self) -> Optional[float]:
+        """
+        Berechnet die aktuelle Hedging-Schwelle
+
+        Returns:
+            Optional[float]: Wartezeit bis zum Hedge in Sekunden, None bei zu wenigen Messwerten
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[index]
+
+    def record_request(self) -> None:
+        """Zählt einen (primären) Request für das Budget"""
+        with self._lock:
+            self.metrics['requests'] += 1
+
+    def try_acquire(self) -> bool:
+        """
+        Reserviert einen Hedge aus dem Budget
+
+        Returns:
+            bool: True wenn ein zweiter Request erlaubt ist
+        """
+        with self._lock:
+            if self.metrics['hedges'] + 1 > self.max_hedge_ratio * self.metrics['requests']:
+                self.metrics['budget_denied'] += 1
+                return False
+            self.metrics['hedges'] += 1
+            return True
+
+    def record_capacity_denied(self) -> None:
+        """Zählt einen Hedge, für den kein Slot (Parallelität/Rate-Limit) frei war"""
+        with self._lock:
+            self.metrics['capacity_denied'] += 1
+
+    def record_hedge_win(self) -> None:
+        """Zählt einen Hedge, der schneller war als der ursprüngliche Request"""
+        with self._lock:
+            self.metrics['hedge_wins'] += 1
+
+
+class HedgeAttempt:
+    """Handle eines einzelnen Versuchs (Abbruch und erstes Byte)"""
+
+    def __init__(self, index: int, policy: HedgePolicy):
+        self.index = index
+        self.policy = policy
+        self.started_at = time.monotonic()
+        self.first_byte = threading.Event()
+        self.settled = threading.Event()  # erstes Byte oder Versuch beendet
+        self._cancelled = threading.Event()
+        self._callbacks: List[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Ob der Versuch abgebrochen wurde"""
+        return self._cancelled.is_set()
+
+    def mark_first_byte(self) -> None:
+        """Meldet das erste empfangene Byte (einmalig)"""
+        if not self.first_byte.is_set():
+            self.first_byte.set()
+            self.settled.set()
+            self.policy.record_latency(time.monotonic() - self.started_at)
+
+    def on_cancel(self, callback: Callable[[], Any]) -> None:
+        """Registriert eine Aufräumfunktion (z.B. Response schließen)"""
+        with self._lock:
+            if not self.cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self) -> None:
+        """Bricht den Versuch ab und schließt offene Verbindungen"""
+        with self._lock:
+            self._cancelled.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+
+def _run_attempt(attempt: Callable[[HedgeAttempt], Optional[Any]], handle: HedgeAttempt) -> Optional[Any]:
+    """Führt einen Versuch aus und meldet dessen Ende"""
+    try:
+        return attempt(handle)
+    finally:
+        handle.settled.set()
+
+
+def _discard_callback(discard: Callable[[int], None], index: int) -> Callable[[Any], None]:
+    """Erzeugt einen Callback, der ein dennoch fertig gewordenes Verlierer-Ergebnis verwirft"""
+    def callback(future) -> None:
+        if future.exception() is None and future.result() is not None:
+            discard(index)
+    return callback
+
+
+def run_hedged(attempt: Callable[[HedgeAttempt], Optional[Any]], policy: HedgePolicy,
+               discard: Optional[Callable[[int], None]] = None,
+               admit: Optional[Callable[[], bool]] = None,
+               release: Optional[Callable[[], None]] = None) -> Optional[Tuple[int, Any]]:
+    """
+    Führt einen Request mit optionalem Hedge aus
+
+    Kommt innerhalb der Schwelle kein erstes Byte, wird (sofern Kapazität und
+    Budget es erlauben) ein zweiter identischer Versuch gestartet. Der erste
+    erfolgreich abgeschlossene Versuch gewinnt, der andere wird abgebrochen.
+
+    Args:
+        attempt: Führt einen Versuch aus, gibt bei Erfolg ein Ergebnis zurück, sonst None
+        policy: Hedging-Strategie
+        discard: Optional: Räumt das Ergebnis eines verlorenen Versuchs auf (Index)
+        admit: Optional: Belegt ohne zu warten Kapazität für den Hedge (False = kein Hedge)
+        release: Optional: Gibt die mit admit belegte Kapazität nach Ende des Hedges frei
+
+    Returns:
+        Optional[Tuple[int, Any]]: (Index des Gewinners, Ergebnis) oder None
+    """
+    policy.record_request()
+    threshold = policy.threshold()
+
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hedge")
+    attempts: Dict[Any, HedgeAttempt] = {}
+
+    primary = HedgeAttempt(0, policy)
+    attempts[executor.submit(_run_attempt, attempt, primary)] = primary
+
+    if threshold is not None and not primary.settled.wait(threshold):
+        if admit is not None and not admit():
+            logger.debug("Keine freie Kapazität - kein Hedge-Request")
+            policy.record_capacity_denied()
+        elif policy.try_acquire():
+            logger.info(f"⏱️ Kein erstes Byte nach {threshold:.2f}s - starte Hedge-Request")
+            secondary = HedgeAttempt(1, policy)
+            future = executor.submit(_run_attempt, attempt, secondary)
+            if release is not None:
+                future.add_done_callback(lambda _: release())
+            attempts[future] = secondary
+        elif release is not None:
+            release()
+
+    winner: Optional[Tuple[int, Any]] = None
+    remaining = set(attempts)
+
+    while remaining and winner is None:
+        done, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.debug(f"Versuch {attempts[future].index} fehlgeschlagen: {e}")
+                continue
+            if result is not None and winner is None:
+                winner = (attempts[future].index, result)
+
+    # Verlierer abbrechen und ggf. deren Ergebnis verwerfen
+    for future, handle in attempts.items():
+        if winner is not None and handle.index == winner[0]:
+            continue
+        handle.cancel()
+        if discard is not None:
+            future.add_done_callback(_discard_callback(discard, handle.index))
+
+    executor.shutdown(wait=False)
+
+    if winner is not None and winner[0] > 0:
+        policy.record_hedge_win()
+    return winner
+
+
+# Globale Instanz (Latenzhistorie und Budget über alle Generatoren)
+_hedge_policy: HedgePolicy = None
+
+def get_hedge_policy() -> HedgePolicy:
+    """
+    Holt die globale Hedging-Strategie
+
+    Returns:
+        HedgePolicy-Instanz
+    """
+    global _hedge_policy
+
+    if _hedge_policy is None:
+        _hedge_policy = HedgePolicy()
+
+    return _hedge_policy
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Hedging-Modul geladen")
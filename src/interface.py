@@ -3,14 +3,29 @@ Interface-Modul für Colab-Sound Projekt
 Vereinheitlicht Demo und Hook-Generator in einem Gradio-Interface mit Tabs
 """
 
+import time
 import gradio as gr
-from pathlib import Path
-from typing import Optional, Tuple
-from src.generator import generate_hooks
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.generator import HookGenerator, QUALITY_DRAFT, QUALITY_FINAL
+from src.scheduler import HookJob, job_scheduler, draft_scheduler
+from src.cancellation import CancellationToken
+from src.sweep import VoiceSweep, build_grid, parse_hook_numbers, parse_values
+from src.config import get_config
 from src.demo import demo_player
+from src.workspace import WorkspaceBusyError, workspace_manager, start_janitor
+from src.circuit_breaker import get_circuit_breaker, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+from src.concurrency import get_adaptive_concurrency
 from src.logger import get_logger
 
 logger = get_logger("interface")
+config = get_config()
+
+# Auswahl der Render-Qualität in der Oberfläche (Entwürfe nur auf Wunsch)
+QUALITY_CHOICES = {
+    "⚡ Entwurf (schnell, zum Vorhören)": QUALITY_DRAFT,
+    "🎯 Final (volle Qualität)": QUALITY_FINAL,
+}
+DEFAULT_QUALITY = "🎯 Final (volle Qualität)"
 
 class UnifiedInterface:
     """Vereinheitlichtes Interface für Demo und Hook-Generierung"""
@@ -26,41 +41,275 @@ class UnifiedInterface:
         self.secrets = secrets
         self.current_version = current_version
 
-    def process_file(self, file_obj) -> Tuple[Optional[str], str]:
+        # Alte Job-Ausgaben im Hintergrund aufräumen
+        self.janitor = start_janitor()
+
+        # Laufende Jobs pro Sitzung (für den Abbrechen-Button)
+        self._tokens: Dict[str, CancellationToken] = {}
+
+        # Zuletzt geladene Hook-Texte pro Sitzung (für das Final-Rendering ausgewählter Hooks)
+        self._texts: Dict[str, List[str]] = {}
+
+    def _create_generator(self, quality: str = QUALITY_FINAL) -> HookGenerator:
+        """Erstellt einen Generator mit den geladenen Secrets"""
+        return HookGenerator(
+            api_key=self.secrets['API_KEY'],
+            voice_id=self.secrets['VOICE_ID'],
+            separator=self.secrets['TRENNER'],
+            quality=quality
+        )
+
+    def process_file(self, file_obj, quality: str = None,
+                     request: gr.Request = None) -> Tuple[Optional[str], str, dict]:
         """
         Verarbeitet die hochgeladene Datei und generiert Hooks
 
+        Der Job wird im gemeinsamen Scheduler eingereiht, damit kleine Jobs
+        nicht hinter großen Katalogen anderer Nutzer warten müssen. Entwürfe
+        laufen im eigenen, breiteren Pool; danach können einzelne Hooks für
+        das Final-Rendering ausgewählt werden.
+
         Args:
             file_obj: Gradio File-Objekt
+            quality: Auswahl aus QUALITY_CHOICES (Final wenn nicht angegeben)
+            request: Gradio Request (für die Sitzungs-ID)
 
         Returns:
-            Tuple: (zip_path, message)
+            Tuple: (zip_path, message, Update der Hook-Auswahl)
         """
         if file_obj is None:
-            return None, "❌ Bitte wähle eine Text-Datei aus!"
+            return None, "❌ Bitte wähle eine Text-Datei aus!", gr.update()
+
+        quality = QUALITY_CHOICES.get(quality, QUALITY_FINAL)
+        session = getattr(request, 'session_hash', None)
+        tenant = session or "default"
+
+        try:
+            generator = self._create_generator(quality)
+            # Gradio liefert je nach Version einen Pfad oder ein Datei-Objekt
+            file_path = getattr(file_obj, 'name', file_obj)
+            parse_started = time.time_ns()
+            texts = generator.parse_text_file(file_path)
+            parsed = (parse_started, time.time_ns())
+        except Exception as e:
+            return None, f"❌ Fehler bei der Verarbeitung: {e}", gr.update()
+
+        self._texts[tenant] = texts
+        choices = [f"{i+1:02d}: {text[:60]}" for i, text in enumerate(texts)]
+
+        # Fester Workspace pro Sitzung und Qualität: bei erneutem Upload nur Änderungen generieren
+        # (ohne Sitzung teilen sich alle Aufrufe "default" - dann immer ein eigener Workspace)
+        workspace = f"{session}-{quality}" if session else None
+        zip_path, message = self._run_job(generator, texts, tenant, workspace=workspace, parsed=parsed)
+        return zip_path, message, gr.update(choices=choices, value=[])
+
+    def render_final(self, selected: List[str], request: gr.Request = None) -> Tuple[Optional[str], str]:
+        """
+        Rendert die ausgewählten Hooks in voller Qualität
+
+        Args:
+            selected: Ausgewählte Einträge der Hook-Auswahl ("NN: Text...")
+            request: Gradio Request (für die Sitzungs-ID)
+
+        Returns:
+            Tuple: (zip_path, message)
+        """
+        tenant = getattr(request, 'session_hash', None) or "default"
+        texts = self._texts.get(tenant)
+
+        if not texts:
+            return None, "❌ Bitte lade zuerst eine Text-Datei und generiere Entwürfe!"
+        if not selected:
+            return None, "❌ Bitte wähle mindestens einen Hook aus!"
+
+        numbers = sorted(int(label.split(":", 1)[0]) for label in selected)
+        return self._run_job(
+            self._create_generator(QUALITY_FINAL),
+            [texts[number - 1] for number in numbers],
+            tenant,
+            numbers
+        )
+
+    def _run_job(self, generator: HookGenerator, texts: List[str], tenant: str,
+                 numbers: Optional[List[int]] = None,
+                 workspace: Optional[str] = None,
+                 parsed: Optional[Tuple[int, int]] = None) -> Tuple[Optional[str], str]:
+        """
+        Reiht einen Job ein und wartet auf das Ergebnis
+
+        Args:
+            generator: Generator in der gewünschten Qualität
+            texts: Hook-Texte
+            tenant: Sitzungs-ID
+            numbers: Optional: Hook-Nummern für die Dateinamen
+            workspace: Optional: Wiederverwendeter Workspace - die ZIP-Datei des
+                letzten Laufs wird dann inkrementell aktualisiert
+            parsed: Optional: Start und Ende des Parsens (ns seit Epoch, für Span und Profil des Jobs)
+
+        Returns:
+            Tuple: (zip_path, message)
+        """
+        # Eigenes Ausgabeverzeichnis pro Job, damit parallele Nutzer sich nicht überschreiben;
+        # ein fester Workspace darf nur von einem Job gleichzeitig aktualisiert werden
+        try:
+            output_dir = workspace_manager.create(workspace, exclusive=workspace is not None)
+        except WorkspaceBusyError:
+            return None, "❌ Für diese Sitzung läuft bereits eine Generierung - bitte warten oder abbrechen"
+
+        update = None
+        if workspace is not None:
+            update = generator.plan_update(texts, str(output_dir))
+            numbers = [i + 1 for i in update.pending]
+            texts = [texts[i] for i in update.pending]
+
+        token = CancellationToken(timeout=config.scheduler.job_deadline or None)
+        self._tokens[tenant] = token
 
         try:
-            # Erstelle temporäres Verzeichnis für Ausgabe
-            output_dir = Path("output")
-            output_dir.mkdir(exist_ok=True)
-
-            # Generiere Hooks mit den geladenen Secrets
-            zip_path, message = generate_hooks(
-                file_path=file_obj.name,
-                api_key=self.secrets['API_KEY'],
-                voice_id=self.secrets['VOICE_ID'],
-                separator=self.secrets['TRENNER'],
-                output_dir=str(output_dir)
+            scheduler = draft_scheduler if generator.quality == QUALITY_DRAFT else job_scheduler
+            job = scheduler.submit(
+                HookJob(generator, texts, str(output_dir), tenant=tenant, token=token,
+                        numbers=numbers, update=update, parsed=parsed)
             )
+            zip_path, message = job.wait()
 
             if zip_path:
                 return zip_path, f"✅ {message}"
+            elif get_circuit_breaker(config.backend.name).state != STATE_CLOSED:
+                return None, f"❌ {message}\n{self.api_status()}"
             else:
                 return None, f"❌ {message}"
 
         except Exception as e:
             return None, f"❌ Fehler bei der Verarbeitung: {e}"
 
+        finally:
+            if self._tokens.get(tenant) is token:
+                del self._tokens[tenant]
+            workspace_manager.release(output_dir)
+
+    def run_sweep(self, file_obj, hook_numbers: str, voices: str, stability: str,
+                  similarity_boost: str, style: str, quality: str = None,
+                  request: gr.Request = None) -> Tuple[Optional[str], str]:
+        """
+        Rendert ausgewählte Hooks für ein Raster aus Voice-Settings (A/B-Vergleich)
+
+        Args:
+            file_obj: Gradio File-Objekt
+            hook_numbers: Hook-Auswahl, z.B. "1-3, 5" (leer = alle)
+            voices: Kommagetrennte Voice IDs (leer = konfigurierte Stimme)
+            stability: Werte für stability, z.B. "0.0, 0.5"
+            similarity_boost: Werte für similarity_boost
+            style: Werte für style
+            quality: Auswahl aus QUALITY_CHOICES (Final wenn nicht angegeben)
+            request: Gradio Request (für die Sitzungs-ID)
+
+        Returns:
+            Tuple: (zip_path, message)
+        """
+        if file_obj is None:
+            return None, "❌ Bitte wähle eine Text-Datei aus!"
+
+        tenant = getattr(request, 'session_hash', None) or "default"
+        output_dir = workspace_manager.create()
+        token = CancellationToken(timeout=config.scheduler.job_deadline or None)
+        self._tokens[tenant] = token
+
+        try:
+            texts = self._create_generator().parse_text_file(getattr(file_obj, 'name', file_obj))
+            voice_ids = [v.strip() for v in (voices or "").split(',') if v.strip()] or [self.secrets['VOICE_ID']]
+            points = build_grid(
+                voice_ids,
+                parse_values(stability, "stability"),
+                parse_values(similarity_boost, "similarity_boost"),
+                parse_values(style, "style")
+            )
+
+            sweep = VoiceSweep(self.secrets['API_KEY'], points, QUALITY_CHOICES.get(quality, QUALITY_FINAL))
+            zip_path, message = sweep.run(texts, parse_hook_numbers(hook_numbers, len(texts)),
+                                          str(output_dir), token)
+            return zip_path, message if zip_path else f"❌ {message}"
+
+        except Exception as e:
+            return None, f"❌ Fehler beim Sweep: {e}"
+
+        finally:
+            if self._tokens.get(tenant) is token:
+                del self._tokens[tenant]
+            workspace_manager.release(output_dir)
+
+    def preview_hook(self, text: str) -> Iterator[bytes]:
+        """
+        Streamt einen einzelnen Hook zur sofortigen Wiedergabe
+
+        Args:
+            text: Hook-Text
+
+        Yields:
+            bytes: MP3-Chunks für die Streaming-Audio-Komponente
+        """
+        if not text or not text.strip():
+            raise gr.Error("Bitte gib einen Hook-Text ein!")
+
+        generator = self._create_generator()
+
+        try:
+            yield from generator.stream_preview(text.strip())
+        except RuntimeError as e:
+            raise gr.Error(f"Vorschau fehlgeschlagen: {e}")
+
+    def cancel_processing(self, request: gr.Request = None) -> str:
+        """
+        Bricht den laufenden Job der Sitzung ab und gibt Worker und Quota sofort frei
+
+        Args:
+            request: Gradio Request (für die Sitzungs-ID)
+
+        Returns:
+            str: Status-Nachricht
+        """
+        tenant = getattr(request, 'session_hash', None) or "default"
+        token = self._tokens.get(tenant)
+
+        if token is None:
+            return "ℹ️ Kein laufender Job"
+
+        token.cancel()
+        return "⏹️ Generierung abgebrochen"
+
+    def end_session(self, request: gr.Request = None) -> None:
+        """
+        Räumt eine geschlossene Sitzung auf: bricht ihren Job ab und vergisst ihre Hook-Texte
+
+        Args:
+            request: Gradio Request (für die Sitzungs-ID)
+        """
+        self.cancel_processing(request)
+        self._texts.pop(getattr(request, 'session_hash', None) or "default", None)
+
+    def api_status(self) -> str:
+        """
+        Beschreibt den Zustand der TTS-API (Circuit-Breaker) für die Anzeige
+
+        Returns:
+            str: Status-Text in Markdown
+        """
+        status = get_circuit_breaker(config.backend.name).snapshot()
+
+        if status['state'] == STATE_OPEN:
+            text = (f"🔴 **API gestört** - Jobs pausieren, nächster Versuch in "
+                    f"{status['retry_after']:.0f}s (Fehlerquote {status['error_rate']:.0%})")
+        elif status['state'] == STATE_HALF_OPEN:
+            text = "🟡 **API wird getestet** - Probe-Request läuft"
+        else:
+            text = "🟢 **API erreichbar**"
+
+        if config.concurrency.enabled:
+            concurrency = get_adaptive_concurrency().snapshot()
+            text += (f" · ⚙️ Parallelität {concurrency['in_flight']}/{concurrency['limit']} "
+                     f"(429: {concurrency['throttled']})")
+        return text
+
     def run_demo(self) -> Tuple[gr.Audio, str]:
         """
         Führt die Demo aus und gibt Audio-Player und Status zurück
@@ -160,20 +409,33 @@ class UnifiedInterface:
                                 type="filepath"
                             )
 
+                            quality_input = gr.Radio(
+                                label="Qualität",
+                                choices=list(QUALITY_CHOICES),
+                                value=DEFAULT_QUALITY
+                            )
+
                             generate_btn = gr.Button(
                                 "🚀 Hooks generieren",
                                 variant="primary",
                                 size="lg"
                             )
 
+                            cancel_btn = gr.Button(
+                                "⏹️ Abbrechen",
+                                variant="stop",
+                                size="sm"
+                            )
+
                         with gr.Column(scale=1):
                             gr.Markdown("""
                             #### 📋 Anleitung
                             1. **Text-Datei erstellen**: Schreibe deine Hook-Texte
                             2. **Trennzeichen verwenden**: Trenne Hooks mit `---`
                             3. **Datei hochladen**: Wähle deine .txt-Datei aus
-                            4. **Generieren**: Klicke auf "Hooks generieren"
-                            5. **Herunterladen**: Speichere die ZIP-Datei
+                            4. **Entwürfe generieren**: Schnell alle Hooks vorhören
+                            5. **Final rendern**: Gewünschte Hooks auswählen und in voller Qualität erzeugen
+                            6. **Herunterladen**: Speichere die ZIP-Datei
 
                             ### 🎯 Beispiel-Format:
                             ```
@@ -185,6 +447,32 @@ class UnifiedInterface:
                             ```
                             """)
 
+                    # Schnelle Vorschau einzelner Hooks (Streaming)
+                    with gr.Row():
+                        with gr.Column():
+                            gr.Markdown("""
+                            #### ⚡ Schnelle Vorschau
+                            Höre einen einzelnen Hook schon während er generiert wird.
+                            """)
+
+                            preview_text = gr.Textbox(
+                                label="Hook-Text",
+                                lines=2,
+                                placeholder="Dieser Text wird sofort gesprochen..."
+                            )
+
+                            preview_btn = gr.Button("▶️ Vorschau abspielen")
+
+                            preview_audio = gr.Audio(
+                                label="Vorschau",
+                                streaming=True,
+                                autoplay=True,
+                                interactive=False
+                            )
+
+                    # API-Zustand (Circuit-Breaker), regelmäßig aktualisiert
+                    gr.Markdown(value=self.api_status, every=5)
+
                     # Status und Download-Bereich
                     with gr.Row():
                         status_output = gr.Textbox(
@@ -200,13 +488,109 @@ class UnifiedInterface:
                             interactive=False
                         )
 
+                    # Nach dem Vorhören der Entwürfe: Auswahl in voller Qualität rendern
+                    with gr.Row():
+                        with gr.Column():
+                            hook_selector = gr.CheckboxGroup(
+                                label="🎯 Hooks für das Final-Rendering auswählen",
+                                choices=[]
+                            )
+
+                            final_btn = gr.Button("🎯 Auswahl final rendern", variant="secondary")
+
                     # Event-Handler
-                    generate_btn.click(
+                    generate_event = generate_btn.click(
                         fn=self.process_file,
-                        inputs=[file_input],
+                        inputs=[file_input, quality_input],
+                        outputs=[download_output, status_output, hook_selector]
+                    )
+
+                    final_event = final_btn.click(
+                        fn=self.render_final,
+                        inputs=[hook_selector],
                         outputs=[download_output, status_output]
                     )
 
+                    preview_btn.click(
+                        fn=self.preview_hook,
+                        inputs=[preview_text],
+                        outputs=[preview_audio]
+                    )
+
+                    cancel_btn.click(
+                        fn=self.cancel_processing,
+                        inputs=[],
+                        outputs=[status_output],
+                        cancels=[generate_event, final_event]
+                    )
+
+                # Tab 3: Voice-Sweep
+                with gr.TabItem("🎛️ Voice-Sweep", id="sweep"):
+                    gr.Markdown("""
+                    ### 🎛️ Voice-Settings vergleichen
+
+                    Rendert ausgewählte Hooks für alle Kombinationen der angegebenen Werte.
+                    Die ZIP-Datei enthält einen Ordner pro Kombination sowie eine Vergleichstabelle.
+                    Bereits gerenderte Kombinationen kommen aus dem Cache.
+                    """)
+
+                    with gr.Row():
+                        with gr.Column():
+                            sweep_file = gr.File(
+                                label="Text-Datei auswählen",
+                                file_types=[".txt"],
+                                type="filepath"
+                            )
+
+                            sweep_hooks = gr.Textbox(
+                                label="Hooks",
+                                placeholder="z.B. 1-3, 5 (leer = alle)"
+                            )
+
+                            sweep_voices = gr.Textbox(
+                                label="Voice IDs (optional, kommagetrennt)",
+                                placeholder="leer = konfigurierte Stimme"
+                            )
+
+                            sweep_quality = gr.Radio(
+                                label="Qualität",
+                                choices=list(QUALITY_CHOICES),
+                                value=DEFAULT_QUALITY
+                            )
+
+                        with gr.Column():
+                            sweep_stability = gr.Textbox(
+                                label="stability",
+                                value="0.0, 0.5"
+                            )
+
+                            sweep_similarity = gr.Textbox(
+                                label="similarity_boost",
+                                value=str(config.elevenlabs.default_similarity_boost)
+                            )
+
+                            sweep_style = gr.Textbox(
+                                label="style",
+                                value="0.5, 1.0"
+                            )
+
+                    sweep_btn = gr.Button("🎛️ Sweep starten", variant="primary")
+
+                    sweep_status = gr.Textbox(label="📊 Status", interactive=False, lines=2)
+
+                    sweep_output = gr.File(label="📦 Sweep-Ergebnis herunterladen", interactive=False)
+
+                    sweep_btn.click(
+                        fn=self.run_sweep,
+                        inputs=[sweep_file, sweep_hooks, sweep_voices, sweep_stability,
+                                sweep_similarity, sweep_style, sweep_quality],
+                        outputs=[sweep_output, sweep_status]
+                    )
+
+            # Tab geschlossen: laufenden Job abbrechen und Sitzungsdaten freigeben
+            if hasattr(interface, 'unload'):
+                interface.unload(self.end_session)
+
         return interface
 
 # Globale Funktion für einfache Verwendung
@@ -0,0 +1,184 @@
+"""
+Manifest-Modul für Colab-Sound Projekt
+Inkrementelle Neugenerierung: nur geänderte Hooks synthetisieren, ZIP-Einträge roh übernehmen
+"""
+
+import json
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("manifest")
+config = get_config()
+
+MANIFEST_NAME = "manifest.json"
+
+
+def hook_file_name(index: int) -> str:
+    """Dateiname des Hooks an Position index"""
+    return f"hook_{index+1:02d}.mp3"
+
+
+# Interna von zipfile, die das rohe Kopieren braucht (nicht Teil der öffentlichen API)
+_RAW_COPY_MODULE_ATTRIBUTES = ('structFileHeader', 'sizeFileHeader', '_FH_FILENAME_LENGTH', '_FH_EXTRA_FIELD_LENGTH')
+_RAW_COPY_ARCHIVE_ATTRIBUTES = ('fp', '_lock', '_writecheck', '_didModify', 'start_dir', 'filelist', 'NameToInfo')
+
+
+def raw_copy_supported(source: zipfile.ZipFile, target: zipfile.ZipFile) -> bool:
+    """Ob die zipfile-Interna für das rohe Kopieren in dieser Python-Version vorhanden sind"""
+    return (all(hasattr(zipfile, name) for name in _RAW_COPY_MODULE_ATTRIBUTES)
+            and all(hasattr(target, name) for name in _RAW_COPY_ARCHIVE_ATTRIBUTES)
+            and getattr(source, 'fp', None) is not None)
+
+
+def copy_zip_entry(source: zipfile.ZipFile, target: zipfile.ZipFile,
+                   info: zipfile.ZipInfo, arcname: str) -> None:
+    """
+    Kopiert einen ZIP-Eintrag ohne Entpacken oder erneutes Komprimieren
+
+    Die komprimierten Bytes werden direkt aus dem alten Archiv übernommen;
+    CRC und Größen stehen bereits im alten Central Directory. Fehlen die
+    dafür nötigen zipfile-Interna, wird der Eintrag entpackt und mit
+    derselben Kompression neu geschrieben.
+
+    Args:
+        source: Altes Archiv (Lesemodus)
+        target: Neues Archiv (Schreibmodus)
+        info: Eintrag im alten Archiv
+        arcname: Name im neuen Archiv
+    """
+    if not raw_copy_supported(source, target):
+        entry = zipfile.ZipInfo(arcname, date_time=info.date_time)
+        entry.compress_type = info.compress_type
+        entry.external_attr = info.external_attr
+        entry.create_system = info.create_system
+        target.writestr(entry, source.read(info))
+        return
+
+    source.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, source.fp.read(zipfile.sizeFileHeader))
+    source.fp.seek(header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR)
+    raw = source.fp.read(info.compress_size)
+
+    entry = zipfile.ZipInfo(arcname, date_time=info.date_time)
+    entry.compress_type = info.compress_type
+    entry.external_attr = info.external_attr
+    entry.create_system = info.create_system
+    entry.CRC = info.CRC
+    entry.compress_size = info.compress_size
+    entry.file_size = info.file_size
+
+    # Entspricht ZipFile._open_to_write, nur ohne Kompressor
+    with target._lock:
+        target.fp.seek(target.start_dir)
+        entry.header_offset = target.fp.tell()
+        target._writecheck(entry)
+        target._didModify = True
+        target.fp.write(entry.FileHeader())
+        target.fp.write(raw)
+        target.start_dir = target.fp.tell()
+        target.filelist.append(entry)
+        target.NameToInfo[arcname] = entry
+
+
+class ArchiveUpdate:
+    """
+    Vergleicht neue Hooks mit dem Manifest des letzten Laufs im Workspace
+
+    Hooks mit gleichem Inhalts-Hash (gleiche Position oder verschoben) werden
+    aus der alten ZIP-Datei übernommen, nur geänderte und neue Hooks müssen
+    synthetisiert werden.
+    """
+
+    def __init__(self, output_dir: str, keys: List[str], zip_name: str = None):
+        """
+        Plant die Aktualisierung
+
+        Args:
+            output_dir: Workspace mit ZIP-Datei und Manifest des letzten Laufs
+            keys: Inhalts-Hash pro Hook (z.B. HookGenerator.cache_key)
+            zip_name: Name der ZIP-Datei (aus Config wenn nicht angegeben)
+        """
+        self.output_dir = Path(output_dir)
+        self.keys = keys
+        self.zip_path = self.output_dir / (zip_name or config.files.default_zip_name)
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+
+        previous = self._load()
+        by_name = {entry['name']: entry['key'] for entry in previous}
+        by_key: Dict[str, str] = {}
+        for entry in previous:
+            by_key.setdefault(entry['key'], entry['name'])
+
+        # Neuer Index -> Eintragsname in der alten ZIP-Datei
+        self.reused: Dict[int, str] = {}
+        for i, key in enumerate(keys):
+            if by_name.get(hook_file_name(i)) == key:
+                self.reused[i] = hook_file_name(i)
+            elif key in by_key:
+                self.reused[i] = by_key[key]
+
+        self.pending = [i for i in range(len(keys)) if i not in self.reused]
+
+        if previous:
+            logger.info(f"🔁 {len(self.reused)} Hooks unverändert, {len(self.pending)} neu zu generieren")
+
+    def _load(self) -> List[dict]:
+        """Liest das Manifest (leer wenn nicht vorhanden, beschädigt oder ohne ZIP-Datei)"""
+        if not self.zip_path.exists():
+            return []
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['entries']
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def write(self, mp3_files: List[str]) -> int:
+        """
+        Baut die ZIP-Datei neu und aktualisiert das Manifest
+
+        Args:
+            mp3_files: Neu generierte Hooks im Workspace (werden danach gelöscht)
+
+        Returns:
+            int: Anzahl der Hooks in der neuen ZIP-Datei
+        """
+        generated = set(mp3_files)
+        entries = []
+        temp_path = self.zip_path.with_name(f"{self.zip_path.name}.tmp")
+
+        old = zipfile.ZipFile(self.zip_path) if self.reused else None
+        try:
+            with zipfile.ZipFile(temp_path, 'w') as target:
+                for i, key in enumerate(self.keys):
+                    name = hook_file_name(i)
+                    if i in self.reused:
+                        copy_zip_entry(old, target, old.getinfo(self.reused[i]), name)
+                    elif name in generated:
+                        target.write(str(self.output_dir / name), name)
+                    else:
+                        continue
+                    entries.append({'name': name, 'key': key})
+        finally:
+            if old is not None:
+                old.close()
+
+        # Ohne Manifest gilt der Workspace als leer - nie ein veraltetes Manifest zur neuen ZIP
+        self.manifest_path.unlink(missing_ok=True)
+        os.replace(temp_path, self.zip_path)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': entries}, f)
+
+        for name in mp3_files:
+            (self.output_dir / name).unlink(missing_ok=True)
+
+        return len(entries)
+
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Manifest-Modul geladen")
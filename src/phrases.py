@@ -0,0 +1,90 @@
+"""
+Phrasen-Modul für Colab-Sound Projekt
+Zerlegt Hooks in Sätze und setzt Audio-Fragmente auf MP3-Frame-Ebene zusammen
+"""
+
+import re
+from typing import List
+from src.logger import get_logger
+from src.validator import ID3V1_TAG_SIZE, parse_frame_header, skip_id3v2
+
+logger = get_logger("phrases")
+
+# Satzende: . ! ? … (auch mehrfach oder mit schließendem Anführungszeichen) gefolgt von Leerraum
+SENTENCE_END = re.compile(r'(?<=[.!?…])["»«“”\')]*\s+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Zerlegt einen Hook-Text in Sätze
+
+    Args:
+        text: Hook-Text
+
+    Returns:
+        List[str]: Sätze ohne umgebenden Leerraum (Satzzeichen bleiben erhalten)
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+
+    rest = text[start:].strip()
+    if rest:
+        sentences.append(rest)
+    return sentences
+
+
+def audio_frames(data: bytes) -> List[bytes]:
+    """
+    Extrahiert die MP3-Frames einer Datei
+
+    ID3-Tags, Xing/Info-Header (gelten nur für die Einzeldatei) und
+    abgeschnittene Frames am Ende werden verworfen.
+
+    Args:
+        data: MP3-Daten
+
+    Returns:
+        List[bytes]: Vollständige Audio-Frames
+    """
+    end = len(data)
+    if end >= ID3V1_TAG_SIZE and data[end - ID3V1_TAG_SIZE:end - ID3V1_TAG_SIZE + 3] == b"TAG":
+        end -= ID3V1_TAG_SIZE
+
+    frames = []
+    offset = skip_id3v2(data)
+    while offset < end:
+        header = parse_frame_header(data, offset)
+        if header is None or offset + header[0] > end:
+            break
+
+        frame = data[offset:offset + header[0]]
+        if not frames and (b"Xing" in frame[:64] or b"Info" in frame[:64]):
+            offset += header[0]
+            continue
+
+        frames.append(frame)
+        offset += header[0]
+    return frames
+
+
+def concat_mp3(parts: List[bytes]) -> bytes:
+    """
+    Hängt MP3-Dateien gleichen Formats auf Frame-Ebene aneinander
+
+    Args:
+        parts: MP3-Daten in Wiedergabereihenfolge
+
+    Returns:
+        bytes: Zusammengesetzter Frame-Stream
+    """
+    return b"".join(frame for part in parts for frame in audio_frames(part))
+
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Phrasen-Modul geladen")
@@ -0,0 +1,259 @@
+"""
+Profiling-Modul für Colab-Sound Projekt
+Zeitmessung pro Phase, cProfile und tracemalloc für einzelne Generierungsläufe
+"""
+
+import cProfile
+import contextlib
+import contextvars
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("profiling")
+config = get_config()
+
+# Phasen eines Laufs in Ausgabereihenfolge (weitere werden hinten angehängt)
+STAGES = ["parse", "queue_wait", "network", "disk_write", "validate", "zip"]
+
+# Ohne Profiling: wiederverwendbarer No-op-Kontext, kostet nur den Aufruf
+NO_STAGE = contextlib.nullcontext()
+
+# Laufendes Profil des aktuellen Kontexts (pro Lauf, nicht pro Generator)
+_current: contextvars.ContextVar = contextvars.ContextVar("current_profile", default=None)
+
+# tracemalloc ist prozessweit: gestartet vom ersten, gestoppt vom letzten Profil
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def current_profile() -> Optional["RunProfile"]:
+    """Aktives Profil im aktuellen Kontext (None außerhalb eines profilierten Laufs)"""
+    return _current.get()
+
+
+def stage(name: str):
+    """Zeitmessung einer Phase im aktiven Profil (ohne Profil ein No-op)"""
+    profile = _current.get()
+    return profile.stage(name) if profile is not None else NO_STAGE
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Überträgt das aktive Profil auf eine Funktion, die in einem anderen Thread läuft
+
+    Args:
+        fn: Funktion für einen Thread-Pool
+
+    Returns:
+        Funktion, die im Kontext des aktuellen Profils ausgeführt wird
+    """
+    profile = _current.get()
+    if profile is None:
+        return fn
+
+    def run(*args, **kwargs):
+        with profile.activate():
+            return fn(*args, **kwargs)
+
+    return run
+
+
+class RunProfile:
+    """
+    Profiliert einen Generierungslauf
+
+    cProfile läuft im startenden Thread und in allen Threads, die
+    thread() verwenden (Synthese- und Prüf-Pool); die Profile werden beim
+    Speichern zusammengeführt. tracemalloc erfasst alle Threads.
+    Phasenzeiten sind aufsummierte Wall-Clock-Zeiten - parallel laufende
+    Downloads können zusammen länger dauern als der Lauf selbst.
+    Gemessen wird nur Code, in dessen Kontext das Profil aktiv ist
+    (activate()), so bleiben gleichzeitige Läufe getrennt.
+    """
+
+    def __init__(self, output_dir: str, prefix: str = None, top: int = None):
+        """
+        Initialisiert das Profil
+
+        Args:
+            output_dir: Verzeichnis für die Berichte (neben der ZIP-Datei)
+            prefix: Dateinamen-Präfix der Berichte (aus Config wenn nicht angegeben)
+            top: Anzahl Einträge im Allokationsbericht (aus Config wenn nicht angegeben)
+        """
+        self.output_dir = Path(output_dir)
+        self.prefix = prefix or config.profiling.file_prefix
+        self.top = top or config.profiling.top_allocations
+
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.started_at: Optional[float] = None
+        self.wall_time: Optional[float] = None
+        self.files: Dict[str, str] = {}
+
+        self._profiles: List[cProfile.Profile] = []
+        self._main: Optional[cProfile.Profile] = None
+        self._owns_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Verbucht gemessene Zeit auf eine Phase"""
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Misst die Wall-Clock-Zeit des Blocks als Phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def _enable(self) -> Optional[cProfile.Profile]:
+        """Startet cProfile im aktuellen Thread (None falls schon ein Profiler aktiv ist)"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            logger.debug(f"cProfile nicht verfügbar: {e}")
+            return None
+        return profile
+
+    def _collect(self, profile: Optional[cProfile.Profile]) -> None:
+        """Stoppt ein Thread-Profil und merkt es zum Zusammenführen vor"""
+        if profile is None:
+            return
+        profile.disable()
+        with self._lock:
+            self._profiles.append(profile)
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["RunProfile"]:
+        """Macht das Profil für den Block zum aktiven Profil des Kontexts"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    @contextlib.contextmanager
+    def thread(self) -> Iterator[None]:
+        """Profiliert den Block in einem Worker-Thread"""
+        profile = self._enable()
+        try:
+            yield
+        finally:
+            self._collect(profile)
+
+    def start(self, main: bool = True) -> "RunProfile":
+        """
+        Startet cProfile und tracemalloc
+
+        Args:
+            main: cProfile auch im startenden Thread (False, wenn nur
+                Worker-Threads über thread() profiliert werden)
+        """
+        global _tracemalloc_users
+        with _tracemalloc_lock:
+            if _tracemalloc_users or not tracemalloc.is_tracing():
+                if not _tracemalloc_users:
+                    tracemalloc.start(config.profiling.traceback_frames)
+                _tracemalloc_users += 1
+                self._owns_tracemalloc = True
+        self.started_at = time.perf_counter()
+        self._main = self._enable() if main else None
+        return self
+
+    def stop(self) -> Dict[str, str]:
+        """
+        Beendet die Messung und schreibt die Berichte
+
+        Returns:
+            Dict[str, str]: Art -> Pfad (pstats, allocations, stages)
+        """
+        self._collect(self._main)
+        self.wall_time = time.perf_counter() - self.started_at
+        global _tracemalloc_users
+        with _tracemalloc_lock:
+            snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+            if self._owns_tracemalloc:
+                self._owns_tracemalloc = False
+                _tracemalloc_users -= 1
+                if not _tracemalloc_users:
+                    tracemalloc.stop()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            if self._profiles:
+                path = self.output_dir / f"{self.prefix}.pstats"
+                stats = pstats.Stats(self._profiles[0])
+                for profile in self._profiles[1:]:
+                    stats.add(profile)
+                stats.dump_stats(str(path))
+                self.files['pstats'] = str(path)
+
+            if snapshot is not None:
+                path = self.output_dir / f"{self.prefix}_allocations.txt"
+                path.write_text(self._allocation_report(snapshot), encoding="utf-8")
+                self.files['allocations'] = str(path)
+
+            path = self.output_dir / f"{self.prefix}_stages.json"
+            path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+            self.files['stages'] = str(path)
+
+        except OSError as e:
+            logger.error(f"Profil konnte nicht gespeichert werden: {e}")
+
+        logger.info(self.summary())
+        return self.files
+
+    def _allocation_report(self, snapshot: tracemalloc.Snapshot) -> str:
+        """Größte Allokationen nach Quellzeile"""
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        statistics = snapshot.statistics("lineno")
+        total = sum(stat.size for stat in statistics)
+
+        lines = [f"Top {self.top} Allokationen (gesamt {total / 1024:.1f} KiB)", ""]
+        for index, stat in enumerate(statistics[:self.top], 1):
+            frame = stat.traceback[0]
+            lines.append(f"{index:>3}. {frame.filename}:{frame.lineno}: "
+                         f"{stat.size / 1024:.1f} KiB in {stat.count} Blöcken")
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> Dict[str, object]:
+        """Phasenzeiten und Aufrufzahlen als Dictionary"""
+        with self._lock:
+            order = STAGES + sorted(set(self.stages) - set(STAGES))
+            return {
+                'wall_time': self.wall_time,
+                'stages': {name: {'seconds': round(self.stages[name], 6), 'count': self.counts[name]}
+                           for name in order if name in self.stages}
+            }
+
+    def summary(self) -> str:
+        """Einzeilige Zusammenfassung für Log und Statusmeldung"""
+        report = self.report()
+        parts = [f"{name} {values['seconds']:.2f}s" for name, values in report['stages'].items()]
+        return f"📊 Profil ({report['wall_time']:.2f}s): " + ", ".join(parts)
+
+    def __enter__(self) -> "RunProfile":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Profiling-Modul geladen")
@@ -0,0 +1,80 @@
+"""
+Rate-Limiter-Modul für Colab-Sound Projekt
+Gemeinsamer, threadsicherer Mindestabstand zwischen API-Calls
+"""
+
+import threading
+import time
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("rate_limiter")
+config = get_config()
+
+
+class RateLimiter:
+    """Vergibt Startzeitpunkte für API-Calls mit festem Mindestabstand"""
+
+    def __init__(self, delay: float = None):
+        """
+        Initialisiert den Rate-Limiter
+
+        Args:
+            delay: Mindestabstand in Sekunden (aus Config wenn nicht angegeben)
+        """
+        self.delay = delay if delay is not None else config.elevenlabs.rate_limit_delay
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """
+        Blockiert bis der nächste Slot frei ist
+
+        Returns:
+            float: Gewartete Zeit in Sekunden
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.delay
+
+        waited = slot - now
+        if waited > 0:
+            time.sleep(waited)
+        return waited
+
+    def try_acquire(self) -> bool:
+        """
+        Belegt den nächsten Slot nur, wenn er sofort frei ist (z.B. für Hedge-Requests)
+
+        Returns:
+            bool: True wenn ohne Warten ein Slot vergeben wurde
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._next_slot > now:
+                return False
+            self._next_slot = now + self.delay
+            return True
+
+
+# Globale Instanz (von allen Generatoren und Workern geteilt)
+_rate_limiter: RateLimiter = None
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Holt den globalen Rate-Limiter
+
+    Returns:
+        RateLimiter-Instanz
+    """
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+
+    return _rate_limiter
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Rate-Limiter-Modul geladen")
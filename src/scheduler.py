@@ -0,0 +1,433 @@
+"""
+Scheduler-Modul für Colab-Sound Projekt
+Verteilt Hooks mehrerer Jobs nach Priorität, Kürze und fairer Nutzeraufteilung auf Worker
+"""
+
+import contextlib
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from src.logger import get_logger
+from src.config import get_config
+from src.rate_limiter import RateLimiter, get_rate_limiter
+from src.cancellation import CancellationToken, DurationEstimator
+from src.manifest import ArchiveUpdate
+from src.profiling import RunProfile, stage as profile_stage
+
+logger = get_logger("scheduler")
+config = get_config()
+
+# Prioritätsklassen (Reihenfolge = Vorrang)
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BULK = "bulk"
+PRIORITY_ORDER = [PRIORITY_INTERACTIVE, PRIORITY_BULK]
+
+# Prüfintervall, solange die adaptive Parallelität keinen Slot frei hat (Sekunden)
+CAPACITY_POLL_INTERVAL = 0.05
+
+
+class HookJob:
+    """Ein Generierungsauftrag (eine hochgeladene Datei) in der Warteschlange"""
+
+    def __init__(self, generator, texts: List[str], output_dir: str,
+                 tenant: str = "default", priority: Optional[str] = None,
+                 job_id: Optional[str] = None, token: Optional[CancellationToken] = None,
+                 numbers: Optional[List[int]] = None, update: Optional[ArchiveUpdate] = None,
+                 parsed: Optional[Tuple[int, int]] = None):
+        """
+        Initialisiert einen Job
+
+        Args:
+            generator: HookGenerator, der die einzelnen Hooks erzeugt
+            texts: Liste der Hook-Texte
+            output_dir: Ausgabeverzeichnis (Workspace) des Jobs
+            tenant: Nutzer/Sitzung, für faire Aufteilung
+            priority: Prioritätsklasse (automatisch nach Hook-Anzahl wenn nicht angegeben)
+            job_id: Optional: Job-ID
+            token: Optional: Cancellation-Token mit Abbruch und Zeitbudget
+            numbers: Optional: Hook-Nummern für die Dateinamen (z.B. bei Auswahl einzelner Hooks)
+            update: Optional: Inkrementelle Aktualisierung der ZIP-Datei im Workspace
+                (texts enthält dann nur die neu zu generierenden Hooks)
+            parsed: Optional: Start und Ende des Parsens der Datei (Nanosekunden seit
+                Epoch) - wird als Span "parse_text_file" und Phase "parse" des Jobs verbucht
+        """
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        self.generator = generator
+        self.texts = texts
+        self.numbers = numbers or list(range(1, len(texts) + 1))
+        self.update = update
+        self.parsed = parsed
+        self.output_dir = Path(output_dir)
+        self.tenant = tenant
+        self.token = token or CancellationToken()
+
+        if priority is None:
+            interactive = len(texts) <= config.scheduler.interactive_max_hooks
+            priority = PRIORITY_INTERACTIVE if interactive else PRIORITY_BULK
+        self.priority = priority
+
+        # Kostenschätzung: Zeichenanzahl (bestimmt Synthesedauer und Quota)
+        self.cost = sum(len(text) for text in texts)
+        self.remaining_cost = self.cost
+
+        self.next_index = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.completed_indices: List[int] = []
+        self.deadline_skipped = False
+        self.error: Optional[str] = None
+        self.result: Tuple[Optional[str], str] = (None, "")
+
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+        # Tracing: Root-Span des Jobs (von submit bis zum Abschluss)
+        self.span = None
+
+        # Profiling: Profil des Jobs (bei aktivem Profiling des Generators)
+        self.profile: Optional[RunProfile] = None
+
+    def file_name(self, index: int) -> str:
+        """Dateiname des Hooks mit gegebenem Index"""
+        return f"hook_{self.numbers[index]:02d}.mp3"
+
+    @property
+    def has_pending(self) -> bool:
+        """Ob noch nicht vergebene Hooks vorhanden sind"""
+        return (self.error is None and not self.deadline_skipped and not self.token.cancelled
+                and self.next_index < len(self.texts))
+
+    @property
+    def done(self) -> bool:
+        """Ob der Job abgeschlossen ist"""
+        return self._done.is_set()
+
+    @property
+    def completion_time(self) -> Optional[float]:
+        """Zeit von Einreichung bis Abschluss in Sekunden"""
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.submitted_at
+
+    def wait(self, timeout: Optional[float] = None) -> Tuple[Optional[str], str]:
+        """
+        Wartet auf das Ergebnis des Jobs
+
+        Args:
+            timeout: Optional: maximale Wartezeit in Sekunden
+
+        Returns:
+            Tuple[Optional[str], str]: (ZIP-Pfad, Status-Nachricht)
+        """
+        if not self._done.wait(timeout):
+            return None, "Zeitüberschreitung beim Warten auf den Job"
+        return self.result
+
+
+class JobScheduler:
+    """
+    Verteilt Hooks aller wartenden Jobs auf einen Worker-Pool
+
+    Reihenfolge: zuerst Prioritätsklasse (interaktiv vor Bulk), innerhalb einer
+    Klasse der Job mit den geringsten Restkosten (Shortest-Job-First). Nutzer,
+    die mehr als fair_share_quantum Zeichen Vorsprung haben, müssen warten,
+    bis die anderen aufgeholt haben - so verhungert niemand.
+    """
+
+    def __init__(self, workers: int = None, policy: str = "sjf",
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialisiert den Scheduler
+
+        Mit adaptiver Parallelität (config.concurrency) werden so viele Worker
+        gestartet, wie der Controller maximal erlaubt; wie viele davon
+        gleichzeitig synthetisieren, bestimmt der Controller des Generators.
+
+        Args:
+            workers: Anzahl Worker-Threads (aus Config wenn nicht angegeben)
+            policy: "sjf" (Priorität/SJF/Fair-Share) oder "fifo" (Vergleichsbasis)
+            rate_limiter: Optional: Rate-Limiter (global geteilt wenn nicht angegeben)
+        """
+        self.workers = workers or config.scheduler.workers
+        if workers is None and config.concurrency.enabled:
+            self.workers = max(self.workers, config.concurrency.max_limit)
+        self.policy = policy
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.quantum = config.scheduler.fair_share_quantum
+        self.estimator = DurationEstimator()
+
+        self._jobs: List[HookJob] = []
+        self._served: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+
+    def submit(self, job: HookJob) -> HookJob:
+        """
+        Reiht einen Job in die Warteschlange ein
+
+        Args:
+            job: Einzureihender Job
+
+        Returns:
+            HookJob: Derselbe Job (zum Warten auf das Ergebnis)
+        """
+        tracer = job.generator.tracer
+        job.span = tracer.start_span(
+            "job", start_ns=job.parsed[0] if job.parsed else None,
+            job_id=job.job_id, tenant=job.tenant, hooks=len(job.texts), priority=job.priority
+        )
+        if job.parsed is not None:
+            tracer.record("parse_text_file", *job.parsed, parent=job.span, job_id=job.job_id)
+
+        if not job.texts and not (job.update is not None and job.update.reused):
+            job.result = (None, "Keine Texte zum Generieren")
+            job.finished_at = time.monotonic()
+            job.span.end()
+            job._done.set()
+            return job
+
+        # Berichte landen wie bei generate_hooks_batch neben der ZIP-Datei;
+        # cProfile läuft nur in den Workern, solange sie Hooks des Jobs bearbeiten
+        if job.generator.profiling:
+            job.profile = RunProfile(str(job.output_dir)).start(main=False)
+            if job.parsed is not None:
+                job.profile.add("parse", (job.parsed[1] - job.parsed[0]) / 1e9)
+
+        # Alles unverändert: ZIP-Datei direkt aus dem letzten Lauf zusammensetzen
+        if not job.texts:
+            self._finish(job)
+            return job
+
+        with self._cond:
+            # Neue Nutzer starten auf dem Stand des am wenigsten bedienten aktiven Nutzers
+            if job.tenant not in self._served:
+                self._served[job.tenant] = min(self._served.values(), default=0)
+
+            self._jobs.append(job)
+            self._ensure_workers()
+            self._cond.notify_all()
+
+        # Abgebrochene Jobs ohne laufende Hooks sofort abschließen
+        job.token.on_cancel(lambda: self._finish_if_idle(job))
+
+        logger.info(
+            f"📥 Job {job.job_id} eingereiht: {len(job.texts)} Hooks, "
+            f"{job.cost} Zeichen ({job.priority})"
+        )
+        return job
+
+    def _ensure_workers(self) -> None:
+        """Startet fehlende Worker-Threads (unter Lock aufrufen)"""
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"hook-worker-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _select(self) -> Optional[HookJob]:
+        """Wählt den Job für den nächsten Hook (unter Lock aufrufen)"""
+        pending = [job for job in self._jobs if job.has_pending]
+        if not pending:
+            return None
+
+        if self.policy == "fifo":
+            return min(pending, key=lambda job: job.submitted_at)
+
+        best_class = min(PRIORITY_ORDER.index(job.priority) for job in pending)
+        candidates = [job for job in pending if PRIORITY_ORDER.index(job.priority) == best_class]
+
+        floor = min(self._served[job.tenant] for job in candidates)
+        eligible = [job for job in candidates if self._served[job.tenant] - floor <= self.quantum]
+
+        return min(eligible, key=lambda job: (job.remaining_cost, job.submitted_at))
+
+    def _next_task(self) -> Optional[Tuple[HookJob, int]]:
+        """Blockiert bis ein Hook vergeben werden kann"""
+        idle_jobs: List[HookJob] = []
+
+        with self._cond:
+            while True:
+                if self._stopped:
+                    return None
+                job = self._select()
+                if job is None:
+                    self._cond.wait()
+                    continue
+
+                # Hooks überspringen, die das Zeitbudget des Jobs nicht mehr schaffen
+                text = job.texts[job.next_index]
+                if not job.token.can_finish(self.estimator.estimate(len(text))):
+                    if not job.token.cancelled:
+                        logger.warning(f"⏱️ Job {job.job_id}: Zeitbudget reicht nicht - überspringe Rest")
+                    job.deadline_skipped = True
+                    if self._detach_if_idle(job):
+                        idle_jobs.append(job)
+                    continue
+
+                # Hook erst vergeben, wenn die adaptive Parallelität einen Slot frei hat
+                concurrency = job.generator.concurrency
+                if concurrency is not None and not concurrency.try_acquire():
+                    self._cond.wait(CAPACITY_POLL_INTERVAL)
+                    continue
+                break
+
+            index = job.next_index
+            job.next_index += 1
+            job.in_flight += 1
+
+            cost = len(job.texts[index])
+            job.remaining_cost -= cost
+            self._served[job.tenant] += cost
+
+            if job.started_at is None:
+                job.started_at = time.monotonic()
+
+        for idle in idle_jobs:
+            self._finish(idle)
+
+        return job, index
+
+    @contextlib.contextmanager
+    def _profiled(self, job: HookJob):
+        """Misst den Block im Profil des Jobs (ohne Profil ein No-op)"""
+        if job.profile is None:
+            yield
+            return
+        with job.profile.activate(), job.profile.thread():
+            yield
+
+    def _worker(self) -> None:
+        """Worker-Schleife: holt Hooks und generiert sie"""
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+
+            job, index = task
+            text = job.texts[index]
+            concurrency = job.generator.concurrency
+            tracer = job.generator.tracer
+            ids = {'job_id': job.job_id, 'hook': job.numbers[index]}
+
+            with tracer.span("hook", parent=job.span, chars=len(text), **ids) as span, self._profiled(job):
+                # Hooks aus dem Cache verbrauchen weder Quota, Rate-Limit noch Synthese-Slot
+                cached = job.generator.is_cached(text)
+                if not cached:
+                    with profile_stage("queue_wait"), tracer.span("rate_limit_wait", **ids):
+                        self.rate_limiter.wait()
+                elif concurrency is not None:
+                    concurrency.release()
+
+                ok = False
+                started = time.monotonic()
+                try:
+                    output_path = str(job.output_dir / job.file_name(index))
+                    ok = job.generator.generate_audio_hook(text, output_path, job.token)
+                except Exception as e:
+                    logger.error(f"Fehler in Job {job.job_id}, Hook {index+1}: {e}")
+                finally:
+                    if concurrency is not None and not cached:
+                        concurrency.release()
+                span.set_attribute("ok", ok)
+
+            if ok and not cached:
+                self.estimator.record(len(text), time.monotonic() - started)
+            self._complete(job, index, ok)
+
+    def _detach_if_idle(self, job: HookJob) -> bool:
+        """Entfernt einen Job ohne offene oder laufende Hooks (unter Lock aufrufen)"""
+        if job.in_flight or job.has_pending or job not in self._jobs:
+            return False
+
+        self._jobs.remove(job)
+        if not any(other.tenant == job.tenant for other in self._jobs):
+            self._served.pop(job.tenant, None)
+        return True
+
+    def _finish_if_idle(self, job: HookJob) -> None:
+        """Schließt einen Job ab, falls keine Hooks mehr laufen"""
+        with self._cond:
+            finished = self._detach_if_idle(job)
+        if finished:
+            self._finish(job)
+
+    def _complete(self, job: HookJob, index: int, ok: bool) -> None:
+        """Verbucht einen fertigen Hook und schließt den Job ggf. ab"""
+        with self._cond:
+            job.in_flight -= 1
+            if ok:
+                job.completed += 1
+                job.completed_indices.append(index)
+            elif job.error is None and not job.token.cancelled:
+                job.error = f"Fehler bei Hook {job.numbers[index]}"
+
+            finished = self._detach_if_idle(job)
+
+        if finished:
+            self._finish(job)
+
+    def _finish(self, job: HookJob) -> None:
+        """Packt das Ergebnis eines vollständig bearbeiteten Jobs"""
+        if job.token.cancelled and not job.token.timed_out:
+            job.result = (None, "⏹️ Generierung abgebrochen")
+        elif job.error:
+            job.result = (None, job.error)
+        elif not job.completed_indices and not (job.update and job.update.reused):
+            job.result = (None, "⏱️ Zeitbudget erschöpft - keine Hooks generiert")
+        else:
+            mp3_files = [job.file_name(i) for i in sorted(job.completed_indices)]
+            with job.generator.tracer.span("zip", parent=job.span, job_id=job.job_id, files=len(mp3_files)), \
+                    self._profiled(job), profile_stage("zip"):
+                job.result = job.generator.create_zip(mp3_files, str(job.output_dir), job.update)
+            if job.result[0] and len(mp3_files) < len(job.texts):
+                reused = len(job.update.reused) if job.update else 0
+                job.result = (job.result[0], f"⏱️ Zeitbudget erschöpft - {len(mp3_files) + reused} "
+                                             f"von {len(job.texts) + reused} Hooks generiert")
+
+            summary = job.generator.phrase_summary()
+            if job.result[0] and summary:
+                job.result = (job.result[0], f"{job.result[1]}\n{summary}")
+
+        if job.profile is not None:
+            job.profile.stop()
+            job.result = (job.result[0], f"{job.result[1]}\n{job.profile.summary()}")
+
+        job.finished_at = time.monotonic()
+        job.span.set_attribute("completed", len(job.completed_indices))
+        if job.result[0] is None:
+            job.span.set_status("error", job.result[1])
+        job.span.end()
+        job._done.set()
+        logger.info(f"🏁 Job {job.job_id} abgeschlossen nach {job.completion_time:.1f}s")
+
+    def queue_length(self) -> int:
+        """Anzahl noch nicht vergebener Hooks über alle Jobs"""
+        with self._cond:
+            return sum(len(job.texts) - job.next_index for job in self._jobs if job.has_pending)
+
+    def shutdown(self) -> None:
+        """Stoppt alle Worker nach dem aktuellen Hook"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+
+# Globale Instanzen (von allen Nutzern des Interfaces geteilt)
+job_scheduler = JobScheduler()
+
+# Entwürfe sind günstig: eigener Pool mit mehr Workern (Rate-Limit bleibt geteilt)
+draft_scheduler = JobScheduler(workers=config.render.draft_workers)
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Scheduler-Modul geladen")
@@ -3,62 +3,490 @@ Setup-Modul für Colab-Sound Projekt
 Behandelt Installation, Konfiguration und Initialisierung
 """
 
+import contextlib
+import hashlib
+import json
+import os
+import shutil
 import subprocess
 import sys
-from typing import List, Dict, Any
+import tempfile
+import time
+import zipfile
+from email.parser import Parser
+from importlib import metadata
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 from src.logger import get_logger
+from src.config import get_config
+
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+    from packaging.tags import sys_tags
+    from packaging.utils import InvalidWheelFilename, canonicalize_name, parse_wheel_filename
+except ImportError:
+    # packaging fehlt in minimalen Umgebungen, pip bringt es immer mit
+    from pip._vendor.packaging.requirements import InvalidRequirement, Requirement
+    from pip._vendor.packaging.tags import sys_tags
+    from pip._vendor.packaging.utils import InvalidWheelFilename, canonicalize_name, parse_wheel_filename
 
 logger = get_logger("setup")
+config = get_config()
+
+# Prüfsummen der Wheels, geschrieben beim Bauen des Wheelhouse
+WHEELHOUSE_MANIFEST = "manifest.json"
+
+# Packages für das Web-Interface
+GRADIO_PACKAGES = ["gradio>=4.0", "nest_asyncio"]
+
+# Zustand der letzten Initialisierung (im Stempel-Verzeichnis, ohne Secrets)
+SNAPSHOT_FILE = "snapshot.json"
+
+
+def _ipython():
+    """Aktive IPython-Shell (None außerhalb von Notebooks)"""
+    try:
+        from IPython import get_ipython
+    except ImportError:
+        return None
+    return get_ipython()
 
 class ColabSetup:
     """Verwaltet Setup und Konfiguration für Google Colab"""
 
-    def __init__(self):
+    def __init__(self, wheelhouse_dir: Optional[str] = None, offline: Optional[bool] = None):
+        """
+        Args:
+            wheelhouse_dir: Optional: Verzeichnis mit vorgebauten Wheels (aus Config wenn nicht angegeben)
+            offline: Nie auf den Package-Index zugreifen (aus Config wenn nicht angegeben)
+        """
         self.installed_packages = set()
         self.config = {}
+        self.secrets: Dict[str, str] = {}
+        self.wheelhouse_dir = wheelhouse_dir or config.setup.wheelhouse_dir
+        self.offline = config.setup.offline if offline is None else offline
+        # SHA256 laut Manifest pro verifiziertem Wheel (aus wheelhouse_index)
+        self._wheel_hashes: Dict[str, str] = {}
 
-    def install_packages(self, packages: List[str], quiet: bool = True) -> bool:
+    def stamp_path(self, packages: List[str]) -> Path:
         """
-        Installiert Python-Packages mit pip
+        Stempel-Datei für eine Menge von Anforderungen
+
+        Der Schlüssel umfasst die Anforderungen und den Interpreter, damit
+        ein anderes venv oder eine andere Python-Version neu prüft.
+        """
+        canonical = "\n".join(sorted(package.strip() for package in packages))
+        key = hashlib.sha256(f"{sys.executable}\n{sys.version}\n{canonical}".encode('utf-8')).hexdigest()
+        return Path(config.setup.stamp_dir) / f"{key[:32]}.json"
+
+    def missing_requirements(self, packages: List[str]) -> List[str]:
+        """
+        Prüft Anforderungen gegen die installierten Distributionen
+
+        Args:
+            packages: Anforderungen (z.B. "gradio>=4.0")
+
+        Returns:
+            List[str]: Nicht erfüllte Anforderungen (fehlend oder falsche Version)
+        """
+        missing = []
+        for package in packages:
+            try:
+                requirement = Requirement(package)
+            except InvalidRequirement:
+                # Unbekanntes Format (URL, Pfad, ...) - pip entscheiden lassen
+                missing.append(package)
+                continue
+
+            if requirement.marker is not None and not requirement.marker.evaluate():
+                continue
+
+            try:
+                installed = metadata.version(requirement.name)
+            except metadata.PackageNotFoundError:
+                missing.append(package)
+                continue
+
+            if not requirement.specifier.contains(installed, prereleases=True):
+                logger.info(f"{requirement.name} {installed} erfüllt '{package}' nicht")
+                missing.append(package)
+        return missing
+
+    def install_packages(self, packages: List[str], quiet: bool = True, force: bool = False) -> bool:
+        """
+        Installiert Python-Packages mit pip, sofern sie nicht schon erfüllt sind
+
+        Bereits erfüllte Anforderungen werden übersprungen, alle fehlenden
+        in einem einzigen pip-Aufruf installiert. Danach merkt sich eine
+        Stempel-Datei (Schlüssel: Hash der Anforderungen) die installierten
+        Versionen - weitere Aufrufe gleichen nur diese ab und prüfen erst
+        neu, wenn sich eine Version geändert hat (Deinstallation, Downgrade).
 
         Args:
             packages: Liste der zu installierenden Packages
             quiet: Unterdrückt Ausgabe wenn True
+            force: Stempel ignorieren und erneut prüfen
+
+        Returns:
+            bool: True bei Erfolg
+        """
+        started = time.perf_counter()
+        names = [self._package_name(package) for package in packages]
+        stamp = self.stamp_path(packages)
+
+        if not force and self._stamp_valid(stamp):
+            self.installed_packages.update(names)
+            logger.info(f"Packages bereits erfüllt (Stempel, {(time.perf_counter() - started) * 1000:.0f}ms)")
+            return True
+
+        missing = self.missing_requirements(packages)
+        if missing:
+            with self._install_command(missing, quiet) as cmd:
+                if cmd is None:
+                    return False
+                try:
+                    subprocess.run(cmd, capture_output=quiet, text=True, check=True)
+                except subprocess.CalledProcessError as e:
+                    logger.error(f"Fehler bei Package-Installation: {e}")
+                    if e.stderr:
+                        logger.error(e.stderr.strip())
+                    return False
+            logger.info(f"Packages installiert: {', '.join(missing)}")
+        else:
+            logger.info(f"Packages bereits installiert: {', '.join(packages)}")
+
+        self.installed_packages.update(names)
+        self._write_stamp(stamp, packages)
+        return True
+
+    @contextlib.contextmanager
+    def _install_command(self, missing: List[str], quiet: bool = True, isolated: bool = False):
+        """
+        pip-Aufruf für fehlende Anforderungen (als Kontext: räumt das Staging-Verzeichnis auf)
+
+        Mit Wheelhouse werden die Abhängigkeiten vorab über die Metadaten
+        der verifizierten Wheels aufgelöst. pip sieht nur diese Wheels (in
+        einem eigenen --find-links-Verzeichnis). Deckt das Wheelhouse alles
+        ab, läuft pip ohne Index im Hash-Prüfmodus (--require-hashes mit
+        den SHA256 aus dem Manifest); sonst werden die abgedeckten
+        Anforderungen auf das lokale Wheel gepinnt und nur die fehlenden
+        Wheels aus dem Netz geladen.
+
+        Args:
+            missing: Fehlende Anforderungen
+            quiet: Unterdrückt Ausgabe wenn True
+            isolated: Ziel ohne die installierten Packages (z.B. pip --target)
+
+        Yields:
+            Optional[List[str]]: Kommando (None wenn offline nicht installierbar)
+        """
+        cmd = [sys.executable, '-m', 'pip', 'install'] + (['-q'] if quiet else [])
+        wheels = self.wheelhouse_index()
+        if not wheels:
+            if self.offline:
+                logger.error(f"Offline ohne Wheelhouse - nicht installierbar: {', '.join(missing)}")
+                yield None
+            else:
+                yield cmd + missing
+            return
+
+        selected, covered, uncovered = self._plan_wheelhouse(missing, wheels, isolated)
+        if uncovered and self.offline:
+            logger.error(f"Offline - keine Wheels für: {', '.join(uncovered)}")
+            yield None
+            return
+
+        with tempfile.TemporaryDirectory(prefix="wheelhouse-") as staging:
+            staging = Path(staging)
+            for version, path, _ in selected.values():
+                self._stage_wheel(path, staging)
+            cmd += ['--find-links', str(staging)]
+
+            if not uncovered:
+                lines = [f"{self._pinned_name(name, extras)}=={version} "
+                         f"--hash=sha256:{self._wheel_hashes[path.name]}"
+                         for name, (version, path, extras) in selected.items()]
+                requirements_file = staging / "requirements.txt"
+                requirements_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+                logger.info(f"📦 Installiere aus Wheelhouse (Hash-Prüfung): {', '.join(covered)}")
+                yield cmd + ['--no-index', '--require-hashes', '-r', str(requirements_file)]
+                return
+
+            logger.info(f"📦 Wheelhouse deckt {len(selected)} Wheels ab, "
+                        f"aus dem Netz: {', '.join(uncovered)}")
+            yield cmd + covered + uncovered
+
+    @staticmethod
+    def _pinned_name(name: str, extras) -> str:
+        return f"{name}[{','.join(sorted(extras))}]" if extras else name
+
+    def _plan_wheelhouse(self, missing: List[str], wheels: Dict[str, List[Tuple[str, Path]]],
+                         isolated: bool = False):
+        """
+        Löst fehlende Anforderungen samt Abhängigkeiten gegen das Wheelhouse auf
+
+        Abhängigkeiten, die bereits installiert sind, werden übersprungen
+        (außer isolated).
+
+        Returns:
+            Tuple: (Name -> (Version, Wheel, Extras), gepinnte Anforderungen,
+                Anforderungen ohne verifiziertes Wheel)
+        """
+        selected: Dict[str, Tuple[str, Path, set]] = {}
+        covered, uncovered = [], []
+        queue = [(package, True) for package in missing]
+        seen = set()
+
+        while queue:
+            package, top_level = queue.pop(0)
+            if package in seen:
+                continue
+            seen.add(package)
+            if not top_level and not isolated and not self.missing_requirements([package]):
+                continue
+
+            try:
+                requirement = Requirement(package)
+            except InvalidRequirement:
+                uncovered.append(package)
+                continue
+
+            name = canonicalize_name(requirement.name)
+            current = selected.get(name)
+            if current is not None and requirement.specifier.contains(current[0], prereleases=True):
+                version, path = current[0], current[1]
+            else:
+                wheel = self._find_wheel(package, wheels)
+                if wheel is None:
+                    uncovered.append(package)
+                    continue
+                version, path = wheel
+
+            dependencies = self._wheel_dependencies(path, requirement.extras)
+            if dependencies is None:
+                uncovered.append(package)
+                continue
+            extras = set(requirement.extras) | (current[2] if current is not None else set())
+            selected[name] = (version, path, extras)
+            queue.extend((dependency, False) for dependency in dependencies)
+            if top_level:
+                covered.append(f"{self._pinned_name(requirement.name, requirement.extras)}=={version}")
+
+        return selected, covered, uncovered
+
+    @staticmethod
+    def _wheel_dependencies(path: Path, extras) -> Optional[List[str]]:
+        """Abhängigkeiten eines Wheels für diese Umgebung (None bei unlesbarem Wheel)"""
+        try:
+            with zipfile.ZipFile(path) as wheel:
+                name = next(name for name in wheel.namelist()
+                            if name.count('/') == 1 and name.endswith('.dist-info/METADATA'))
+                text = wheel.read(name).decode('utf-8')
+        except (OSError, zipfile.BadZipFile, StopIteration, UnicodeDecodeError):
+            logger.error(f"Wheel ohne lesbare Metadaten, ignoriert: {path.name}")
+            return None
+
+        dependencies = []
+        for line in Parser().parsestr(text).get_all('Requires-Dist') or []:
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement:
+                continue
+            if requirement.marker is not None and not any(
+                    requirement.marker.evaluate({'extra': extra}) for extra in (extras or {''})):
+                continue
+            dependency_extras = f"[{','.join(sorted(requirement.extras))}]" if requirement.extras else ""
+            dependencies.append(f"{requirement.name}{dependency_extras}{requirement.specifier}")
+        return dependencies
+
+    @staticmethod
+    def _stage_wheel(path: Path, staging: Path) -> None:
+        """Legt ein verifiziertes Wheel ins Staging-Verzeichnis (Hardlink, sonst Kopie)"""
+        target = staging / path.name
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copyfile(path, target)
+
+    def wheelhouse_index(self) -> Dict[str, List[Tuple[str, Path]]]:
+        """
+        Verifizierte, zur Plattform passende Wheels des Wheelhouse
+
+        Nur Wheels mit passender SHA256 aus dem Manifest zählen; fehlende
+        oder veränderte Dateien werden wie fehlende Wheels behandelt.
+
+        Returns:
+            Dict[str, List[Tuple[str, Path]]]: Normalisierter Name -> [(Version, Pfad)]
+        """
+        if not self.wheelhouse_dir:
+            return {}
+        root = Path(self.wheelhouse_dir)
+        try:
+            manifest = json.loads((root / WHEELHOUSE_MANIFEST).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            logger.warning(f"Wheelhouse ohne gültiges Manifest: {root}")
+            return {}
+
+        supported = set(sys_tags())
+        index: Dict[str, List[Tuple[str, Path]]] = {}
+        for filename, expected in manifest.get('wheels', {}).items():
+            path = root / filename
+            try:
+                name, version, _, tags = parse_wheel_filename(filename)
+                actual = hashlib.sha256(path.read_bytes()).hexdigest()
+            except (OSError, InvalidWheelFilename):
+                continue
+            if actual != expected:
+                logger.error(f"Prüfsumme falsch, Wheel ignoriert: {filename}")
+                continue
+            if supported.isdisjoint(tags):
+                continue
+            self._wheel_hashes[filename] = expected
+            index.setdefault(name, []).append((str(version), path))
+        return index
+
+    @staticmethod
+    def _find_wheel(package: str, wheels: Dict[str, List[Tuple[str, Path]]]) -> Optional[Tuple[str, Path]]:
+        """Neuestes Wheel, das die Anforderung erfüllt (None wenn keines passt)"""
+        try:
+            requirement = Requirement(package)
+        except InvalidRequirement:
+            return None
+        candidates = [wheel for wheel in wheels.get(canonicalize_name(requirement.name), [])
+                      if requirement.specifier.contains(wheel[0], prereleases=True)]
+        return max(candidates, key=lambda wheel: parse_wheel_filename(wheel[1].name)[1], default=None)
+
+    def build_wheelhouse(self, path: str = "requirements.txt", wheelhouse_dir: Optional[str] = None,
+                         quiet: bool = True) -> bool:
+        """
+        Baut das Wheelhouse einmalig aus einer requirements.txt (samt aller Abhängigkeiten)
+
+        Vorhandene Wheels werden wiederverwendet; das Manifest enthält die
+        SHA256 jedes Wheels und wird bei jeder Installation geprüft.
+
+        Args:
+            path: Pfad der requirements.txt
+            wheelhouse_dir: Zielverzeichnis (default: self.wheelhouse_dir)
+            quiet: Unterdrückt Ausgabe wenn True
 
         Returns:
             bool: True bei Erfolg
         """
+        root = Path(wheelhouse_dir or self.wheelhouse_dir or "wheelhouse")
         try:
-            cmd = [sys.executable, '-m', 'pip', 'install']
+            requirements = self.read_requirements(path)
+            root.mkdir(parents=True, exist_ok=True)
+            cmd = [sys.executable, '-m', 'pip', 'wheel', '--wheel-dir', str(root), '--find-links', str(root)]
             if quiet:
                 cmd.append('-q')
-            cmd.extend(packages)
+            subprocess.run(cmd + requirements, capture_output=quiet, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.error(f"Wheelhouse konnte nicht gebaut werden: {e}")
+            return False
 
-            result = subprocess.run(cmd, capture_output=quiet, text=True, check=True)
+        wheels = {wheel.name: hashlib.sha256(wheel.read_bytes()).hexdigest() for wheel in root.glob("*.whl")}
+        manifest = {'requirements': requirements, 'wheels': wheels,
+                    'python': sys.version.split()[0], 'created': time.time()}
+        (root / WHEELHOUSE_MANIFEST).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
 
-            for package in packages:
-                self.installed_packages.add(package.split('>=')[0].split('==')[0])
+        self.wheelhouse_dir = str(root)
+        logger.info(f"📦 Wheelhouse gebaut: {len(wheels)} Wheels in {root}")
+        return True
 
-            logger.info(f"Packages installiert: {', '.join(packages)}")
-            return True
+    @staticmethod
+    def _package_name(package: str) -> str:
+        """Distributionsname einer Anforderung ("gradio>=4.0" -> "gradio")"""
+        try:
+            return Requirement(package).name
+        except InvalidRequirement:
+            return package
 
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Fehler bei Package-Installation: {e}")
+    def _stamp_valid(self, stamp: Path) -> bool:
+        """Ob der Stempel existiert und alle darin gemerkten Versionen noch installiert sind"""
+        try:
+            data = json.loads(stamp.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
             return False
 
+        for name, version in data.get('versions', {}).items():
+            try:
+                installed = metadata.version(name)
+            except metadata.PackageNotFoundError:
+                installed = None
+            if installed != version:
+                logger.info(f"{name} hat sich geändert ({version} -> {installed or 'fehlt'}), prüfe erneut")
+                return False
+        return True
+
+    def _write_stamp(self, stamp: Path, packages: List[str]) -> None:
+        """Merkt sich erfüllte Anforderungen samt installierter Versionen"""
+        versions = {}
+        for package in packages:
+            name = self._package_name(package)
+            try:
+                versions[name] = metadata.version(name)
+            except metadata.PackageNotFoundError:
+                continue
+        try:
+            stamp.parent.mkdir(parents=True, exist_ok=True)
+            stamp.write_text(json.dumps({'requirements': packages, 'versions': versions,
+                                         'python': sys.executable, 'created': time.time()}, indent=2),
+                             encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"Stempel konnte nicht geschrieben werden: {e}")
+
+    def read_requirements(self, path: str = "requirements.txt") -> List[str]:
+        """
+        Liest Anforderungen aus einer requirements.txt
+
+        Args:
+            path: Pfad der Datei
+
+        Returns:
+            List[str]: Anforderungen ohne Kommentare, Leerzeilen und pip-Optionen
+        """
+        requirements = []
+        for line in Path(path).read_text(encoding='utf-8').splitlines():
+            line = line.split(' #')[0].strip()
+            if line and not line.startswith(('#', '-')):
+                requirements.append(line)
+        return requirements
+
+    def install_requirements(self, path: str = "requirements.txt", quiet: bool = True) -> bool:
+        """
+        Installiert eine requirements.txt (ein pip-Aufruf, übersprungen wenn erfüllt)
+
+        Args:
+            path: Pfad der Datei
+            quiet: Unterdrückt Ausgabe wenn True
+
+        Returns:
+            bool: True bei Erfolg
+        """
+        try:
+            requirements = self.read_requirements(path)
+        except OSError as e:
+            logger.error(f"Requirements nicht lesbar: {e}")
+            return False
+        return self.install_packages(requirements, quiet)
+
     def setup_gradio(self) -> bool:
         """Richtet Gradio für Colab ein"""
-        try:
-            # Gradio installieren
-            if not self.install_packages(["gradio>=4.0"]):
-                return False
+        # Gradio und nest_asyncio installieren (ein pip-Aufruf, nur falls nötig)
+        if not self.install_packages(GRADIO_PACKAGES):
+            return False
 
-            # Nest asyncio installieren
-            if not self.install_packages(["nest_asyncio"]):
-                return False
+        return self.load_extensions()
+
+    def load_extensions(self) -> bool:
+        """Lädt die Gradio-Extension und aktiviert nest_asyncio"""
+        try:
+            shell = _ipython()
+            if shell is None:
+                raise RuntimeError("keine IPython-Umgebung")
 
             # Gradio Extension laden
-            get_ipython().run_line_magic('load_ext', 'gradio')
+            shell.run_line_magic('load_ext', 'gradio')
 
             # Nest asyncio aktivieren
             import nest_asyncio
@@ -104,29 +532,150 @@ class ColabSetup:
             logger.error(f"Fehler beim Laden der Secrets: {e}")
             return {}
 
+    def snapshot_path(self) -> Path:
+        """Ablageort des Setup-Snapshots"""
+        return Path(config.setup.stamp_dir) / SNAPSHOT_FILE
+
+    def load_snapshot(self) -> Dict[str, Any]:
+        """Snapshot der letzten Initialisierung (leer wenn keiner vorhanden)"""
+        try:
+            return json.loads(self.snapshot_path().read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def secrets_checksum(secrets: Dict[str, str]) -> str:
+        """Prüfsumme der Secrets-Konfiguration (die Werte selbst werden nie gespeichert)"""
+        canonical = json.dumps(secrets, sort_keys=True)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _packages_valid(self, snapshot: Dict[str, Any]) -> bool:
+        """Ob alle Packages noch in den Versionen des Snapshots installiert sind"""
+        versions = snapshot.get('packages')
+        if not versions or snapshot.get('python') != sys.executable:
+            return False
+        try:
+            return all(metadata.version(name) == version for name, version in versions.items())
+        except metadata.PackageNotFoundError:
+            return False
+
+    def _extensions_valid(self, snapshot: Dict[str, Any]) -> bool:
+        """Ob Extension und nest_asyncio in diesem Prozess schon aktiv sind"""
+        if snapshot.get('pid') != os.getpid() or 'gradio' not in snapshot.get('extensions', []):
+            return False
+        shell = _ipython()
+        return shell is not None and 'gradio' in shell.extension_manager.loaded
+
+    def _secrets_valid(self, snapshot: Dict[str, Any]) -> bool:
+        """Ob die Secrets dieses Prozesses die des Snapshots sind"""
+        return (snapshot.get('pid') == os.getpid() and bool(self.secrets)
+                and self.secrets_checksum(self.secrets) == snapshot.get('secrets_checksum'))
+
+    def _load_secrets_step(self) -> bool:
+        self.secrets = self.load_secrets()
+        return bool(self.secrets)
+
+    def _run_step(self, steps: Dict[str, Dict[str, Any]], snapshot: Dict[str, Any], name: str,
+                  valid, run) -> bool:
+        """
+        Führt einen Setup-Schritt aus, sofern der Snapshot ihn nicht als erledigt ausweist
+
+        Args:
+            steps: Bericht pro Schritt (wird ergänzt)
+            snapshot: Snapshot der letzten Initialisierung
+            name: Name des Schritts
+            valid: Prüfung, ob der Schritt noch gültig ist
+            run: Ausführung des Schritts (liefert Erfolg)
+
+        Returns:
+            bool: True wenn der Schritt erledigt ist
+        """
+        started = time.perf_counter()
+        skipped = valid(snapshot)
+        ok = True if skipped else run()
+        seconds = time.perf_counter() - started
+
+        # Kosten des Schritts: gemessen, oder bei Übersprungenem aus dem Snapshot
+        cost = snapshot.get('steps', {}).get(name, 0.0) if skipped else seconds
+        steps[name] = {
+            'ok': ok,
+            'skipped': skipped,
+            'seconds': seconds,
+            'cost_seconds': cost,
+            'saved_seconds': max(0.0, cost - seconds) if skipped else 0.0
+        }
+        return ok
+
+    def save_snapshot(self, steps: Dict[str, Dict[str, Any]]) -> None:
+        """Speichert den geprüften Zustand (Versionen, Extensions, Secrets-Prüfsumme)"""
+        packages = {}
+        if steps['packages']['ok']:
+            try:
+                packages = {name: metadata.version(name)
+                            for name in map(self._package_name, GRADIO_PACKAGES)}
+            except metadata.PackageNotFoundError:
+                packages = {}
+
+        snapshot = {
+            'python': sys.executable,
+            'pid': os.getpid(),
+            'packages': packages,
+            'extensions': ['gradio', 'nest_asyncio'] if steps['extensions']['ok'] else [],
+            'secret_keys': sorted(self.secrets),
+            'secrets_checksum': self.secrets_checksum(self.secrets) if self.secrets else None,
+            'steps': {name: step['cost_seconds'] for name, step in steps.items() if step['ok']},
+            'created': time.time()
+        }
+        path = self.snapshot_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(snapshot, indent=2), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"Setup-Snapshot konnte nicht gespeichert werden: {e}")
+
     def initialize(self) -> Dict[str, Any]:
         """
         Führt vollständige Initialisierung durch
 
+        Schritte, die laut Snapshot der letzten Initialisierung noch gültig
+        sind, werden übersprungen: Packages bei unveränderten Versionen,
+        Extension und Secrets im selben Prozess.
+
         Returns:
-            Dict mit Setup-Status und Konfiguration
+            Dict mit Setup-Status und Konfiguration (warm_start: Bericht pro Schritt)
         """
         logger.info("🚀 Starte Colab-Sound Setup...")
+        snapshot = self.load_snapshot()
+        steps: Dict[str, Dict[str, Any]] = {}
 
         # Gradio Setup
-        gradio_ok = self.setup_gradio()
+        packages_ok = self._run_step(steps, snapshot, 'packages', self._packages_valid,
+                                     lambda: self.install_packages(GRADIO_PACKAGES))
+        extensions_ok = self._run_step(steps, snapshot, 'extensions', self._extensions_valid,
+                                       lambda: packages_ok and self.load_extensions())
+        gradio_ok = packages_ok and extensions_ok
 
         # Secrets laden
-        secrets = self.load_secrets()
+        self._run_step(steps, snapshot, 'secrets', self._secrets_valid, self._load_secrets_step)
+        secrets = self.secrets
+
+        self.save_snapshot(steps)
+        time_saved = sum(step['saved_seconds'] for step in steps.values())
 
         # Status zusammenfassen
         status = {
             'gradio_setup': gradio_ok,
             'secrets_loaded': bool(secrets),
             'packages_installed': list(self.installed_packages),
-            'secrets': secrets
+            'secrets': secrets,
+            'warm_start': steps,
+            'time_saved': time_saved
         }
 
+        skipped = [f"{name} ({step['saved_seconds']:.2f}s gespart)" for name, step in steps.items() if step['skipped']]
+        if skipped:
+            logger.info(f"⚡ Warmstart: {', '.join(skipped)}")
+
         if gradio_ok and secrets:
             logger.info("Setup erfolgreich abgeschlossen!")
         else:
@@ -141,6 +690,14 @@ def init_colab():
     """Vereinfachte Initialisierungsfunktion"""
     return setup.initialize()
 
+def install_requirements(path: str = "requirements.txt") -> bool:
+    """Installiert fehlende Abhängigkeiten aus einer requirements.txt"""
+    return setup.install_requirements(path)
+
+def build_wheelhouse(path: str = "requirements.txt", wheelhouse_dir: Optional[str] = None) -> bool:
+    """Baut das Wheelhouse für spätere Offline-Installationen"""
+    return setup.build_wheelhouse(path, wheelhouse_dir)
+
 # Automatische Initialisierung beim Import
 if __name__ != "__main__":
     logger.debug("Colab-Sound Setup-Modul geladen")
\ No newline at end of file
@@ -0,0 +1,301 @@
+"""
+Sweep-Modul für Colab-Sound Projekt
+A/B-Vergleich von Voice-Settings: rendert ausgewählte Hooks für ein Raster aus Einstellungen und Stimmen
+"""
+
+import csv
+import io
+import itertools
+import json
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from src.logger import get_logger
+from src.config import get_config
+from src.generator import HookGenerator, QUALITY_DRAFT
+from src.backends import TTSBackend
+from src.cancellation import CancellationToken
+from src.rate_limiter import RateLimiter, get_rate_limiter
+from src.validator import AudioValidator
+
+logger = get_logger("sweep")
+config = get_config()
+
+
+@dataclass
+class SweepPoint:
+    """Eine Kombination aus Stimme und Voice-Settings"""
+
+    voice_id: str
+    stability: float
+    similarity_boost: float
+    style: float
+
+    @property
+    def settings(self) -> Dict[str, float]:
+        """Voice-Settings im Format des Backends"""
+        return {
+            "stability": self.stability,
+            "similarity_boost": self.similarity_boost,
+            "style": self.style
+        }
+
+    @property
+    def label(self) -> str:
+        """Verzeichnisname im Ergebnis-ZIP (Werte exakt, damit 0.12 und 0.125 getrennt bleiben)"""
+        voice = re.sub(r'[^A-Za-z0-9_-]', '_', self.voice_id)
+        return (f"{voice}_stab{float(self.stability)!r}_sim{float(self.similarity_boost)!r}"
+                f"_style{float(self.style)!r}")
+
+
+def build_grid(voice_ids: List[str], stability: List[float], similarity_boost: List[float],
+               style: List[float]) -> List[SweepPoint]:
+    """
+    Bildet das Kreuzprodukt aller Werte
+
+    Args:
+        voice_ids: Stimmen
+        stability: Werte für stability
+        similarity_boost: Werte für similarity_boost
+        style: Werte für style
+
+    Returns:
+        List[SweepPoint]: Alle Kombinationen (ohne Duplikate)
+
+    Raises:
+        ValueError: Wenn zwei Kombinationen denselben Verzeichnisnamen ergäben
+            (z.B. Voice IDs, die sich nur in Sonderzeichen unterscheiden)
+    """
+    points = []
+    labels: Dict[str, SweepPoint] = {}
+    for combination in itertools.product(voice_ids, stability, similarity_boost, style):
+        point = SweepPoint(*combination)
+        if point in points:
+            continue
+        if point.label in labels:
+            raise ValueError(f"Kombinationen nicht unterscheidbar: {labels[point.label]} und {point}")
+        labels[point.label] = point
+        points.append(point)
+    return points
+
+
+def parse_values(text: str, name: str) -> List[float]:
+    """
+    Liest eine kommagetrennte Werteliste (z.B. "0.0, 0.5, 1.0")
+
+    Args:
+        text: Eingabe
+        name: Name des Parameters (für Fehlermeldungen)
+
+    Returns:
+        List[float]: Werte zwischen 0 und 1
+
+    Raises:
+        ValueError: Bei leerer Eingabe oder Werten außerhalb von 0..1
+    """
+    values = []
+    for part in text.replace(';', ',').split(','):
+        if not part.strip():
+            continue
+        try:
+            value = float(part)
+        except ValueError:
+            raise ValueError(f"Ungültiger Wert für {name}: {part.strip()}")
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"{name} muss zwischen 0 und 1 liegen: {value}")
+        values.append(value)
+
+    if not values:
+        raise ValueError(f"Keine Werte für {name} angegeben")
+    return values
+
+
+def parse_hook_numbers(text: str, count: int) -> List[int]:
+    """
+    Liest eine Hook-Auswahl (z.B. "1-3, 5"), leer = alle Hooks
+
+    Args:
+        text: Eingabe
+        count: Anzahl verfügbarer Hooks
+
+    Returns:
+        List[int]: Sortierte Hook-Nummern (ab 1)
+
+    Raises:
+        ValueError: Bei ungültiger Eingabe oder Nummern außerhalb des Bereichs
+    """
+    if not text or not text.strip():
+        return list(range(1, count + 1))
+
+    numbers = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        match = re.fullmatch(r'(\d+)\s*(?:-\s*(\d+))?', part)
+        if not match:
+            raise ValueError(f"Ungültige Hook-Auswahl: {part}")
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        if start < 1 or end > count or start > end:
+            raise ValueError(f"Hook-Auswahl außerhalb von 1-{count}: {part}")
+        numbers.update(range(start, end + 1))
+
+    return sorted(numbers)
+
+
+class VoiceSweep:
+    """Rendert Hooks für alle Punkte eines Rasters parallel unter dem geteilten Rate-Limiter"""
+
+    def __init__(self, api_key: str, points: List[SweepPoint], quality: str = QUALITY_DRAFT,
+                 workers: int = None, backend: Optional[TTSBackend] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialisiert den Sweep
+
+        Args:
+            api_key: API Key für das Backend
+            points: Raster aus build_grid
+            quality: Render-Qualität (Entwurf als Default, der Cache gilt pro Qualität)
+            workers: Parallele Renderings (aus Config wenn nicht angegeben)
+            backend: Optional: TTS-Backend (aus Config wenn nicht angegeben)
+            rate_limiter: Optional: Rate-Limiter (global geteilt wenn nicht angegeben)
+        """
+        if not points:
+            raise ValueError("Sweep benötigt mindestens einen Rasterpunkt")
+
+        self.points = points
+        self.quality = quality
+        self.workers = workers or config.sweep.workers
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.validator = AudioValidator()
+
+        self.generators: Dict[str, HookGenerator] = {}
+        for point in points:
+            generator = HookGenerator(api_key, point.voice_id, quality=quality, backend=backend)
+            generator.voice_settings = point.settings
+            self.generators[point.label] = generator
+
+    def _render(self, point: SweepPoint, number: int, text: str, output_dir: Path,
+                token: Optional[CancellationToken]) -> dict:
+        """Rendert einen Hook für einen Rasterpunkt"""
+        generator = self.generators[point.label]
+        file_name = f"{point.label}/hook_{number:02d}.mp3"
+        file_path = output_dir / file_name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        entry = {'hook': number, 'point': point.label, 'file': None, 'cached': False,
+                 'duration': None, 'bytes': None}
+        if token is not None and token.cancelled:
+            return entry
+
+        # Bereits gerenderte Rasterpunkte kommen aus dem Cache und verbrauchen kein Rate-Limit
+        entry['cached'] = generator.is_cached(text)
+        if not entry['cached']:
+            self.rate_limiter.wait()
+
+        if generator.generate_audio_hook(text, str(file_path), token):
+            entry['file'] = file_name
+            entry['bytes'] = file_path.stat().st_size
+            entry['duration'] = round(self.validator.validate_file(str(file_path)).duration, 3)
+        return entry
+
+    def run(self, texts: List[str], numbers: List[int], output_dir: str,
+            token: Optional[CancellationToken] = None) -> Tuple[Optional[str], str]:
+        """
+        Rendert das Kreuzprodukt aus Hooks und Rasterpunkten und packt es als ZIP
+
+        Layout: <rasterpunkt>/hook_NN.mp3 sowie manifest.json und vergleich.csv
+        mit den Einstellungen, Dauer und Größe jedes Renderings.
+
+        Args:
+            texts: Alle Hook-Texte der Datei
+            numbers: Ausgewählte Hook-Nummern (ab 1)
+            output_dir: Ausgabeverzeichnis
+            token: Optional: Cancellation-Token mit Abbruch und Zeitbudget
+
+        Returns:
+            Tuple[Optional[str], str]: (ZIP-Pfad, Status-Nachricht)
+        """
+        total = len(numbers) * len(self.points)
+        if total == 0:
+            return None, "Keine Hooks für den Sweep ausgewählt"
+        if total > config.sweep.max_renders:
+            return None, f"Sweep zu groß ({total} Renderings). Maximum: {config.sweep.max_renders}"
+
+        output_dir = Path(output_dir)
+        logger.info(f"🎛️ Starte Sweep: {len(numbers)} Hooks x {len(self.points)} Einstellungen")
+
+        tasks = [(point, number) for point in self.points for number in numbers]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(self._render, point, number, texts[number - 1], output_dir, token)
+                for point, number in tasks
+            ]
+            renders = [future.result() for future in futures]
+
+        if token is not None and token.cancelled and not token.timed_out:
+            self._cleanup(renders, output_dir)
+            return None, "⏹️ Sweep abgebrochen"
+
+        done = [entry for entry in renders if entry['file']]
+        if not done:
+            return None, "Keine Renderings erfolgreich"
+
+        manifest = {
+            'quality': self.quality,
+            'points': [dict(asdict(point), label=point.label) for point in self.points],
+            'hooks': [{'number': number, 'text': texts[number - 1]} for number in numbers],
+            'renders': renders
+        }
+
+        zip_path = output_dir / config.sweep.zip_name
+        try:
+            with zipfile.ZipFile(zip_path, 'w') as z:
+                for entry in done:
+                    z.write(str(output_dir / entry['file']), entry['file'])
+                z.writestr("manifest.json", json.dumps(manifest, indent=2, ensure_ascii=False))
+                z.writestr("vergleich.csv", self._comparison_csv(renders))
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen der ZIP-Datei: {e}")
+            return None, f"Fehler beim Erstellen der ZIP-Datei: {e}"
+        finally:
+            self._cleanup(renders, output_dir)
+
+        cached = sum(1 for entry in done if entry['cached'])
+        logger.info(f"📦 Sweep-ZIP erstellt: {zip_path}")
+        message = f"✅ {len(done)} von {total} Renderings erstellt ({cached} aus Cache)"
+        return str(zip_path), message
+
+    def _comparison_csv(self, renders: List[dict]) -> str:
+        """Vergleichstabelle: eine Zeile pro Hook und Rasterpunkt"""
+        points = {point.label: point for point in self.points}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["hook", "voice_id", "stability", "similarity_boost", "style",
+                         "duration", "bytes", "cached", "file"])
+        for entry in sorted(renders, key=lambda e: (e['hook'], e['point'])):
+            point = points[entry['point']]
+            writer.writerow([entry['hook'], point.voice_id, point.stability, point.similarity_boost,
+                             point.style, entry['duration'], entry['bytes'], entry['cached'],
+                             entry['file'] or ""])
+        return buffer.getvalue()
+
+    def _cleanup(self, renders: List[dict], output_dir: Path) -> None:
+        """Löscht die einzelnen MP3-Dateien nach dem Packen"""
+        for entry in renders:
+            if entry['file']:
+                (output_dir / entry['file']).unlink(missing_ok=True)
+        for point in self.points:
+            try:
+                (output_dir / point.label).rmdir()
+            except OSError:
+                pass
+
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Sweep-Modul geladen")
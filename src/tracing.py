@@ -0,0 +1,342 @@
+"""
+Tracing-Modul für Colab-Sound Projekt
+Spans im Stil von OpenTelemetry, exportiert als JSONL-Datei (ohne Collector)
+
+Jede Zeile der Trace-Datei ist ein abgeschlossener Span. Mit
+    python -m src.tracing trace.jsonl [timeline.json]
+entsteht daraus eine Timeline im Chrome-Trace-Format (chrome://tracing,
+Perfetto, speedscope) samt Übersicht über Überlappung und Leerlauf der Hooks.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("tracing")
+config = get_config()
+
+# Aktiver Span des aktuellen Threads bzw. Kontexts
+_current: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """Ein zeitlich begrenzter Abschnitt eines Laufs"""
+
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"] = None,
+                 start_ns: Optional[int] = None, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            tracer: Exportierender Tracer
+            name: Name des Spans (z.B. "hook", "request")
+            parent: Optional: Eltern-Span (bestimmt die Trace-ID)
+            start_ns: Optional: Startzeit in Nanosekunden seit Epoch (jetzt wenn nicht angegeben)
+            attributes: Optional: Attribute (z.B. job_id, hook)
+        """
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "ok"
+        self.thread = threading.current_thread().name
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Setzt ein Attribut"""
+        self.attributes[key] = value
+
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        """Setzt den Status ("ok" oder "error") und optional eine Fehlermeldung"""
+        self.status = status
+        if message:
+            self.attributes['error'] = message
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        """Beendet den Span und exportiert ihn (einmalig)"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        self.tracer.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Zeile der Trace-Datei"""
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round((self.end_ns - self.start_ns) / 1e6, 3),
+            'thread': self.thread,
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+class _NoopSpan:
+    """Span bei abgeschaltetem Tracing: alle Operationen sind No-ops"""
+
+    recording = False
+    attributes: Dict[str, Any] = {}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        pass
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_NOOP_CONTEXT = contextlib.nullcontext(NOOP_SPAN)
+
+
+def current_span() -> Optional[Span]:
+    """Aktiver Span im aktuellen Kontext (None außerhalb eines Spans)"""
+    return _current.get()
+
+
+class Tracer:
+    """Erzeugt Spans und hängt abgeschlossene Spans an eine JSONL-Datei an"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialisiert den Tracer
+
+        Args:
+            path: Optional: Trace-Datei (None = Tracing aus)
+        """
+        self.path = Path(path) if path else None
+        self.enabled = self.path is not None
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def start_span(self, name: str, parent: Optional[Span] = None,
+                   start_ns: Optional[int] = None, **attributes) -> Span:
+        """
+        Startet einen Span ohne ihn zu aktivieren (Ende mit span.end())
+
+        Args:
+            name: Name des Spans
+            parent: Optional: Eltern-Span (aktiver Span wenn nicht angegeben)
+            start_ns: Optional: Startzeit in Nanosekunden seit Epoch
+            **attributes: Attribute des Spans
+
+        Returns:
+            Span (bei abgeschaltetem Tracing ein No-op-Span)
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        if parent is None or not parent.recording:
+            parent = _current.get()
+        return Span(self, name, parent, start_ns, attributes)
+
+    def span(self, name: str, parent: Optional[Span] = None, **attributes):
+        """
+        Kontextmanager: Span für die Dauer des Blocks, verschachtelte Spans werden Kinder
+
+        Exceptions markieren den Span als fehlerhaft und werden weitergereicht.
+
+        Args:
+            name: Name des Spans
+            parent: Optional: Eltern-Span (aktiver Span wenn nicht angegeben)
+            **attributes: Attribute des Spans
+        """
+        if not self.enabled:
+            return _NOOP_CONTEXT
+        return self._active(self.start_span(name, parent, **attributes))
+
+    @contextlib.contextmanager
+    def _active(self, span: Span) -> Iterator[Span]:
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_status("error", str(e) or type(e).__name__)
+            raise
+        finally:
+            _current.reset(token)
+            span.end()
+
+    def record(self, name: str, start_ns: int, end_ns: int,
+               parent: Optional[Span] = None, **attributes) -> None:
+        """Exportiert einen nachträglich gemessenen Span"""
+        if self.enabled:
+            self.start_span(name, parent, start_ns, **attributes).end(end_ns)
+
+    def bind(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Überträgt den aktiven Span auf eine Funktion, die in einem anderen Thread läuft
+
+        Args:
+            fn: Funktion für einen Thread-Pool
+
+        Returns:
+            Funktion, die im Kontext des aktuellen Spans ausgeführt wird
+        """
+        if not self.enabled:
+            return fn
+        parent = _current.get()
+
+        def run(*args, **kwargs):
+            token = _current.set(parent)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _current.reset(token)
+
+        return run
+
+    def export(self, span: Span) -> None:
+        """Hängt einen abgeschlossenen Span an die Trace-Datei an"""
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.error(f"Span konnte nicht geschrieben werden: {e}")
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """
+    Liest eine Trace-Datei
+
+    Args:
+        path: JSONL-Datei
+
+    Returns:
+        List[Dict[str, Any]]: Spans nach Startzeit sortiert
+    """
+    with open(path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f if line.strip()]
+    return sorted(spans, key=lambda span: span['start_ns'])
+
+
+def to_chrome_trace(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Wandelt Spans in das Chrome-Trace-Format (Timeline / Flame-Ansicht)
+
+    Args:
+        spans: Spans aus load_spans
+
+    Returns:
+        Dict[str, Any]: JSON-Objekt mit traceEvents (Zeiten in Mikrosekunden)
+    """
+    threads = {}
+    events = []
+    for span in spans:
+        tid = threads.setdefault(span['thread'], len(threads) + 1)
+        events.append({
+            'name': span['name'],
+            'cat': span['status'],
+            'ph': 'X',
+            'ts': span['start_ns'] / 1000,
+            'dur': (span['end_ns'] - span['start_ns']) / 1000,
+            'pid': 1,
+            'tid': tid,
+            'args': dict(span['attributes'], span_id=span['span_id'], parent_id=span['parent_id'])
+        })
+    for name, tid in threads.items():
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': name}})
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def overlap_summary(spans: List[Dict[str, Any]], name: str = "hook") -> Dict[str, Any]:
+    """
+    Wie stark sich Spans eines Namens überlappen und wo Leerlauf entsteht
+
+    Args:
+        spans: Spans aus load_spans
+        name: Span-Name (Standard: ein Span pro Hook)
+
+    Returns:
+        Dict[str, Any]: Anzahl, maximale Überlappung, Leerlauf und die Lücken
+            (Start relativ zum ersten Span, Dauer) in Sekunden
+    """
+    selected = [span for span in spans if span['name'] == name]
+    if not selected:
+        return {'count': 0, 'max_overlap': 0, 'busy_seconds': 0.0, 'idle_seconds': 0.0, 'gaps': []}
+
+    events = sorted([(span['start_ns'], 1) for span in selected] +
+                    [(span['end_ns'], -1) for span in selected])
+    origin = events[0][0]
+    running = max_overlap = 0
+    busy = idle = 0
+    gaps = []
+    previous = origin
+    for timestamp, delta in events:
+        if running:
+            busy += timestamp - previous
+        elif timestamp > previous:
+            idle += timestamp - previous
+            gaps.append(((previous - origin) / 1e9, (timestamp - previous) / 1e9))
+        running += delta
+        max_overlap = max(max_overlap, running)
+        previous = timestamp
+
+    return {
+        'count': len(selected),
+        'max_overlap': max_overlap,
+        'busy_seconds': busy / 1e9,
+        'idle_seconds': idle / 1e9,
+        'gaps': gaps
+    }
+
+
+# Globale Instanz (Trace-Datei aus Config)
+_tracer: Tracer = None
+
+def get_tracer() -> Tracer:
+    """
+    Holt den globalen Tracer
+
+    Returns:
+        Tracer-Instanz (ohne config.tracing.enabled ein abgeschalteter Tracer)
+    """
+    global _tracer
+
+    if _tracer is None:
+        _tracer = Tracer(config.tracing.trace_file if config.tracing.enabled else None)
+
+    return _tracer
+
+
+def main(argv: List[str]) -> int:
+    """Kommandozeile: Trace-Datei in Chrome-Trace-Format wandeln und zusammenfassen"""
+    if not argv:
+        print("Aufruf: python -m src.tracing trace.jsonl [timeline.json]")
+        return 1
+
+    spans = load_spans(argv[0])
+    output = argv[1] if len(argv) > 1 else str(Path(argv[0]).with_suffix(".chrome.json"))
+    Path(output).write_text(json.dumps(to_chrome_trace(spans)), encoding="utf-8")
+
+    summary = overlap_summary(spans)
+    print(f"📈 {len(spans)} Spans -> {output}")
+    print(f"🎵 {summary['count']} Hooks, max. {summary['max_overlap']} gleichzeitig, "
+          f"Leerlauf {summary['idle_seconds']:.2f}s in {len(summary['gaps'])} Lücken")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+else:
+    # Automatische Info beim Import
+    logger.debug("Tracing-Modul geladen")
@@ -0,0 +1,250 @@
+"""
+Validator-Modul für Colab-Sound Projekt
+Prüft heruntergeladene Audio-Hooks auf Vollständigkeit und gültige MP3-Struktur
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("validator")
+config = get_config()
+
+# Bitraten (kbit/s) für Layer III, Index 0 = "free", 15 = ungültig
+BITRATES_MPEG1_L3 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0]
+BITRATES_MPEG2_L3 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0]
+
+# Sample-Raten nach MPEG-Version (Bits 19-20 des Headers)
+SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],   # MPEG 2.5
+}
+
+ID3V1_TAG_SIZE = 128
+
+
+@dataclass
+class ValidationResult:
+    """Ergebnis einer Audio-Prüfung"""
+
+    valid: bool
+    reason: str = ""
+    frames: int = 0
+    duration: float = 0.0
+
+
+def parse_frame_header(data: bytes, offset: int) -> Optional[Tuple[int, int, int]]:
+    """
+    Liest einen MPEG Layer III Frame-Header
+
+    Args:
+        data: Audio-Daten
+        offset: Position des Headers
+
+    Returns:
+        Optional[Tuple[int, int, int]]: (Frame-Länge, Samples pro Frame, Sample-Rate)
+        oder None wenn an der Position kein gültiger Header steht
+    """
+    if offset + 4 > len(data):
+        return None
+
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    padding = (b2 >> 1) & 0x01
+
+    # Nur Layer III (ElevenLabs liefert ausschließlich MP3)
+    if version == 1 or layer != 1 or sample_rate_index == 3:
+        return None
+
+    bitrates = BITRATES_MPEG1_L3 if version == 3 else BITRATES_MPEG2_L3
+    bitrate = bitrates[bitrate_index] * 1000
+    if bitrate == 0:
+        return None
+
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    if version == 3:
+        frame_length = 144 * bitrate // sample_rate + padding
+        samples = 1152
+    else:
+        frame_length = 72 * bitrate // sample_rate + padding
+        samples = 576
+
+    return frame_length, samples, sample_rate
+
+
+def skip_id3v2(data: bytes) -> int:
+    """
+    Ermittelt die Länge eines ID3v2-Tags am Dateianfang
+
+    Args:
+        data: Audio-Daten
+
+    Returns:
+        int: Offset des ersten Audio-Frames
+    """
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+
+    # Größe ist "syncsafe" (7 Bit pro Byte)
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def find_first_frame(data: bytes) -> Optional[int]:
+    """
+    Sucht den ersten gültigen Frame-Header (z.B. in einem teilweise empfangenen Stream)
+
+    Args:
+        data: Bisher empfangene Audio-Daten
+
+    Returns:
+        Optional[int]: Offset des ersten Frames oder None
+    """
+    offset = skip_id3v2(data)
+    while offset + 4 <= len(data):
+        if parse_frame_header(data, offset) is not None:
+            return offset
+        offset = data.find(b"\xFF", offset + 1)
+        if offset < 0:
+            return None
+    return None
+
+
+class AudioValidator:
+    """Prüft MP3-Dateien auf Content-Type, Frame-Kontinuität, Dauer und Abschneiden"""
+
+    def __init__(self, min_seconds_per_char: float = None, min_frames: int = None):
+        """
+        Initialisiert den Validator
+
+        Args:
+            min_seconds_per_char: Erwartete Mindestdauer pro Zeichen (aus Config wenn nicht angegeben)
+            min_frames: Mindestanzahl an Frames (aus Config wenn nicht angegeben)
+        """
+        self.min_seconds_per_char = (
+            min_seconds_per_char if min_seconds_per_char is not None
+            else config.validation.min_seconds_per_char
+        )
+        self.min_frames = min_frames if min_frames is not None else config.validation.min_frames
+
+    def check_content_type(self, content_type: Optional[str]) -> Optional[str]:
+        """
+        Prüft den Content-Type der API-Antwort
+
+        Args:
+            content_type: Wert des Content-Type Headers
+
+        Returns:
+            Optional[str]: Fehlerbeschreibung oder None wenn gültig
+        """
+        if not content_type:
+            return None
+
+        media_type = content_type.split(';')[0].strip().lower()
+        if not media_type.startswith('audio/'):
+            return f"Unerwarteter Content-Type: {media_type}"
+        return None
+
+    def validate_bytes(self, data: bytes, text: str = "",
+                       content_type: Optional[str] = None) -> ValidationResult:
+        """
+        Prüft MP3-Daten im Speicher
+
+        Args:
+            data: Audio-Daten
+            text: Zugehöriger Hook-Text (für die Mindestdauer)
+            content_type: Optional: Content-Type der API-Antwort
+
+        Returns:
+            ValidationResult: Prüfergebnis
+        """
+        error = self.check_content_type(content_type)
+        if error:
+            return ValidationResult(False, error)
+
+        if not data:
+            return ValidationResult(False, "Keine Audio-Daten empfangen")
+
+        if data.lstrip()[:1] in (b'{', b'['):
+            return ValidationResult(False, "Antwort ist JSON statt Audio")
+
+        # ID3v1-Tag am Ende gehört nicht zum Frame-Stream
+        end = len(data)
+        if end >= ID3V1_TAG_SIZE and data[end - ID3V1_TAG_SIZE:end - ID3V1_TAG_SIZE + 3] == b"TAG":
+            end -= ID3V1_TAG_SIZE
+
+        offset = skip_id3v2(data)
+        frames = 0
+        duration = 0.0
+
+        while offset < end:
+            header = parse_frame_header(data, offset)
+            if header is None:
+                return ValidationResult(
+                    False, f"Frame-Sync verloren bei Byte {offset}", frames, duration
+                )
+
+            frame_length, samples, sample_rate = header
+            if offset + frame_length > end:
+                return ValidationResult(
+                    False, f"Audio abgeschnitten in Frame {frames + 1}", frames, duration
+                )
+
+            frames += 1
+            duration += samples / sample_rate
+            offset += frame_length
+
+        if frames < self.min_frames:
+            return ValidationResult(False, f"Zu wenige MP3-Frames ({frames})", frames, duration)
+
+        min_duration = len(text) * self.min_seconds_per_char
+        if duration < min_duration:
+            return ValidationResult(
+                False,
+                f"Audio zu kurz ({duration:.2f}s, erwartet mindestens {min_duration:.2f}s)",
+                frames,
+                duration
+            )
+
+        return ValidationResult(True, "", frames, duration)
+
+    def validate_file(self, file_path: str, text: str = "",
+                      content_type: Optional[str] = None) -> ValidationResult:
+        """
+        Prüft eine MP3-Datei auf der Festplatte
+
+        Args:
+            file_path: Pfad zur MP3-Datei
+            text: Zugehöriger Hook-Text (für die Mindestdauer)
+            content_type: Optional: Content-Type der API-Antwort
+
+        Returns:
+            ValidationResult: Prüfergebnis
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            return ValidationResult(False, f"Datei nicht lesbar: {e}")
+
+        result = self.validate_bytes(data, text, content_type)
+        if result.valid:
+            logger.debug(f"Audio geprüft: {file_path} ({result.frames} Frames, {result.duration:.2f}s)")
+        return result
+
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Validator-Modul geladen")
@@ -0,0 +1,271 @@
+"""
+Workspace-Modul für Colab-Sound Projekt
+Isolierte Arbeitsverzeichnisse pro Job und automatisches Aufräumen alter Ausgaben
+"""
+
+import re
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+from src.logger import get_logger
+from src.config import get_config
+
+logger = get_logger("workspace")
+config = get_config()
+
+
+def directory_size(path: Path) -> int:
+    """
+    Berechnet die Gesamtgröße eines Verzeichnisses
+
+    Args:
+        path: Verzeichnis
+
+    Returns:
+        int: Größe in Bytes
+    """
+    total = 0
+    for entry in path.rglob('*'):
+        try:
+            if entry.is_file():
+                total += entry.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+class WorkspaceBusyError(Exception):
+    """Ein exklusiv angeforderter Workspace wird gerade von einem anderen Job benutzt"""
+
+
+class WorkspaceManager:
+    """Verwaltet ein eigenes Ausgabeverzeichnis pro Job"""
+
+    def __init__(self, root_dir: str = None):
+        """
+        Initialisiert den Workspace-Manager
+
+        Args:
+            root_dir: Basisverzeichnis (aus Config wenn nicht angegeben)
+        """
+        self.root_dir = Path(root_dir or config.workspace.root_dir)
+        self._active: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _sanitize(self, job_id: str) -> str:
+        """Macht eine Job-ID dateisystemsicher"""
+        return re.sub(r'[^A-Za-z0-9_-]', '_', job_id)[:64]
+
+    def create(self, job_id: Optional[str] = None, exclusive: bool = False) -> Path:
+        """
+        Erstellt (oder reaktiviert) einen Workspace und markiert ihn als aktiv
+
+        Args:
+            job_id: Optional: Job-ID, sonst wird eine eindeutige ID erzeugt
+            exclusive: Nur anlegen, wenn kein anderer Job den Workspace benutzt
+                (inkrementelle Läufe lesen und schreiben Manifest und ZIP-Datei)
+
+        Returns:
+            Path: Pfad zum Workspace
+
+        Raises:
+            WorkspaceBusyError: Bei exclusive, wenn der Workspace bereits aktiv ist
+        """
+        job_id = self._sanitize(job_id) if job_id else uuid.uuid4().hex[:12]
+        path = self.root_dir / job_id
+
+        with self._lock:
+            if exclusive and job_id in self._active:
+                raise WorkspaceBusyError(f"Workspace wird bereits benutzt: {job_id}")
+            path.mkdir(parents=True, exist_ok=True)
+            path.touch()  # Alter ab letzter Nutzung
+            self._active[job_id] = self._active.get(job_id, 0) + 1
+
+        logger.debug(f"Workspace erstellt: {path}")
+        return path
+
+    def contains(self, path) -> bool:
+        """
+        Prüft, ob ein Verzeichnis ein Workspace (unterhalb von root_dir) ist
+
+        Args:
+            path: Verzeichnis
+
+        Returns:
+            bool: True für Workspaces
+        """
+        return self.root_dir.resolve() in Path(path).resolve().parents
+
+    def release(self, workspace: Path) -> None:
+        """
+        Gibt einen Workspace frei, damit er aufgeräumt werden darf
+
+        Args:
+            workspace: Pfad zum Workspace
+        """
+        job_id = Path(workspace).name
+        with self._lock:
+            count = self._active.get(job_id, 0) - 1
+            if count > 0:
+                self._active[job_id] = count
+            else:
+                self._active.pop(job_id, None)
+
+    def list_workspaces(self) -> List[Dict[str, Any]]:
+        """
+        Listet alle Workspaces mit Alter und Größe
+
+        Returns:
+            List[Dict]: Einträge mit path, mtime, size, active
+        """
+        if not self.root_dir.exists():
+            return []
+
+        workspaces = []
+        for path in self.root_dir.iterdir():
+            if not path.is_dir():
+                continue
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            workspaces.append({
+                'path': path,
+                'mtime': mtime,
+                'size': directory_size(path),
+                'active': path.name in self._active
+            })
+        return workspaces
+
+    def cleanup(self, max_age_seconds: int = None, max_total_bytes: int = None) -> Dict[str, int]:
+        """
+        Löscht inaktive Workspaces nach Alter und Speicherbudget (älteste zuerst)
+
+        Args:
+            max_age_seconds: Maximales Alter (aus Config wenn nicht angegeben)
+            max_total_bytes: Speicherbudget (aus Config wenn nicht angegeben)
+
+        Returns:
+            Dict[str, int]: evicted, reclaimed_bytes, remaining_bytes
+        """
+        if max_age_seconds is None:
+            max_age_seconds = config.workspace.max_age_seconds
+        if max_total_bytes is None:
+            max_total_bytes = config.workspace.max_total_bytes
+
+        now = time.time()
+        evicted = 0
+        reclaimed = 0
+
+        with self._lock:
+            workspaces = sorted(self.list_workspaces(), key=lambda w: w['mtime'])
+            total = sum(w['size'] for w in workspaces)
+
+            for workspace in workspaces:
+                if workspace['active']:
+                    continue
+
+                too_old = now - workspace['mtime'] > max_age_seconds
+                over_budget = total > max_total_bytes
+                if not too_old and not over_budget:
+                    continue
+
+                try:
+                    shutil.rmtree(workspace['path'])
+                except OSError as e:
+                    logger.warning(f"Workspace konnte nicht gelöscht werden: {workspace['path']} ({e})")
+                    continue
+
+                evicted += 1
+                reclaimed += workspace['size']
+                total -= workspace['size']
+
+        return {'evicted': evicted, 'reclaimed_bytes': reclaimed, 'remaining_bytes': total}
+
+
+class OutputJanitor:
+    """Räumt alte Workspaces periodisch im Hintergrund auf"""
+
+    def __init__(self, manager: WorkspaceManager, interval: int = None):
+        """
+        Initialisiert den Aufräumer
+
+        Args:
+            manager: Zu überwachender Workspace-Manager
+            interval: Prüfintervall in Sekunden (aus Config wenn nicht angegeben)
+        """
+        self.manager = manager
+        self.interval = interval or config.workspace.janitor_interval
+        self.metrics = {
+            'runs': 0,
+            'evicted_workspaces': 0,
+            'reclaimed_bytes': 0,
+            'remaining_bytes': 0,
+            'last_run': None
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        Führt einen Aufräum-Durchlauf aus und aktualisiert die Metriken
+
+        Returns:
+            Dict[str, int]: Ergebnis des Durchlaufs
+        """
+        result = self.manager.cleanup()
+
+        self.metrics['runs'] += 1
+        self.metrics['evicted_workspaces'] += result['evicted']
+        self.metrics['reclaimed_bytes'] += result['reclaimed_bytes']
+        self.metrics['remaining_bytes'] = result['remaining_bytes']
+        self.metrics['last_run'] = time.time()
+
+        if result['evicted']:
+            logger.info(
+                f"🧹 {result['evicted']} Workspaces gelöscht, "
+                f"{result['reclaimed_bytes'] / 1024 / 1024:.1f}MB freigegeben"
+            )
+        return result
+
+    def _loop(self) -> None:
+        """Hintergrund-Schleife"""
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Fehler beim Aufräumen: {e}")
+
+    def start(self) -> None:
+        """Startet den Hintergrund-Thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="output-janitor", daemon=True)
+        self._thread.start()
+        logger.debug("Output-Janitor gestartet")
+
+    def stop(self) -> None:
+        """Stoppt den Hintergrund-Thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+# Globale Instanzen
+workspace_manager = WorkspaceManager()
+output_janitor = OutputJanitor(workspace_manager)
+
+def start_janitor() -> OutputJanitor:
+    """Startet den globalen Aufräumer und gibt ihn zurück"""
+    output_janitor.start()
+    return output_janitor
+
+# Automatische Info beim Import
+if __name__ != "__main__":
+    logger.debug("Workspace-Modul geladen")
@@ -25,6 +25,16 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture(autouse=True)
+def isolated_audio_cache(tmp_path, monkeypatch):
+    """Jeder Test bekommt leere Caches (Audio, Module, Setup-Stempel, Demo)"""
+    from src.config import get_config
+    monkeypatch.setattr(get_config().render, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(get_config().git_loader, "cache_dir", str(tmp_path / "cache" / "git"))
+    monkeypatch.setattr(get_config().setup, "stamp_dir", str(tmp_path / "setup-stamps"))
+    monkeypatch.setattr(get_config().demo, "cache_dir", str(tmp_path / "cache" / "demo"))
+
+
 @pytest.fixture
 def sample_text_file(temp_dir):
     """Erstelle eine Beispiel-Text-Datei für Tests"""
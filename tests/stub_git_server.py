@@ -0,0 +1,159 @@
+"""
+Lokaler Stub-Server für raw.githubusercontent.com
+
+Liefert Quelltexte unter /{repo}/{version}/src/{module}.py mit ETag
+(If-None-Match -> 304), Repository-Archive wie codeload.github.com unter
+/archive/{repo}/{tar.gz|zip}/{version} und zählt Requests, Antwort-Status
+sowie gleichzeitige Verbindungen. Wird von den GitLoader-Tests
+verwendet.
+"""
+
+import hashlib
+import io
+import re
+import tarfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+SOURCE_PATH = re.compile(r'^/(?P<version>.+)/src/(?P<module>\w+)\.py$')
+ARCHIVE_PATH = re.compile(r'^/(?P<format>tar\.gz|zip)/(?P<version>.+)$')
+
+
+def make_archive(files: dict, top: str, archive_format: str) -> bytes:
+    """Erzeugt ein Repository-Archiv mit {top}/src/*.py und weiteren Dateien"""
+    entries = {f"{top}/src/{module}.py": code for module, code in files.items()}
+    entries[f"{top}/README.md"] = "# Test-Repository\n"
+    entries[f"{top}/tests/test_stub.py"] = "raise AssertionError('nicht laden')\n"
+
+    buffer = io.BytesIO()
+    if archive_format == "zip":
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for name, text in entries.items():
+                archive.writestr(name, text)
+    else:
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for name, text in entries.items():
+                data = text.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class StubGitServer:
+    """Stub für Roh-Dateien eines Repositories"""
+
+    def __init__(self, files: Dict[str, Dict[str, str]], repo: str = "test/repo", delay: float = 0.0):
+        """
+        Initialisiert den Stub
+
+        Args:
+            files: Version -> {Modulname: Quelltext}
+            repo: Repository im Format 'user/repo-name'
+            delay: Verzögerung pro Antwort in Sekunden
+        """
+        self.files = files
+        self.repo = repo
+        self.delay = delay
+        self.requests: List[str] = []
+        self.statuses: List[int] = []
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        """Basis-URL im Format von GitLoader.base_url"""
+        return f"http://127.0.0.1:{self._server.server_port}/{self.repo}"
+
+    @property
+    def archive_url(self) -> str:
+        """Basis-URL im Format von GitLoader.archive_url"""
+        return f"http://127.0.0.1:{self._server.server_port}/archive/{self.repo}"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests.append(self.path)
+                    stub.active += 1
+                    stub.peak_active = max(stub.peak_active, stub.active)
+                try:
+                    time.sleep(stub.delay)
+                    self.send_file()
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def send_file(self):
+                archive_prefix = f"/archive/{stub.repo}"
+                if self.path.startswith(archive_prefix):
+                    self.send_archive(ARCHIVE_PATH.match(self.path[len(archive_prefix):]))
+                    return
+
+                prefix = f"/{stub.repo}"
+                match = SOURCE_PATH.match(self.path[len(prefix):]) if self.path.startswith(prefix) else None
+                code = stub.files.get(match['version'], {}).get(match['module']) if match else None
+                if code is None:
+                    self.send_body(404, b"404: Not Found")
+                    return
+
+                payload = code.encode("utf-8")
+                etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_body(304, b"", etag)
+                    return
+                self.send_body(200, payload, etag)
+
+            def send_archive(self, match):
+                files = stub.files.get(match['version']) if match else None
+                if files is None:
+                    self.send_body(404, b"404: Not Found")
+                    return
+                top = f"{stub.repo.split('/')[-1]}-{match['version'].replace('/', '-')}"
+                self.send_body(200, make_archive(files, top, match['format']))
+
+            def send_body(self, status, payload, etag=None):
+                with stub._lock:
+                    stub.statuses.append(status)
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                if etag:
+                    self.send_header("ETag", etag)
+                if status != 304:
+                    self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubGitServer":
+        """Startet den Server auf einem freien Port"""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stoppt den Server"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubGitServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,153 @@
+"""
+Lokaler Stub-Server für die ElevenLabs Text-to-Speech API
+
+Liefert stumme MP3-Frames per Chunked Transfer-Encoding und kann langsame
+Antworten sowie eine Quota gleichzeitiger Requests (429) simulieren.
+Wird von Tests und Benchmarks verwendet.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlparse, parse_qs
+
+# MPEG1 Layer III, 128 kbit/s, 44100 Hz -> 417 Bytes pro Frame (~26ms Audio)
+FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+FRAME_LENGTH = 417
+
+
+def make_mp3(frames: int) -> bytes:
+    """Erzeugt einen Stream aus stummen MP3-Frames"""
+    frame = FRAME_HEADER + bytes(FRAME_LENGTH - len(FRAME_HEADER))
+    return frame * frames
+
+
+class StubTTSServer:
+    """Stub für /v1/text-to-speech/{voice_id}[/stream]"""
+
+    def __init__(self, frames: int = 40, frames_per_chunk: int = 4, chunk_delay: float = 0.0,
+                 first_byte_delay: float = 0.0, status: int = 200,
+                 max_concurrent: Optional[int] = None, latency_per_active: float = 0.0):
+        """
+        Initialisiert den Stub
+
+        Args:
+            frames: Anzahl MP3-Frames pro Antwort
+            frames_per_chunk: Frames pro gesendetem Chunk
+            chunk_delay: Pause zwischen Chunks in Sekunden
+            first_byte_delay: Pause vor dem ersten Chunk in Sekunden
+            status: HTTP-Status der Antwort
+            max_concurrent: Optional: Quota gleichzeitiger Requests, darüber 429
+            latency_per_active: Zusätzliche Verzögerung vor dem ersten Chunk pro laufendem Request
+        """
+        self.frames = frames
+        self.frames_per_chunk = frames_per_chunk
+        self.chunk_delay = chunk_delay
+        self.first_byte_delay = first_byte_delay
+        self.status = status
+        self.max_concurrent = max_concurrent
+        self.latency_per_active = latency_per_active
+        self.requests: List[dict] = []
+        self.active = 0
+        self.peak_active = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def api_base(self) -> str:
+        """Basis-URL im Format von ElevenLabsConfig.api_base"""
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                url = urlparse(self.path)
+
+                with stub._lock:
+                    stub.requests.append({
+                        'path': url.path,
+                        'query': {k: v[0] for k, v in parse_qs(url.query).items()},
+                        'body': body
+                    })
+                    throttled = stub.max_concurrent is not None and stub.active >= stub.max_concurrent
+                    if throttled:
+                        stub.throttled += 1
+                    else:
+                        stub.active += 1
+                        stub.peak_active = max(stub.peak_active, stub.active)
+                        active = stub.active
+
+                if throttled:
+                    self.send_error_payload(429, "too_many_concurrent_requests")
+                    return
+
+                try:
+                    self.send_audio(active)
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def send_error_payload(self, status, detail):
+                payload = json.dumps({"detail": detail}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def send_audio(self, active):
+                if stub.status != 200:
+                    self.send_error_payload(stub.status, "stub error")
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "audio/mpeg")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                time.sleep(stub.first_byte_delay + stub.latency_per_active * active)
+                data = make_mp3(stub.frames)
+                step = FRAME_LENGTH * stub.frames_per_chunk
+                try:
+                    for offset in range(0, len(data), step):
+                        chunk = data[offset:offset + step]
+                        self.wfile.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+                        self.wfile.flush()
+                        time.sleep(stub.chunk_delay)
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubTTSServer":
+        """Startet den Server auf einem freien Port"""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stoppt den Server"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubTTSServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,106 @@
+"""
+Tests für audio_cache.py Modul und Entwurfs-/Final-Renderings
+"""
+
+import os
+import pytest
+from src.audio_cache import AudioCache
+from src.generator import HookGenerator, QUALITY_DRAFT, QUALITY_FINAL, config
+from tests.stub_server import StubTTSServer
+
+
+class TestAudioCache:
+    """Tests für Ablage, Treffer und Verdrängung"""
+
+    def test_store_and_fetch(self, tmp_path):
+        """Test: Abgelegte Dateien werden unverändert geliefert"""
+        cache = AudioCache(str(tmp_path / "cache"))
+        source = tmp_path / "hook.mp3"
+        source.write_bytes(b"audio")
+        key = AudioCache.make_key(text="Hallo")
+
+        assert not cache.fetch(key, str(tmp_path / "miss.mp3"))
+        cache.store(key, str(source))
+        assert cache.fetch(key, str(tmp_path / "hit.mp3"))
+        assert (tmp_path / "hit.mp3").read_bytes() == b"audio"
+        assert cache.metrics['hits'] == 1
+        assert cache.metrics['misses'] == 1
+
+    def test_overwrite_counts_size_once(self, tmp_path):
+        """Test: Erneutes Ablegen desselben Schlüssels zählt seine Größe nur einmal"""
+        cache = AudioCache(str(tmp_path / "cache"), max_bytes=250)
+        source = tmp_path / "hook.mp3"
+        source.write_bytes(b"\x00" * 100)
+        cache.prune = lambda: pytest.fail("Größengrenze fälschlich überschritten")
+
+        cache.store("a" * 24, str(source))
+        for _ in range(3):
+            cache.store("b" * 24, str(source))
+
+        assert cache.contains("a" * 24)
+        with cache._lock:
+            assert cache._current_size() == 200
+
+    def test_key_depends_on_all_params(self):
+        """Test: Unterschiedliche Formate ergeben unterschiedliche Schlüssel"""
+        a = AudioCache.make_key(text="Hallo", output_format="mp3_22050_32")
+        b = AudioCache.make_key(text="Hallo", output_format="mp3_44100_128")
+
+        assert a != b
+        assert a == AudioCache.make_key(output_format="mp3_22050_32", text="Hallo")
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        """Test: Bei Überschreiten der Größe fliegen die ältesten Einträge"""
+        cache = AudioCache(str(tmp_path / "cache"), max_bytes=250)
+        source = tmp_path / "hook.mp3"
+        source.write_bytes(b"\x00" * 100)
+
+        for i, key in enumerate(["old", "mid", "new"]):
+            cache.store(key * 8, str(source))
+            os.utime(cache.path(key * 8), (1000 + i, 1000 + i))
+        cache.prune()
+
+        assert not cache.contains("old" * 8)
+        assert cache.contains("mid" * 8)
+        assert cache.contains("new" * 8)
+
+
+class TestRenderQuality:
+    """Tests für Entwurfs- und Final-Renderings gegen den Stub-Server"""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        """Stub-Server für die TTS-API"""
+        with StubTTSServer(frames=40) as server:
+            monkeypatch.setattr(config.elevenlabs, "api_base", server.api_base)
+            yield server
+
+    def test_draft_uses_draft_format(self, server, tmp_path):
+        """Test: Entwürfe werden im günstigen Format angefordert"""
+        generator = HookGenerator("key", "voice", quality=QUALITY_DRAFT)
+
+        assert generator.generate_audio_hook("Hallo Welt", str(tmp_path / "hook.mp3"))
+        assert server.requests[-1]['body']['output_format'] == config.render.draft_output_format
+
+    def test_repeat_render_served_from_cache(self, server, tmp_path):
+        """Test: Unveränderte Hooks lösen keinen zweiten Request aus"""
+        generator = HookGenerator("key", "voice", quality=QUALITY_DRAFT)
+
+        generator.generate_audio_hook("Hallo Welt", str(tmp_path / "a.mp3"))
+        assert generator.is_cached("Hallo Welt")
+        generator.generate_audio_hook("Hallo Welt", str(tmp_path / "b.mp3"))
+
+        assert len(server.requests) == 1
+        assert (tmp_path / "a.mp3").read_bytes() == (tmp_path / "b.mp3").read_bytes()
+
+    def test_draft_and_final_cached_separately(self, server, tmp_path):
+        """Test: Ein gecachter Entwurf ersetzt kein Final-Rendering"""
+        draft = HookGenerator("key", "voice", quality=QUALITY_DRAFT)
+        final = HookGenerator("key", "voice", quality=QUALITY_FINAL)
+
+        draft.generate_audio_hook("Hallo Welt", str(tmp_path / "draft.mp3"))
+
+        assert not final.is_cached("Hallo Welt")
+        final.generate_audio_hook("Hallo Welt", str(tmp_path / "final.mp3"))
+        assert len(server.requests) == 2
+        assert server.requests[-1]['body']['output_format'] == config.elevenlabs.output_format
@@ -0,0 +1,196 @@
+"""
+Tests für backends.py Modul
+"""
+
+import uuid
+import pytest
+from src.backends import (
+    BackendError, ElevenLabsBackend, FakeBackend, LatencyRouter, SynthesisStream, TTSBackend,
+    create_backend
+)
+from src.circuit_breaker import get_circuit_breaker
+from src.generator import HookGenerator, config
+from src.validator import AudioValidator
+from tests.stub_server import StubTTSServer
+
+
+class ScriptedBackend(TTSBackend):
+    """Backend mit eindeutigem Namen, das fest vorgegebene Ergebnisse liefert"""
+
+    def __init__(self, error: BackendError = None, cost: float = 1.0):
+        self.name = f"test-{uuid.uuid4().hex[:8]}"
+        self.capabilities = FakeBackend().capabilities
+        self.capabilities.cost_per_char = cost
+        self.error = error
+        self.calls = 0
+
+    def synthesize(self, text, voice_id, settings, output_format=None, stream=False):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return SynthesisStream([self.name.encode()], "audio/mpeg")
+
+
+class TestTTSBackend:
+    """Tests für die Basisklasse"""
+
+    def test_incomplete_backend_rejected(self):
+        """Test: Backends ohne synthesize lassen sich nicht erzeugen"""
+        class Incomplete(TTSBackend):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_create_backend_with_api_base(self):
+        """Test: "elevenlabs@<api_base>" erzeugt einen weiteren ElevenLabs-Endpunkt"""
+        backend = create_backend("elevenlabs@http://eu.example/v1", "key")
+
+        assert backend.endpoint("voice") == "http://eu.example/v1/text-to-speech/voice"
+
+
+class TestFakeBackend:
+    """Tests für das lokale Fake-Backend"""
+
+    def test_output_passes_validation(self):
+        """Test: Erzeugtes Audio besteht die Integritätsprüfung"""
+        text = "Ein Hook für den Lasttest"
+        audio = FakeBackend().synthesize(text, "voice", {})
+        data = b"".join(audio)
+
+        assert AudioValidator().validate_bytes(data, text, audio.content_type).valid
+
+    def test_deterministic(self):
+        """Test: Gleicher Text ergibt gleiche Bytes"""
+        backend = FakeBackend()
+        assert b"".join(backend.synthesize("Hallo", "v", {})) == b"".join(backend.synthesize("Hallo", "v", {}))
+
+    def test_generator_with_fake_backend(self, tmp_path):
+        """Test: Generator erzeugt mit dem Fake-Backend gültige Hooks ohne Netzwerk"""
+        generator = HookGenerator("key", "voice", backend=FakeBackend())
+
+        assert generator.generate_audio_hook("Hallo Welt", str(tmp_path / "hook.mp3"))
+        assert generator.url == "fake://voice"
+
+
+class TestElevenLabsBackend:
+    """Tests für das ElevenLabs-Backend gegen den Stub-Server"""
+
+    @pytest.mark.parametrize("status,transient", [(400, False), (503, True)])
+    def test_error_status(self, status, transient):
+        """Test: Fehlerstatus wird als BackendError mit Einstufung gemeldet"""
+        with StubTTSServer(status=status) as server:
+            backend = ElevenLabsBackend("key", api_base=server.api_base)
+
+            with pytest.raises(BackendError) as error:
+                backend.synthesize("Hallo", "voice", {})
+
+        assert error.value.status_code == status
+        assert error.value.transient == transient
+
+    def test_payload(self):
+        """Test: Text, Modell und Voice-Settings landen im Request-Body"""
+        with StubTTSServer() as server:
+            backend = ElevenLabsBackend("key", api_base=server.api_base)
+            b"".join(backend.synthesize("Hallo", "voice", {"stability": 0.5}, "mp3_44100_128"))
+
+        body = server.requests[-1]['body']
+        assert body['text'] == "Hallo"
+        assert body['model_id'] == config.elevenlabs.model_id
+        assert body['voice_settings'] == {"stability": 0.5}
+        assert body['output_format'] == "mp3_44100_128"
+
+
+class TestLatencyRouter:
+    """Tests für Auswahl und Fallback des Routers"""
+
+    def test_prefers_lower_latency(self):
+        """Test: Das schnellere Backend wird bevorzugt"""
+        slow, fast = ScriptedBackend(), ScriptedBackend()
+        router = LatencyRouter([slow, fast], cost_weight=0)
+        router.stats[slow.name].record_latency(2.0)
+        router.stats[fast.name].record_latency(0.1)
+
+        assert b"".join(router.synthesize("Hallo", "voice", {})) == fast.name.encode()
+
+    def test_fallback_on_transient_error(self):
+        """Test: Bei Störung wird automatisch das nächste Backend versucht"""
+        broken = ScriptedBackend(error=BackendError("down", 503))
+        healthy = ScriptedBackend()
+        router = LatencyRouter([broken, healthy])
+
+        assert b"".join(router.synthesize("Hallo", "voice", {})) == healthy.name.encode()
+        assert router.stats[broken.name].error_rate == 1.0
+        assert router.rank("Hallo")[0] is healthy
+
+    def test_skips_open_circuit(self):
+        """Test: Backends mit offenem Circuit werden nicht angefragt"""
+        down, healthy = ScriptedBackend(), ScriptedBackend()
+        for _ in range(config.circuit_breaker.failure_threshold):
+            get_circuit_breaker(down.name).record_failure()
+        router = LatencyRouter([down, healthy])
+
+        b"".join(router.synthesize("Hallo", "voice", {}))
+
+        assert down.calls == 0
+
+    def test_client_error_not_retried(self):
+        """Test: Client-Fehler (4xx) werden direkt gemeldet"""
+        rejecting = ScriptedBackend(error=BackendError("bad request", 400))
+        other = ScriptedBackend()
+        router = LatencyRouter([rejecting, other])
+
+        with pytest.raises(BackendError, match="bad request"):
+            router.synthesize("Hallo", "voice", {})
+        assert other.calls == 0
+
+    def test_cost_breaks_ties(self):
+        """Test: Ohne Messwerte gewinnt das günstigere Backend"""
+        expensive, cheap = ScriptedBackend(cost=1.0), ScriptedBackend(cost=0.1)
+        router = LatencyRouter([expensive, cheap], cost_weight=0.01)
+
+        assert router.rank("Hallo")[0] is cheap
+
+    def test_unmeasured_backend_gets_prior(self):
+        """Test: Ohne Messwerte gilt die angenommene Latenz statt 0"""
+        measured, unmeasured = ScriptedBackend(), ScriptedBackend()
+        router = LatencyRouter([unmeasured, measured], cost_weight=0, latency_prior=1.0)
+        router.stats[measured.name].record_latency(0.5)
+
+        assert router.rank("Hallo")[0] is measured
+
+    def test_same_type_backends_tracked_separately(self):
+        """Test: Zwei Backends gleichen Typs haben eigene Statistik und eigenen Circuit"""
+        first = ScriptedBackend(error=BackendError("down", 503))
+        second = ScriptedBackend()
+        second.name = first.name
+        router = LatencyRouter([first, second], probe_interval=0)
+
+        assert b"".join(router.synthesize("Hallo", "voice", {})) == first.name.encode()
+        assert router.ids[second] == f"{first.name}-2"
+        assert router.stats[first.name].error_rate == 1.0
+        assert router.stats[f"{first.name}-2"].error_rate == 0.0
+        assert [entry['name'] for entry in router.snapshot()] == [first.name, f"{first.name}-2"]
+        assert get_circuit_breaker(f"{first.name}-2").snapshot()['error_rate'] == 0.0
+
+    def test_fake_backend_refused(self):
+        """Test: Das Fake-Backend kommt nur ausdrücklich zugelassen in den Router"""
+        with pytest.raises(ValueError, match="Fake"):
+            LatencyRouter([ScriptedBackend(), FakeBackend()])
+
+        assert LatencyRouter([FakeBackend()], allow_fake=True).ids
+
+    def test_losing_backend_probed(self):
+        """Test: Ein unterlegenes Backend bekommt nach probe_interval einen Test-Request"""
+        fast, slow = ScriptedBackend(), ScriptedBackend()
+        router = LatencyRouter([fast, slow], cost_weight=0, probe_interval=3600)
+        router.stats[fast.name].record_latency(0.1)
+        router.stats[slow.name].record_latency(5.0)
+
+        b"".join(router.synthesize("Hallo", "voice", {}))
+        assert (fast.calls, slow.calls) == (1, 0)
+
+        router.stats[slow.name].last_request -= 3600
+        b"".join(router.synthesize("Hallo", "voice", {}))
+        b"".join(router.synthesize("Hallo", "voice", {}))
+        assert (fast.calls, slow.calls) == (2, 1)
@@ -0,0 +1,124 @@
+"""
+Tests für cancellation.py Modul
+"""
+
+import time
+from src.cancellation import CancellationToken, DurationEstimator
+
+
+class TestCancellationToken:
+    """Tests für Abbruch und Zeitbudget"""
+
+    def test_cancel_runs_callbacks(self):
+        """Test: Abbruch ruft registrierte Callbacks auf"""
+        token = CancellationToken()
+        calls = []
+        token.on_cancel(lambda: calls.append("closed"))
+
+        token.cancel()
+
+        assert token.cancelled
+        assert not token.timed_out
+        assert calls == ["closed"]
+
+    def test_unregister_callback(self):
+        """Test: Entfernte Callbacks werden nicht mehr aufgerufen"""
+        token = CancellationToken()
+        calls = []
+        unregister = token.on_cancel(lambda: calls.append("closed"))
+
+        unregister()
+        token.cancel()
+
+        assert calls == []
+
+    def test_callback_after_cancel_runs_immediately(self):
+        """Test: Callback nach dem Abbruch wird sofort ausgeführt"""
+        token = CancellationToken()
+        token.cancel()
+        calls = []
+
+        token.on_cancel(lambda: calls.append("closed"))
+
+        assert calls == ["closed"]
+
+    def test_deadline_fires(self):
+        """Test: Ablauf des Zeitbudgets bricht ab und schließt Streams"""
+        token = CancellationToken(timeout=0.05)
+        calls = []
+        token.on_cancel(lambda: calls.append("closed"))
+
+        time.sleep(0.2)
+
+        assert token.cancelled
+        assert token.timed_out
+        assert calls == ["closed"]
+
+    def test_can_finish(self):
+        """Test: Arbeit, die nicht mehr ins Budget passt, wird abgelehnt"""
+        token = CancellationToken(timeout=10)
+
+        assert token.can_finish(1)
+        assert not token.can_finish(60)
+        assert CancellationToken().can_finish(10**6)
+
+
+class TestDurationEstimator:
+    """Tests für die Dauerschätzung"""
+
+    def test_estimate(self):
+        """Test: Schätzung skaliert mit der Zeichenanzahl"""
+        estimator = DurationEstimator()
+
+        assert estimator.estimate(100) == 0
+        estimator.record(100, 2.0)
+        assert estimator.estimate(50) == 1.0
+
+
+class TestGeneratorCancellation:
+    """Tests für den Abbruch im Generator"""
+
+    def test_batch_stops_on_cancel(self, tmp_path, monkeypatch):
+        """Test: Nach einem Abbruch werden keine weiteren Hooks angefragt"""
+        from src.generator import HookGenerator, config
+        from src.rate_limiter import RateLimiter
+
+        monkeypatch.setattr(config.validation, "enabled", False)
+        generator = HookGenerator("key", "voice")
+        generator.rate_limiter = RateLimiter(0)
+        token = CancellationToken()
+        calls = []
+
+        def fake_download(text, output_path, token=None):
+            calls.append(text)
+            token.cancel()
+            return None
+
+        monkeypatch.setattr(generator, "_download_hook", fake_download)
+
+        assert generator.generate_hooks_batch(["a", "b", "c"], str(tmp_path), token) == \
+            (None, "⏹️ Generierung abgebrochen")
+        assert calls == ["a"]
+
+    def test_batch_deadline_returns_partial_zip(self, tmp_path, monkeypatch):
+        """Test: Bei erschöpftem Zeitbudget werden die fertigen Hooks verpackt"""
+        from src.generator import HookGenerator, config
+        from src.rate_limiter import RateLimiter
+
+        monkeypatch.setattr(config.validation, "enabled", False)
+        generator = HookGenerator("key", "voice")
+        generator.rate_limiter = RateLimiter(0)
+        token = CancellationToken(timeout=0.3)
+
+        def slow_download(text, output_path, token=None):
+            time.sleep(0.2)
+            with open(output_path, "wb") as f:
+                f.write(b"\x00")
+            return "audio/mpeg"
+
+        monkeypatch.setattr(generator, "_download_hook", slow_download)
+
+        zip_path, message = generator.generate_hooks_batch(["a", "b", "c"], str(tmp_path), token)
+
+        assert zip_path is not None
+        assert "1 von 3" in message
@@ -0,0 +1,95 @@
+"""
+Tests für circuit_breaker.py Modul
+"""
+
+import time
+import pytest
+from src.circuit_breaker import CircuitBreaker, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+
+
+class TestCircuitBreaker:
+    """Tests für Zustandswechsel und Fail-Fast"""
+
+    @pytest.fixture
+    def breaker(self):
+        """Fixture für einen Breaker mit kurzer Öffnungszeit"""
+        return CircuitBreaker(
+            "test", failure_threshold=3, error_rate_threshold=0.5,
+            window_size=10, min_requests=6, open_seconds=0.1, half_open_max_calls=1
+        )
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        """Test: N aufeinanderfolgende Fehler öffnen den Circuit"""
+        for _ in range(3):
+            breaker.record_failure()
+
+        assert breaker.state == STATE_OPEN
+        assert breaker.metrics['opened'] == 1
+
+    def test_opens_on_error_rate(self, breaker):
+        """Test: Hohe Fehlerquote öffnet auch ohne Serie"""
+        for _ in range(3):
+            breaker.record_success()
+            breaker.record_failure()
+
+        assert breaker.state == STATE_OPEN
+
+    def test_fail_fast_while_open(self, breaker):
+        """Test: Offener Circuit lehnt sofort ab"""
+        for _ in range(3):
+            breaker.record_failure()
+
+        start = time.monotonic()
+        assert not breaker.acquire(timeout=0)
+        assert time.monotonic() - start < 0.05
+        assert breaker.metrics['rejected'] == 1
+
+    def test_half_open_single_trial(self, breaker):
+        """Test: Nach der Wartezeit ist genau ein Probe-Request erlaubt"""
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.15)
+
+        assert breaker.state == STATE_HALF_OPEN
+        assert breaker.acquire(timeout=0)
+        assert not breaker.acquire(timeout=0)
+
+    def test_trial_success_closes(self, breaker):
+        """Test: Erfolgreicher Probe-Request schließt den Circuit"""
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.15)
+
+        assert breaker.acquire(timeout=0)
+        breaker.record_success()
+
+        assert breaker.state == STATE_CLOSED
+
+    def test_trial_failure_reopens(self, breaker):
+        """Test: Fehlgeschlagener Probe-Request öffnet erneut"""
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.15)
+
+        assert breaker.acquire(timeout=0)
+        breaker.record_failure()
+
+        assert breaker.state == STATE_OPEN
+
+    def test_acquire_pauses_until_half_open(self, breaker):
+        """Test: Wartende Requests pausieren bis zum Probe-Zeitpunkt"""
+        for _ in range(3):
+            breaker.record_failure()
+
+        start = time.monotonic()
+        assert breaker.acquire(timeout=1)
+        assert 0.05 < time.monotonic() - start < 0.5
+
+    def test_snapshot(self, breaker):
+        """Test: Snapshot enthält Zustand und Metriken"""
+        breaker.record_failure()
+        status = breaker.snapshot()
+
+        assert status['state'] == STATE_CLOSED
+        assert status['consecutive_failures'] == 1
+        assert status['failures'] == 1
@@ -0,0 +1,158 @@
+"""
+Tests für concurrency.py Modul
+"""
+
+import threading
+import time
+import zipfile
+import pytest
+from src.backends import ElevenLabsBackend
+from src.concurrency import AdaptiveConcurrency
+from src.generator import HookGenerator, config
+from src.rate_limiter import RateLimiter
+from src.scheduler import HookJob, JobScheduler
+from tests.stub_server import StubTTSServer
+
+
+def fill(controller: AdaptiveConcurrency) -> float:
+    """Belegt alle Slots und gibt sie wieder frei (Limit ausgeschöpft)"""
+    limit = controller.limit
+    for _ in range(limit):
+        assert controller.try_acquire()
+    for _ in range(limit):
+        controller.release()
+    return time.monotonic()
+
+
+class TestAdaptiveConcurrency:
+    """Tests für die AIMD-Regelung"""
+
+    def test_additive_increase(self):
+        """Test: Nach einem vollen Fenster stabiler Requests steigt das Limit um eins"""
+        controller = AdaptiveConcurrency(initial_limit=2, max_limit=4)
+        started = fill(controller)
+
+        controller.record_success(1.0, 10, started)
+        assert controller.limit == 2
+        controller.record_success(1.0, 10, started)
+        assert controller.limit == 3
+        assert controller.decisions()[-1]['reason'] == "Latenz stabil"
+
+    def test_no_increase_without_load(self):
+        """Test: Wird das Limit nicht ausgeschöpft, bleibt es unverändert"""
+        controller = AdaptiveConcurrency(initial_limit=2)
+        for _ in range(10):
+            controller.record_success(1.0, 10, time.monotonic())
+
+        assert controller.limit == 2
+
+    def test_multiplicative_decrease(self):
+        """Test: 429 halbiert das Limit, Timeouts ebenso"""
+        controller = AdaptiveConcurrency(initial_limit=8, min_limit=1)
+
+        controller.record_overload(time.monotonic())
+        assert controller.limit == 4
+        controller.record_overload(time.monotonic(), timeout=True)
+        assert controller.limit == 2
+
+        status = controller.snapshot()
+        assert (status['throttled'], status['timeouts'], status['decreases']) == (1, 1, 2)
+
+    def test_stale_feedback_ignored(self):
+        """Test: Requests von vor der letzten Senkung senken nicht erneut"""
+        controller = AdaptiveConcurrency(initial_limit=8)
+        started = time.monotonic()
+
+        controller.record_overload(started)
+        controller.record_overload(started)
+
+        assert controller.limit == 4
+
+    def test_rising_latency(self):
+        """Test: Steigende Latenz gegenüber gleich langen Hooks senkt das Limit"""
+        controller = AdaptiveConcurrency(initial_limit=4, max_limit=4, min_samples=3)
+        for _ in range(3):
+            controller.record_success(1.0, 100, time.monotonic())
+        controller.record_success(50.0, 100, time.monotonic())
+
+        assert controller.limit == 2
+        assert "Latenz" in controller.decisions()[-1]['reason']
+
+    def test_mixed_lengths_at_constant_latency(self):
+        """Test: Kurze und lange Hooks im Wechsel senken das Limit bei gleicher Serverlatenz nicht"""
+        controller = AdaptiveConcurrency(initial_limit=4, max_limit=4, min_samples=3)
+        lengths = [8, 400, 30, 1500, 120, 4, 900]
+        for i in range(70):
+            chars = lengths[i % len(lengths)]
+            # Fester Overhead pro Request plus Zeit pro Zeichen, leicht schwankend
+            latency = (0.4 + 0.002 * chars) * (1 + 0.1 * (i % 3))
+            controller.record_success(latency, chars, time.monotonic())
+
+        assert controller.limit == 4
+        assert controller.snapshot()['decreases'] == 0
+        assert len(controller.snapshot()['baseline_latency']) == len(lengths)
+
+    def test_acquire_respects_limit(self):
+        """Test: Über dem Limit blockiert acquire bis ein Slot frei wird"""
+        controller = AdaptiveConcurrency(initial_limit=1)
+        assert controller.acquire()
+        assert not controller.try_acquire()
+
+        threading.Timer(0.05, controller.release).start()
+        assert controller.acquire()
+        assert controller.snapshot()['peak_in_flight'] == 1
+
+
+class TestIntegration:
+    """Tests für Batch und Scheduler unter adaptiver Parallelität"""
+
+    @pytest.fixture(autouse=True)
+    def short_retry(self, monkeypatch):
+        monkeypatch.setattr(config.network, "retry_delay", 0.02)
+
+    def test_batch_adapts_to_quota(self, tmp_path):
+        """Test: Bei 429 senkt der Batch die Parallelität und alle Hooks kommen an"""
+        controller = AdaptiveConcurrency(initial_limit=2, max_limit=8)
+
+        with StubTTSServer(frames=40, first_byte_delay=0.03, max_concurrent=3) as server:
+            generator = HookGenerator("key", "voice", concurrency=controller,
+                                      backend=ElevenLabsBackend("key", api_base=server.api_base))
+            generator.rate_limiter = RateLimiter(0)
+            texts = [f"Hook Nummer {i}" for i in range(30)]
+            zip_path, message = generator.generate_hooks_batch(texts, str(tmp_path))
+
+        assert zip_path, message
+        with zipfile.ZipFile(zip_path) as z:
+            assert len(z.namelist()) == len(texts)
+        assert server.peak_active <= 3
+        assert server.throttled > 0
+        assert controller.snapshot()['decreases'] >= 1
+
+    def test_scheduler_respects_limit(self, tmp_path):
+        """Test: Worker synthetisieren nie mehr Hooks gleichzeitig als das Limit erlaubt"""
+        controller = AdaptiveConcurrency(initial_limit=2, max_limit=2)
+        generator = HookGenerator("key", "voice", concurrency=controller)
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def generate(text, output_path, token=None):
+            with lock:
+                active.append(text)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(text)
+            with open(output_path, "wb") as f:
+                f.write(b"\x00")
+            return True
+
+        generator.generate_audio_hook = generate
+        scheduler = JobScheduler(workers=6, rate_limiter=RateLimiter(0))
+        job = scheduler.submit(HookJob(generator, [f"h{i}" for i in range(12)], str(tmp_path)))
+        zip_path, _ = job.wait(10)
+        scheduler.shutdown()
+
+        assert zip_path
+        assert max(peak) == 2
+        assert controller.in_flight == 0
@@ -0,0 +1,141 @@
+"""
+Tests für demo.py Modul
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import pytest
+import requests
+from src.config import get_config
+from src.demo import DemoPlayer
+
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class DemoServer:
+    """Liefert eine Demo-Datei mit ETag und Last-Modified und zählt gesendete Bodies"""
+
+    def __init__(self, payload: bytes, delay: float = 0.0, compress: bool = False):
+        self.payload = payload
+        self.delay = delay
+        self.compress = compress
+        self.statuses = []
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/demo.mp3"
+
+    @property
+    def bodies(self) -> int:
+        return self.statuses.count(200)
+
+    def __enter__(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                time.sleep(server.delay)
+                etag = f'"{hashlib.sha1(server.payload).hexdigest()}"'
+                status = 304 if self.headers.get("If-None-Match") == etag else 200
+                server.statuses.append(status)
+                body = b""
+                if status == 200:
+                    body = gzip.compress(server.payload) if server.compress else server.payload
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                if server.compress:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def always_revalidate(monkeypatch):
+    """Jeder Aufruf fragt beim Server nach"""
+    monkeypatch.setattr(get_config().demo, "revalidate_seconds", 0)
+
+
+class TestDownloadDemo:
+    """Tests für Cache, Revalidierung und Streaming"""
+
+    def test_fresh_cache_needs_no_request(self):
+        """Test: Innerhalb der Frist wird die Demo ohne Request aus dem Cache geliefert"""
+        with DemoServer(b"ID3" + bytes(4096)) as server:
+            player = DemoPlayer(server.url)
+            assert player.download_demo()
+            assert player.download_demo()
+
+        assert server.statuses == [200]
+        assert player.metrics == {'downloads': 1, 'not_modified': 0, 'hits': 1}
+        assert Path(player.demo_file).read_bytes() == server.payload
+
+    def test_revalidation_without_body(self, always_revalidate):
+        """Test: Nach Ablauf der Frist antwortet der Server mit 304, die Datei bleibt"""
+        with DemoServer(b"ID3" + bytes(4096)) as server:
+            player = DemoPlayer(server.url)
+            assert player.download_demo()
+            assert DemoPlayer(server.url).download_demo()
+
+            server.payload = b"ID3 neue Demo"
+            assert player.download_demo()
+
+        assert server.statuses == [200, 304, 200]
+        assert Path(player.demo_file).read_bytes() == b"ID3 neue Demo"
+        assert not list(Path(player.demo_file).parent.glob("*.tmp"))
+
+    def test_compressed_transfer(self):
+        """Test: Mit Content-Encoding wird gegen die übertragenen Bytes geprüft und entpackt abgelegt"""
+        with DemoServer(b"ID3" + bytes(4096), compress=True) as server:
+            player = DemoPlayer(server.url)
+            assert player.download_demo()
+
+        assert Path(player.demo_file).read_bytes() == server.payload
+
+    def test_concurrent_users_share_one_download(self):
+        """Test: Parallele Aufrufe laden die Demo nur einmal herunter"""
+        with DemoServer(b"ID3" + bytes(4096), delay=0.1) as server:
+            player = DemoPlayer(server.url)
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(player.download_demo()))
+                       for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert results == [True] * 5
+        assert server.bodies == 1
+
+    def test_offline_uses_cache(self, always_revalidate, monkeypatch):
+        """Test: Ist der Server nicht erreichbar, wird die gecachte Demo verwendet"""
+        with DemoServer(b"ID3" + bytes(128)) as server:
+            player = DemoPlayer(server.url)
+            assert player.download_demo()
+
+        def offline(*args, **kwargs):
+            raise requests.exceptions.ConnectionError("offline")
+
+        monkeypatch.setattr("src.demo.requests.get", offline)
+        assert player.download_demo()
+        assert not DemoPlayer(server.url, cache_dir=str(Path(player.demo_file).parent / "leer")).download_demo()
@@ -0,0 +1,473 @@
+"""
+Tests für git_loader.py Modul
+"""
+
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+import pytest
+from src.git_loader import GitLoader, LsRemoteResolver, ModuleCache, RefResolver
+from tests.stub_git_server import StubGitServer
+
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+MODULES = {
+    'logger': "loaded.append('logger')\n",
+    'generator': "from src.logger import get_logger\nloaded.append('generator')\n",
+    'interface': "from src.generator import HookGenerator\nfrom src.demo import DemoPlayer\n"
+                 "loaded.append('interface')\n",
+    'demo': "loaded.append('demo')\n",
+    'setup': "loaded.append('setup')\n",
+    'git_loader': "loaded.append('git_loader')\n",
+}
+
+
+@pytest.fixture
+def server():
+    with StubGitServer({'main': dict(MODULES)}, delay=0.2) as stub:
+        yield stub
+
+
+def make_loader(server, **kwargs):
+    return GitLoader(server.repo, base_url=server.base_url, **kwargs)
+
+
+class TestLoadMultipleModules:
+    """Tests für paralleles Laden mehrerer Module"""
+
+    def test_fetches_concurrently(self, server):
+        """Test: Sechs Module kosten etwa einen Round-Trip statt sechs"""
+        namespace = {'loaded': []}
+
+        started = time.monotonic()
+        results = make_loader(server).load_multiple_modules(list(MODULES), namespace=namespace)
+        elapsed = time.monotonic() - started
+
+        assert all(status['success'] for status in results.values())
+        assert server.peak_active == len(MODULES)
+        assert elapsed < 3 * server.delay
+        assert all(status['fetch_seconds'] >= server.delay for status in results.values())
+        assert all(status['exec_seconds'] > 0 for status in results.values())
+
+    def test_dependency_order(self, server):
+        """Test: Importierte Projekt-Module werden vor ihren Nutzern ausgeführt"""
+        namespace = {'loaded': []}
+
+        make_loader(server).load_multiple_modules(['interface', 'generator', 'demo', 'logger'],
+                                                  namespace=namespace)
+
+        order = namespace['loaded']
+        assert order.index('logger') < order.index('generator') < order.index('interface')
+        assert order.index('demo') < order.index('interface')
+
+    def test_failed_dependency_skips_dependents(self, server):
+        """Test: Fehlt eine Abhängigkeit, wird das abhängige Modul nicht ausgeführt"""
+        del server.files['main']['logger']
+        namespace = {'loaded': []}
+
+        results = make_loader(server).load_multiple_modules(['generator', 'logger', 'demo', 'evil'],
+                                                            namespace=namespace)
+
+        assert "404" in results['logger']['error']
+        assert "logger" in results['generator']['error']
+        assert results['demo']['success']
+        assert results['evil']['error'] == "nicht in Whitelist"
+        assert namespace['loaded'] == ['demo']
+
+    def test_load_module_uses_session(self, server):
+        """Test: Einzelnes Laden nutzt dieselbe Session"""
+        namespace = {'loaded': []}
+        loader = make_loader(server)
+
+        assert loader.load_module('demo', namespace=namespace)
+        assert not loader.load_module('missing', namespace=namespace, force=True)
+        assert namespace['loaded'] == ['demo']
+
+
+class TestModuleCache:
+    """Tests für den persistenten Modul-Cache"""
+
+    @pytest.fixture
+    def server(self):
+        with StubGitServer({'main': dict(MODULES), COMMIT: dict(MODULES)}) as stub:
+            yield stub
+
+    def warm_start(self, server, tmp_path, version='main'):
+        """Zwei Sessions mit demselben Cache-Verzeichnis, liefert den zweiten Loader"""
+        cache = ModuleCache(str(tmp_path / "git"))
+        make_loader(server, cache=cache).load_multiple_modules(list(MODULES), version, {'loaded': []})
+        server.statuses.clear()
+
+        loader = make_loader(server, cache=cache)
+        namespace = {'loaded': []}
+        results = loader.load_multiple_modules(list(MODULES), version, namespace)
+        assert all(status['success'] for status in results.values())
+        assert sorted(namespace['loaded']) == sorted(MODULES)
+        return loader
+
+    def test_branch_revalidates_with_etag(self, server, tmp_path):
+        """Test: Branches werden beim Warmstart nur per 304 bestätigt"""
+        loader = self.warm_start(server, tmp_path)
+
+        assert server.statuses == [304] * len(MODULES)
+        assert loader.metrics['revalidated'] == len(MODULES)
+        assert loader.metrics['downloaded'] == 0
+
+    def test_commit_never_revalidated(self, server, tmp_path):
+        """Test: Commit-Hashes werden beim Warmstart ohne Netzwerk geladen"""
+        loader = self.warm_start(server, tmp_path, COMMIT)
+
+        assert server.statuses == []
+        assert loader.metrics['cache_hits'] == len(MODULES)
+
+    def test_changed_source_downloaded(self, server, tmp_path):
+        """Test: Geänderter Branch-Inhalt wird neu geladen und gecacht"""
+        cache = ModuleCache(str(tmp_path / "git"))
+        make_loader(server, cache=cache).load_module('demo', namespace={'loaded': []})
+        server.files['main']['demo'] = "loaded.append('demo v2')\n"
+
+        namespace = {'loaded': []}
+        make_loader(server, cache=cache).load_module('demo', namespace=namespace)
+
+        assert namespace['loaded'] == ['demo v2']
+        assert server.statuses == [200, 200]
+        assert "v2" in cache.load(server.repo, 'main', 'demo')['code']
+
+    def test_offline_fallback(self, server, tmp_path):
+        """Test: Ohne Netzwerk wird die zuletzt verifizierte Kopie verwendet"""
+        cache = ModuleCache(str(tmp_path / "git"))
+        make_loader(server, cache=cache).load_module('demo', namespace={'loaded': []})
+        loader = make_loader(server, cache=cache, timeout=1)
+        server.stop()
+
+        namespace = {'loaded': []}
+        assert loader.load_module('demo', namespace=namespace)
+        assert not loader.load_module('setup', namespace=namespace)
+        assert namespace['loaded'] == ['demo']
+        assert loader.metrics['offline_fallbacks'] == 1
+
+    def test_corrupt_or_unverified_not_used(self, server, tmp_path):
+        """Test: Beschädigte Einträge werden neu geladen, unverifizierter Code nie gecacht"""
+        cache = ModuleCache(str(tmp_path / "git"))
+        make_loader(server, cache=cache).load_module('demo', namespace={'loaded': []})
+        cache.path(server.repo, 'main', 'demo').write_text("loaded.append('manipuliert')\n")
+
+        namespace = {'loaded': []}
+        make_loader(server, cache=cache).load_module('demo', namespace=namespace)
+        assert namespace['loaded'] == ['demo']
+
+        loader = make_loader(server, cache=cache, verify_hashes=True)
+        loader.MODULE_HASHES = {'setup': {'main': "0" * 64}}
+        assert not loader.load_module('setup', namespace=namespace)
+        assert cache.load(server.repo, 'main', 'setup') is None
+
+
+class TestBytecodeCache:
+    """Tests für den Bytecode-Cache"""
+
+    @pytest.fixture
+    def server(self):
+        with StubGitServer({'main': dict(MODULES)}) as stub:
+            yield stub
+
+    def test_warm_load_skips_compile(self, server, tmp_path):
+        """Test: Zweite Session führt den gespeicherten Bytecode aus"""
+        cache = ModuleCache(str(tmp_path / "git"))
+        cold = make_loader(server, cache=cache)
+        cold.load_multiple_modules(list(MODULES), namespace={'loaded': []})
+
+        warm = make_loader(server, cache=cache)
+        namespace = {'loaded': []}
+        results = warm.load_multiple_modules(list(MODULES), namespace=namespace)
+
+        assert all(status['success'] for status in results.values())
+        assert cold.metrics['compiled'] == len(MODULES)
+        assert warm.metrics['compiled'] == 0
+        assert warm.metrics['bytecode_hits'] == len(MODULES)
+
+    def test_foreign_bytecode_recompiled(self, server, tmp_path):
+        """Test: Bytecode einer anderen Python-Version oder beschädigter Bytecode wird ersetzt"""
+        cache = ModuleCache(str(tmp_path / "git"))
+        loader = make_loader(server, cache=cache)
+        code = MODULES['demo']
+        sha256 = loader.calculate_hash(code)
+        loader.compile_code('demo', code)
+
+        cache.bytecode_path('demo', sha256).write_bytes(b"\0\0\0\0" + b"kein Bytecode")
+        compiled = loader.compile_code('demo', code)
+
+        assert loader.metrics['compiled'] == 2
+        assert compiled.co_filename == "src/demo.py"
+        assert cache.load_bytecode('demo', sha256) is not None
+
+
+class TestArchiveFetch:
+    """Tests für das Laden einer ganzen Version als Repository-Archiv"""
+
+    @pytest.fixture
+    def server(self):
+        with StubGitServer({'main': dict(MODULES), COMMIT: dict(MODULES)}) as stub:
+            yield stub
+
+    def make_archive_loader(self, server, tmp_path, **kwargs):
+        return make_loader(server, cache=ModuleCache(str(tmp_path / "git")), use_archive=True,
+                           archive_url=server.archive_url, **kwargs)
+
+    @pytest.mark.parametrize("archive_format", ["tar.gz", "zip"])
+    def test_cold_start_single_request(self, server, tmp_path, archive_format):
+        """Test: Alle Module kosten einen einzigen Request und landen im Cache"""
+        loader = self.make_archive_loader(server, tmp_path, archive_format=archive_format)
+        namespace = {'loaded': []}
+
+        results = loader.load_multiple_modules(list(MODULES), namespace=namespace)
+
+        assert all(status['success'] for status in results.values())
+        assert server.requests == [f"/archive/{server.repo}/{archive_format}/main"]
+        assert loader.metrics['archives'] == 1
+        assert loader.cache.load(server.repo, 'main', 'interface')['code'] == MODULES['interface']
+        assert loader.cache.load(server.repo, 'main', 'test_stub') is None
+
+    def test_cached_commit_skips_archive(self, server, tmp_path):
+        """Test: Liegen alle Module eines Commits im Cache, entfällt auch das Archiv"""
+        self.make_archive_loader(server, tmp_path).load_multiple_modules(list(MODULES), COMMIT, {'loaded': []})
+        server.requests.clear()
+
+        results = self.make_archive_loader(server, tmp_path).load_multiple_modules(
+            list(MODULES), COMMIT, {'loaded': []})
+
+        assert all(status['success'] for status in results.values())
+        assert server.requests == []
+
+    def test_missing_archive_falls_back(self, server, tmp_path):
+        """Test: Ohne Archiv werden die Module einzeln geladen"""
+        loader = make_loader(server, cache=ModuleCache(str(tmp_path / "git")), use_archive=True,
+                             archive_url=f"{server.archive_url}/fehlt")
+
+        results = loader.load_multiple_modules(['demo', 'setup'], namespace={'loaded': []})
+
+        assert all(status['success'] for status in results.values())
+        assert len(server.requests) == 3
+        assert loader.metrics['archives'] == 0
+
+    def test_unverified_archive_member_skipped(self, server, tmp_path):
+        """Test: Module mit falschem Hash werden aus dem Archiv weder gecacht noch ausgeführt"""
+        loader = self.make_archive_loader(server, tmp_path, verify_hashes=True)
+        loader.MODULE_HASHES = {'demo': {'main': "0" * 64}}
+        namespace = {'loaded': []}
+
+        results = loader.load_multiple_modules(['demo', 'setup'], namespace=namespace)
+
+        assert not results['demo']['success']
+        assert results['setup']['success']
+        assert loader.cache.load(server.repo, 'main', 'demo') is None
+        assert namespace['loaded'] == ['setup']
+
+
+class TestGitModuleFinder:
+    """Tests für Imports über sys.meta_path mit LazyLoader"""
+
+    PACKAGE = "gitsrc"
+    SOURCES = {
+        'logger': "def get_logger(name):\n    return f'logger:{name}'\n",
+        'generator': "from gitsrc.logger import get_logger\nlogger = get_logger('generator')\n",
+        'demo': "VALUE = 42\n",
+        'setup': "raise RuntimeError('nicht benutzt')\n",
+    }
+
+    @pytest.fixture
+    def server(self):
+        with StubGitServer({'main': dict(self.SOURCES)}) as stub:
+            yield stub
+
+    @pytest.fixture
+    def finder(self, server, tmp_path):
+        loader = make_loader(server, cache=ModuleCache(str(tmp_path / "git")))
+        finder = loader.install_finder(package=self.PACKAGE)
+        yield finder
+        finder.uninstall()
+        for name in [name for name in sys.modules if name.split('.')[0] == self.PACKAGE]:
+            del sys.modules[name]
+
+    def test_lazy_until_attribute_access(self, finder, server):
+        """Test: Import kostet nichts, der erste Attributzugriff lädt und führt aus"""
+        import gitsrc.demo
+
+        assert server.requests == []
+        assert gitsrc.demo.VALUE == 42
+        assert server.requests == [f"/{server.repo}/main/src/demo.py"]
+        assert sys.modules['gitsrc.demo'] is gitsrc.demo
+
+    def test_imports_inside_fetched_code(self, finder, server):
+        """Test: Imports im geladenen Code laufen über den Finder, ungenutzte Module nicht"""
+        from gitsrc.generator import logger
+
+        assert logger == "logger:generator"
+        assert sorted(path.rsplit('/', 1)[-1] for path in server.requests) == ["generator.py", "logger.py"]
+        assert sys.modules['gitsrc.logger'].__name__ == "gitsrc.logger"
+        assert finder.git_loader.metrics['compiled'] == 2
+
+    def test_only_whitelisted_modules(self, finder):
+        """Test: Module außerhalb der Whitelist werden nicht aus dem Repository bedient"""
+        with pytest.raises(ModuleNotFoundError):
+            import gitsrc.evil  # noqa: F401
+
+    def test_failed_module_can_be_retried(self, finder, server):
+        """Test: Fehlgeschlagene Verifikation wirft ImportError und hinterlässt kein halbes Modul"""
+        finder.git_loader.verify_hashes = True
+        finder.git_loader.MODULE_HASHES = {'demo': {'main': "0" * 64}}
+        import gitsrc.demo
+
+        with pytest.raises(ImportError):
+            gitsrc.demo.VALUE
+        assert 'gitsrc.demo' not in sys.modules
+
+        finder.git_loader.verify_hashes = False
+        import gitsrc.demo
+        assert gitsrc.demo.VALUE == 42
+
+
+class TestProjectImports:
+    """Tests mit den echten Projekt-Quelltexten, ohne lokales src-Paket"""
+
+    @pytest.fixture
+    def remote_src(self, tmp_path):
+        """Ersetzt das lokale src-Paket durch ein leeres und installiert den Finder"""
+        sources = {path.stem: path.read_text(encoding="utf-8") for path in SRC_DIR.glob("*.py")}
+        local = {name: module for name, module in sys.modules.items() if name.split('.')[0] == 'src'}
+        for name in local:
+            del sys.modules[name]
+        package = types.ModuleType('src')
+        package.__path__ = []
+        sys.modules['src'] = package
+
+        with StubGitServer({COMMIT: sources}) as server:
+            finder = make_loader(server, cache=ModuleCache(str(tmp_path / "git"))).install_finder(COMMIT)
+            try:
+                yield server
+            finally:
+                finder.uninstall()
+                for name in [name for name in sys.modules if name.split('.')[0] == 'src']:
+                    del sys.modules[name]
+                sys.modules.update(local)
+
+    @staticmethod
+    def assert_served_remotely(server):
+        loaded = {name: module for name, module in sys.modules.items() if name.startswith('src.')}
+        assert 'src.config' in loaded
+        assert all(module.__spec__.origin.startswith(server.base_url) for module in loaded.values())
+
+    def test_whitelist_covers_project(self):
+        """Test: Jedes Modul unter src/ darf aus dem Repository geladen werden"""
+        assert {path.stem for path in SRC_DIR.glob("*.py")} <= GitLoader.ALLOWED_MODULES
+
+    def test_generator(self, remote_src):
+        """Test: Der echte Generator lädt samt aller Projekt-Imports über den Finder"""
+        import src.generator
+
+        assert src.generator.HookGenerator.__module__ == "src.generator"
+        self.assert_served_remotely(remote_src)
+
+    def test_interface(self, remote_src):
+        """Test: Das echte Interface lädt samt aller Projekt-Imports über den Finder"""
+        pytest.importorskip("gradio")
+        import src.interface
+
+        assert src.interface.UnifiedInterface.__module__ == "src.interface"
+        self.assert_served_remotely(remote_src)
+
+
+def git(*args, cwd):
+    """Führt git im Test-Repository aus und liefert die Ausgabe"""
+    return subprocess.run(['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+                          cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+class TestRefPinning:
+    """Tests für die Auflösung von Branches und Tags zu Commits"""
+
+    @pytest.fixture
+    def remote(self, tmp_path):
+        """Lokales Bare-Repository mit Branch main und annotiertem Tag v1.0.0"""
+        bare, work = tmp_path / "remote.git", tmp_path / "work"
+        git('init', '--bare', '-b', 'main', str(bare), cwd=tmp_path)
+        git('clone', str(bare), str(work), cwd=tmp_path)
+        git('checkout', '-b', 'main', cwd=work)
+        (work / "README.md").write_text("v1\n")
+        git('add', '.', cwd=work)
+        git('commit', '-m', 'v1', cwd=work)
+        git('tag', '-a', 'v1.0.0', '-m', 'Release', cwd=work)
+        git('push', 'origin', 'main', '--tags', cwd=work)
+        return bare, work
+
+    def commit(self, work):
+        return git('rev-parse', 'HEAD', cwd=work)
+
+    def make_pinned_loader(self, server, tmp_path, remote, **kwargs):
+        return make_loader(server, cache=ModuleCache(str(tmp_path / "git")),
+                           resolver=LsRemoteResolver(str(remote)), **kwargs)
+
+    def test_incomplete_resolver_rejected(self):
+        """Test: Resolver ohne list_refs lassen sich nicht erzeugen"""
+        class Incomplete(RefResolver):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_branch_pinned_once_per_session(self, remote, tmp_path):
+        """Test: main wird einmal aufgelöst, spätere Pushes ändern die Session nicht"""
+        bare, work = remote
+        first = self.commit(work)
+        with StubGitServer({first: dict(MODULES)}) as server:
+            loader = self.make_pinned_loader(server, tmp_path, bare)
+            namespace = {'loaded': []}
+            assert loader.load_module('demo', namespace=namespace)
+
+            (work / "README.md").write_text("v2\n")
+            git('commit', '-am', 'v2', cwd=work)
+            git('push', 'origin', 'main', cwd=work)
+
+            assert loader.load_module('setup', namespace=namespace)
+            assert loader.pins == {'main': first}
+            assert server.requests == [f"/{server.repo}/{first}/src/demo.py",
+                                       f"/{server.repo}/{first}/src/setup.py"]
+            assert self.make_pinned_loader(server, tmp_path, bare).resolve_version() == self.commit(work)
+
+    def test_annotated_tag_and_versions(self, remote, tmp_path):
+        """Test: Annotierte Tags zeigen auf den Commit, Versionen kommen vom Resolver"""
+        bare, work = remote
+        loader = GitLoader("test/repo", base_url="http://127.0.0.1:1", cache=ModuleCache(str(tmp_path)),
+                           resolver=LsRemoteResolver(str(bare)))
+
+        assert loader.resolve_version('v1.0.0') == self.commit(work)
+        assert loader.get_available_versions() == ['main', 'v1.0.0']
+
+    def test_offline_uses_last_pin(self, remote, tmp_path):
+        """Test: Ohne Resolver-Zugriff gilt der zuletzt gespeicherte Pin samt gecachter Module"""
+        bare, work = remote
+        sha = self.commit(work)
+        with StubGitServer({sha: dict(MODULES)}) as server:
+            self.make_pinned_loader(server, tmp_path, bare).load_module('demo', namespace={'loaded': []})
+            server.requests.clear()
+
+            offline = self.make_pinned_loader(server, tmp_path, tmp_path / "fehlt.git")
+            namespace = {'loaded': []}
+            assert offline.load_module('demo', namespace=namespace)
+
+        assert offline.pins == {'main': sha}
+        assert server.requests == []
+        assert namespace['loaded'] == ['demo']
+
+    def test_hashes_by_ref_name(self, remote, tmp_path):
+        """Test: Unter dem Tag-Namen hinterlegte Hashes gelten für den gepinnten Commit"""
+        bare, work = remote
+        with StubGitServer({self.commit(work): dict(MODULES)}) as server:
+            loader = self.make_pinned_loader(server, tmp_path, bare, verify_hashes=True)
+            loader.MODULE_HASHES = {'demo': {'v1.0.0': "0" * 64},
+                                    'setup': {'v1.0.0': loader.calculate_hash(MODULES['setup'])}}
+
+            assert not loader.load_module('demo', 'v1.0.0', namespace={'loaded': []})
+            assert loader.load_module('setup', 'v1.0.0', namespace={'loaded': []})
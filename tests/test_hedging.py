@@ -0,0 +1,160 @@
+"""
+Tests für hedging.py Modul
+"""
+
+import time
+from src.backends import FakeBackend
+from src.concurrency import AdaptiveConcurrency
+from src.generator import HookGenerator
+from src.hedging import HedgePolicy, run_hedged
+from src.rate_limiter import RateLimiter
+
+
+def warm_policy(latency: float = 0.01, **kwargs) -> HedgePolicy:
+    """Erzeugt eine Strategie mit ausreichender Latenzhistorie"""
+    policy = HedgePolicy(percentile=0.9, min_samples=5, **kwargs)
+    for _ in range(10):
+        policy.record_latency(latency)
+    return policy
+
+
+class TestHedgePolicy:
+    """Tests für Schwelle und Budget"""
+
+    def test_no_threshold_without_samples(self):
+        """Test: Ohne Messwerte wird nicht gehedgt"""
+        assert HedgePolicy(min_samples=5).threshold() is None
+
+    def test_threshold_percentile(self):
+        """Test: Schwelle entspricht dem Perzentil der Latenzen"""
+        policy = HedgePolicy(percentile=0.9, min_samples=1)
+        for value in range(1, 11):
+            policy.record_latency(value / 10)
+
+        assert policy.threshold() == 1.0
+
+    def test_budget_caps_hedges(self):
+        """Test: Budget begrenzt den Anteil gehedgter Requests"""
+        policy = HedgePolicy(max_hedge_ratio=0.1)
+        for _ in range(10):
+            policy.record_request()
+
+        assert policy.try_acquire()
+        assert not policy.try_acquire()
+        assert policy.metrics['budget_denied'] == 1
+
+
+class TestRunHedged:
+    """Tests für die Ausführung mit Hedge"""
+
+    def test_fast_primary_no_hedge(self):
+        """Test: Schneller primärer Request löst keinen Hedge aus"""
+        policy = warm_policy(max_hedge_ratio=1.0)
+        calls = []
+
+        def attempt(handle):
+            calls.append(handle.index)
+            handle.mark_first_byte()
+            return "ok"
+
+        assert run_hedged(attempt, policy) == (0, "ok")
+        assert calls == [0]
+
+    def test_slow_primary_hedged_and_cancelled(self):
+        """Test: Langsamer Request wird gehedgt, der Verlierer abgebrochen"""
+        policy = warm_policy(max_hedge_ratio=1.0)
+        discarded = []
+        cancelled = []
+
+        def attempt(handle):
+            if handle.index == 0:
+                handle.on_cancel(lambda: cancelled.append(0))
+                for _ in range(100):
+                    if handle.cancelled:
+                        return None
+                    time.sleep(0.01)
+                return "slow"
+            handle.mark_first_byte()
+            return "fast"
+
+        assert run_hedged(attempt, policy, discard=discarded.append) == (1, "fast")
+        assert cancelled == [0]
+        assert policy.metrics['hedge_wins'] == 1
+
+    def test_hedge_denied_by_budget(self):
+        """Test: Ohne Budget wird auf den langsamen Request gewartet"""
+        policy = warm_policy(max_hedge_ratio=0.0)
+
+        def attempt(handle):
+            time.sleep(0.05)
+            return f"attempt-{handle.index}"
+
+        assert run_hedged(attempt, policy) == (0, "attempt-0")
+        assert policy.metrics['hedges'] == 0
+
+    def test_hedge_needs_capacity(self):
+        """Test: Ohne freie Kapazität entfällt der Hedge, sonst wird sie danach freigegeben"""
+        def attempt(handle):
+            time.sleep(0.05)
+            return f"attempt-{handle.index}"
+
+        policy = warm_policy(max_hedge_ratio=1.0)
+        assert run_hedged(attempt, policy, admit=lambda: False) == (0, "attempt-0")
+        assert policy.metrics['hedges'] == 0
+        assert policy.metrics['capacity_denied'] == 1
+
+        released = []
+        assert run_hedged(attempt, policy, admit=lambda: True, release=lambda: released.append(1))
+        for _ in range(100):
+            if released:
+                break
+            time.sleep(0.01)
+        assert policy.metrics['hedges'] == 1
+        assert released == [1]
+
+
+class TestGeneratorHedging:
+    """Tests für Hedges im Generator (geteilte Parallelität und Rate-Limit)"""
+
+    def make_generator(self, policy, limit, delay=0):
+        concurrency = AdaptiveConcurrency(initial_limit=limit, min_limit=limit, max_limit=limit)
+        generator = HookGenerator("key", "voice", backend=FakeBackend(seconds_per_char=0.01),
+                                  hedge_policy=policy, concurrency=concurrency)
+        generator.rate_limiter = RateLimiter(delay)
+        return generator
+
+    def test_hedge_skipped_without_slot(self, tmp_path):
+        """Test: Belegt der primäre Request den letzten Slot, wird nicht gehedgt"""
+        policy = warm_policy(max_hedge_ratio=1.0)
+        generator = self.make_generator(policy, limit=1)
+        generator.concurrency.acquire()
+
+        assert generator._download_hook("Hallo Welt", str(tmp_path / "hook.mp3"))
+        assert policy.metrics['hedges'] == 0
+        assert policy.metrics['capacity_denied'] == 1
+
+    def test_hedge_skipped_when_rate_limited(self, tmp_path):
+        """Test: Ist der nächste Rate-Limit-Slot nicht sofort frei, wird nicht gehedgt"""
+        policy = warm_policy(max_hedge_ratio=1.0)
+        generator = self.make_generator(policy, limit=2, delay=60)
+        generator.concurrency.acquire()
+        generator.rate_limiter.wait()
+
+        assert generator._download_hook("Hallo Welt", str(tmp_path / "hook.mp3"))
+        assert policy.metrics['capacity_denied'] == 1
+        assert generator.concurrency.in_flight == 1
+
+    def test_hedge_takes_and_returns_slot(self, tmp_path):
+        """Test: Ein Hedge belegt einen Synthese-Slot und gibt ihn danach wieder frei"""
+        policy = warm_policy(max_hedge_ratio=1.0)
+        generator = self.make_generator(policy, limit=2)
+        generator.concurrency.acquire()
+
+        assert generator._download_hook("Hallo Welt", str(tmp_path / "hook.mp3"))
+        assert policy.metrics['hedges'] == 1
+        assert generator.concurrency.snapshot()['peak_in_flight'] == 2
+        for _ in range(100):
+            if generator.concurrency.in_flight == 1:
+                break
+            time.sleep(0.01)
+        assert generator.concurrency.in_flight == 1
@@ -0,0 +1,117 @@
+"""
+Tests für manifest.py Modul (inkrementelle Neugenerierung)
+"""
+
+import zipfile
+import pytest
+from src import manifest
+from src.manifest import MANIFEST_NAME, ArchiveUpdate, copy_zip_entry
+from src.generator import HookGenerator, config
+from src.rate_limiter import RateLimiter
+
+
+class TestCopyZipEntry:
+    """Tests für die rohe Übernahme von ZIP-Einträgen"""
+
+    @pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+    def test_copy_preserves_content(self, tmp_path, compression):
+        """Test: Kopierte Einträge sind gültig und unverändert"""
+        with zipfile.ZipFile(tmp_path / "old.zip", "w", compression) as z:
+            z.writestr("a.mp3", b"audio-a" * 100)
+
+        with zipfile.ZipFile(tmp_path / "old.zip") as old, \
+                zipfile.ZipFile(tmp_path / "new.zip", "w") as new:
+            assert manifest.raw_copy_supported(old, new)
+            copy_zip_entry(old, new, old.getinfo("a.mp3"), "b.mp3")
+            new.writestr("c.mp3", b"audio-c")
+
+        with zipfile.ZipFile(tmp_path / "new.zip") as z:
+            assert z.testzip() is None
+            assert z.read("b.mp3") == b"audio-a" * 100
+            assert z.read("c.mp3") == b"audio-c"
+
+    def test_fallback_without_zipfile_internals(self, tmp_path, monkeypatch):
+        """Test: Ohne die zipfile-Interna wird entpackt und mit gleicher Kompression neu geschrieben"""
+        with zipfile.ZipFile(tmp_path / "old.zip", "w", zipfile.ZIP_DEFLATED) as z:
+            z.writestr("a.mp3", b"audio-a" * 100)
+        # Python-Version, der ein benötigtes Internum fehlt
+        monkeypatch.setattr("src.manifest._RAW_COPY_MODULE_ATTRIBUTES",
+                            manifest._RAW_COPY_MODULE_ATTRIBUTES + ("_FH_ENTFERNT",))
+
+        with zipfile.ZipFile(tmp_path / "old.zip") as old, \
+                zipfile.ZipFile(tmp_path / "new.zip", "w") as new:
+            assert not manifest.raw_copy_supported(old, new)
+            copy_zip_entry(old, new, old.getinfo("a.mp3"), "b.mp3")
+
+        with zipfile.ZipFile(tmp_path / "new.zip") as z:
+            assert z.testzip() is None
+            assert z.read("b.mp3") == b"audio-a" * 100
+            assert z.getinfo("b.mp3").compress_type == zipfile.ZIP_DEFLATED
+
+
+class TestIncrementalBatch:
+    """Tests für erneute Uploads mit geänderten Hooks"""
+
+    @pytest.fixture
+    def generator(self, monkeypatch):
+        """Generator ohne Netzwerk, der angefragte Texte aufzeichnet"""
+        monkeypatch.setattr(config.validation, "enabled", False)
+        generator = HookGenerator("key", "voice")
+        generator.rate_limiter = RateLimiter(0)
+        generator.calls = []
+
+        def fake_download(text, output_path, token=None):
+            generator.calls.append(text)
+            with open(output_path, "wb") as f:
+                f.write(text.encode())
+            return "audio/mpeg"
+
+        monkeypatch.setattr(generator, "_download_hook", fake_download)
+        return generator
+
+    def test_only_changed_hooks_regenerated(self, generator, tmp_path):
+        """Test: Nur geänderte Hooks werden neu synthetisiert"""
+        generator.generate_hooks_batch(["a", "b", "c"], str(tmp_path), incremental=True)
+        generator.calls.clear()
+
+        zip_path, message = generator.generate_hooks_batch(["a", "B", "c"], str(tmp_path), incremental=True)
+
+        assert generator.calls == ["B"]
+        assert "2 unverändert" in message
+        with zipfile.ZipFile(zip_path) as z:
+            assert [z.read(name) for name in z.namelist()] == [b"a", b"B", b"c"]
+
+    def test_moved_hooks_reused(self, generator, tmp_path):
+        """Test: Verschobene Hooks werden über den Inhalts-Hash erkannt"""
+        generator.generate_hooks_batch(["a", "b"], str(tmp_path), incremental=True)
+        generator.calls.clear()
+
+        zip_path, _ = generator.generate_hooks_batch(["new", "a", "b"], str(tmp_path), incremental=True)
+
+        assert generator.calls == ["new"]
+        with zipfile.ZipFile(zip_path) as z:
+            assert z.read("hook_02.mp3") == b"a"
+            assert z.read("hook_03.mp3") == b"b"
+
+    def test_missing_zip_forces_full_run(self, generator, tmp_path):
+        """Test: Ohne alte ZIP-Datei wird das Manifest ignoriert"""
+        generator.generate_hooks_batch(["a"], str(tmp_path), incremental=True)
+        (tmp_path / config.files.default_zip_name).unlink()
+
+        update = ArchiveUpdate(str(tmp_path), [generator.cache_key("a")])
+
+        assert update.pending == [0]
+
+    def test_manifest_only_for_workspaces(self, generator, tmp_path, monkeypatch):
+        """Test: Beliebige Ausgabeverzeichnisse bekommen kein Manifest, Workspaces schon"""
+        zip_path, _ = generator.generate_hooks_batch(["a"], str(tmp_path))
+
+        assert zip_path
+        assert not (tmp_path / MANIFEST_NAME).exists()
+
+        monkeypatch.setattr("src.generator.workspace_manager.root_dir", tmp_path / "output")
+        workspace = tmp_path / "output" / "job"
+        workspace.mkdir(parents=True)
+        generator.generate_hooks_batch(["a"], str(workspace))
+
+        assert (workspace / MANIFEST_NAME).exists()
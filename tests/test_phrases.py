@@ -0,0 +1,105 @@
+"""
+Tests für phrases.py Modul und den Phrasen-Cache im Generator
+"""
+
+import itertools
+import zipfile
+import pytest
+from src.audio_cache import AudioCache
+from src.backends import FakeBackend
+from src.generator import HookGenerator
+from src.phrases import audio_frames, concat_mp3, split_sentences
+from src.rate_limiter import RateLimiter
+from src.validator import AudioValidator
+from tests.stub_server import FRAME_LENGTH, make_mp3
+
+
+class TestSentences:
+    """Tests für die Satzzerlegung"""
+
+    def test_split(self):
+        """Test: Satzzeichen bleiben am Satz"""
+        assert split_sentences("Jetzt kaufen! Nur heute. Wirklich?") == \
+            ["Jetzt kaufen!", "Nur heute.", "Wirklich?"]
+
+    def test_single_sentence(self):
+        """Test: Text ohne Satzende bleibt ein Satz"""
+        assert split_sentences("  Acid Monk  ") == ["Acid Monk"]
+
+
+class TestConcat:
+    """Tests für das Zusammensetzen auf Frame-Ebene"""
+
+    def test_strips_tags_and_xing_header(self):
+        """Test: ID3-Tags und Xing-Header der Einzeldateien fallen weg"""
+        id3 = b"ID3\x03\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+        xing = bytearray(make_mp3(1))
+        xing[36:40] = b"Xing"
+        first = id3 + bytes(xing) + make_mp3(3) + b"TAG" + b"\x00" * 125
+        second = make_mp3(4)
+
+        data = concat_mp3([first, second])
+
+        assert len(data) == 7 * FRAME_LENGTH
+        assert AudioValidator().validate_bytes(data).frames == 7
+
+    def test_drops_truncated_frame(self):
+        """Test: Abgeschnittene Frames am Ende werden verworfen"""
+        assert len(audio_frames(make_mp3(3)[:-10])) == 2
+
+
+class TestPhraseCache:
+    """Tests für die satzweise Synthese im Generator"""
+
+    @pytest.fixture
+    def backend(self):
+        """Fake-Backend, das die synthetisierten Texte aufzeichnet"""
+        backend = FakeBackend()
+        backend.texts = []
+        synthesize = backend.synthesize
+
+        def recording(text, *args, **kwargs):
+            backend.texts.append(text)
+            return synthesize(text, *args, **kwargs)
+
+        backend.synthesize = recording
+        return backend
+
+    @pytest.fixture
+    def catalog(self):
+        """Katalog: jede Kombination aus Einstieg und Slogan"""
+        openers = ["Neu im Shop.", "Nur diese Woche.", "Jetzt entdecken."]
+        taglines = ["Acid Monk bringt den Sound.", "Hör rein!", "Dein Hook wartet."]
+        return [f"{a} {b}" for a, b in itertools.product(openers, taglines)]
+
+    def make_generator(self, backend, phrase_cache, cache=None):
+        generator = HookGenerator("key", "voice", cache=cache, backend=backend, phrase_cache=phrase_cache)
+        generator.rate_limiter = RateLimiter(0)
+        return generator
+
+    def test_fewer_calls_than_hook_cache(self, backend, catalog, tmp_path):
+        """Test: Wiederkehrende Sätze werden nur einmal synthetisiert"""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        zip_path, message = self.make_generator(backend, True).generate_hooks_batch(catalog, str(tmp_path / "a"))
+
+        assert len(backend.texts) == 6
+        assert "12 von 18 Sätzen" in message
+
+        with zipfile.ZipFile(zip_path) as z:
+            for name, text in zip(sorted(z.namelist()), catalog):
+                assert AudioValidator().validate_bytes(z.read(name), text).valid
+
+        backend.texts.clear()
+        hook_cache = AudioCache(str(tmp_path / "hook-cache"))
+        self.make_generator(backend, False, hook_cache).generate_hooks_batch(catalog, str(tmp_path / "b"))
+        assert len(backend.texts) == len(catalog)
+
+    def test_assembled_hook_cached(self, backend, tmp_path):
+        """Test: Zusammengesetzte Hooks landen zusätzlich im Hook-Cache"""
+        generator = self.make_generator(backend, True)
+        text = "Erster Satz. Zweiter Satz."
+
+        assert generator.generate_audio_hook(text, str(tmp_path / "a.mp3"))
+        assert backend.texts == ["Erster Satz.", "Zweiter Satz."]
+        assert generator.is_cached(text)
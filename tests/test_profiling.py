@@ -0,0 +1,139 @@
+"""
+Tests für profiling.py Modul
+"""
+
+import json
+import pstats
+import threading
+from src.backends import FakeBackend
+from src.generator import HookGenerator
+from src.profiling import NO_STAGE, RunProfile
+from src.rate_limiter import RateLimiter
+from src.scheduler import HookJob, JobScheduler
+
+
+class GatedBackend(FakeBackend):
+    """Fake-Backend, das die ersten Hooks zweier Läufe gleichzeitig synthetisiert"""
+
+    def __init__(self, gated):
+        super().__init__(seconds_per_char=0)
+        self.gated = gated
+        self.barrier = threading.Barrier(len(gated), timeout=5)
+
+    def synthesize(self, text, *args, **kwargs):
+        if text in self.gated:
+            self.barrier.wait()
+        return super().synthesize(text, *args, **kwargs)
+
+
+def busy_worker_function():
+    """Eindeutig benannte Funktion für die Thread-Profile"""
+    return sum(range(1000))
+
+
+class TestRunProfile:
+    """Tests für Phasenzeiten und Berichte"""
+
+    def test_stages_accumulate(self, tmp_path):
+        """Test: Mehrfach gemessene Phasen werden aufsummiert und gezählt"""
+        profile = RunProfile(str(tmp_path))
+        profile.add("network", 0.5)
+        profile.add("network", 0.25)
+        with profile.stage("zip"):
+            pass
+
+        stages = profile.report()['stages']
+        assert stages['network'] == {'seconds': 0.75, 'count': 2}
+        assert list(stages) == ["network", "zip"]
+
+    def test_worker_threads_merged(self, tmp_path):
+        """Test: Profile aus Worker-Threads landen in derselben .pstats-Datei"""
+        def work():
+            with profile.thread():
+                busy_worker_function()
+
+        with RunProfile(str(tmp_path)) as profile:
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        functions = {name for _, _, name in pstats.Stats(profile.files['pstats']).stats}
+        assert "busy_worker_function" in functions
+
+
+class TestGeneratorProfiling:
+    """Tests für den Profiling-Modus des Generators"""
+
+    def make_generator(self, profile, backend=None):
+        generator = HookGenerator("key", "voice", backend=backend or FakeBackend(), profile=profile)
+        generator.rate_limiter = RateLimiter(0)
+        return generator
+
+    def test_reports_next_to_output(self, tmp_path):
+        """Test: Profilierter Lauf schreibt pstats, Allokationen und Phasenzeiten"""
+        source = tmp_path / "hooks.txt"
+        source.write_text("Erster Hook---Zweiter Hook", encoding="utf-8")
+
+        zip_path, message = self.make_generator(True).generate_from_file(str(source), str(tmp_path))
+
+        assert zip_path
+        assert "📊 Profil" in message
+        assert pstats.Stats(str(tmp_path / "profile.pstats")).total_calls > 0
+        assert "Allokationen" in (tmp_path / "profile_allocations.txt").read_text(encoding="utf-8")
+
+        stages = json.loads((tmp_path / "profile_stages.json").read_text())['stages']
+        for stage in ("parse", "queue_wait", "network", "disk_write", "validate", "zip"):
+            assert stage in stages
+        assert stages['network']['count'] == 2
+
+    def test_disabled_is_noop(self, tmp_path):
+        """Test: Ohne Profiling entstehen keine Berichte und Phasen kosten nichts"""
+        generator = self.make_generator(False)
+
+        zip_path, message = generator.generate_hooks_batch(["Hallo Welt"], str(tmp_path))
+
+        assert zip_path
+        assert "Profil" not in message
+        assert not list(tmp_path.glob("profile*"))
+        assert generator._stage("network") is NO_STAGE
+
+    def test_concurrent_runs_keep_separate_profiles(self, tmp_path):
+        """Test: Gleichzeitige Läufe auf einem Generator verbuchen ihre Phasen getrennt"""
+        generator = self.make_generator(True, GatedBackend({"Lauf A", "Lauf B eins"}))
+        runs = {"a": ["Lauf A"], "b": ["Lauf B eins", "Lauf B zwei", "Lauf B drei"]}
+        results = {}
+
+        def run(name):
+            (tmp_path / name).mkdir()
+            results[name] = generator.generate_hooks_batch(runs[name], str(tmp_path / name))
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in runs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for name, texts in runs.items():
+            assert "📊 Profil" in results[name][1]
+            stages = json.loads((tmp_path / name / "profile_stages.json").read_text())['stages']
+            assert stages['network']['count'] == len(texts)
+
+    def test_scheduler_job_profiled(self, tmp_path):
+        """Test: Jobs aus dem Scheduler schreiben ihre Berichte ins Ausgabeverzeichnis"""
+        scheduler = JobScheduler(workers=2, rate_limiter=RateLimiter(0))
+        try:
+            job = scheduler.submit(HookJob(self.make_generator(True), ["Erster Hook", "Zweiter Hook"],
+                                           str(tmp_path)))
+            zip_path, message = job.wait(10)
+        finally:
+            scheduler.shutdown()
+
+        assert zip_path
+        assert "📊 Profil" in message
+        assert pstats.Stats(str(tmp_path / "profile.pstats")).total_calls > 0
+        assert (tmp_path / "profile_allocations.txt").exists()
+
+        stages = json.loads((tmp_path / "profile_stages.json").read_text())['stages']
+        for stage in ("queue_wait", "network", "disk_write", "validate", "zip"):
+            assert stage in stages
+        assert stages['network']['count'] == 2
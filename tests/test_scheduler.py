@@ -0,0 +1,117 @@
+"""
+Tests für scheduler.py Modul
+"""
+
+import threading
+import pytest
+from src.generator import HookGenerator
+from src.rate_limiter import RateLimiter
+from src.scheduler import HookJob, JobScheduler, PRIORITY_BULK, PRIORITY_INTERACTIVE
+
+
+class RecordingGenerator(HookGenerator):
+    """Generator ohne Netzwerk, der die Reihenfolge der Hooks aufzeichnet"""
+
+    def __init__(self):
+        super().__init__("key", "voice")
+        self.order = []
+        self.gate = threading.Event()
+        self.started = threading.Event()
+
+    def generate_audio_hook(self, text, output_path, token=None):
+        self.started.set()
+        self.gate.wait(5)
+        self.order.append(text)
+        with open(output_path, "wb") as f:
+            f.write(b"\x00")
+        return True
+
+
+class TestJobScheduler:
+    """Tests für die Job-Reihenfolge"""
+
+    @pytest.fixture
+    def scheduler(self):
+        """Fixture für Scheduler mit einem Worker und ohne Rate-Limit"""
+        scheduler = JobScheduler(workers=1, rate_limiter=RateLimiter(0))
+        yield scheduler
+        scheduler.shutdown()
+
+    def test_priority_classification(self, tmp_path):
+        """Test: Kleine Jobs sind interaktiv, große Bulk"""
+        generator = RecordingGenerator()
+
+        assert HookJob(generator, ["a"] * 3, str(tmp_path)).priority == PRIORITY_INTERACTIVE
+        assert HookJob(generator, ["a"] * 500, str(tmp_path)).priority == PRIORITY_BULK
+
+    def test_cost_from_characters(self, tmp_path):
+        """Test: Kosten entsprechen der Zeichenanzahl"""
+        job = HookJob(RecordingGenerator(), ["abc", "de"], str(tmp_path))
+
+        assert job.cost == 5
+
+    def test_small_job_overtakes_large(self, scheduler, tmp_path):
+        """Test: Ein kleiner Job wartet nicht hinter einem großen Katalog"""
+        generator = RecordingGenerator()
+        (tmp_path / "big").mkdir()
+        (tmp_path / "small").mkdir()
+
+        big = scheduler.submit(HookJob(generator, [f"big{i}" for i in range(20)],
+                                       str(tmp_path / "big"), tenant="a"))
+        generator.started.wait(5)
+        small = scheduler.submit(HookJob(generator, ["s1", "s2", "s3"],
+                                         str(tmp_path / "small"), tenant="b"))
+        generator.gate.set()
+
+        assert small.wait(10)[0] is not None
+        assert big.wait(10)[0] is not None
+        assert generator.order[1:4] == ["s1", "s2", "s3"]
+
+    def test_fair_share_interleaves_tenants(self, scheduler, tmp_path):
+        """Test: Bei gleicher Klasse werden Nutzer abwechselnd bedient"""
+        generator = RecordingGenerator()
+        scheduler.quantum = 0
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+
+        first = scheduler.submit(HookJob(generator, ["a"] * 4, str(tmp_path / "a"), tenant="a"))
+        generator.started.wait(5)
+        second = scheduler.submit(HookJob(generator, ["b"] * 6, str(tmp_path / "b"), tenant="b"))
+        generator.gate.set()
+
+        first.wait(10)
+        second.wait(10)
+        # Nach dem bereits laufenden ersten Hook wechseln sich die Nutzer ab
+        assert generator.order == ["a", "a", "b", "a", "b", "a", "b", "b", "b", "b"]
+
+    def test_failed_hook_fails_job(self, scheduler, tmp_path):
+        """Test: Ein fehlgeschlagener Hook beendet den Job mit Fehler"""
+        generator = RecordingGenerator()
+        generator.gate.set()
+        generator.generate_audio_hook = lambda text, path, token=None: False
+
+        job = scheduler.submit(HookJob(generator, ["a", "b"], str(tmp_path)))
+
+        assert job.wait(10) == (None, "Fehler bei Hook 1")
+
+    def test_failed_hook_reports_hook_number(self, scheduler, tmp_path):
+        """Test: Bei einer Auswahl einzelner Hooks nennt der Fehler die Hook-Nummer, nicht die Position"""
+        generator = RecordingGenerator()
+        generator.gate.set()
+        generator.generate_audio_hook = lambda text, path, token=None: text != "sieben"
+
+        job = scheduler.submit(HookJob(generator, ["drei", "sieben"], str(tmp_path), numbers=[3, 7]))
+
+        assert job.wait(10) == (None, "Fehler bei Hook 7")
+
+    def test_cancel_skips_queued_hooks(self, scheduler, tmp_path):
+        """Test: Abbruch überspringt wartende Hooks und beendet den Job sofort"""
+        generator = RecordingGenerator()
+
+        job = scheduler.submit(HookJob(generator, ["a"] * 10, str(tmp_path)))
+        generator.started.wait(5)
+        job.token.cancel()
+        generator.gate.set()
+
+        assert job.wait(5) == (None, "⏹️ Generierung abgebrochen")
+        assert len(generator.order) == 1
@@ -0,0 +1,357 @@
+"""
+Tests für setup.py Modul
+"""
+
+import hashlib
+import json
+import subprocess
+import sys
+import time
+import types
+import zipfile
+from pathlib import Path
+import pytest
+from src.setup import ColabSetup
+
+SATISFIED = "pytest>=1.0"
+MISSING = "colab-sound-nicht-installiert>=1.0"
+OUTDATED = "pytest<1.0"
+
+
+@pytest.fixture
+def pip_calls(monkeypatch):
+    """Zeichnet pip-Aufrufe auf statt zu installieren"""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr("src.setup.subprocess.run", fake_run)
+    return calls
+
+
+class TestInstallPackages:
+    """Tests für die Installation nur fehlender Packages"""
+
+    def test_missing_batched_into_one_call(self, pip_calls):
+        """Test: Fehlende und veraltete Anforderungen landen in einem pip-Aufruf"""
+        colab = ColabSetup()
+
+        assert colab.install_packages([SATISFIED, MISSING, OUTDATED])
+
+        assert len(pip_calls) == 1
+        assert pip_calls[0][-2:] == [MISSING, OUTDATED]
+        assert {"pytest", "colab-sound-nicht-installiert"} <= colab.installed_packages
+
+    def test_satisfied_needs_no_pip(self, pip_calls):
+        """Test: Erfüllte Anforderungen und nicht zutreffende Marker brauchen kein pip"""
+        assert ColabSetup().install_packages([SATISFIED, 'other-package; python_version < "3"'])
+        assert pip_calls == []
+
+    def test_stamp_skips_all_checks(self, pip_calls, monkeypatch):
+        """Test: Nach erfolgreichem Lauf genügt der Stempel, ohne Prüfung der Anforderungen"""
+        colab = ColabSetup()
+        colab.install_packages([SATISFIED, MISSING])
+        monkeypatch.setattr(ColabSetup, "missing_requirements", lambda *args: pytest.fail("erneut geprüft"))
+
+        assert ColabSetup().install_packages([MISSING, SATISFIED])
+        assert len(pip_calls) == 1
+        assert colab.stamp_path([SATISFIED, MISSING]).exists()
+
+    def test_changed_version_invalidates_stamp(self, pip_calls):
+        """Test: Weicht eine installierte Version vom Stempel ab, wird erneut geprüft und installiert"""
+        colab = ColabSetup()
+        colab.install_packages([SATISFIED, MISSING])
+        stamp = colab.stamp_path([SATISFIED, MISSING])
+
+        # Wie nach 'pip uninstall': eine gemerkte Version ist nicht mehr installiert
+        data = json.loads(stamp.read_text())
+        data['versions']['colab-sound-nicht-installiert'] = "1.0"
+        stamp.write_text(json.dumps(data))
+
+        assert colab.install_packages([SATISFIED, MISSING])
+        assert len(pip_calls) == 2
+        assert pip_calls[1][-1:] == [MISSING]
+        assert 'colab-sound-nicht-installiert' not in json.loads(stamp.read_text())['versions']
+
+    def test_failed_install_writes_no_stamp(self, monkeypatch):
+        """Test: Schlägt pip fehl, bleibt der Stempel aus und der nächste Lauf versucht es erneut"""
+        def failing_run(cmd, **kwargs):
+            raise subprocess.CalledProcessError(1, cmd)
+
+        monkeypatch.setattr("src.setup.subprocess.run", failing_run)
+        colab = ColabSetup()
+
+        assert not colab.install_packages([MISSING])
+        assert not colab.stamp_path([MISSING]).exists()
+
+    def test_requirements_file(self, pip_calls, tmp_path):
+        """Test: requirements.txt ohne Kommentare und Optionen, fehlende in einem Aufruf"""
+        requirements = tmp_path / "requirements.txt"
+        requirements.write_text(f"# Kern\n{SATISFIED}\n\n-i https://example.com/simple\n{MISSING}  # neu\n")
+
+        assert ColabSetup().install_requirements(str(requirements))
+        assert len(pip_calls) == 1
+        assert pip_calls[0][-1] == MISSING
+
+
+def make_wheel(root, name, version, requires=()):
+    """Minimales, installierbares Wheel mit Requires-Dist"""
+    dist = name.replace("-", "_")
+    info = f"{dist}-{version}.dist-info"
+    files = {
+        f"{dist}/__init__.py": "",
+        f"{info}/METADATA": f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+                            + "".join(f"Requires-Dist: {requirement}\n" for requirement in requires),
+        f"{info}/WHEEL": "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    files[f"{info}/RECORD"] = "".join(f"{path},,\n" for path in [*files, f"{info}/RECORD"])
+
+    path = root / f"{dist}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(path, "w") as wheel:
+        for file_name, text in files.items():
+            wheel.writestr(file_name, text)
+    return path.name
+
+
+def make_wheelhouse(root, wheels, tamper=()):
+    """Wheelhouse aus (Name, Version, Abhängigkeiten) mit Manifest; tamper: nachträglich veränderte Wheels"""
+    root.mkdir(exist_ok=True)
+    hashes = {}
+    for name, version, requires in wheels:
+        filename = make_wheel(root, name, version, requires)
+        hashes[filename] = hashlib.sha256((root / filename).read_bytes()).hexdigest()
+        if name in tamper:
+            with zipfile.ZipFile(root / filename, "a") as wheel:
+                wheel.writestr("manipuliert.py", "import os\n")
+    (root / "manifest.json").write_text(json.dumps({'wheels': hashes}))
+    return str(root)
+
+
+@pytest.fixture
+def staged_pip(monkeypatch):
+    """Zeichnet pip-Aufrufe samt Staging-Verzeichnis und Requirements-Datei auf"""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        staging = Path(cmd[cmd.index("--find-links") + 1]) if "--find-links" in cmd else None
+        requirements = Path(cmd[cmd.index("-r") + 1]).read_text() if "-r" in cmd else None
+        calls.append({'cmd': cmd, 'requirements': requirements,
+                      'staged': sorted(p.name for p in staging.glob("*.whl")) if staging else []})
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr("src.setup.subprocess.run", fake_run)
+    return calls
+
+
+class TestWheelhouse:
+    """Tests für Installationen aus einem lokalen Wheelhouse"""
+
+    APP = ("colab-sound-nicht-installiert", "1.2.0", ["colab-sound-abhaengig>=1.0"])
+    DEPENDENCY = ("colab-sound-abhaengig", "1.1.0", [])
+    APP_WHEEL = "colab_sound_nicht_installiert-1.2.0-py3-none-any.whl"
+    DEPENDENCY_WHEEL = "colab_sound_abhaengig-1.1.0-py3-none-any.whl"
+
+    def test_fully_covered_installs_with_hash_checking(self, staged_pip, tmp_path):
+        """Test: Deckt das Wheelhouse alles ab, läuft pip ohne Index mit den Manifest-Hashes"""
+        wheelhouse = make_wheelhouse(tmp_path / "wheels", [self.APP, self.DEPENDENCY])
+        manifest = json.loads((tmp_path / "wheels" / "manifest.json").read_text())['wheels']
+
+        assert ColabSetup(wheelhouse_dir=wheelhouse).install_packages([MISSING])
+
+        call = staged_pip[0]
+        assert {"--no-index", "--require-hashes"} <= set(call['cmd'])
+        assert call['cmd'][call['cmd'].index("--find-links") + 1] != wheelhouse
+        assert call['staged'] == sorted([self.APP_WHEEL, self.DEPENDENCY_WHEEL])
+        assert f"colab-sound-nicht-installiert==1.2.0 --hash=sha256:{manifest[self.APP_WHEEL]}" \
+            in call['requirements']
+        assert f"colab-sound-abhaengig==1.1.0 --hash=sha256:{manifest[self.DEPENDENCY_WHEEL]}" \
+            in call['requirements']
+
+    def test_network_only_for_missing_wheels(self, staged_pip, tmp_path):
+        """Test: Nur Anforderungen ohne Wheel kommen aus dem Netz"""
+        wheelhouse = make_wheelhouse(tmp_path / "wheels", [self.APP, self.DEPENDENCY])
+
+        assert ColabSetup(wheelhouse_dir=wheelhouse).install_packages([MISSING, "colab-sound-neu"])
+
+        cmd = staged_pip[0]['cmd']
+        assert "--no-index" not in cmd
+        assert cmd[-2:] == ["colab-sound-nicht-installiert==1.2.0", "colab-sound-neu"]
+
+    def test_tampered_dependency_never_reaches_pip(self, staged_pip, tmp_path):
+        """Test: Ein verändertes Abhängigkeits-Wheel wird nicht bereitgestellt, sondern geladen"""
+        wheelhouse = make_wheelhouse(tmp_path / "wheels", [self.APP, self.DEPENDENCY],
+                                     tamper=["colab-sound-abhaengig"])
+
+        assert ColabSetup(wheelhouse_dir=wheelhouse).install_packages([MISSING])
+
+        call = staged_pip[0]
+        assert call['staged'] == [self.APP_WHEEL]
+        assert "--no-index" not in call['cmd']
+        assert call['cmd'][-2:] == ["colab-sound-nicht-installiert==1.2.0", "colab-sound-abhaengig>=1.0"]
+
+    def test_offline_refuses_missing_wheels(self, staged_pip, tmp_path):
+        """Test: Offline ohne verifiziertes Wheel (auch für Abhängigkeiten) wird nichts installiert"""
+        wheelhouse = make_wheelhouse(tmp_path / "wheels", [self.APP, self.DEPENDENCY],
+                                     tamper=["colab-sound-abhaengig"])
+
+        assert not ColabSetup(wheelhouse_dir=wheelhouse, offline=True).install_packages(["colab-sound-neu"])
+        assert not ColabSetup(wheelhouse_dir=wheelhouse, offline=True).install_packages([MISSING])
+        assert staged_pip == []
+
+    def test_only_verified_compatible_wheels(self, tmp_path):
+        """Test: Veränderte und plattformfremde Wheels zählen nicht"""
+        wheelhouse = make_wheelhouse(tmp_path / "wheels", [self.APP, self.DEPENDENCY],
+                                     tamper=["colab-sound-abhaengig"])
+        foreign = "colab_sound_fremd-1.0-cp27-cp27m-win32.whl"
+        (tmp_path / "wheels" / foreign).write_bytes(b"fremd")
+        manifest = json.loads((tmp_path / "wheels" / "manifest.json").read_text())
+        manifest['wheels'][foreign] = hashlib.sha256(b"fremd").hexdigest()
+        (tmp_path / "wheels" / "manifest.json").write_text(json.dumps(manifest))
+
+        index = ColabSetup(wheelhouse_dir=wheelhouse).wheelhouse_index()
+
+        assert list(index) == ["colab-sound-nicht-installiert"]
+
+    def test_failed_offline_install_is_not_retried_online(self, monkeypatch, tmp_path, caplog):
+        """Test: Scheitert pip ohne Index, gibt es keinen Netz-Fallback; stderr wird geloggt"""
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(list(cmd))
+            raise subprocess.CalledProcessError(1, cmd, stderr="ERROR: Hash mismatch")
+
+        monkeypatch.setattr("src.setup.subprocess.run", run)
+        wheelhouse = make_wheelhouse(tmp_path / "wheels", [self.APP, self.DEPENDENCY])
+
+        assert not ColabSetup(wheelhouse_dir=wheelhouse).install_packages([MISSING])
+        assert len(calls) == 1
+        assert "Hash mismatch" in caplog.text
+
+    def test_real_pip_installs_with_hashes(self, tmp_path):
+        """Test: pip akzeptiert die erzeugte Requirements-Datei im Hash-Prüfmodus"""
+        wheelhouse = make_wheelhouse(tmp_path / "wheels", [self.APP, self.DEPENDENCY])
+        target = tmp_path / "target"
+
+        with ColabSetup(wheelhouse_dir=wheelhouse)._install_command([MISSING], isolated=True) as cmd:
+            result = subprocess.run(cmd + ["--target", str(target), "--no-cache-dir"],
+                                    capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert (target / "colab_sound_nicht_installiert").is_dir()
+        assert (target / "colab_sound_abhaengig").is_dir()
+
+    def test_build_writes_manifest(self, monkeypatch, tmp_path):
+        """Test: Gebaute Wheels landen mit Prüfsumme im Manifest"""
+        def pip_wheel(cmd, **kwargs):
+            wheel_dir = Path(cmd[cmd.index("--wheel-dir") + 1])
+            (wheel_dir / self.APP_WHEEL).write_bytes(b"wheel")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        monkeypatch.setattr("src.setup.subprocess.run", pip_wheel)
+        requirements = tmp_path / "requirements.txt"
+        requirements.write_text(f"{MISSING}\n")
+        colab = ColabSetup()
+
+        assert colab.build_wheelhouse(str(requirements), str(tmp_path / "wheels"))
+
+        manifest = json.loads((tmp_path / "wheels" / "manifest.json").read_text())
+        assert manifest['wheels'] == {self.APP_WHEEL: hashlib.sha256(b"wheel").hexdigest()}
+        assert list(colab.wheelhouse_index()) == ["colab-sound-nicht-installiert"]
+
+
+class FakeShell:
+    """IPython-Shell mit Extension-Manager"""
+
+    def __init__(self):
+        self.extension_manager = types.SimpleNamespace(loaded=set())
+        self.magics = []
+
+    def run_line_magic(self, magic, name):
+        self.magics.append((magic, name))
+        self.extension_manager.loaded.add(name)
+
+
+class TestWarmStart:
+    """Tests für den Setup-Snapshot"""
+
+    @pytest.fixture
+    def environment(self, monkeypatch):
+        """Installation und Secrets mit messbarer Dauer, IPython und nest_asyncio als Fakes"""
+        shell = FakeShell()
+        calls = {'install': 0, 'secrets': 0}
+
+        def install(self, packages, quiet=True, force=False):
+            calls['install'] += 1
+            time.sleep(0.05)
+            return True
+
+        def load_secrets(self):
+            calls['secrets'] += 1
+            time.sleep(0.02)
+            return {'ELEVENLABS_API_KEY': "geheim-123"}
+
+        monkeypatch.setattr("src.setup.GRADIO_PACKAGES", [SATISFIED])
+        monkeypatch.setattr(ColabSetup, "install_packages", install)
+        monkeypatch.setattr(ColabSetup, "load_secrets", load_secrets)
+        monkeypatch.setattr("src.setup._ipython", lambda: shell)
+        monkeypatch.setitem(sys.modules, "nest_asyncio", types.SimpleNamespace(apply=lambda: None))
+        return shell, calls
+
+    def test_second_initialize_skips_all_steps(self, environment):
+        """Test: Im selben Prozess wird keine Arbeit wiederholt, die Ersparnis wird berichtet"""
+        shell, calls = environment
+        colab = ColabSetup()
+
+        first = colab.initialize()
+        second = colab.initialize()
+
+        assert first['gradio_setup'] and first['secrets_loaded']
+        assert not any(step['skipped'] for step in first['warm_start'].values())
+        assert all(step['skipped'] for step in second['warm_start'].values())
+        assert calls == {'install': 1, 'secrets': 1}
+        assert shell.magics == [('load_ext', 'gradio')]
+        assert second['secrets'] == first['secrets']
+        assert second['warm_start']['packages']['saved_seconds'] > 0.04
+        assert second['time_saved'] > 0.06
+
+    def test_new_process_reuses_packages_only(self, environment, monkeypatch):
+        """Test: Nach einem Neustart werden nur Extension und Secrets neu geladen"""
+        shell, calls = environment
+        ColabSetup().initialize()
+        monkeypatch.setattr("src.setup.os.getpid", lambda: -1)
+
+        status = ColabSetup().initialize()
+
+        assert status['warm_start']['packages']['skipped']
+        assert not status['warm_start']['extensions']['skipped']
+        assert not status['warm_start']['secrets']['skipped']
+        assert calls == {'install': 1, 'secrets': 2}
+
+    def test_changed_version_reinstalls(self, environment):
+        """Test: Weicht eine installierte Version vom Snapshot ab, wird neu installiert"""
+        _, calls = environment
+        colab = ColabSetup()
+        colab.initialize()
+
+        snapshot = json.loads(colab.snapshot_path().read_text())
+        snapshot['packages']['pytest'] = "0.0.1"
+        colab.snapshot_path().write_text(json.dumps(snapshot))
+
+        status = colab.initialize()
+
+        assert not status['warm_start']['packages']['skipped']
+        assert status['warm_start']['extensions']['skipped']
+        assert calls['install'] == 2
+
+    def test_snapshot_contains_no_secret_values(self, environment):
+        """Test: Der Snapshot speichert nur Schlüssel und Prüfsumme der Secrets"""
+        colab = ColabSetup()
+        colab.initialize()
+
+        text = colab.snapshot_path().read_text()
+        snapshot = json.loads(text)
+        assert "geheim-123" not in text
+        assert snapshot['secret_keys'] == ['ELEVENLABS_API_KEY']
+        assert snapshot['secrets_checksum'] == ColabSetup.secrets_checksum({'ELEVENLABS_API_KEY': "geheim-123"})
@@ -0,0 +1,65 @@
+"""
+Tests für die Streaming-Vorschau im Generator (gegen lokalen Stub-Server)
+"""
+
+import time
+import pytest
+from src.generator import HookGenerator, config
+from src.cancellation import CancellationToken
+from tests.stub_server import StubTTSServer
+
+
+class TestStreamPreview:
+    """Tests für HookGenerator.stream_preview"""
+
+    @pytest.fixture
+    def slow_server(self, monkeypatch):
+        """Stub, der 10 Chunks mit je 50ms Abstand sendet"""
+        with StubTTSServer(frames=40, frames_per_chunk=4, chunk_delay=0.05) as server:
+            monkeypatch.setattr(config.elevenlabs, "api_base", server.api_base)
+            yield server
+
+    def test_chunks_arrive_incrementally(self, slow_server):
+        """Test: Erste Chunks kommen lange vor dem Ende des Streams an"""
+        generator = HookGenerator("key", "voice")
+        start = time.monotonic()
+        arrivals = []
+
+        for chunk in generator.stream_preview("Hallo Welt"):
+            arrivals.append(time.monotonic() - start)
+
+        assert len(arrivals) > 1
+        assert arrivals[0] < arrivals[-1] / 2
+        assert generator.last_preview_latency is not None
+        assert generator.last_preview_latency < arrivals[-1]
+
+    def test_uses_streaming_endpoint(self, slow_server):
+        """Test: Vorschau nutzt den Stream-Endpunkt mit Latenz-Optimierung"""
+        generator = HookGenerator("key", "voice")
+        list(generator.stream_preview("Hallo"))
+
+        request = slow_server.requests[-1]
+        assert request['path'] == "/v1/text-to-speech/voice/stream"
+        assert request['query']['optimize_streaming_latency'] == str(config.elevenlabs.streaming_latency)
+        assert request['body']['text'] == "Hallo"
+
+    def test_cancel_stops_stream(self, slow_server):
+        """Test: Abbruch beendet den Stream vorzeitig"""
+        generator = HookGenerator("key", "voice")
+        token = CancellationToken()
+        chunks = 0
+
+        for _ in generator.stream_preview("Hallo", token):
+            chunks += 1
+            token.cancel()
+
+        assert chunks == 1
+
+    def test_api_error(self, monkeypatch):
+        """Test: API-Fehler werden als RuntimeError gemeldet"""
+        with StubTTSServer(status=400) as server:
+            monkeypatch.setattr(config.elevenlabs, "api_base", server.api_base)
+            generator = HookGenerator("key", "voice")
+
+            with pytest.raises(RuntimeError, match="API-Fehler 400"):
+                list(generator.stream_preview("Hallo"))
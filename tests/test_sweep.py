@@ -0,0 +1,99 @@
+"""
+Tests für sweep.py Modul
+"""
+
+import json
+import zipfile
+import pytest
+from src.backends import FakeBackend
+from src.rate_limiter import RateLimiter
+from src.sweep import VoiceSweep, build_grid, parse_hook_numbers, parse_values
+
+
+class TestGrid:
+    """Tests für Raster und Eingaben"""
+
+    def test_cross_product(self):
+        """Test: Raster enthält alle Kombinationen"""
+        points = build_grid(["a", "b"], [0.0, 0.5], [0.8], [0.5, 1.0])
+
+        assert len(points) == 8
+        assert len({point.label for point in points}) == 8
+
+    def test_labels_keep_close_values_apart(self):
+        """Test: Nah beieinander liegende Werte bekommen eigene Verzeichnisse"""
+        points = build_grid(["a"], [0.12, 0.125], [0.5, 0.499], [0.0])
+
+        assert len({point.label for point in points}) == 4
+        assert points[0].label == "a_stab0.12_sim0.5_style0.0"
+
+    def test_indistinguishable_labels_rejected(self):
+        """Test: Voice IDs, die auf denselben Verzeichnisnamen abbilden, werden abgelehnt"""
+        with pytest.raises(ValueError, match="nicht unterscheidbar"):
+            build_grid(["voice.1", "voice_1"], [0.5], [0.5], [0.5])
+
+    def test_parse_values(self):
+        """Test: Werte werden gelesen und geprüft"""
+        assert parse_values("0.0, 0.5;1", "stability") == [0.0, 0.5, 1.0]
+        with pytest.raises(ValueError, match="zwischen 0 und 1"):
+            parse_values("1.5", "stability")
+
+    def test_parse_hook_numbers(self):
+        """Test: Bereiche und Einzelwerte, leer = alle"""
+        assert parse_hook_numbers("1-3, 5", 5) == [1, 2, 3, 5]
+        assert parse_hook_numbers("", 3) == [1, 2, 3]
+        with pytest.raises(ValueError):
+            parse_hook_numbers("4", 3)
+
+
+class TestVoiceSweep:
+    """Tests für das Rendern des Rasters"""
+
+    @pytest.fixture
+    def backend(self):
+        """Fake-Backend, das Aufrufe zählt"""
+        backend = FakeBackend()
+        backend.calls = 0
+        synthesize = backend.synthesize
+
+        def counting(*args, **kwargs):
+            backend.calls += 1
+            return synthesize(*args, **kwargs)
+
+        backend.synthesize = counting
+        return backend
+
+    def test_zip_layout_and_manifest(self, backend, tmp_path):
+        """Test: Ein Ordner pro Rasterpunkt plus Vergleichs-Manifest"""
+        points = build_grid(["voice"], [0.0, 0.5], [0.8], [1.0])
+        texts = ["Erster Hook", "Zweiter Hook", "Dritter Hook"]
+
+        sweep = VoiceSweep("key", points, backend=backend, rate_limiter=RateLimiter(0))
+        zip_path, message = sweep.run(texts, [1, 3], str(tmp_path))
+
+        with zipfile.ZipFile(zip_path) as z:
+            names = set(z.namelist())
+            manifest = json.loads(z.read("manifest.json"))
+
+        for point in points:
+            assert f"{point.label}/hook_01.mp3" in names
+            assert f"{point.label}/hook_03.mp3" in names
+        assert "vergleich.csv" in names
+        assert len(manifest['renders']) == 4
+        assert all(entry['duration'] > 0 for entry in manifest['renders'])
+        assert "4 von 4" in message
+
+    def test_repeated_sweep_renders_only_new_points(self, backend, tmp_path):
+        """Test: Erneuter Sweep mit erweitertem Raster nutzt den Cache"""
+        texts = ["Erster Hook"]
+        first = VoiceSweep("key", build_grid(["voice"], [0.0], [0.8], [1.0]),
+                           backend=backend, rate_limiter=RateLimiter(0))
+        first.run(texts, [1], str(tmp_path / "a"))
+        backend.calls = 0
+
+        second = VoiceSweep("key", build_grid(["voice"], [0.0, 0.5], [0.8], [1.0]),
+                            backend=backend, rate_limiter=RateLimiter(0))
+        _, message = second.run(texts, [1], str(tmp_path / "b"))
+
+        assert backend.calls == 1
+        assert "1 aus Cache" in message
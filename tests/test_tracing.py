@@ -0,0 +1,177 @@
+"""
+Tests für tracing.py Modul
+"""
+
+import json
+import threading
+import time
+import pytest
+from src.backends import FakeBackend
+from src.concurrency import AdaptiveConcurrency
+from src.generator import HookGenerator
+from src.rate_limiter import RateLimiter
+from src.scheduler import HookJob, JobScheduler
+from src.tracing import NOOP_SPAN, Tracer, load_spans, main, overlap_summary, to_chrome_trace
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    return tmp_path / "traces" / "trace.jsonl"
+
+
+def by_name(spans):
+    """Spans nach Namen gruppiert"""
+    grouped = {}
+    for span in spans:
+        grouped.setdefault(span['name'], []).append(span)
+    return grouped
+
+
+class TestTracer:
+    """Tests für Spans und Export"""
+
+    def test_nested_spans(self, trace_file):
+        """Test: Verschachtelte Spans teilen die Trace-ID und verweisen auf den Eltern-Span"""
+        tracer = Tracer(str(trace_file))
+        with tracer.span("job", job_id="abc") as job:
+            with tracer.span("hook", hook=1):
+                pass
+
+        hook, exported_job = load_spans(str(trace_file))[::-1]
+        assert hook['parent_id'] == job.span_id
+        assert hook['trace_id'] == exported_job['trace_id']
+        assert exported_job['attributes'] == {'job_id': "abc"}
+        assert exported_job['parent_id'] is None
+
+    def test_error_status(self, trace_file):
+        """Test: Exceptions markieren den Span als fehlerhaft"""
+        tracer = Tracer(str(trace_file))
+        with pytest.raises(ValueError):
+            with tracer.span("parse_text_file"):
+                raise ValueError("kaputt")
+
+        span = load_spans(str(trace_file))[0]
+        assert span['status'] == "error"
+        assert span['attributes']['error'] == "kaputt"
+
+    def test_bind_crosses_threads(self, trace_file):
+        """Test: bind überträgt den aktiven Span in Worker-Threads"""
+        tracer = Tracer(str(trace_file))
+        with tracer.span("job") as job:
+            work = tracer.bind(lambda: tracer.span("hook").__enter__().end())
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        hook = by_name(load_spans(str(trace_file)))['hook'][0]
+        assert hook['parent_id'] == job.span_id
+
+    def test_disabled(self, tmp_path):
+        """Test: Ohne Trace-Datei entstehen nur No-op-Spans"""
+        tracer = Tracer()
+        with tracer.span("job") as span:
+            assert span is NOOP_SPAN
+        assert tracer.start_span("request") is NOOP_SPAN
+        assert not list(tmp_path.iterdir())
+
+
+class TestTimeline:
+    """Tests für Auswertung und Konvertierung"""
+
+    SPANS = [
+        {'name': "hook", 'start_ns': 0, 'end_ns': 2_000_000_000},
+        {'name': "hook", 'start_ns': 1_000_000_000, 'end_ns': 3_000_000_000},
+        {'name': "hook", 'start_ns': 4_000_000_000, 'end_ns': 5_000_000_000},
+    ]
+
+    def test_overlap_and_gaps(self):
+        """Test: Maximale Überlappung und Leerlauf zwischen Hooks"""
+        summary = overlap_summary(self.SPANS)
+
+        assert summary['max_overlap'] == 2
+        assert summary['busy_seconds'] == 4.0
+        assert summary['gaps'] == [(3.0, 1.0)]
+
+    def test_chrome_trace(self, trace_file, tmp_path):
+        """Test: Kommandozeile schreibt eine Timeline im Chrome-Trace-Format"""
+        tracer = Tracer(str(trace_file))
+        with tracer.span("hook", hook=1):
+            pass
+
+        output = tmp_path / "timeline.json"
+        assert main([str(trace_file), str(output)]) == 0
+
+        events = json.loads(output.read_text())['traceEvents']
+        complete = [event for event in events if event['ph'] == "X"]
+        assert complete[0]['name'] == "hook"
+        assert complete[0]['args']['hook'] == 1
+        assert to_chrome_trace([])['traceEvents'] == []
+
+
+class TestGeneratorTracing:
+    """Tests für die Spans eines Generierungslaufs"""
+
+    def test_batch_spans(self, trace_file, tmp_path):
+        """Test: Job, Parsen, Hooks, Requests mit Phasen, Cache, Rate-Limit und ZIP"""
+        source = tmp_path / "hooks.txt"
+        source.write_text("---".join(f"Hook Nummer {i}" for i in range(4)), encoding="utf-8")
+        generator = HookGenerator(
+            "key", "voice", backend=FakeBackend(seconds_per_char=0.003),
+            concurrency=AdaptiveConcurrency(initial_limit=4, min_limit=4, max_limit=4),
+            tracer=Tracer(str(trace_file))
+        )
+        generator.rate_limiter = RateLimiter(0)
+
+        zip_path, _ = generator.generate_from_file(str(source), str(tmp_path))
+
+        assert zip_path
+        spans = load_spans(str(trace_file))
+        grouped = by_name(spans)
+        job = grouped['job'][0]
+        job_id = job['attributes']['job_id']
+
+        assert {span['trace_id'] for span in spans} == {job['trace_id']}
+        assert grouped['parse_text_file'][0]['parent_id'] == job['span_id']
+        assert sorted(span['attributes']['hook'] for span in grouped['hook']) == [1, 2, 3, 4]
+        assert all(span['attributes']['job_id'] == job_id for span in grouped['hook'])
+        assert len(grouped['cache_lookup']) == len(grouped['rate_limit_wait']) == 4
+        assert grouped['zip'][0]['parent_id'] == job['span_id']
+
+        requests = {span['span_id'] for span in grouped['request']}
+        hooks = {span['span_id'] for span in grouped['hook']}
+        assert all(span['parent_id'] in hooks for span in grouped['request'])
+        for phase in ("connect", "first_byte", "body"):
+            assert {span['parent_id'] for span in grouped[phase]} == requests
+
+        assert overlap_summary(spans)['max_overlap'] >= 2
+
+    def test_scheduler_spans(self, trace_file, tmp_path):
+        """Test: Scheduler-Jobs bekommen einen Root-Span mit einem Kind pro Hook"""
+        generator = HookGenerator("key", "voice", backend=FakeBackend(), tracer=Tracer(str(trace_file)))
+        scheduler = JobScheduler(workers=2, rate_limiter=RateLimiter(0))
+
+        job = scheduler.submit(HookJob(generator, ["Hallo Welt", "Noch ein Hook"], str(tmp_path)))
+        assert job.wait(10)[0]
+        scheduler.shutdown()
+
+        grouped = by_name(load_spans(str(trace_file)))
+        assert grouped['job'][0]['attributes']['job_id'] == job.job_id
+        assert grouped['job'][0]['attributes']['completed'] == 2
+        assert {span['parent_id'] for span in grouped['hook']} == {job.span.span_id}
+        assert len(grouped['generate_audio_hook']) == 2
+
+    def test_scheduler_parse_span(self, trace_file, tmp_path):
+        """Test: Das Parsen vor dem Einreihen wird als Kind des Job-Spans verbucht"""
+        generator = HookGenerator("key", "voice", backend=FakeBackend(), tracer=Tracer(str(trace_file)))
+        scheduler = JobScheduler(workers=1, rate_limiter=RateLimiter(0))
+        parsed = (time.time_ns() - 5_000_000, time.time_ns())
+
+        job = scheduler.submit(HookJob(generator, ["Hallo Welt"], str(tmp_path), parsed=parsed))
+        assert job.wait(10)[0]
+        scheduler.shutdown()
+
+        grouped = by_name(load_spans(str(trace_file)))
+        parse = grouped['parse_text_file'][0]
+        assert parse['parent_id'] == job.span.span_id
+        assert parse['attributes']['job_id'] == job.job_id
+        assert grouped['job'][0]['start_ns'] == parse['start_ns'] == parsed[0]
@@ -0,0 +1,114 @@
+"""
+Tests für validator.py Modul
+"""
+
+import pytest
+from src.validator import AudioValidator, parse_frame_header, skip_id3v2
+
+# MPEG1 Layer III, 128 kbit/s, 44100 Hz, ohne Padding -> 417 Bytes pro Frame
+FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+FRAME_LENGTH = 417
+
+
+def make_mp3(frames: int) -> bytes:
+    """Erzeugt einen Stream aus stummen MP3-Frames"""
+    frame = FRAME_HEADER + bytes(FRAME_LENGTH - len(FRAME_HEADER))
+    return frame * frames
+
+
+class TestAudioValidator:
+    """Tests für die AudioValidator Klasse"""
+
+    @pytest.fixture
+    def validator(self):
+        """Fixture für AudioValidator-Instanz"""
+        return AudioValidator(min_seconds_per_char=0.02, min_frames=3)
+
+    def test_parse_frame_header(self):
+        """Test: Frame-Länge und Dauer aus dem Header lesen"""
+        length, samples, sample_rate = parse_frame_header(make_mp3(1), 0)
+
+        assert length == FRAME_LENGTH
+        assert samples == 1152
+        assert sample_rate == 44100
+
+    def test_parse_frame_header_invalid(self):
+        """Test: Kein Sync-Wort sollte None liefern"""
+        assert parse_frame_header(b"\x00\x00\x00\x00", 0) is None
+
+    def test_skip_id3v2(self):
+        """Test: ID3v2-Tag am Anfang wird übersprungen"""
+        tag = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"x" * 5
+
+        assert skip_id3v2(tag + make_mp3(1)) == 15
+
+    def test_valid_stream(self, validator):
+        """Test: Vollständiger Stream ist gültig"""
+        result = validator.validate_bytes(make_mp3(50), "Kurzer Hook", "audio/mpeg")
+
+        assert result.valid
+        assert result.frames == 50
+        assert result.duration == pytest.approx(50 * 1152 / 44100)
+
+    def test_json_content_type(self, validator):
+        """Test: JSON-Fehlerantwort mit Status 200 ist ungültig"""
+        result = validator.validate_bytes(b'{"detail": "quota"}', "Hook", "application/json")
+
+        assert not result.valid
+        assert "Content-Type" in result.reason
+
+    def test_json_body(self, validator):
+        """Test: JSON-Body ohne Content-Type wird erkannt"""
+        result = validator.validate_bytes(b'{"detail": "quota"}', "Hook")
+
+        assert not result.valid
+
+    def test_truncated_stream(self, validator):
+        """Test: Abgeschnittener letzter Frame wird erkannt"""
+        result = validator.validate_bytes(make_mp3(10)[:-100], "Hook", "audio/mpeg")
+
+        assert not result.valid
+        assert "abgeschnitten" in result.reason
+
+    def test_sync_lost(self, validator):
+        """Test: Müll zwischen Frames unterbricht die Kontinuität"""
+        data = make_mp3(5) + b"garbage" + make_mp3(5)
+        result = validator.validate_bytes(data, "Hook", "audio/mpeg")
+
+        assert not result.valid
+        assert "Frame-Sync" in result.reason
+
+    def test_too_short_for_text(self, validator):
+        """Test: Audio deutlich kürzer als der Text ist ungültig"""
+        result = validator.validate_bytes(make_mp3(5), "A" * 500, "audio/mpeg")
+
+        assert not result.valid
+        assert "zu kurz" in result.reason
+
+    def test_id3v1_tag_allowed(self, validator):
+        """Test: ID3v1-Tag am Ende stört die Prüfung nicht"""
+        data = make_mp3(10) + b"TAG" + bytes(125)
+
+        assert validator.validate_bytes(data, "Hook", "audio/mpeg").valid
+
+
+class TestGeneratorValidation:
+    """Tests für die Wiederholung ungültiger Hooks im Generator"""
+
+    def test_invalid_hook_is_retried(self, tmp_path, monkeypatch):
+        """Test: Ein ungültiger Download wird automatisch wiederholt"""
+        from src.generator import HookGenerator, config
+
+        monkeypatch.setattr(config.network, "retry_delay", 0)
+        generator = HookGenerator("key", "voice")
+        responses = [b"truncated", make_mp3(20)]
+
+        def fake_download(text, output_path, token=None):
+            with open(output_path, "wb") as f:
+                f.write(responses.pop(0))
+            return "audio/mpeg"
+
+        monkeypatch.setattr(generator, "_download_hook", fake_download)
+
+        assert generator.generate_audio_hook("Hook", str(tmp_path / "hook.mp3"))
+        assert responses == []
@@ -0,0 +1,93 @@
+"""
+Tests für workspace.py Modul
+"""
+
+import os
+import time
+import pytest
+from src.workspace import WorkspaceBusyError, WorkspaceManager, OutputJanitor
+
+
+class TestWorkspaceManager:
+    """Tests für Workspaces und Aufräumen"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Fixture für WorkspaceManager in temporärem Verzeichnis"""
+        return WorkspaceManager(str(tmp_path / "output"))
+
+    def make_workspace(self, manager, size: int, age: float = 0):
+        """Erstellt einen freigegebenen Workspace mit Datei und Alter"""
+        path = manager.create()
+        (path / "hooks.zip").write_bytes(b"x" * size)
+        manager.release(path)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_create_unique(self, manager):
+        """Test: Jeder Job bekommt ein eigenes Verzeichnis"""
+        first = manager.create()
+        second = manager.create()
+
+        assert first != second
+        assert first.is_dir() and second.is_dir()
+
+    def test_create_sanitizes_job_id(self, manager):
+        """Test: Job-IDs können keine Pfade verlassen"""
+        path = manager.create("../evil")
+
+        assert path.parent == manager.root_dir
+
+    def test_exclusive_workspace_rejects_second_job(self, manager):
+        """Test: Ein exklusiver Workspace wird erst nach der Freigabe wieder vergeben"""
+        path = manager.create("sitzung-final", exclusive=True)
+
+        with pytest.raises(WorkspaceBusyError):
+            manager.create("sitzung-final", exclusive=True)
+
+        manager.release(path)
+        assert manager.create("sitzung-final", exclusive=True) == path
+
+    def test_cleanup_by_age(self, manager):
+        """Test: Alte Workspaces werden gelöscht, neue bleiben"""
+        old = self.make_workspace(manager, 100, age=1000)
+        new = self.make_workspace(manager, 100)
+
+        result = manager.cleanup(max_age_seconds=500, max_total_bytes=10**9)
+
+        assert not old.exists()
+        assert new.exists()
+        assert result['evicted'] == 1
+        assert result['reclaimed_bytes'] == 100
+
+    def test_cleanup_by_budget(self, manager):
+        """Test: Bei Budget-Überschreitung wird das Älteste zuerst gelöscht"""
+        oldest = self.make_workspace(manager, 600, age=30)
+        newer = self.make_workspace(manager, 600, age=10)
+
+        result = manager.cleanup(max_age_seconds=10**6, max_total_bytes=1000)
+
+        assert not oldest.exists()
+        assert newer.exists()
+        assert result['remaining_bytes'] == 600
+
+    def test_active_workspace_protected(self, manager):
+        """Test: Laufende Jobs werden nie gelöscht"""
+        active = manager.create()
+        os.utime(active, (0, 0))
+
+        manager.cleanup(max_age_seconds=0, max_total_bytes=0)
+
+        assert active.exists()
+
+    def test_janitor_metrics(self, manager):
+        """Test: Der Aufräumer summiert freigegebenen Speicher"""
+        self.make_workspace(manager, 100, age=10**6)
+        janitor = OutputJanitor(manager, interval=60)
+
+        janitor.run_once()
+
+        assert janitor.metrics['runs'] == 1
+        assert janitor.metrics['evicted_workspaces'] == 1
+        assert janitor.metrics['reclaimed_bytes'] == 100